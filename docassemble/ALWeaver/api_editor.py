@@ -41,6 +41,8 @@ Provides:
     GET  /al/editor/api/agent/sessions/<id> — read assistant session state
     DELETE /al/editor/api/agent/sessions/<id> — end an assistant session
     POST /al/editor/api/agent/sessions/<id>/turn — run one assistant turn
+    GET  /al/editor/api/agent/sessions/<id>/progress — poll a running turn
+    GET  /al/editor/api/agent/sessions/<id>/progress/stream — the same, as SSE (opt-in)
     POST /al/editor/api/agent/sessions/<id>/cancel — stop a running turn
     POST /al/editor/api/agent/sessions/<id>/reset — restore the original candidate
     POST /al/editor/api/agent/sessions/<id>/apply — return the candidate source
@@ -72,7 +74,7 @@ from urllib.parse import quote
 from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 import yaml
-from flask import Response, jsonify, redirect, request, url_for
+from flask import Response, jsonify, redirect, request, stream_with_context, url_for
 from flask_wtf.csrf import generate_csrf
 from flask_login import current_user
 
@@ -207,6 +209,7 @@ from .review_screen_sync import (
     review_screen_identity,
     sync_review_screen,
 )
+from .project_index import forget_project_file, project_index
 from .source_document import (
     apply_range_operations,
     parse_source_document,
@@ -216,7 +219,10 @@ from .editor_project_search import (
     MAX_PROJECT_MATCHES,
     context_for_span,
     find_literal_matches,
+    may_contain_text,
+    may_contain_variable,
     replace_selected_matches,
+    search_index_entry,
 )
 from .editor_agent import (
     AgentConfigurationError,
@@ -230,6 +236,7 @@ from .editor_agent_models import (
     MAX_CHAT_MESSAGE_CHARS,
     MAX_TURNS_PER_SESSION,
     WeaverAgentSession,
+    append_progress_event,
     clear_progress,
     delete_agent_session,
     diff_stats,
@@ -253,6 +260,7 @@ from .editor_agent_validation import (
     validate_candidate_source,
     validate_source_text,
 )
+from .llm_response_cache import cached_llms
 from .runtime_sessions import (
     append_runtime_event,
     create_runtime_record,
@@ -282,6 +290,7 @@ except Exception as _ai_utils_import_err:
 from .playground_publish import (
     SECTION_TO_STORAGE,
     _copy_files_to_section,
+    close_github_snapshot,
     delete_project,
     create_project,
     get_list_of_projects,
@@ -422,6 +431,23 @@ def _auth_fail(request_id: str):
     )
 
 
+def _with_revision_etag(
+    response: Response, revision: str, conditional: bool = False
+) -> Response:
+    """Label a response with the revision of the source it describes.
+
+    Reads that only depend on the file's text are ``conditional``: a client
+    sending the revision back in ``If-None-Match`` gets ``304 Not Modified``
+    rather than the same block model again.
+    """
+    response.set_etag(revision)
+    if conditional:
+        response.headers["Cache-Control"] = "no-cache"
+        # Turns the response into a 304 in place when the tag matches
+        response.make_conditional(request)
+    return response
+
+
 def _current_user_id() -> int:
     uid = getattr(current_user, "id", None)
     if uid is None:
@@ -1088,6 +1114,75 @@ def _get_static_content(filename: str) -> str:
     return ""
 
 
+# The editor's own scripts and stylesheets never change while a process runs,
+# so each is read, hashed and compressed once. editor.html links them with the
+# hash in the query string, which lets browsers keep them for a year and still
+# fetch the new file the moment an upgrade changes it.
+STATIC_ASSET_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+_STATIC_COMPRESS_MIN_BYTES = 1024
+_STATIC_MIMETYPES = {".css": "text/css", ".js": "application/javascript"}
+
+
+@dataclass(frozen=True)
+class _StaticAsset:
+    mimetype: str
+    fingerprint: str
+    encodings: Dict[str, bytes]
+
+
+# Only files that exist are kept, so requests for made-up names cannot grow it
+_static_assets: Dict[str, _StaticAsset] = {}
+
+
+def _compressed_static_encodings(content: bytes) -> Dict[str, bytes]:
+    encodings = {"identity": content}
+    if len(content) < _STATIC_COMPRESS_MIN_BYTES:
+        return encodings
+    import gzip
+
+    encodings["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+    try:
+        import brotli  # type: ignore
+    except ImportError:
+        return encodings
+    encodings["br"] = brotli.compress(content, quality=11)
+    return encodings
+
+
+def _editor_static_asset(filename: str) -> Optional[_StaticAsset]:
+    """The editor asset ``filename``, read and compressed once per process."""
+    asset = _static_assets.get(filename)
+    if asset is not None:
+        return asset
+    content = _get_static_content(filename).encode("utf-8")
+    if not content:
+        return None
+    asset = _static_assets[filename] = _StaticAsset(
+        mimetype=_STATIC_MIMETYPES.get(
+            os.path.splitext(filename)[1].lower(), "text/plain"
+        ),
+        fingerprint=hashlib.sha256(content).hexdigest()[:20],
+        encodings=_compressed_static_encodings(content),
+    )
+    return asset
+
+
+def _fingerprint_static_urls(html: str) -> str:
+    """Add each editor asset's content hash to its URL in the page."""
+
+    def with_fingerprint(match: re.Match) -> str:
+        asset = _editor_static_asset(match.group(1))
+        if asset is None:
+            return match.group(0)
+        return f"{match.group(0)}?v={asset.fingerprint}"
+
+    return re.sub(
+        re.escape(EDITOR_BASE_PATH) + r"/static/([A-Za-z0-9_.-]+)(?![?\w.-])",
+        with_fingerprint,
+        html,
+    )
+
+
 def _editor_feature_bootstrap() -> Dict[str, Any]:
     """Publish the editor's feature state to the browser.
 
@@ -1102,6 +1197,7 @@ def _editor_feature_bootstrap() -> Dict[str, Any]:
     patch_model = _patch_model_enabled()
     runtime_inspector = _runtime_inspector_enabled()
     agent_editor = _agent_editor_enabled()
+    progress_stream = _agent_progress_stream_enabled()
     status = _assistant_status()
     capability = _restart_capability()
     module_restart = {
@@ -1114,11 +1210,13 @@ def _editor_feature_bootstrap() -> Dict[str, Any]:
         "patch_model": patch_model,
         "runtime_inspector": runtime_inspector,
         "agent_editor": agent_editor,
+        "progress_stream": progress_stream,
         "assistant_status": status,
         "module_restart": module_restart,
         "patchModel": patch_model,
         "runtimeInspector": runtime_inspector,
         "agentEditor": agent_editor,
+        "progressStream": progress_stream,
         "assistantStatus": status,
         "moduleRestart": module_restart,
     }
@@ -1129,6 +1227,7 @@ def _render_editor_page() -> str:
     html = _get_template_content("editor.html")
     if not html:
         return ""
+    html = _fingerprint_static_urls(html)
     login_url, logout_url = _editor_auth_urls()
     bootstrap: Dict[str, Any] = {
         "apiBasePath": EDITOR_BASE_PATH,
@@ -1315,21 +1414,42 @@ def editor_page() -> Response:
 
 @app.route(f"{EDITOR_BASE_PATH}/static/<path:filename>", methods=["GET"])
 def editor_static(filename: str) -> Response:
-    """Serve static assets (CSS/JS) for the editor."""
+    """Serve static assets (CSS/JS) for the editor.
+
+    Each asset is sent compressed when the browser accepts it, with a strong
+    ETag. A request naming the current content hash in ``v`` may be cached for a
+    year; anything else must be revalidated, which costs a 304.
+    """
     # Only allow safe filenames
     safe = os.path.basename(filename)
     if safe != filename or ".." in filename:
         return Response("Not found", status=404, mimetype="text/plain")
-    content = _get_static_content(safe)
-    if not content:
+    asset = _editor_static_asset(safe)
+    if asset is None:
         return Response("Not found", status=404, mimetype="text/plain")
-    if safe.endswith(".css"):
-        mimetype = "text/css"
-    elif safe.endswith(".js"):
-        mimetype = "application/javascript"
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        if candidate in asset.encodings and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+    response = Response(asset.encodings[encoding], mimetype=asset.mimetype)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    # Each encoding is its own representation, so each has its own strong tag.
+    response.set_etag(
+        asset.fingerprint
+        if encoding == "identity"
+        else f"{asset.fingerprint}-{encoding}"
+    )
+    if request.args.get("v") == asset.fingerprint:
+        response.headers["Cache-Control"] = (
+            f"public, max-age={STATIC_ASSET_MAX_AGE_SECONDS}, immutable"
+        )
     else:
-        mimetype = "text/plain"
-    return Response(content, mimetype=mimetype)
+        response.headers["Cache-Control"] = "no-cache"
+    response.make_conditional(request)
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -1703,23 +1823,26 @@ def editor_api_github_pull() -> Response:
         remote = get_github_repository_snapshot(
             repository_url=sync["repository_url"], user_id=uid, ref=sync["branch"]
         )
-        # Older manifests did not record the published commit. Establishing the
-        # current head as the base is safe and makes all later pulls mergeable.
-        base_ref = sync.get("commit") or remote["sha"]
-        base = (
-            remote
-            if base_ref == remote["sha"]
-            else get_github_repository_snapshot(
-                repository_url=sync["repository_url"], user_id=uid, ref=base_ref
+        base = remote
+        try:
+            # Older manifests did not record the published commit. Establishing
+            # the current head as the base is safe and makes all later pulls
+            # mergeable.
+            base_ref = sync.get("commit") or remote["sha"]
+            if base_ref != remote["sha"]:
+                base = get_github_repository_snapshot(
+                    repository_url=sync["repository_url"], user_id=uid, ref=base_ref
+                )
+            result = merge_github_snapshot(
+                user_id=uid,
+                project_name=project,
+                base_snapshot=base,
+                remote_snapshot=remote,
+                sync=sync,
             )
-        )
-        result = merge_github_snapshot(
-            user_id=uid,
-            project_name=project,
-            base_snapshot=base,
-            remote_snapshot=remote,
-            sync=sync,
-        )
+        finally:
+            close_github_snapshot(remote)
+            close_github_snapshot(base)
         if not result.get("merged"):
             conflicts = result.get("conflicts") or []
             return jsonify_with_status(
@@ -1945,6 +2068,10 @@ def editor_api_project_search() -> Response:
             if query == replacement:
                 raise ValueError(f"{query} is already named that")
             for item in files:
+                if not may_contain_variable(
+                    search_index_entry(item["content"], item["revision"]), query
+                ):
+                    continue
                 analysis = analyze_rename(
                     filename=item["filename"],
                     raw_yaml=item["content"],
@@ -1991,6 +2118,10 @@ def editor_api_project_search() -> Response:
                 if remaining <= 0:
                     truncated = True
                     break
+                if not may_contain_text(
+                    search_index_entry(item["content"], item["revision"]), query
+                ):
+                    continue
                 matches, file_truncated = find_literal_matches(
                     item["content"],
                     query,
@@ -2686,7 +2817,10 @@ def editor_api_template_variable_report_suggestion() -> Response:
             return playground_read_yaml(uid, project, _normalize_filename(name))
 
         sources, yaml_texts = collect_interview_yaml_texts(
-            read_project_file, filename, _project_yaml_filenames(uid, project)
+            read_project_file,
+            filename,
+            _project_yaml_filenames(uid, project),
+            index=project_index(uid, project),
         )
         suggested = suggested_report_names(yaml_texts, primary_filename=filename)
         return jsonify(
@@ -2757,7 +2891,10 @@ def editor_api_template_variable_report() -> Response:
             return playground_read_yaml(uid, project, _normalize_filename(name))
 
         sources, yaml_texts = collect_interview_yaml_texts(
-            read_project_file, filename, _project_yaml_filenames(uid, project)
+            read_project_file,
+            filename,
+            _project_yaml_filenames(uid, project),
+            index=project_index(uid, project),
         )
         suggested = suggested_report_names(yaml_texts, primary_filename=filename)
         report_title = str(post_data.get("title") or suggested["title"]).strip()
@@ -3128,7 +3265,7 @@ def editor_api_get_package_file() -> Response:
     try:
         raw_yaml = _read_package_yaml(reference)
         model = parse_interview_yaml(raw_yaml)
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "request_id": request_id,
@@ -3140,6 +3277,9 @@ def editor_api_get_package_file() -> Response:
                 },
             }
         )
+        return _with_revision_etag(
+            response, source_revision(raw_yaml), conditional=True
+        )
     except (ValueError, DAInvalidFilename) as exc:
         return jsonify_with_status(
             {
@@ -3181,10 +3321,11 @@ def editor_api_get_file() -> Response:
         project = _normalize_project(request.args.get("project"))
         filename = _normalize_filename(request.args.get("filename"))
         raw_yaml = playground_read_yaml(uid, project, filename)
+        revision = source_revision(raw_yaml)
         model = parse_interview_yaml(raw_yaml)
         order_step_map, order_steps = _order_steps_from_model(model)
 
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "request_id": request_id,
@@ -3199,11 +3340,12 @@ def editor_api_get_file() -> Response:
                     "order_steps": order_steps,
                     "order_step_map": order_step_map,
                     "raw_yaml": raw_yaml,
-                    "revision": source_revision(raw_yaml),
+                    "revision": revision,
                     "metadata_raw_yaml": metadata_source_slice(raw_yaml),
                 },
             }
         )
+        return _with_revision_etag(response, revision, conditional=True)
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
@@ -3403,7 +3545,7 @@ def editor_api_validate() -> Response:
             deduped, model["blocks"], source_name="validation"
         )
 
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "request_id": request_id,
@@ -3424,6 +3566,7 @@ def editor_api_validate() -> Response:
                 },
             }
         )
+        return _with_revision_etag(response, source_revision(raw_yaml))
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
@@ -3476,7 +3619,7 @@ def editor_api_style_check() -> Response:
         )
         summary = _lint_summary_for_findings(annotated_findings)
 
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "request_id": request_id,
@@ -3506,6 +3649,7 @@ def editor_api_style_check() -> Response:
                 },
             }
         )
+        return _with_revision_etag(response, source_revision(raw_yaml))
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
@@ -3543,7 +3687,7 @@ def editor_api_save_file() -> Response:
         if not isinstance(content, str):
             raise ValueError("content must be a YAML string")
         playground_write_yaml(uid, project, filename, content)
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "request_id": request_id,
@@ -3554,6 +3698,7 @@ def editor_api_save_file() -> Response:
                 },
             }
         )
+        return _with_revision_etag(response, source_revision(content))
     except ValueError as exc:
         return jsonify_with_status(
             {
@@ -4250,7 +4395,7 @@ def editor_api_save_metadata() -> Response:
         )
         playground_write_yaml(uid, project, filename, updated_content)
         model = parse_interview_yaml(updated_content)
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "request_id": request_id,
@@ -4268,6 +4413,7 @@ def editor_api_save_metadata() -> Response:
                 },
             }
         )
+        return _with_revision_etag(response, source_revision(updated_content))
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
@@ -4410,7 +4556,8 @@ def editor_api_get_assemblyline_settings() -> Response:
                 "server_defaults": _resolve_server_defaults(),
             }
         )
-        return jsonify({"success": True, "request_id": request_id, "data": data})
+        response = jsonify({"success": True, "request_id": request_id, "data": data})
+        return _with_revision_etag(response, data["revision"])
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
@@ -4501,7 +4648,8 @@ def editor_api_save_assemblyline_settings() -> Response:
                 "metadata_raw_yaml": metadata_source_slice(updated),
             }
         )
-        return jsonify({"success": True, "request_id": request_id, "data": data})
+        response = jsonify({"success": True, "request_id": request_id, "data": data})
+        return _with_revision_etag(response, data["revision"])
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
@@ -5500,9 +5648,6 @@ def _run_agent_turn_in_background(
     lands in the progress record, because that is the only place the browser
     can still read it once the original request is gone.
     """
-    live_events: List[Dict[str, Any]] = [
-        {"type": "status", "label": "Starting", "status": "thinking"}
-    ]
 
     def publish_progress(
         running: bool,
@@ -5514,7 +5659,6 @@ def _run_agent_turn_in_background(
             session_id,
             owner_user_id,
             running=running,
-            events=live_events,
             started_at=started_at,
             result=result,
             error=error,
@@ -5550,8 +5694,7 @@ def _run_agent_turn_in_background(
             return bool(latest and latest.cancelled)
 
         def on_event(event: Dict[str, Any]) -> None:
-            live_events.append(event)
-            publish_progress(True)
+            append_progress_event(r, session_id, event)
 
         candidate = session.candidate()
         result = run_agent_turn(
@@ -5789,7 +5932,8 @@ def editor_api_agent_progress(session_id: str) -> Response:
     """Report what the running turn has done so far.
 
     Polled by the browser while a turn is in flight. Reads a dedicated record
-    rather than the session, so it never races the turn's own writes.
+    rather than the session, so it never races the turn's own writes. With
+    ``after``, the cursor a previous read returned, only newer events are sent.
     """
     request_id = str(uuid.uuid4())
     if not _editor_auth_check():
@@ -5799,14 +5943,133 @@ def editor_api_agent_progress(session_id: str) -> Response:
     uid = _current_user_id()
     if load_agent_session(r, session_id, uid) is None:
         return _agent_not_found(request_id)
-    progress = load_progress(r, session_id, uid) or {
+    after = _progress_cursor(request.args.get("after"))
+    progress = load_progress(r, session_id, uid, after=after) or {
         "running": False,
         "events": [],
         "started_at": None,
+        "cursor": after or 0,
     }
     return jsonify({"success": True, "request_id": request_id, "data": progress})
 
 
+# How long one progress stream is held open. The browser's EventSource
+# reconnects on its own when it closes, resuming from the last event id, so this
+# only has to stay under the proxy's idle timeout and free the worker regularly.
+AGENT_PROGRESS_STREAM_SECONDS = 45
+AGENT_PROGRESS_STREAM_INTERVAL_SECONDS = 0.5
+
+
+def _agent_progress_stream_enabled() -> bool:
+    """Whether the assistant panel may follow a turn over Server-Sent Events.
+
+    Off unless ``progress stream`` is set: an open stream holds a web worker
+    for as long as it is open, which a server with a few synchronous workers
+    cannot spare for every open panel. Polling is the default.
+    """
+    return _weaver_flag("progress stream", False)
+
+
+def _progress_cursor(value: Any) -> Optional[int]:
+    try:
+        cursor = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor >= 0 else None
+
+
+def _server_sent_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, default=str))
+    return "\n".join(lines) + "\n\n"
+
+
+@app.route(
+    f"{EDITOR_BASE_PATH}/api/agent/sessions/<session_id>/progress/stream",
+    methods=["GET"],
+)
+def editor_api_agent_progress_stream(session_id: str) -> Response:
+    """Push the running turn's events to the browser as Server-Sent Events.
+
+    The stream sends a ``progress`` event per step, with the step's cursor as
+    its id, and one ``finished`` event with the turn's result or error before
+    it closes. A dropped connection resumes from ``Last-Event-ID``.
+    """
+    request_id = str(uuid.uuid4())
+    if not _editor_auth_check():
+        return _auth_fail(request_id)
+    if not _agent_editor_available():
+        return _agent_disabled(request_id)
+    if not _agent_progress_stream_enabled():
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {
+                    "type": "feature_disabled",
+                    "code": "progress_stream_disabled",
+                    "message": "The progress stream is not enabled; poll the "
+                    "progress endpoint instead.",
+                },
+            },
+            404,
+        )
+    uid = _current_user_id()
+    if load_agent_session(r, session_id, uid) is None:
+        return _agent_not_found(request_id)
+    cursor = _progress_cursor(request.headers.get("Last-Event-ID"))
+    if cursor is None:
+        cursor = _progress_cursor(request.args.get("after")) or 0
+
+    def generate():
+        position = cursor
+        deadline = time.time() + AGENT_PROGRESS_STREAM_SECONDS
+        last_sent = time.time()
+        yield "retry: 1000\n\n"
+        while True:
+            progress = load_progress(r, session_id, uid, after=position)
+            if progress is None:
+                yield _server_sent_event(
+                    "finished", {"running": False, "result": None, "error": None}
+                )
+                return
+            for event in progress["events"]:
+                position += 1
+                yield _server_sent_event("progress", event, event_id=position)
+            position = int(progress["cursor"])
+            if not progress.get("running"):
+                yield _server_sent_event(
+                    "finished",
+                    {
+                        "running": False,
+                        "started_at": progress.get("started_at"),
+                        "result": progress.get("result"),
+                        "error": progress.get("error"),
+                    },
+                    event_id=position,
+                )
+                return
+            now = time.time()
+            if now >= deadline:
+                return
+            if progress["events"]:
+                last_sent = now
+            elif now - last_sent >= 15:
+                # A comment line keeps proxies from closing an idle stream.
+                yield ": waiting\n\n"
+                last_sent = now
+            time.sleep(AGENT_PROGRESS_STREAM_INTERVAL_SECONDS)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route(
     f"{EDITOR_BASE_PATH}/api/agent/sessions/<session_id>/cancel", methods=["POST"]
 )
@@ -5964,6 +6227,7 @@ def editor_api_rename_file() -> Response:
             raise ValueError("New filename must be different")
         area, directory = _editor_playground_directory(uid, project)
         rename_saved_file(area, directory, old_filename, new_filename)
+        forget_project_file(uid, project, old_filename)
         return jsonify(
             {
                 "success": True,
@@ -6010,6 +6274,7 @@ def editor_api_delete_file() -> Response:
         filename = _normalize_filename(post_data.get("filename"))
         area, directory = _editor_playground_directory(uid, project)
         delete_saved_file(area, directory, filename)
+        forget_project_file(uid, project, filename)
         return jsonify(
             {
                 "success": True,
@@ -6851,6 +7116,9 @@ def editor_api_ai_generate_screen() -> Response:
         filename = _normalize_filename(post_data.get("filename"))
         block_id = str(post_data.get("block_id") or "").strip()
         user_instruction = str(post_data.get("instruction") or "").strip()
+        llms = cached_llms(
+            llms, bypass=parse_bool(post_data.get("bypass_cache"), default=False)
+        )
         field_types = _field_types_from_request(post_data)
 
         raw_yaml = playground_read_yaml(uid, project, filename)
@@ -6971,6 +7239,9 @@ def editor_api_ai_generate_fields() -> Response:
         block_id = str(post_data.get("block_id") or "").strip()
         if not block_id:
             raise ValueError("block_id is required")
+        llms = cached_llms(
+            llms, bypass=parse_bool(post_data.get("bypass_cache"), default=False)
+        )
         field_types = _field_types_from_request(post_data)
 
         raw_yaml = playground_read_yaml(uid, project, filename)
@@ -7164,15 +7435,27 @@ def editor_api_draft_review_screen() -> Response:
                 return raw_yaml
             return playground_read_yaml(uid, project, _normalize_filename(name))
 
+        index = project_index(uid, project)
         sources, yaml_texts = collect_interview_yaml_texts(
-            read_project_file, filename, _project_yaml_filenames(uid, project)
+            read_project_file,
+            filename,
+            _project_yaml_filenames(uid, project),
+            index=index,
         )
         identity = review_screen_identity(raw_yaml)
         # AssemblyLine declares `plaintiffs`, `defendants` and `courts` in its
         # own package, which the include walk does not follow. Telling the
         # generator about the lists this file already reviews keeps their
         # entries instead of silently dropping them.
-        inferred_objects = inferred_objects_document(yaml_texts)
+        inferred_objects = inferred_objects_document(
+            yaml_texts,
+            set().union(
+                *(
+                    index.declared_objects(name, text)
+                    for name, text in zip(sources, yaml_texts)
+                )
+            ),
+        )
         generator_inputs = list(yaml_texts)
         if inferred_objects:
             generator_inputs.append(inferred_objects)
@@ -8081,6 +8364,7 @@ def _new_project_from_template(uid: int, request_id: str) -> Response:
     create_project(uid, project_name)
 
     if github_url:
+        snapshot: Dict[str, Any] = {}
         try:
             snapshot = get_github_repository_snapshot(
                 repository_url=github_url,
@@ -8095,6 +8379,8 @@ def _new_project_from_template(uid: int, request_id: str) -> Response:
             # the user's project chooser.
             delete_project(uid, project_name)
             raise
+        finally:
+            close_github_snapshot(snapshot)
         # An imported repository can bring Python modules with it, and no save
         # went through the editor to install them.
         _reconcile_project_modules(uid, project_name)
@@ -8534,6 +8820,9 @@ def _complete_template_import_job(
             template_filename=template_filename,
             interview_yaml=interview_yaml,
             use_llm_assist=use_llm_assist,
+            already_defined=project_index(uid, project).defined_variables(
+                interview_filename, interview_yaml
+            ),
         )
         result = analysis.to_dict()
         result["project"] = project
@@ -8930,7 +9219,16 @@ def editor_api_documents() -> Response:
                 "templates": template_status(content, template_files),
             }
         )
-        return jsonify({"success": True, "request_id": request_id, "data": data})
+        response = jsonify({"success": True, "request_id": request_id, "data": data})
+        # Template status changes when a template is uploaded or deleted, even
+        # though the YAML does not
+        return _with_revision_etag(
+            response,
+            hashlib.sha256(
+                "\n".join([data["revision"], *sorted(template_files)]).encode("utf-8")
+            ).hexdigest(),
+            conditional=True,
+        )
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
@@ -9030,7 +9328,8 @@ def editor_api_save_documents() -> Response:
                 "raw_yaml": content,
             }
         )
-        return jsonify({"success": True, "request_id": request_id, "data": data})
+        response = jsonify({"success": True, "request_id": request_id, "data": data})
+        return _with_revision_etag(response, data["revision"])
     except (ValueError, FileNotFoundError) as exc:
         status = 404 if isinstance(exc, FileNotFoundError) else 400
         return jsonify_with_status(
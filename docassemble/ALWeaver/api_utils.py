@@ -1,16 +1,41 @@
 import base64
 import binascii
+import hashlib
 import json
 import os
+import re
 import shutil
 import tempfile
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-from .interview_generator import generate_interview_from_path, TemplateInput
+from .generation_progress import ProgressCallback
 
 WEAVER_API_BASE_PATH = "/al/api/v1/weaver"
 
 DEFAULT_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+DEFAULT_MAX_BATCH_DOCUMENTS = 500
+
+# Uploads are copied to a spool file this much at a time, so a large scan is
+# never held in memory whole.
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+DEFAULT_UPLOAD_SPOOL_DIRECTORY = os.path.join(
+    tempfile.gettempdir(), "alweaver-api-uploads"
+)
+# A spool file no task has claimed after this long is left over from a job
+# that never ran, and is removed the next time an upload is spooled.
+UPLOAD_SPOOL_EXPIRE_SECONDS = 24 * 60 * 60
+UPLOAD_KEY_PREFIX = "da:alweaver:upload:"
+# Stage events of an async generation, keyed by its task id
+JOB_PROGRESS_KEY_PREFIX = "da:alweaver:job-progress:"
+
+RESULT_CACHE_KEY_PREFIX = "da:alweaver:result:"
+DEFAULT_RESULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_RESULT_CACHE_MAX_ENTRIES = 500
+DEFAULT_RESULT_CACHE_MAX_ENTRY_BYTES = 8 * 1024 * 1024
 
 ALLOWED_EXTENSION_TO_MIMETYPE = {
     ".pdf": "application/pdf",
@@ -20,6 +45,21 @@ ALLOWED_MIMETYPE_TO_EXTENSION = {
     mimetype: extension for extension, mimetype in ALLOWED_EXTENSION_TO_MIMETYPE.items()
 }
 
+# Generated files of an async job, kept for download as long as the job is.
+ARTIFACT_KEY_PREFIX = "da:alweaver:artifact:"
+ARTIFACT_EXPIRE_SECONDS = 24 * 60 * 60
+DEFAULT_ARTIFACT_DIRECTORY = os.path.join(
+    tempfile.gettempdir(), "alweaver-api-artifacts"
+)
+ARTIFACT_CONTENT_TYPES = {
+    ".yml": "application/x-yaml",
+    ".yaml": "application/x-yaml",
+    ".zip": "application/zip",
+    ".html": "text/html",
+    **ALLOWED_EXTENSION_TO_MIMETYPE,
+}
+_ARTIFACT_NAME = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9._-]*$")
+
 
 class WeaverAPIValidationError(ValueError):
     def __init__(self, message: str, status_code: int = 400):
@@ -55,6 +95,393 @@ def decode_base64_content(content: Any) -> bytes:
         raise WeaverAPIValidationError("file_content_base64 is not valid base64 data.")
 
 
+@dataclass(frozen=True)
+class SpooledUpload:
+    """An uploaded template, written to a file as it was received.
+
+    Whoever generates from the upload owns the file and removes it; see
+    :func:`generate_interview_from_upload` and :func:`discard_upload`.
+    """
+
+    filename: str
+    mimetype: Optional[str]
+    path: str
+    size: int
+    sha256: str
+
+
+def _new_spool_path(spool_dir: Optional[str], extension: str) -> str:
+    directory = spool_dir or DEFAULT_UPLOAD_SPOOL_DIRECTORY
+    os.makedirs(directory, exist_ok=True)
+    _remove_stale_spool_files(directory)
+    return os.path.join(directory, uuid.uuid4().hex + extension)
+
+
+def _remove_stale_spool_files(directory: str) -> None:
+    cutoff = time.time() - UPLOAD_SPOOL_EXPIRE_SECONDS
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            continue
+
+
+def _spool_chunks(
+    chunks: Any,
+    *,
+    filename: str,
+    mimetype: Optional[str],
+    spool_dir: Optional[str],
+    max_upload_bytes: int,
+) -> SpooledUpload:
+    _safe_filename, extension = validate_upload_name(
+        filename=filename, mimetype=mimetype
+    )
+    path = _new_spool_path(spool_dir, extension)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as handle:
+            for chunk in chunks:
+                size += len(chunk)
+                if size > max_upload_bytes:
+                    raise WeaverAPIValidationError(
+                        f"Uploaded file is larger than {max_upload_bytes} bytes.",
+                        status_code=413,
+                    )
+                digest.update(chunk)
+                handle.write(chunk)
+        if size == 0:
+            raise WeaverAPIValidationError("Uploaded file is empty.")
+    except BaseException:
+        _remove_file(path)
+        raise
+    return SpooledUpload(
+        filename=filename,
+        mimetype=mimetype,
+        path=path,
+        size=size,
+        sha256=digest.hexdigest(),
+    )
+
+
+def spool_upload_stream(
+    stream: IO[bytes],
+    *,
+    filename: str,
+    mimetype: Optional[str] = None,
+    spool_dir: Optional[str] = None,
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+) -> SpooledUpload:
+    """Copy an upload to a spool file a chunk at a time.
+
+    The name and type are checked before anything is read, and the size limit
+    as the bytes arrive, so an oversized upload is refused without reading the
+    rest of it.
+    """
+    return _spool_chunks(
+        iter(lambda: stream.read(UPLOAD_CHUNK_BYTES), b""),
+        filename=filename,
+        mimetype=mimetype,
+        spool_dir=spool_dir,
+        max_upload_bytes=max_upload_bytes,
+    )
+
+
+def spool_base64_upload(
+    content: Any,
+    *,
+    filename: str,
+    mimetype: Optional[str] = None,
+    spool_dir: Optional[str] = None,
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+) -> SpooledUpload:
+    """Decode ``file_content_base64`` to a spool file a chunk at a time."""
+    if not isinstance(content, str) or not content.strip():
+        raise WeaverAPIValidationError(
+            "file_content_base64 must be a non-empty base64-encoded string."
+        )
+    # Four characters of base64 make three bytes, so chunks of a multiple of
+    # four characters decode independently.
+    step = (UPLOAD_CHUNK_BYTES // 3) * 4
+
+    def chunks():
+        for start in range(0, len(content), step):
+            try:
+                yield base64.b64decode(content[start : start + step], validate=True)
+            except (ValueError, binascii.Error):
+                raise WeaverAPIValidationError(
+                    "file_content_base64 is not valid base64 data."
+                )
+
+    return _spool_chunks(
+        chunks(),
+        filename=filename,
+        mimetype=mimetype,
+        spool_dir=spool_dir,
+        max_upload_bytes=max_upload_bytes,
+    )
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def spooled_upload_at(
+    path: str, *, filename: str, mimetype: Optional[str] = None
+) -> SpooledUpload:
+    """The spooled upload at ``path``, as handed to a task by reference."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        raise WeaverAPIValidationError(
+            "The uploaded file has expired or was already used.", status_code=410
+        )
+    return SpooledUpload(
+        filename=filename, mimetype=mimetype, path=path, size=size, sha256=""
+    )
+
+
+def discard_upload(upload: SpooledUpload) -> None:
+    """Remove an upload's spool file, if generation has not already taken it."""
+    _remove_file(upload.path)
+
+
+def store_upload_in_redis(
+    redis_client: Any, upload: SpooledUpload, *, expire_seconds: int
+) -> str:
+    """Copy a spool file into Redis a chunk at a time and remove the file.
+
+    For servers whose Celery workers do not share the web server's disk.
+    Returns the key to hand to :func:`restore_upload_from_redis`.
+    """
+    key = UPLOAD_KEY_PREFIX + uuid.uuid4().hex
+    try:
+        with open(upload.path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(UPLOAD_CHUNK_BYTES), b""):
+                redis_client.append(key, chunk)
+        redis_client.expire(key, expire_seconds)
+    except BaseException:
+        redis_client.delete(key)
+        raise
+    finally:
+        discard_upload(upload)
+    return key
+
+
+def restore_upload_from_redis(
+    redis_client: Any,
+    key: str,
+    *,
+    filename: str,
+    mimetype: Optional[str] = None,
+    spool_dir: Optional[str] = None,
+) -> SpooledUpload:
+    """Copy an upload stored by :func:`store_upload_in_redis` back to a file."""
+    size = int(redis_client.strlen(key) or 0)
+    if size == 0:
+        raise WeaverAPIValidationError(
+            "The uploaded file has expired or was already used.", status_code=410
+        )
+
+    def chunks():
+        for start in range(0, size, UPLOAD_CHUNK_BYTES):
+            yield bytes(
+                redis_client.getrange(key, start, start + UPLOAD_CHUNK_BYTES - 1)
+            )
+
+    upload = _spool_chunks(
+        chunks(),
+        filename=filename,
+        mimetype=mimetype,
+        spool_dir=spool_dir,
+        max_upload_bytes=size,
+    )
+    redis_client.delete(key)
+    return upload
+
+
+class ArtifactStore(ABC):
+    """Where an async job's generated files are kept for download.
+
+    Files are grouped under an ``artifact_id`` (the job's task id) and
+    expire after :data:`ARTIFACT_EXPIRE_SECONDS`.
+    """
+
+    @abstractmethod
+    def save(self, artifact_id: str, name: str, path: str) -> int:
+        """Keep the file at ``path`` as ``name``; returns its size."""
+
+    @abstractmethod
+    def size(self, artifact_id: str, name: str) -> Optional[int]:
+        """The size of a kept file, or None if there is none by that name."""
+
+    @abstractmethod
+    def read(
+        self, artifact_id: str, name: str, start: int, stop: int
+    ) -> Iterator[bytes]:
+        """Bytes ``start`` up to ``stop`` of a kept file, a chunk at a time."""
+
+    @abstractmethod
+    def delete(self, artifact_id: str) -> None:
+        """Remove every file kept under ``artifact_id``."""
+
+
+class DirectoryArtifactStore(ArtifactStore):
+    """Artifacts in a directory, one subdirectory per job."""
+
+    def __init__(self, directory: str = DEFAULT_ARTIFACT_DIRECTORY):
+        self.directory = directory
+
+    def _path(self, artifact_id: str, name: str) -> str:
+        return os.path.join(
+            self.directory, _artifact_name(artifact_id), _artifact_name(name)
+        )
+
+    def save(self, artifact_id: str, name: str, path: str) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        self._remove_expired()
+        target = self._path(artifact_id, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target)
+        return os.path.getsize(target)
+
+    def size(self, artifact_id: str, name: str) -> Optional[int]:
+        target = self._path(artifact_id, name)
+        try:
+            if time.time() - os.path.getmtime(target) > ARTIFACT_EXPIRE_SECONDS:
+                return None
+            return os.path.getsize(target)
+        except OSError:
+            return None
+
+    def read(
+        self, artifact_id: str, name: str, start: int, stop: int
+    ) -> Iterator[bytes]:
+        with open(self._path(artifact_id, name), "rb") as handle:
+            handle.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                chunk = handle.read(min(UPLOAD_CHUNK_BYTES, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, artifact_id: str) -> None:
+        shutil.rmtree(
+            os.path.join(self.directory, _artifact_name(artifact_id)),
+            ignore_errors=True,
+        )
+
+    def _remove_expired(self) -> None:
+        cutoff = time.time() - ARTIFACT_EXPIRE_SECONDS
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                continue
+
+
+class RedisArtifactStore(ArtifactStore):
+    """Artifacts in Redis, for workers that do not share the web server's disk."""
+
+    def __init__(self, redis_client: Any):
+        self.redis = redis_client
+
+    def _key(self, artifact_id: str, name: str) -> str:
+        return (
+            f"{ARTIFACT_KEY_PREFIX}{_artifact_name(artifact_id)}:{_artifact_name(name)}"
+        )
+
+    def save(self, artifact_id: str, name: str, path: str) -> int:
+        key = self._key(artifact_id, name)
+        self.redis.delete(key)
+        size = 0
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(UPLOAD_CHUNK_BYTES), b""):
+                self.redis.append(key, chunk)
+                size += len(chunk)
+        self.redis.expire(key, ARTIFACT_EXPIRE_SECONDS)
+        return size
+
+    def size(self, artifact_id: str, name: str) -> Optional[int]:
+        key = self._key(artifact_id, name)
+        if not self.redis.exists(key):
+            return None
+        return int(self.redis.strlen(key) or 0)
+
+    def read(
+        self, artifact_id: str, name: str, start: int, stop: int
+    ) -> Iterator[bytes]:
+        key = self._key(artifact_id, name)
+        for offset in range(start, stop, UPLOAD_CHUNK_BYTES):
+            end = min(offset + UPLOAD_CHUNK_BYTES, stop) - 1
+            yield bytes(self.redis.getrange(key, offset, end))
+
+    def delete(self, artifact_id: str) -> None:
+        keys = list(
+            self.redis.scan_iter(
+                match=f"{ARTIFACT_KEY_PREFIX}{_artifact_name(artifact_id)}:*"
+            )
+        )
+        if keys:
+            self.redis.delete(*keys)
+
+
+def artifact_store_for(settings: Mapping[str, Any], redis_client: Any) -> ArtifactStore:
+    """The artifact store the ``assembly line`` configuration asks for.
+
+    ``weaver api artifact storage`` is ``file`` or ``redis``, and follows
+    ``weaver api upload storage`` when unset; ``weaver api artifact
+    directory`` moves the directory files are kept in.
+    """
+    storage = settings.get("weaver api artifact storage") or settings.get(
+        "weaver api upload storage"
+    )
+    if str(storage or "").strip().lower() == "redis":
+        return RedisArtifactStore(redis_client)
+    return DirectoryArtifactStore(
+        str(settings.get("weaver api artifact directory") or DEFAULT_ARTIFACT_DIRECTORY)
+    )
+
+
+def _artifact_name(name: str) -> str:
+    if not _ARTIFACT_NAME.match(name or ""):
+        raise WeaverAPIValidationError(f"{name!r} is not an artifact name.", 404)
+    return name
+
+
+def _safe_artifact_name(name: str, taken: Sequence[str]) -> str:
+    candidate = re.sub(r"[^A-Za-z0-9._-]", "_", os.path.basename(name)).lstrip(".")
+    candidate = candidate or "artifact"
+    stem, extension = os.path.splitext(candidate)
+    suffix = 2
+    while candidate in taken:
+        candidate = f"{stem}_{suffix}{extension}"
+        suffix += 1
+    return candidate
+
+
+def artifact_content_type(name: str) -> str:
+    return ARTIFACT_CONTENT_TYPES.get(
+        os.path.splitext(name)[1].lower(), "application/octet-stream"
+    )
+
+
 def _load_json_field(
     raw_value: Any, *, field_name: str, expected_type: type
 ) -> Optional[Any]:
@@ -103,6 +530,9 @@ def coerce_generation_options(raw_options: Mapping[str, Any]) -> Dict[str, Any]:
         "copy_baseline_questions",
         "use_llm_assist",
         "normalize_field_names",
+        "lint_generated_yaml",
+        "bypass_llm_cache",
+        "profile",
     ):
         if key in raw_options and raw_options.get(key) is not None:
             options[key] = parse_bool(raw_options.get(key), default=False)
@@ -142,9 +572,92 @@ def coerce_response_flags(raw_options: Mapping[str, Any]) -> Dict[str, bool]:
         "include_yaml_text": parse_bool(
             raw_options.get("include_yaml_text"), default=True
         ),
+        "include_timings": parse_bool(
+            raw_options.get("include_timings"), default=False
+        ),
+    }
+
+
+def coerce_cache_flags(raw_options: Mapping[str, Any]) -> Dict[str, bool]:
+    """Whether a request asked to reuse an earlier identical generation.
+
+    The result cache is opt-in per request. Requests that use the LLM assist
+    are never served from it unless they also say ``cache_llm_results``, since
+    a second run there is often a deliberate request for a different draft.
+    """
+    return {
+        "use_result_cache": parse_bool(
+            raw_options.get("use_result_cache"), default=False
+        ),
+        "cache_llm_results": parse_bool(
+            raw_options.get("cache_llm_results"), default=False
+        ),
     }
 
 
+def result_cache_applies(
+    generation_options: Mapping[str, Any], cache_flags: Mapping[str, bool]
+) -> bool:
+    if not cache_flags.get("use_result_cache"):
+        return False
+    # A profile is only worth anything from a run that actually happens
+    if generation_options.get("profile"):
+        return False
+    if generation_options.get("use_llm_assist") and not cache_flags.get(
+        "cache_llm_results"
+    ):
+        return False
+    return True
+
+
+def generation_result_cache_key(
+    *,
+    filename: str,
+    content_bytes: Optional[bytes] = None,
+    mimetype: Optional[str],
+    generation_options: Mapping[str, Any],
+    response_flags: Mapping[str, bool],
+    content_sha256: Optional[str] = None,
+) -> str:
+    """A key that only an identical generation request would produce.
+
+    Covers the uploaded bytes, the options after coercion (with the same
+    ``exact_name`` default generation applies), the response flags that shape
+    the payload, and the package version, so an upgrade never serves a draft
+    the new generator would not write. A spooled upload passes the
+    ``content_sha256`` it was given while being written instead of its bytes.
+    """
+    try:
+        from . import __version__
+    except ImportError:
+        __version__ = "0.0.0"
+
+    if content_bytes is not None:
+        safe_filename, _extension = validate_upload_metadata(
+            filename=filename, content_bytes=content_bytes, mimetype=mimetype
+        )
+        content_sha256 = hashlib.sha256(content_bytes).hexdigest()
+    elif content_sha256:
+        safe_filename, _extension = validate_upload_name(
+            filename=filename, mimetype=mimetype
+        )
+    else:
+        raise ValueError("Either content_bytes or content_sha256 is required")
+    resolved_options = dict(generation_options)
+    resolved_options.setdefault("exact_name", safe_filename)
+    fingerprint = json.dumps(
+        {
+            "content_sha256": content_sha256,
+            "options": resolved_options,
+            "response_flags": dict(response_flags),
+            "version": __version__,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
 def merge_raw_options(raw_options: Mapping[str, Any]) -> Dict[str, Any]:
     merged: Dict[str, Any] = dict(raw_options)
     options_blob = raw_options.get("options")
@@ -171,6 +684,87 @@ def coerce_async_flag(raw_options: Mapping[str, Any]) -> bool:
     return False
 
 
+def coerce_batch_documents(
+    raw_documents: Any, *, max_documents: int = DEFAULT_MAX_BATCH_DOCUMENTS
+) -> List[Dict[str, Any]]:
+    """Check the ``documents`` list of a JSON batch request.
+
+    Each entry needs a ``filename`` and ``file_content_base64``, and may name a
+    ``mimetype``. Every document is validated before any is queued, so a batch
+    is either accepted whole or rejected with the position of the bad entry.
+    """
+    if not isinstance(raw_documents, list) or not raw_documents:
+        raise WeaverAPIValidationError("documents must be a non-empty list.")
+    if len(raw_documents) > max_documents:
+        raise WeaverAPIValidationError(
+            f"A batch may hold at most {max_documents} documents.",
+            status_code=413,
+        )
+    documents: List[Dict[str, Any]] = []
+    for index, raw_document in enumerate(raw_documents):
+        if not isinstance(raw_document, dict):
+            raise WeaverAPIValidationError(f"documents[{index}] must be an object.")
+        try:
+            filename = str(raw_document.get("filename") or "upload")
+            raw_mimetype = raw_document.get("mimetype")
+            mimetype = (
+                raw_mimetype
+                if isinstance(raw_mimetype, str) and raw_mimetype.strip()
+                else None
+            )
+            content_bytes = decode_base64_content(
+                raw_document.get("file_content_base64")
+            )
+            validate_upload_metadata(
+                filename=filename, content_bytes=content_bytes, mimetype=mimetype
+            )
+        except WeaverAPIValidationError as exc:
+            raise WeaverAPIValidationError(
+                f"documents[{index}]: {exc.message}", status_code=exc.status_code
+            )
+        documents.append(
+            {"filename": filename, "mimetype": mimetype, "content_bytes": content_bytes}
+        )
+    return documents
+
+
+def job_status_for_celery_state(state: str) -> str:
+    """The API's name for a Celery task state."""
+    state = (state or "").upper()
+    if state == "SUCCESS":
+        return "succeeded"
+    if state in {"RECEIVED", "STARTED", "RETRY"}:
+        return "running"
+    if state == "FAILURE":
+        return "failed"
+    return "queued"
+
+
+def summarize_batch_statuses(statuses: Sequence[str]) -> Dict[str, Any]:
+    """Roll the per-document statuses of a batch up into one.
+
+    A batch is ``running`` until every document has finished, and then
+    ``succeeded`` -- even when some documents failed, since each document
+    stands on its own. ``failed`` is kept for a batch where nothing worked.
+    """
+    counts = {status: 0 for status in ("queued", "running", "succeeded", "failed")}
+    for status in statuses:
+        counts[status] = counts.get(status, 0) + 1
+    finished = counts["succeeded"] + counts["failed"]
+    if finished < len(statuses):
+        overall = "queued" if counts["queued"] == len(statuses) else "running"
+    elif statuses and counts["failed"] == len(statuses):
+        overall = "failed"
+    else:
+        overall = "succeeded"
+    return {
+        "status": overall,
+        "total": len(statuses),
+        "finished": finished,
+        "counts": counts,
+    }
+
+
 def validate_upload_metadata(
     *,
     filename: str,
@@ -187,7 +781,15 @@ def validate_upload_metadata(
             f"Uploaded file is larger than {max_upload_bytes} bytes.",
             status_code=413,
         )
+    return validate_upload_name(filename=filename, mimetype=mimetype)
+
 
+def validate_upload_name(
+    *, filename: str, mimetype: Optional[str] = None
+) -> Tuple[str, str]:
+    """The safe filename and extension of an upload, from its name or type."""
+    if not filename:
+        raise WeaverAPIValidationError("filename is required.")
     safe_filename = os.path.basename(filename)
     extension = os.path.splitext(safe_filename)[1].lower()
     normalized_mimetype = (mimetype or "").split(";")[0].strip().lower()
@@ -215,29 +817,166 @@ def generate_interview_from_bytes(
     generation_options: Mapping[str, Any],
     include_package_zip_base64: bool = False,
     include_yaml_text: bool = True,
+    include_timings: bool = False,
     include_generated_template_bytes: bool = False,
     additional_documents: Optional[Sequence[Mapping[str, Any]]] = None,
+    artifact_store: Optional[ArtifactStore] = None,
+    artifact_id: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> Dict[str, Any]:
     """Draft an interview from uploaded template bytes.
 
     ``additional_documents`` holds further templates, each a mapping with
     ``filename``, ``content_bytes`` and an optional ``mimetype``. They are
     woven into the same interview, in order, after the lead document.
+    ``artifact_store``, ``artifact_id`` and ``progress`` are as for
+    :func:`generate_interview_from_upload`.
     """
     safe_filename, extension = validate_upload_metadata(
         filename=filename, content_bytes=content_bytes, mimetype=mimetype
     )
-
-    output_dir = tempfile.mkdtemp(prefix="alweaver-api-")
     input_dir = tempfile.mkdtemp(prefix="alweaver-api-input-")
-
     try:
         with tempfile.NamedTemporaryFile(
             mode="wb", suffix=extension, dir=input_dir, delete=False
         ) as handle:
             input_path = handle.name
             handle.write(content_bytes)
+    except BaseException:
+        shutil.rmtree(input_dir, ignore_errors=True)
+        raise
+    return _generate_interview_in_input_dir(
+        safe_filename=safe_filename,
+        input_path=input_path,
+        input_dir=input_dir,
+        generation_options=generation_options,
+        include_package_zip_base64=include_package_zip_base64,
+        include_yaml_text=include_yaml_text,
+        include_timings=include_timings,
+        include_generated_template_bytes=include_generated_template_bytes,
+        additional_documents=additional_documents,
+        artifact_store=artifact_store,
+        artifact_id=artifact_id,
+        progress=progress,
+    )
+
 
+def generate_interview_from_upload(
+    *,
+    upload: SpooledUpload,
+    generation_options: Mapping[str, Any],
+    include_package_zip_base64: bool = False,
+    include_yaml_text: bool = True,
+    include_timings: bool = False,
+    artifact_store: Optional[ArtifactStore] = None,
+    artifact_id: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """Draft an interview from a spooled upload, and remove its spool file.
+
+    The file is moved rather than copied into the generator's working
+    directory, so the upload is never read into memory here. With an
+    ``artifact_store``, the generated files are kept there under
+    ``artifact_id`` and listed in the payload's ``artifacts``. ``progress``
+    is told as each stage of the generation starts.
+    """
+    try:
+        safe_filename, _extension = validate_upload_name(
+            filename=upload.filename, mimetype=upload.mimetype
+        )
+        input_dir = tempfile.mkdtemp(prefix="alweaver-api-input-")
+    except BaseException:
+        discard_upload(upload)
+        raise
+    try:
+        input_path = os.path.join(input_dir, os.path.basename(upload.path))
+        shutil.move(upload.path, input_path)
+    except BaseException:
+        discard_upload(upload)
+        shutil.rmtree(input_dir, ignore_errors=True)
+        raise
+    return _generate_interview_in_input_dir(
+        safe_filename=safe_filename,
+        input_path=input_path,
+        input_dir=input_dir,
+        generation_options=generation_options,
+        include_package_zip_base64=include_package_zip_base64,
+        include_yaml_text=include_yaml_text,
+        include_timings=include_timings,
+        artifact_store=artifact_store,
+        artifact_id=artifact_id,
+        progress=progress,
+    )
+
+
+def _save_artifacts(
+    artifact_store: ArtifactStore, artifact_id: str, result: Any
+) -> List[Dict[str, Any]]:
+    """Keep the YAML, package ZIP, renamed templates and any profile for download."""
+    files: List[Tuple[str, str, str]] = []
+    if result.yaml_path and os.path.isfile(result.yaml_path):
+        files.append(
+            ("interview", os.path.basename(result.yaml_path), result.yaml_path)
+        )
+    if result.package_zip_path and os.path.isfile(result.package_zip_path):
+        files.append(
+            (
+                "package_zip",
+                os.path.basename(result.package_zip_path),
+                result.package_zip_path,
+            )
+        )
+    for template_name, normalized_path in result.normalized_template_paths.items():
+        if os.path.isfile(normalized_path):
+            files.append(("normalized_template", template_name, normalized_path))
+    if result.profile_path and os.path.isfile(result.profile_path):
+        files.append(
+            ("profile", os.path.basename(result.profile_path), result.profile_path)
+        )
+
+    artifacts: List[Dict[str, Any]] = []
+    for kind, filename, path in files:
+        name = _safe_artifact_name(filename, [item["name"] for item in artifacts])
+        artifacts.append(
+            {
+                "name": name,
+                "kind": kind,
+                "filename": filename,
+                "size": artifact_store.save(artifact_id, name, path),
+                "content_type": artifact_content_type(name),
+            }
+        )
+    return artifacts
+
+
+def _generate_interview_in_input_dir(
+    *,
+    safe_filename: str,
+    input_path: str,
+    input_dir: str,
+    generation_options: Mapping[str, Any],
+    include_package_zip_base64: bool = False,
+    include_yaml_text: bool = True,
+    include_timings: bool = False,
+    include_generated_template_bytes: bool = False,
+    additional_documents: Optional[Sequence[Mapping[str, Any]]] = None,
+    artifact_store: Optional[ArtifactStore] = None,
+    artifact_id: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """Generate from a template already in ``input_dir``, then remove it.
+
+    ``include_timings`` adds how long each stage of the generation took. A
+    generation run with the ``profile`` option reports the name of its profile
+    and, with an ``artifact_store``, keeps the profile as an artifact.
+    """
+    # Imported here so processes that never generate, like the editor's,
+    # do not pay for loading the generator
+    from .interview_generator import TemplateInput, generate_interview_from_path
+
+    output_dir = tempfile.mkdtemp(prefix="alweaver-api-")
+
+    try:
         additional_names: List[str] = []
         additional_templates: List[TemplateInput] = []
         for document in additional_documents or []:
@@ -262,6 +1001,7 @@ def generate_interview_from_bytes(
             input_path=input_path,
             output_dir=output_dir,
             additional_templates=additional_templates,
+            progress=progress,
             **resolved_generation_options,
         )
 
@@ -328,6 +1068,13 @@ def generate_interview_from_bytes(
                         zip_handle.read()
                     ).decode("ascii")
 
+        if include_timings:
+            payload["timings"] = list(result.timings)
+        if result.profile_path:
+            payload["profile_filename"] = os.path.basename(result.profile_path)
+
+        if artifact_store is not None and artifact_id:
+            payload["artifacts"] = _save_artifacts(artifact_store, artifact_id, result)
         return payload
     finally:
         shutil.rmtree(input_dir, ignore_errors=True)
@@ -393,6 +1140,32 @@ def build_openapi_spec() -> Dict[str, Any]:
                                                 "suggested renames are reported either way."
                                             ),
                                         },
+                                        "lint_generated_yaml": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Run the interview linter over the draft and "
+                                                "fix what it flags. Defaults to true; turn it "
+                                                "off for bulk generation."
+                                            ),
+                                        },
+                                        "bypass_llm_cache": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Ask the model afresh for every AI-assist step "
+                                                "instead of reusing answers it gave to the same "
+                                                "request before."
+                                            ),
+                                        },
+                                        "profile": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Profile the generation, when the server "
+                                                "sets `weaver profile generation`. The "
+                                                "response names the profile in "
+                                                "`profile_filename`, and an async job "
+                                                "lists it in its artifacts."
+                                            ),
+                                        },
                                         "field_definitions": {"type": "string"},
                                         "screen_definitions": {"type": "string"},
                                         "interview_overrides": {"type": "string"},
@@ -400,6 +1173,28 @@ def build_openapi_spec() -> Dict[str, Any]:
                                             "type": "boolean"
                                         },
                                         "include_yaml_text": {"type": "boolean"},
+                                        "include_timings": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Add `timings`: the wall and CPU seconds "
+                                                "of each stage of the generation."
+                                            ),
+                                        },
+                                        "use_result_cache": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Return the stored result of an identical "
+                                                "earlier request when there is one. The "
+                                                "response's `cache` field says `hit` or `miss`."
+                                            ),
+                                        },
+                                        "cache_llm_results": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Let `use_result_cache` apply to requests "
+                                                "that set `use_llm_assist`."
+                                            ),
+                                        },
                                         "async": {"type": "boolean"},
                                         "mode": {
                                             "type": "string",
@@ -452,6 +1247,32 @@ def build_openapi_spec() -> Dict[str, Any]:
                                                 "suggested renames are reported either way."
                                             ),
                                         },
+                                        "lint_generated_yaml": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Run the interview linter over the draft and "
+                                                "fix what it flags. Defaults to true; turn it "
+                                                "off for bulk generation."
+                                            ),
+                                        },
+                                        "bypass_llm_cache": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Ask the model afresh for every AI-assist step "
+                                                "instead of reusing answers it gave to the same "
+                                                "request before."
+                                            ),
+                                        },
+                                        "profile": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Profile the generation, when the server "
+                                                "sets `weaver profile generation`. The "
+                                                "response names the profile in "
+                                                "`profile_filename`, and an async job "
+                                                "lists it in its artifacts."
+                                            ),
+                                        },
                                         "field_definitions": {
                                             "type": "array",
                                             "items": {"type": "object"},
@@ -465,6 +1286,28 @@ def build_openapi_spec() -> Dict[str, Any]:
                                             "type": "boolean"
                                         },
                                         "include_yaml_text": {"type": "boolean"},
+                                        "include_timings": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Add `timings`: the wall and CPU seconds "
+                                                "of each stage of the generation."
+                                            ),
+                                        },
+                                        "use_result_cache": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Return the stored result of an identical "
+                                                "earlier request when there is one. The "
+                                                "response's `cache` field says `hit` or `miss`."
+                                            ),
+                                        },
+                                        "cache_llm_results": {
+                                            "type": "boolean",
+                                            "description": (
+                                                "Let `use_result_cache` apply to requests "
+                                                "that set `use_llm_assist`."
+                                            ),
+                                        },
                                         "async": {"type": "boolean"},
                                         "mode": {
                                             "type": "string",
@@ -490,6 +1333,15 @@ def build_openapi_spec() -> Dict[str, Any]:
             f"{WEAVER_API_BASE_PATH}/jobs/{{job_id}}": {
                 "get": {
                     "summary": "Get async job status and result",
+                    "description": (
+                        "`progress.stages` lists each stage the job has been "
+                        "through -- upload, queued, field_extraction, grouping, "
+                        "llm_assist, rendering, lint_repair, packaging -- with "
+                        "when it started and how many seconds it took. The "
+                        "AI-assist requests are listed as `parts` of llm_assist. "
+                        "`progress.stage` is the stage running now, or finished "
+                        "or failed."
+                    ),
                     "parameters": [
                         {
                             "name": "job_id",
@@ -500,7 +1352,7 @@ def build_openapi_spec() -> Dict[str, Any]:
                     ],
                 },
                 "delete": {
-                    "summary": "Delete async job metadata",
+                    "summary": "Delete async job metadata and artifacts",
                     "parameters": [
                         {
                             "name": "job_id",
@@ -511,6 +1363,147 @@ def build_openapi_spec() -> Dict[str, Any]:
                     ],
                 },
             },
+            f"{WEAVER_API_BASE_PATH}/jobs/{{job_id}}/artifacts/{{name}}": {
+                "get": {
+                    "summary": "Download one generated file of a finished job",
+                    "description": (
+                        "A finished job's `data.artifacts` lists the interview YAML, "
+                        "the package ZIP and any renamed templates, each with the "
+                        "`url` of this endpoint. Files are kept for a day. Send a "
+                        "`Range` header to fetch part of a file."
+                    ),
+                    "parameters": [
+                        {
+                            "name": "job_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        },
+                        {
+                            "name": "name",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        },
+                    ],
+                    "responses": {
+                        "200": {"description": "The whole file."},
+                        "206": {"description": "The requested range of the file."},
+                        "403": {"description": "Access denied."},
+                        "404": {"description": "No such job or artifact."},
+                        "416": {"description": "The range is outside the file."},
+                    },
+                }
+            },
+            f"{WEAVER_API_BASE_PATH}/batch": {
+                "post": {
+                    "summary": "Queue many independent templates at once",
+                    "description": (
+                        "Accepts the same options as the single-document endpoint, "
+                        "applied to every document. Send multipart/form-data with one "
+                        "`file` part per document, or JSON with a `documents` list of "
+                        "`{filename, file_content_base64, mimetype}` objects. Each "
+                        "document is generated by its own task; one failing does not "
+                        "affect the others. Requires async mode."
+                    ),
+                    "responses": {
+                        "202": {"description": "Batch accepted."},
+                        "400": {"description": "Invalid request."},
+                        "403": {"description": "Access denied."},
+                        "413": {"description": "Upload or batch too large."},
+                        "415": {"description": "Unsupported media type."},
+                        "503": {"description": "Async mode is not configured."},
+                    },
+                }
+            },
+            f"{WEAVER_API_BASE_PATH}/batch/{{batch_id}}": {
+                "get": {
+                    "summary": "Get the status of every document in a batch",
+                    "parameters": [
+                        {
+                            "name": "batch_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        },
+                        {
+                            "name": "include_data",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "boolean"},
+                        },
+                    ],
+                },
+                "delete": {
+                    "summary": "Delete batch metadata and artifacts",
+                    "parameters": [
+                        {
+                            "name": "batch_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        }
+                    ],
+                },
+            },
+            f"{WEAVER_API_BASE_PATH}/batch/{{batch_id}}/items/{{index}}/artifacts/{{name}}": {
+                "get": {
+                    "summary": "Download one generated file of a finished batch document",
+                    "description": (
+                        "Each finished document's `data.artifacts` in a batch's "
+                        "status or results lists its files, each with the `url` of "
+                        "this endpoint. `index` is the document's place in the "
+                        "batch, from 0. Files are kept for a day. Send a `Range` "
+                        "header to fetch part of a file."
+                    ),
+                    "parameters": [
+                        {
+                            "name": "batch_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        },
+                        {
+                            "name": "index",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "integer"},
+                        },
+                        {
+                            "name": "name",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        },
+                    ],
+                    "responses": {
+                        "200": {"description": "The whole file."},
+                        "206": {"description": "The requested range of the file."},
+                        "403": {"description": "Access denied."},
+                        "404": {"description": "No such batch, document or artifact."},
+                        "416": {"description": "The range is outside the file."},
+                    },
+                }
+            },
+            f"{WEAVER_API_BASE_PATH}/batch/{{batch_id}}/results": {
+                "get": {
+                    "summary": "Stream a batch's results as NDJSON, one line per document",
+                    "parameters": [
+                        {
+                            "name": "batch_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        },
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "boolean"},
+                        },
+                    ],
+                }
+            },
             f"{WEAVER_API_BASE_PATH}/openapi.json": {
                 "get": {"summary": "Get OpenAPI document"}
             },
@@ -573,6 +1566,16 @@ def build_docs_html() -> str:
   {WEAVER_API_BASE_PATH}</pre>
   <p>Then poll <code>GET {WEAVER_API_BASE_PATH}/jobs/&lt;job_id&gt;</code> until <code>status</code> is <code>succeeded</code> or <code>failed</code>.</p>
   <p>Async mode requires docassemble config:<br><code>celery modules: [docassemble.ALWeaver.api_weaver_worker]</code></p>
+  <h2>Batches</h2>
+  <pre>curl -X POST \\
+  -H "X-API-Key: &lt;DOCASSEMBLE_API_KEY&gt;" \\
+  -F "file=@petition.pdf" \\
+  -F "file=@affidavit.pdf" \\
+  -F "include_next_steps=false" \\
+  {WEAVER_API_BASE_PATH}/batch</pre>
+  <p>Each file becomes its own interview. Poll <code>GET {WEAVER_API_BASE_PATH}/batch/&lt;batch_id&gt;</code> for progress, or read <code>GET {WEAVER_API_BASE_PATH}/batch/&lt;batch_id&gt;/results?wait=true</code> to receive one NDJSON line per document as each finishes. A waiting request returns after a few seconds with the current status of any document still running; call it again until every line is final.</p>
+  <h2>Reusing identical results</h2>
+  <p>Send <code>use_result_cache=true</code> to get back the stored result of an earlier request with the same file and options. The response says <code>"cache": "hit"</code> or <code>"miss"</code>. Requests with <code>use_llm_assist</code> are only cached when <code>cache_llm_results=true</code> is also sent.</p>
   <h2>JSON example</h2>
   <pre>{{
   "filename": "template.docx",
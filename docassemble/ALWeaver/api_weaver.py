@@ -1,12 +1,14 @@
 # pre-load
 
+import io
 import json
 import time
 import uuid
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from flask import Response, jsonify, request
+from flask import Response, jsonify, request, stream_with_context
 from flask_cors import cross_origin
+from werkzeug.exceptions import RequestEntityTooLarge
 
 from docassemble.base.config import daconfig, in_celery
 from docassemble.base.util import log
@@ -19,6 +21,12 @@ from .docassemble_compat import (
     get_worker_app,
     json_response as jsonify_with_status,
 )
+from .generation_progress import (
+    RedisProgressRecorder,
+    load_progress_events,
+    report_stage,
+    stage_durations,
+)
 from .worker_config import (
     CELERY_MODULE as ASYNC_CELERY_MODULE,
     get_worker_configuration_status,
@@ -33,16 +41,38 @@ workerapp = get_worker_app()
 
 try:
     from .api_utils import (
+        ArtifactStore,
+        DEFAULT_MAX_BATCH_DOCUMENTS,
+        DEFAULT_MAX_UPLOAD_BYTES,
+        DEFAULT_RESULT_CACHE_MAX_ENTRIES,
+        DEFAULT_RESULT_CACHE_MAX_ENTRY_BYTES,
+        DEFAULT_RESULT_CACHE_TTL_SECONDS,
+        DEFAULT_UPLOAD_SPOOL_DIRECTORY,
+        JOB_PROGRESS_KEY_PREFIX,
+        RESULT_CACHE_KEY_PREFIX,
+        SpooledUpload,
+        UPLOAD_CHUNK_BYTES,
         WEAVER_API_BASE_PATH,
         WeaverAPIValidationError,
+        artifact_content_type,
+        artifact_store_for,
         build_docs_html,
         build_openapi_spec,
         coerce_async_flag,
+        coerce_batch_documents,
+        coerce_cache_flags,
         coerce_generation_options,
         coerce_response_flags,
-        decode_base64_content,
-        generate_interview_from_bytes,
+        discard_upload,
+        generate_interview_from_upload,
+        generation_result_cache_key,
+        job_status_for_celery_state,
         merge_raw_options,
+        result_cache_applies,
+        spool_base64_upload,
+        spool_upload_stream,
+        store_upload_in_redis,
+        summarize_batch_statuses,
     )
 except Exception as _api_utils_import_err:
     import traceback as _traceback
@@ -56,6 +86,12 @@ except Exception as _api_utils_import_err:
 __all__ = []
 JOB_KEY_PREFIX = "da:alweaver:job:"
 JOB_KEY_EXPIRE_SECONDS = 24 * 60 * 60
+RESULT_CACHE_INDEX_KEY = RESULT_CACHE_KEY_PREFIX + "index"
+BATCH_KEY_PREFIX = "da:alweaver:batch:"
+# How long one results request may wait for unfinished documents, in total. A
+# waiting request holds a web worker, so a batch that takes longer is read by
+# calling again rather than by holding the connection open until it is done.
+BATCH_RESULTS_WAIT_SECONDS = 5
 
 if not in_celery:
     from .api_weaver_worker import weaver_generate_task
@@ -65,12 +101,37 @@ def _async_is_configured() -> bool:
     return worker_configuration_is_ready(daconfig)
 
 
+def _async_not_configured_response(request_id: str) -> Response:
+    return jsonify_with_status(
+        {
+            "success": False,
+            "request_id": request_id,
+            "error": {
+                "type": "async_not_configured",
+                "code": "async_not_configured",
+                "message": (
+                    "Async mode is not configured. Add "
+                    f"{ASYNC_CELERY_MODULE!r} to the docassemble "
+                    "'celery modules' configuration list, then restart "
+                    "the Docassemble web and Celery services."
+                ),
+                "details": get_worker_configuration_status(daconfig),
+            },
+        },
+        503,
+    )
+
+
 def _job_key(job_id: str) -> str:
     return JOB_KEY_PREFIX + job_id
 
 
-def _store_job_mapping(job_id: str, task_id: str) -> None:
-    payload = {"id": task_id, "created_at": time.time()}
+def _store_job_mapping(
+    job_id: str, task_id: str, cache_key: Optional[str] = None
+) -> None:
+    payload: Dict[str, Any] = {"id": task_id, "created_at": time.time()}
+    if cache_key:
+        payload["cache_key"] = cache_key
     pipe = r.pipeline()
     pipe.set(_job_key(job_id), json.dumps(payload))
     pipe.expire(_job_key(job_id), JOB_KEY_EXPIRE_SECONDS)
@@ -87,10 +148,215 @@ def _fetch_job_mapping(job_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _parse_request_payload() -> (
-    Tuple[str, Optional[str], bytes, Dict[str, Any], Dict[str, bool], bool]
-):
+def _result_cache_setting(name: str, default: int) -> int:
+    section = daconfig.get("assembly line", {})
+    value = section.get(name) if isinstance(section, dict) else None
+    try:
+        return int(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _fetch_cached_result(cache_key: str) -> Optional[Dict[str, Any]]:
+    try:
+        raw = r.get(RESULT_CACHE_KEY_PREFIX + cache_key)
+        if raw is None:
+            return None
+        cached = json.loads(raw.decode())
+    except Exception as exc:
+        log(f"ALWeaver api_weaver: result cache read failed: {exc!r}", "warning")
+        return None
+    return cached if isinstance(cached, dict) else None
+
+
+def _store_cached_result(cache_key: str, payload: Dict[str, Any]) -> None:
+    """Keep a generation result for identical requests, within the size caps.
+
+    Entries expire after ``weaver api result cache ttl`` seconds. A result
+    larger than ``weaver api result cache max entry bytes`` is not kept, and
+    once more than ``weaver api result cache max entries`` are held the oldest
+    are dropped first.
+    """
+    ttl = _result_cache_setting(
+        "weaver api result cache ttl", DEFAULT_RESULT_CACHE_TTL_SECONDS
+    )
+    max_entries = _result_cache_setting(
+        "weaver api result cache max entries", DEFAULT_RESULT_CACHE_MAX_ENTRIES
+    )
+    max_entry_bytes = _result_cache_setting(
+        "weaver api result cache max entry bytes",
+        DEFAULT_RESULT_CACHE_MAX_ENTRY_BYTES,
+    )
+    if ttl <= 0 or max_entries <= 0:
+        return
+    try:
+        encoded = json.dumps(payload)
+        if len(encoded) > max_entry_bytes:
+            return
+        now = time.time()
+        pipe = r.pipeline()
+        pipe.set(RESULT_CACHE_KEY_PREFIX + cache_key, encoded, ex=ttl)
+        pipe.zadd(RESULT_CACHE_INDEX_KEY, {cache_key: now})
+        # Entries that have expired on their own no longer count against the cap
+        pipe.zremrangebyscore(RESULT_CACHE_INDEX_KEY, "-inf", now - ttl)
+        pipe.zcard(RESULT_CACHE_INDEX_KEY)
+        held = pipe.execute()[-1]
+        overflow = int(held or 0) - max_entries
+        if overflow > 0:
+            oldest = r.zrange(RESULT_CACHE_INDEX_KEY, 0, overflow - 1)
+            if oldest:
+                pipe = r.pipeline()
+                for old_key in oldest:
+                    if isinstance(old_key, bytes):
+                        old_key = old_key.decode()
+                    pipe.delete(RESULT_CACHE_KEY_PREFIX + old_key)
+                pipe.zrem(RESULT_CACHE_INDEX_KEY, *oldest)
+                pipe.execute()
+    except Exception as exc:
+        log(f"ALWeaver api_weaver: result cache write failed: {exc!r}", "warning")
+
+
+def _upload_spool_directory() -> str:
+    """Where uploads are spooled: ``weaver api upload directory``, if set.
+
+    Point it at storage the Celery workers share when they run on other
+    machines, or set ``weaver api upload storage`` to ``redis`` instead.
+    """
+    section = daconfig.get("assembly line", {})
+    value = (
+        section.get("weaver api upload directory")
+        if isinstance(section, dict)
+        else None
+    )
+    return str(value) if value else DEFAULT_UPLOAD_SPOOL_DIRECTORY
+
+
+def _job_progress_recorder(task_id: str) -> RedisProgressRecorder:
+    return RedisProgressRecorder(
+        r, JOB_PROGRESS_KEY_PREFIX + task_id, JOB_KEY_EXPIRE_SECONDS
+    )
+
+
+def _job_progress(task_id: str) -> Dict[str, Any]:
+    """The stages a job's task has been through, with how long each took."""
+    try:
+        events = load_progress_events(r, JOB_PROGRESS_KEY_PREFIX + task_id)
+    except Exception as exc:
+        log(f"ALWeaver api_weaver: job progress read failed: {exc!r}", "warning")
+        events = []
+    return stage_durations(events)
+
+
+def _artifacts_with_urls(artifacts_url: str, data: Any) -> None:
+    """Point each artifact a finished task lists at its download endpoint.
+
+    ``artifacts_url`` is the endpoint's path up to and including ``artifacts``.
+    """
+    if not isinstance(data, dict):
+        return
+    for artifact in data.get("artifacts") or []:
+        if isinstance(artifact, dict) and artifact.get("name"):
+            artifact["url"] = f"{artifacts_url}/{artifact['name']}"
+
+
+def _artifact_store() -> ArtifactStore:
+    section = daconfig.get("assembly line", {})
+    return artifact_store_for(section if isinstance(section, dict) else {}, r)
+
+
+def _delete_artifacts(task_ids: List[str]) -> None:
+    """Remove the files the tasks kept for download."""
+    store = _artifact_store()
+    for task_id in task_ids:
+        try:
+            store.delete(task_id)
+        except Exception as exc:
+            log(
+                f"ALWeaver api_weaver: failed to delete the artifacts of "
+                f"{task_id!r}: {exc!r}",
+                "warning",
+            )
+
+
+def _upload_task_reference(upload: SpooledUpload) -> Dict[str, str]:
+    """The task arguments that hand ``upload`` to a Celery worker."""
+    section = daconfig.get("assembly line", {})
+    storage = (
+        section.get("weaver api upload storage") if isinstance(section, dict) else None
+    )
+    if str(storage or "").strip().lower() == "redis":
+        return {
+            "upload_key": store_upload_in_redis(
+                r, upload, expire_seconds=JOB_KEY_EXPIRE_SECONDS
+            )
+        }
+    return {"upload_path": upload.path}
+
+
+def _body_too_large(max_body_bytes: int) -> WeaverAPIValidationError:
+    return WeaverAPIValidationError(
+        f"Request body is larger than {max_body_bytes} bytes.", status_code=413
+    )
+
+
+def _reject_oversized_request(max_body_bytes: int) -> None:
+    """Refuse a request whose declared length is already too large.
+
+    Checked before the body is read. A chunked body declares no length, so
+    the readers below also count what they read.
+    """
+    declared = request.content_length
+    if declared is not None and declared > max_body_bytes:
+        raise _body_too_large(max_body_bytes)
+
+
+def _read_form_within(max_body_bytes: int) -> None:
+    """Parse a multipart body, reading no more than ``max_body_bytes`` of it."""
+    _reject_oversized_request(max_body_bytes)
+    # Werkzeug stops reading the body at this many bytes and refuses the form
+    request.max_content_length = max_body_bytes
+    try:
+        request.files
+    except RequestEntityTooLarge:
+        raise _body_too_large(max_body_bytes)
+
+
+def _read_json_within(max_body_bytes: int) -> Any:
+    """The request's JSON, or None, reading no more than ``max_body_bytes``.
+
+    The body is read a chunk at a time rather than through ``get_json``,
+    since werkzeug's limit on a whole-body read cuts the body short instead of
+    refusing it.
+    """
+    _reject_oversized_request(max_body_bytes)
+    if not request.is_json:
+        return None
+    body = bytearray()
+    while True:
+        chunk = request.stream.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        body.extend(chunk)
+        if len(body) > max_body_bytes:
+            raise _body_too_large(max_body_bytes)
+    try:
+        return json.loads(bytes(body))
+    except ValueError:
+        return None
+
+
+def _parse_request_payload() -> Tuple[
+    SpooledUpload,
+    Dict[str, Any],
+    Dict[str, bool],
+    bool,
+    Dict[str, bool],
+]:
+    """Read a generation request, spooling its upload to a file as it arrives."""
     mimetype: Optional[str]
+    if request.mimetype == "multipart/form-data":
+        # The options and multipart framing take far less than the 1 MiB allowed
+        _read_form_within(DEFAULT_MAX_UPLOAD_BYTES + 1024 * 1024)
     if "file" in request.files:
         upload = request.files["file"]
         filename = upload.filename or "upload"
@@ -99,23 +365,29 @@ def _parse_request_payload() -> (
             mimetype = raw_upload_mimetype
         else:
             mimetype = None
-        content_bytes = upload.read()
 
         raw_options: Dict[str, Any] = dict(request.form)
         merged_options = merge_raw_options(raw_options)
         generation_options = coerce_generation_options(merged_options)
         response_flags = coerce_response_flags(merged_options)
         use_async = coerce_async_flag(merged_options)
+        cache_flags = coerce_cache_flags(merged_options)
+        spooled = spool_upload_stream(
+            upload.stream,
+            filename=filename,
+            mimetype=mimetype,
+            spool_dir=_upload_spool_directory(),
+        )
         return (
-            filename,
-            mimetype,
-            content_bytes,
+            spooled,
             generation_options,
             response_flags,
             use_async,
+            cache_flags,
         )
 
-    post_data = request.get_json(silent=True)
+    # Base64 takes four characters for every three bytes
+    post_data = _read_json_within(DEFAULT_MAX_UPLOAD_BYTES * 4 // 3 + 1024 * 1024)
     if isinstance(post_data, dict):
         if "file_content_base64" not in post_data:
             raise WeaverAPIValidationError(
@@ -128,18 +400,23 @@ def _parse_request_payload() -> (
             mimetype = raw_json_mimetype
         else:
             mimetype = None
-        content_bytes = decode_base64_content(post_data.get("file_content_base64"))
         merged_options = merge_raw_options(post_data)
         generation_options = coerce_generation_options(merged_options)
         response_flags = coerce_response_flags(merged_options)
         use_async = coerce_async_flag(merged_options)
+        cache_flags = coerce_cache_flags(merged_options)
+        spooled = spool_base64_upload(
+            post_data.get("file_content_base64"),
+            filename=filename,
+            mimetype=mimetype,
+            spool_dir=_upload_spool_directory(),
+        )
         return (
-            filename,
-            mimetype,
-            content_bytes,
+            spooled,
             generation_options,
             response_flags,
             use_async,
+            cache_flags,
         )
 
     raise WeaverAPIValidationError(
@@ -163,63 +440,82 @@ def weaver_generate():
             403,
         )
 
+    upload: Optional[SpooledUpload] = None
+    upload_started_at = time.time()
     try:
         (
-            filename,
-            mimetype,
-            content_bytes,
+            upload,
             generation_options,
             response_flags,
             use_async,
+            cache_flags,
         ) = _parse_request_payload()
-        if use_async:
-            if not _async_is_configured():
-                return jsonify_with_status(
+        cache_key: Optional[str] = None
+        if result_cache_applies(generation_options, cache_flags):
+            cache_key = generation_result_cache_key(
+                filename=upload.filename,
+                content_sha256=upload.sha256,
+                mimetype=upload.mimetype,
+                generation_options=generation_options,
+                response_flags=response_flags,
+            )
+            cached_payload = _fetch_cached_result(cache_key)
+            if cached_payload is not None:
+                # Answered straight away, even when async mode was asked for
+                return jsonify(
                     {
-                        "success": False,
+                        "success": True,
+                        "api_version": "v1",
                         "request_id": request_id,
-                        "error": {
-                            "type": "async_not_configured",
-                            "code": "async_not_configured",
-                            "message": (
-                                "Async mode is not configured. Add "
-                                f"{ASYNC_CELERY_MODULE!r} to the docassemble "
-                                "'celery modules' configuration list, then restart "
-                                "the Docassemble web and Celery services."
-                            ),
-                            "details": get_worker_configuration_status(daconfig),
-                        },
-                    },
-                    503,
+                        "status": "succeeded",
+                        "cache": "hit",
+                        "data": cached_payload,
+                    }
                 )
-            task = weaver_generate_task.delay(
-                filename=filename,
-                mimetype=mimetype,
-                content_bytes=content_bytes,
-                generation_options=generation_options,
-                include_package_zip_base64=response_flags["include_package_zip_base64"],
-                include_yaml_text=response_flags["include_yaml_text"],
+        if use_async:
+            if not _async_is_configured():
+                return _async_not_configured_response(request_id)
+            # The task id is chosen here so the upload can be recorded against
+            # it before the worker starts reporting its own stages
+            task_id = str(uuid.uuid4())
+            progress = _job_progress_recorder(task_id)
+            report_stage(progress, "upload", at=upload_started_at, bytes=upload.size)
+            report_stage(progress, "queued")
+            task = weaver_generate_task.apply_async(
+                kwargs=dict(
+                    filename=upload.filename,
+                    mimetype=upload.mimetype,
+                    generation_options=generation_options,
+                    include_package_zip_base64=response_flags[
+                        "include_package_zip_base64"
+                    ],
+                    include_yaml_text=response_flags["include_yaml_text"],
+                    include_timings=response_flags["include_timings"],
+                    **_upload_task_reference(upload),
+                ),
+                task_id=task_id,
             )
+            # The worker owns the spool file from here
+            upload = None
             job_id = str(uuid.uuid4())
-            _store_job_mapping(job_id, task.id)
-            return jsonify_with_status(
-                {
-                    "success": True,
-                    "api_version": "v1",
-                    "request_id": request_id,
-                    "status": "queued",
-                    "job_id": job_id,
-                    "job_url": f"{WEAVER_API_BASE_PATH}/jobs/{job_id}",
-                },
-                202,
-            )
-        payload = generate_interview_from_bytes(
-            filename=filename,
-            content_bytes=content_bytes,
-            mimetype=mimetype,
+            _store_job_mapping(job_id, task.id, cache_key=cache_key)
+            queued_body: Dict[str, Any] = {
+                "success": True,
+                "api_version": "v1",
+                "request_id": request_id,
+                "status": "queued",
+                "job_id": job_id,
+                "job_url": f"{WEAVER_API_BASE_PATH}/jobs/{job_id}",
+            }
+            if cache_key:
+                queued_body["cache"] = "miss"
+            return jsonify_with_status(queued_body, 202)
+        payload = generate_interview_from_upload(
+            upload=upload,
             generation_options=generation_options,
             include_package_zip_base64=response_flags["include_package_zip_base64"],
             include_yaml_text=response_flags["include_yaml_text"],
+            include_timings=response_flags["include_timings"],
         )
         response_body: Dict[str, Any] = {
             "success": True,
@@ -228,6 +524,9 @@ def weaver_generate():
             "status": "succeeded",
             "data": payload,
         }
+        if cache_key:
+            _store_cached_result(cache_key, payload)
+            response_body["cache"] = "miss"
         return jsonify(response_body)
     except WeaverAPIValidationError as exc:
         return jsonify_with_status(
@@ -251,6 +550,11 @@ def weaver_generate():
             },
             500,
         )
+    finally:
+        # Left over from a cache hit or a refused request; generation itself
+        # moves the file away, and a queued task owns it.
+        if upload is not None:
+            discard_upload(upload)
 
 
 @app.route(f"{WEAVER_API_BASE_PATH}/jobs/<job_id>", methods=["GET", "DELETE"])
@@ -286,7 +590,8 @@ def weaver_job(job_id: str):
                 f"ALWeaver api_weaver: failed to forget job {job_id!r}: {exc!r}",
                 "warning",
             )
-        r.delete(_job_key(job_id))
+        _delete_artifacts([str(task_info["id"])])
+        r.delete(_job_key(job_id), JOB_PROGRESS_KEY_PREFIX + str(task_info["id"]))
         return jsonify(
             {
                 "success": True,
@@ -309,14 +614,7 @@ def weaver_job(job_id: str):
         )
     result = workerapp.AsyncResult(id=task_info["id"])
     state = (result.state or "").upper()
-    if state == "SUCCESS":
-        status = "succeeded"
-    elif state in {"RECEIVED", "STARTED", "RETRY"}:
-        status = "running"
-    elif state == "FAILURE":
-        status = "failed"
-    else:
-        status = "queued"
+    status = job_status_for_celery_state(state)
 
     response_body: Dict[str, Any] = {
         "success": True,
@@ -327,9 +625,24 @@ def weaver_job(job_id: str):
         "status": status,
         "celery_state": state,
         "created_at": task_info.get("created_at"),
+        "progress": _job_progress(str(task_info.get("id"))),
     }
     if state == "SUCCESS":
         response_body["data"] = result.get()
+        cache_key = task_info.get("cache_key")
+        if cache_key and not r.exists(RESULT_CACHE_KEY_PREFIX + cache_key):
+            # Artifacts belong to this job, so a cache hit cannot download them
+            _store_cached_result(
+                cache_key,
+                {
+                    key: value
+                    for key, value in response_body["data"].items()
+                    if key != "artifacts"
+                },
+            )
+        _artifacts_with_urls(
+            f"{WEAVER_API_BASE_PATH}/jobs/{job_id}/artifacts", response_body["data"]
+        )
     elif state == "FAILURE":
         error_obj = result.result
         response_body["error"] = {
@@ -339,6 +652,470 @@ def weaver_job(job_id: str):
     return jsonify(response_body)
 
 
+@app.route(f"{WEAVER_API_BASE_PATH}/jobs/<job_id>/artifacts/<name>", methods=["GET"])
+@csrf.exempt
+@cross_origin(
+    origins="*",
+    methods=["GET", "HEAD"],
+    automatic_options=True,
+    expose_headers=["Accept-Ranges", "Content-Length", "Content-Range"],
+)
+def weaver_job_artifact(job_id: str, name: str):
+    """Stream one generated file of a finished job, honoring a ``Range`` header."""
+    request_id = str(uuid.uuid4())
+    if not api_verify():
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "auth_error", "message": "Access denied."},
+            },
+            403,
+        )
+    not_found = jsonify_with_status(
+        {
+            "success": False,
+            "request_id": request_id,
+            "error": {"type": "not_found", "message": "Artifact not found."},
+        },
+        404,
+    )
+    task_info = _fetch_job_mapping(job_id)
+    if not task_info:
+        return not_found
+    return _artifact_response(request_id, str(task_info["id"]), name) or not_found
+
+
+def _artifact_response(request_id: str, task_id: str, name: str) -> Optional[Response]:
+    """Stream one file ``task_id`` kept, honoring a ``Range`` header.
+
+    None when the task kept no file by that name.
+    """
+    store = _artifact_store()
+    try:
+        size = store.size(task_id, name)
+    except WeaverAPIValidationError:
+        return None
+    if size is None:
+        return None
+
+    start, stop, status = 0, size, 200
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{name}"',
+        "X-Request-ID": request_id,
+    }
+    # Several ranges at once are answered with the whole file, as RFC 9110 allows
+    if request.range is not None and len(request.range.ranges) == 1:
+        byte_range = request.range.range_for_length(size)
+        if byte_range is None:
+            return Response(
+                status=416,
+                headers={"Content-Range": f"bytes */{size}", **headers},
+            )
+        start, stop = byte_range
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    headers["Content-Length"] = str(stop - start)
+    return Response(
+        stream_with_context(store.read(task_id, name, start, stop)),
+        status=status,
+        mimetype=artifact_content_type(name),
+        headers=headers,
+    )
+
+
+def _batch_key(batch_id: str) -> str:
+    return BATCH_KEY_PREFIX + batch_id
+
+
+def _fetch_batch(batch_id: str) -> Optional[Dict[str, Any]]:
+    raw = r.get(_batch_key(batch_id))
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw.decode())
+    except Exception:
+        return None
+
+
+def _parse_batch_request_payload() -> (
+    Tuple[List[SpooledUpload], Dict[str, Any], Dict[str, bool]]
+):
+    """Read the documents and shared options of a batch request.
+
+    Multipart requests repeat the ``file`` part once per document; JSON
+    requests send a ``documents`` list. Either way every other option applies
+    to every document. Each document is spooled to a file; if any is refused,
+    the ones already spooled are removed.
+    """
+    documents: List[SpooledUpload] = []
+    spool_dir = _upload_spool_directory()
+    try:
+        uploads = request.files.getlist("file") if request.files else []
+        # Counted before anything is spooled, as the JSON branch's documents are
+        if len(uploads) > DEFAULT_MAX_BATCH_DOCUMENTS:
+            raise WeaverAPIValidationError(
+                f"A batch may hold at most {DEFAULT_MAX_BATCH_DOCUMENTS} documents.",
+                status_code=413,
+            )
+        if uploads:
+            for index, upload in enumerate(uploads):
+                filename = upload.filename or "upload"
+                raw_upload_mimetype = upload.mimetype
+                mimetype = (
+                    raw_upload_mimetype
+                    if isinstance(raw_upload_mimetype, str)
+                    and raw_upload_mimetype.strip()
+                    else None
+                )
+                try:
+                    documents.append(
+                        spool_upload_stream(
+                            upload.stream,
+                            filename=filename,
+                            mimetype=mimetype,
+                            spool_dir=spool_dir,
+                        )
+                    )
+                except WeaverAPIValidationError as exc:
+                    raise WeaverAPIValidationError(
+                        f"file[{index}] ({filename}): {exc.message}",
+                        status_code=exc.status_code,
+                    )
+            merged_options = merge_raw_options(dict(request.form))
+        else:
+            post_data = request.get_json(silent=True)
+            if not isinstance(post_data, dict):
+                raise WeaverAPIValidationError(
+                    "Expected multipart/form-data with one or more files, or JSON "
+                    "with a documents list."
+                )
+            for entry in coerce_batch_documents(post_data.get("documents")):
+                documents.append(
+                    spool_upload_stream(
+                        io.BytesIO(entry["content_bytes"]),
+                        filename=entry["filename"],
+                        mimetype=entry["mimetype"],
+                        spool_dir=spool_dir,
+                    )
+                )
+            merged_options = merge_raw_options(
+                {key: value for key, value in post_data.items() if key != "documents"}
+            )
+        return (
+            documents,
+            coerce_generation_options(merged_options),
+            coerce_response_flags(merged_options),
+        )
+    except BaseException:
+        for document in documents:
+            discard_upload(document)
+        raise
+
+
+def _batch_item_result(item: Dict[str, Any]) -> Tuple[str, Any]:
+    result = workerapp.AsyncResult(id=item["task_id"])
+    return (result.state or "").upper(), result
+
+
+def _batch_item_body(
+    batch_id: str,
+    index: int,
+    item: Dict[str, Any],
+    state: str,
+    result: Any,
+    include_data: bool,
+) -> Dict[str, Any]:
+    body: Dict[str, Any] = {
+        "index": index,
+        "filename": item.get("filename"),
+        "task_id": item.get("task_id"),
+        "status": job_status_for_celery_state(state),
+        "celery_state": state,
+        "progress": _job_progress(str(item.get("task_id"))),
+    }
+    if state == "SUCCESS" and include_data:
+        body["data"] = result.get()
+        _artifacts_with_urls(
+            f"{WEAVER_API_BASE_PATH}/batch/{batch_id}/items/{index}/artifacts",
+            body["data"],
+        )
+    elif state == "FAILURE":
+        error_obj = result.result
+        body["error"] = {
+            "type": getattr(error_obj, "__class__", type(error_obj)).__name__,
+            "message": str(error_obj),
+        }
+    return body
+
+
+@app.route(f"{WEAVER_API_BASE_PATH}/batch", methods=["POST"])
+@csrf.exempt
+@cross_origin(origins="*", methods=["POST", "HEAD"], automatic_options=True)
+def weaver_generate_batch():
+    """Queue one generation task per document, as a single Celery group."""
+    request_id = str(uuid.uuid4())
+    if not api_verify():
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "auth_error", "message": "Access denied."},
+            },
+            403,
+        )
+    if not _async_is_configured():
+        return _async_not_configured_response(request_id)
+
+    try:
+        documents, generation_options, response_flags = _parse_batch_request_payload()
+        from celery import group
+
+        group_result = group(
+            weaver_generate_task.s(
+                filename=document.filename,
+                mimetype=document.mimetype,
+                generation_options=generation_options,
+                include_package_zip_base64=response_flags["include_package_zip_base64"],
+                include_yaml_text=response_flags["include_yaml_text"],
+                include_timings=response_flags["include_timings"],
+                **_upload_task_reference(document),
+            )
+            for document in documents
+        ).apply_async()
+        batch_id = str(uuid.uuid4())
+        batch_info = {
+            "created_at": time.time(),
+            "items": [
+                {"filename": document.filename, "task_id": task_result.id}
+                for document, task_result in zip(documents, group_result.results)
+            ],
+        }
+        pipe = r.pipeline()
+        pipe.set(_batch_key(batch_id), json.dumps(batch_info))
+        pipe.expire(_batch_key(batch_id), JOB_KEY_EXPIRE_SECONDS)
+        pipe.execute()
+        return jsonify_with_status(
+            {
+                "success": True,
+                "api_version": "v1",
+                "request_id": request_id,
+                "status": "queued",
+                "batch_id": batch_id,
+                "item_count": len(documents),
+                "batch_url": f"{WEAVER_API_BASE_PATH}/batch/{batch_id}",
+                "results_url": f"{WEAVER_API_BASE_PATH}/batch/{batch_id}/results",
+            },
+            202,
+        )
+    except WeaverAPIValidationError as exc:
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "validation_error", "message": exc.message},
+            },
+            exc.status_code,
+        )
+    except Exception as exc:
+        log(f"ALWeaver API batch error: {exc!r}")
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {
+                    "type": "server_error",
+                    "message": "ALWeaver could not queue the batch.",
+                },
+            },
+            500,
+        )
+
+
+@app.route(f"{WEAVER_API_BASE_PATH}/batch/<batch_id>", methods=["GET", "DELETE"])
+@csrf.exempt
+@cross_origin(origins="*", methods=["GET", "DELETE", "HEAD"], automatic_options=True)
+def weaver_batch(batch_id: str):
+    request_id = str(uuid.uuid4())
+    if not api_verify():
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "auth_error", "message": "Access denied."},
+            },
+            403,
+        )
+    batch_info = _fetch_batch(batch_id)
+    if not batch_info:
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "not_found", "message": "Batch not found."},
+            },
+            404,
+        )
+    items = batch_info.get("items", [])
+
+    if request.method == "DELETE":
+        for item in items:
+            try:
+                workerapp.AsyncResult(id=item["task_id"]).forget()
+            except Exception as exc:
+                log(
+                    f"ALWeaver api_weaver: failed to forget batch item "
+                    f"{item.get('task_id')!r}: {exc!r}",
+                    "warning",
+                )
+        _delete_artifacts([str(item.get("task_id")) for item in items])
+        r.delete(
+            _batch_key(batch_id),
+            *[JOB_PROGRESS_KEY_PREFIX + str(item.get("task_id")) for item in items],
+        )
+        return jsonify(
+            {
+                "success": True,
+                "api_version": "v1",
+                "request_id": request_id,
+                "batch_id": batch_id,
+                "deleted": True,
+            }
+        )
+
+    include_data = str(request.args.get("include_data", "")).lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    item_bodies = []
+    for index, item in enumerate(items):
+        state, result = _batch_item_result(item)
+        item_bodies.append(
+            _batch_item_body(
+                batch_id, index, item, state, result, include_data=include_data
+            )
+        )
+    summary = summarize_batch_statuses([body["status"] for body in item_bodies])
+    return jsonify(
+        {
+            "success": True,
+            "api_version": "v1",
+            "request_id": request_id,
+            "batch_id": batch_id,
+            "created_at": batch_info.get("created_at"),
+            **summary,
+            "results_url": f"{WEAVER_API_BASE_PATH}/batch/{batch_id}/results",
+            "items": item_bodies,
+        }
+    )
+
+
+@app.route(
+    f"{WEAVER_API_BASE_PATH}/batch/<batch_id>/items/<int:index>/artifacts/<name>",
+    methods=["GET"],
+)
+@csrf.exempt
+@cross_origin(
+    origins="*",
+    methods=["GET", "HEAD"],
+    automatic_options=True,
+    expose_headers=["Accept-Ranges", "Content-Length", "Content-Range"],
+)
+def weaver_batch_item_artifact(batch_id: str, index: int, name: str):
+    """Stream one generated file of a finished batch document."""
+    request_id = str(uuid.uuid4())
+    if not api_verify():
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "auth_error", "message": "Access denied."},
+            },
+            403,
+        )
+    not_found = jsonify_with_status(
+        {
+            "success": False,
+            "request_id": request_id,
+            "error": {"type": "not_found", "message": "Artifact not found."},
+        },
+        404,
+    )
+    batch_info = _fetch_batch(batch_id)
+    items = batch_info.get("items", []) if batch_info else []
+    if not 0 <= index < len(items):
+        return not_found
+    task_id = str(items[index].get("task_id"))
+    return _artifact_response(request_id, task_id, name) or not_found
+
+
+@app.route(f"{WEAVER_API_BASE_PATH}/batch/<batch_id>/results", methods=["GET"])
+@csrf.exempt
+@cross_origin(origins="*", methods=["GET", "HEAD"], automatic_options=True)
+def weaver_batch_results(batch_id: str):
+    """Stream a batch's results as NDJSON, one document per line, in order.
+
+    Without ``wait``, a document that has not finished is reported with its
+    current status. With ``wait=true`` each line is written as soon as that
+    document finishes, for up to :data:`BATCH_RESULTS_WAIT_SECONDS` in all;
+    after that the rest are reported with their current status, and the client
+    calls again for the ones still running.
+    """
+    request_id = str(uuid.uuid4())
+    if not api_verify():
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "auth_error", "message": "Access denied."},
+            },
+            403,
+        )
+    batch_info = _fetch_batch(batch_id)
+    if not batch_info:
+        return jsonify_with_status(
+            {
+                "success": False,
+                "request_id": request_id,
+                "error": {"type": "not_found", "message": "Batch not found."},
+            },
+            404,
+        )
+    wait = str(request.args.get("wait", "")).lower() in {"1", "true", "yes"}
+    items = list(batch_info.get("items", []))
+
+    def generate():
+        deadline = time.monotonic() + BATCH_RESULTS_WAIT_SECONDS
+        for index, item in enumerate(items):
+            result = workerapp.AsyncResult(id=item["task_id"])
+            remaining = deadline - time.monotonic()
+            if wait and remaining > 0:
+                try:
+                    result.get(propagate=False, timeout=remaining)
+                except Exception as exc:
+                    # Running out of time is expected; the line reports the
+                    # document's current status instead
+                    if time.monotonic() < deadline:
+                        log(
+                            f"ALWeaver api_weaver: could not wait on batch item "
+                            f"{item.get('task_id')!r}: {exc!r}",
+                            "warning",
+                        )
+            state = (result.state or "").upper()
+            body = _batch_item_body(
+                batch_id, index, item, state, result, include_data=True
+            )
+            yield json.dumps(body) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"X-Request-ID": request_id},
+    )
+
+
 @app.route(f"{WEAVER_API_BASE_PATH}/openapi.json", methods=["GET"])
 @csrf.exempt
 @cross_origin(origins="*", methods=["GET", "HEAD"], automatic_options=True)
@@ -2,30 +2,104 @@
 
 from typing import Any, Dict, Mapping, Optional
 
-from .api_utils import generate_interview_from_bytes
-from .docassemble_compat import background_context as bg_context, get_worker_app
+from .api_utils import (
+    JOB_PROGRESS_KEY_PREFIX,
+    artifact_store_for,
+    generate_interview_from_bytes,
+    generate_interview_from_upload,
+    restore_upload_from_redis,
+    spooled_upload_at,
+)
+from .docassemble_compat import (
+    background_context as bg_context,
+    get_redis_client,
+    get_worker_app,
+)
+from .generation_progress import RedisProgressRecorder, report_stage
 
 workerapp = get_worker_app()
 
+# Matches how long the web server keeps the job itself
+JOB_PROGRESS_EXPIRE_SECONDS = 24 * 60 * 60
+
 
-@workerapp.task
+@workerapp.task(bind=True)
 def weaver_generate_task(
+    self: Any,
     filename: str,
     mimetype: Optional[str],
-    content_bytes: bytes,
-    generation_options: Mapping[str, Any],
-    include_package_zip_base64: bool,
-    include_yaml_text: bool,
+    content_bytes: Optional[bytes] = None,
+    generation_options: Optional[Mapping[str, Any]] = None,
+    include_package_zip_base64: bool = False,
+    include_yaml_text: bool = True,
+    include_timings: bool = False,
+    upload_path: Optional[str] = None,
+    upload_key: Optional[str] = None,
 ) -> Dict[str, Any]:
+    """Draft an interview from an upload the web server has already stored.
+
+    The upload is passed by reference -- ``upload_path`` for a spool file on
+    storage the worker shares, ``upload_key`` for one copied into Redis -- so
+    the broker message stays small. ``content_bytes`` is still accepted from
+    messages queued before uploads were spooled.
+
+    The YAML, package ZIP and renamed templates are kept under this task's id
+    for the job's artifact downloads, and each stage is recorded as it starts
+    for the job's progress.
+    """
     with bg_context():
-        return generate_interview_from_bytes(
-            filename=filename,
-            content_bytes=content_bytes,
-            mimetype=mimetype,
-            generation_options=generation_options,
-            include_package_zip_base64=include_package_zip_base64,
-            include_yaml_text=include_yaml_text,
+        from docassemble.base.util import get_config
+
+        redis_client = get_redis_client()
+        artifact_store = artifact_store_for(
+            get_config("assembly line", {}) or {}, redis_client
+        )
+        progress = RedisProgressRecorder(
+            redis_client,
+            JOB_PROGRESS_KEY_PREFIX + str(self.request.id),
+            JOB_PROGRESS_EXPIRE_SECONDS,
         )
+        try:
+            if upload_path or upload_key:
+                if upload_key:
+                    upload = restore_upload_from_redis(
+                        redis_client,
+                        upload_key,
+                        filename=filename,
+                        mimetype=mimetype,
+                    )
+                else:
+                    upload = spooled_upload_at(
+                        str(upload_path), filename=filename, mimetype=mimetype
+                    )
+                payload = generate_interview_from_upload(
+                    upload=upload,
+                    generation_options=generation_options or {},
+                    include_package_zip_base64=include_package_zip_base64,
+                    include_yaml_text=include_yaml_text,
+                    include_timings=include_timings,
+                    artifact_store=artifact_store,
+                    artifact_id=self.request.id,
+                    progress=progress,
+                )
+            else:
+                payload = generate_interview_from_bytes(
+                    filename=filename,
+                    content_bytes=content_bytes or b"",
+                    mimetype=mimetype,
+                    generation_options=generation_options or {},
+                    include_package_zip_base64=include_package_zip_base64,
+                    include_yaml_text=include_yaml_text,
+                    include_timings=include_timings,
+                    artifact_store=artifact_store,
+                    artifact_id=self.request.id,
+                    progress=progress,
+                )
+        except Exception as exc:
+            report_stage(progress, "failed", error=type(exc).__name__)
+            raise
+        report_stage(progress, "finished")
+        return payload
 
 
 @workerapp.task(
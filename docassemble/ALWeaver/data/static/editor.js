@@ -1948,6 +1948,9 @@
       post: apiPost,
       delete: apiDelete,
     },
+    openEventStream: window.EventSource && BOOT.features && BOOT.features.progress_stream ? function (path) {
+      return new window.EventSource(API + path);
+    } : null,
     getContext: function () {
       return {
         project: state.project,
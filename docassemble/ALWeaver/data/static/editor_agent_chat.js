@@ -72,6 +72,8 @@
     var getWorkingSource = options.getWorkingSource;
     var onApply = options.onApply || function () {};
     var onStateChange = options.onStateChange || function () {};
+    // Opens an EventSource for a session path; without one, progress is polled.
+    var openEventStream = options.openEventStream || null;
 
     var session = null;
     var transcript = [];
@@ -92,8 +94,10 @@
 
     var liveEvents = [];
     var liveStartedAt = 0;
+    var progressCursor = 0;
     var pollTimer = null;
     var tickTimer = null;
+    var progressStream = null;
 
     function isAvailable() {
       return Boolean(availability && availability.available);
@@ -110,58 +114,103 @@
 
     // A turn runs on the server for longer than any request can be held open,
     // so starting one only kicks it off. Everything after that — the running
-    // list of steps and the final result — comes from polling this record.
+    // list of steps and the final result — comes from the progress record:
+    // pushed over a Server-Sent Events stream where the browser has one, and
+    // otherwise polled. Either way only the events after `progressCursor` are
+    // fetched, so a long turn does not resend its whole history every time.
     function watchTurn() {
       stopProgressWatch();
+      progressCursor = 0;
       tickTimer = setInterval(function () {
         if (busy) renderWorkingBanner();
       }, 1000);
       return new Promise(function (resolve, reject) {
-        var missedPolls = 0;
-        pollTimer = setInterval(function () {
-          if (!busy || !session) return;
-          api.get(sessionPath('/progress'), { preventStale: false })
-            .then(function (response) {
-              missedPolls = 0;
-              var data = (response && response.data) || {};
-              if (Array.isArray(data.events)) liveEvents = data.events;
-              if (data.running) {
-                renderWorkingBanner();
-                return;
-              }
-              stopProgressWatch();
-              if (data.error) {
-                var failure = new Error(data.error.message || 'The assistant request failed.');
-                failure.code = data.error.code;
-                reject(failure);
-                return;
-              }
-              if (data.result) {
-                resolve(data.result);
-                return;
-              }
-              // Not running, no result, no error: the worker went away.
-              reject(new Error(
-                'The assistant stopped unexpectedly. Nothing was applied — try again.'
-              ));
-            })
-            .catch(function (pollError) {
-              missedPolls += 1;
-              // A dropped poll is normal; losing the record is not.
-              if (missedPolls >= 5) {
-                stopProgressWatch();
-                reject(pollError);
-              }
-            });
-        }, 1500);
+        function finish(data) {
+          stopProgressWatch();
+          if (data.error) {
+            var failure = new Error(data.error.message || 'The assistant request failed.');
+            failure.code = data.error.code;
+            reject(failure);
+            return;
+          }
+          if (data.result) {
+            resolve(data.result);
+            return;
+          }
+          // Not running, no result, no error: the worker went away.
+          reject(new Error(
+            'The assistant stopped unexpectedly. Nothing was applied — try again.'
+          ));
+        }
+
+        function poll() {
+          var missedPolls = 0;
+          pollTimer = setInterval(function () {
+            if (!busy || !session) return;
+            api.get(sessionPath('/progress') + '?after=' + progressCursor, { preventStale: false })
+              .then(function (response) {
+                missedPolls = 0;
+                var data = (response && response.data) || {};
+                if (Array.isArray(data.events)) {
+                  if (typeof data.cursor === 'number') {
+                    liveEvents = liveEvents.concat(data.events);
+                    progressCursor = data.cursor;
+                  } else {
+                    liveEvents = data.events;
+                  }
+                }
+                if (data.running) {
+                  renderWorkingBanner();
+                  return;
+                }
+                finish(data);
+              })
+              .catch(function (pollError) {
+                missedPolls += 1;
+                // A dropped poll is normal; losing the record is not.
+                if (missedPolls >= 5) {
+                  stopProgressWatch();
+                  reject(pollError);
+                }
+              });
+          }, 1500);
+        }
+
+        try {
+          progressStream = openEventStream ? openEventStream(sessionPath('/progress/stream')) : null;
+        } catch (_streamError) {
+          progressStream = null;
+        }
+        if (!progressStream) {
+          poll();
+          return;
+        }
+        progressStream.addEventListener('progress', function (message) {
+          liveEvents.push(JSON.parse(message.data));
+          progressCursor = Number(message.lastEventId) || progressCursor + 1;
+          renderWorkingBanner();
+        });
+        progressStream.addEventListener('finished', function (message) {
+          finish(JSON.parse(message.data));
+        });
+        progressStream.onerror = function () {
+          // The browser reconnects a dropped stream by itself, resuming from
+          // the last event. Only a stream it has given up on falls back to
+          // polling, from the same cursor.
+          if (!progressStream || progressStream.readyState !== 2) return;
+          progressStream = null;
+          poll();
+        };
       });
     }
 
     function stopProgressWatch() {
       if (pollTimer) clearInterval(pollTimer);
       if (tickTimer) clearInterval(tickTimer);
+      if (progressStream) progressStream.close();
       pollTimer = null;
       tickTimer = null;
+      progressStream = null;
     }
 
     function elapsedLabel() {
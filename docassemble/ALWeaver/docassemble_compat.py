@@ -2,21 +2,37 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import AbstractContextManager
 from dataclasses import dataclass, field
 import base64
+import hashlib
 import importlib
 import importlib.metadata
-import io
 import json
 import os
+import queue
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
 import tarfile
-from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import uuid
+import weakref
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from urllib.parse import quote, urlparse
 
 from flask import Response, jsonify, url_for
@@ -36,6 +52,64 @@ class GithubCredentialError(DocassembleCompatibilityError):
 # "there is nothing to build on", not "something went wrong".
 _GITHUB_NO_SUCH_REF_STATUSES = frozenset({404, 409})
 
+# Blob uploads run side by side, each over its own authorized connection.
+# GitHub's secondary rate limits object to much more concurrency than this
+# from a single token.
+_GITHUB_BLOB_UPLOAD_CONNECTIONS = 4
+
+# A repository archive is held in memory up to this size and spooled to disk
+# beyond it, and files are copied out of it this much at a time.
+_SNAPSHOT_ARCHIVE_SPOOL_BYTES = 8 * 1024 * 1024
+_SNAPSHOT_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class GithubSnapshotFiles(Mapping):
+    """The package files of a repository snapshot, kept on disk.
+
+    Each file is copied into a private temporary directory as the archive is
+    read, and its SHA-256 is taken on the way, so comparing snapshots needs
+    only :meth:`digest` and a file's content is read -- through :meth:`open`
+    or by indexing -- only when it is wanted. The directory is removed by
+    :meth:`close`, or when the mapping is garbage collected.
+    """
+
+    def __init__(self) -> None:
+        self._directory = tempfile.mkdtemp(prefix="weaver-snapshot-")
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        self._finalizer = weakref.finalize(
+            self, shutil.rmtree, self._directory, ignore_errors=True
+        )
+
+    def add(self, path: str, stream: IO[bytes]) -> None:
+        """Copy ``stream`` in as the content of ``path``."""
+        stored_path = os.path.join(self._directory, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        with open(stored_path, "wb") as target:
+            for chunk in iter(lambda: stream.read(_SNAPSHOT_COPY_CHUNK_BYTES), b""):
+                digest.update(chunk)
+                target.write(chunk)
+        self._entries[path] = (stored_path, digest.hexdigest())
+
+    def digest(self, path: str) -> str:
+        """The SHA-256 of ``path``'s content, as hex."""
+        return self._entries[path][1]
+
+    def open(self, path: str) -> BinaryIO:
+        return open(self._entries[path][0], "rb")
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def __getitem__(self, path: str) -> bytes:
+        with self.open(path) as stream:
+            return stream.read()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 @dataclass(frozen=True)
 class DocassembleCapabilities:
@@ -668,6 +742,9 @@ def get_github_repository_snapshot(
 
     An anonymous client is deliberately supported so importing a public URL is
     never limited to repositories owned by the connected GitHub account.
+
+    The snapshot's ``files`` is a :class:`GithubSnapshotFiles` holding the
+    package's files on disk, keyed by their path in the repository.
     """
     repository = normalize_github_repository_url(repository_url)
     anonymous = False
@@ -768,40 +845,53 @@ def get_github_repository_snapshot(
             "GitHub could not download the repository archive"
         )
 
-    files: Dict[str, bytes] = {}
+    # httplib2 hands back the whole body, so the archive goes to a spool file
+    # straight away and is read one member at a time from there; the package
+    # files themselves never all sit in memory together.
+    files = GithubSnapshotFiles()
     try:
-        with tarfile.open(fileobj=io.BytesIO(archive_content), mode="r:gz") as archive:
-            for member in archive.getmembers():
-                if not member.isfile() or "/" not in member.name:
-                    continue
-                path = member.name.split("/", 1)[1]
-                if re.fullmatch(
-                    r"docassemble/[^/]+/data/(questions|templates|static|sources)/.+/.+",
-                    path,
-                ):
-                    raise DocassembleCompatibilityError(
-                        "The repository contains nested files under a docassemble data directory; "
-                        "move them directly into questions, templates, static, or sources before importing"
-                    )
-                if not (
-                    re.fullmatch(
-                        r"docassemble/[^/]+/data/(questions|templates|static|sources)/[^/]+",
+        with tempfile.SpooledTemporaryFile(
+            max_size=_SNAPSHOT_ARCHIVE_SPOOL_BYTES
+        ) as archive_file:
+            archive_file.write(archive_content)
+            del archive_content
+            archive_file.seek(0)
+            with tarfile.open(fileobj=archive_file, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile() or "/" not in member.name:
+                        continue
+                    path = member.name.split("/", 1)[1]
+                    if re.fullmatch(
+                        r"docassemble/[^/]+/data/(questions|templates|static|sources)/.+/.+",
                         path,
-                    )
-                    or re.fullmatch(r"docassemble/[^/]+/[^/]+\.py", path)
-                ):
-                    continue
-                if member.size > 25 * 1024 * 1024:
-                    raise DocassembleCompatibilityError(
-                        f"The repository file {path} is too large to import"
-                    )
-                stream = archive.extractfile(member)
-                if stream is not None:
-                    files[path] = stream.read()
+                    ):
+                        raise DocassembleCompatibilityError(
+                            "The repository contains nested files under a docassemble data directory; "
+                            "move them directly into questions, templates, static, or sources before importing"
+                        )
+                    if not (
+                        re.fullmatch(
+                            r"docassemble/[^/]+/data/(questions|templates|static|sources)/[^/]+",
+                            path,
+                        )
+                        or re.fullmatch(r"docassemble/[^/]+/[^/]+\.py", path)
+                    ):
+                        continue
+                    if member.size > 25 * 1024 * 1024:
+                        raise DocassembleCompatibilityError(
+                            f"The repository file {path} is too large to import"
+                        )
+                    stream = archive.extractfile(member)
+                    if stream is not None:
+                        files.add(path, stream)
     except (tarfile.TarError, OSError) as exc:
+        files.close()
         raise DocassembleCompatibilityError(
             "GitHub returned an invalid repository archive"
         ) from exc
+    except BaseException:
+        files.close()
+        raise
 
     return {
         **repository,
@@ -930,6 +1020,63 @@ def ensure_github_repository(
     return repo
 
 
+def _git_blob_sha(content: bytes) -> str:
+    """The SHA Git and GitHub give a blob with this content."""
+    return hashlib.sha1(
+        b"blob %d\0" % len(content) + content, usedforsecurity=False
+    ).hexdigest()
+
+
+def _describe_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} bytes"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.0f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def _github_tree_blob_shas(http: Any, repository_path: str, commit_sha: str) -> set:
+    """The SHAs of every blob in a commit's tree.
+
+    The tree is read once, recursively. A tree GitHub will not list, or lists
+    only in part, just means more of the package is uploaded again.
+    """
+    response, tree = _github_json_request(
+        http,
+        f"{repository_path}/git/trees/{quote(commit_sha, safe='')}?recursive=1",
+    )
+    if int(response.get("status", 0)) != 200 or not isinstance(tree, dict):
+        return set()
+    return {
+        str(entry["sha"])
+        for entry in tree.get("tree") or []
+        if isinstance(entry, dict) and entry.get("type") == "blob" and entry.get("sha")
+    }
+
+
+def _upload_github_blob(
+    http: Any, repository_path: str, full_path: str, relative_path: str
+) -> str:
+    with open(full_path, "rb") as stream:
+        encoded_content = base64.b64encode(stream.read()).decode("ascii")
+    response, blob = _github_json_request(
+        http,
+        f"{repository_path}/git/blobs",
+        "POST",
+        {"content": encoded_content, "encoding": "base64"},
+    )
+    if int(response.get("status", 0)) != 201 or not isinstance(blob, dict):
+        raise DocassembleCompatibilityError(
+            _github_error_message(blob, f"GitHub could not upload {relative_path}")
+        )
+    blob_sha = str(blob.get("sha") or "").strip()
+    if not blob_sha:
+        raise DocassembleCompatibilityError(
+            f"GitHub did not return a blob for {relative_path}"
+        )
+    return blob_sha
+
+
 def publish_github_package(
     *,
     owner: str,
@@ -953,10 +1100,12 @@ def publish_github_package(
     authorized GitHub connection, so the Git database API is a better fit: it
     works for personal and organization repositories and needs no SSH key.
 
-    One blob upload per file means a template-heavy project takes far longer
-    than a web request should, so this runs in Docassemble's Celery worker.
-    ``on_progress`` receives ``(message, percent)`` on this function's own
-    0-100 scale for the caller to surface while it runs.
+    Only files that are not already in the parent commit are uploaded, a few
+    at a time, but a first publish of a template-heavy project still takes far
+    longer than a web request should, so this runs in Docassemble's Celery
+    worker. ``on_progress`` receives ``(message, percent)`` on this function's
+    own 0-100 scale, advancing with the bytes uploaded, for the caller to
+    surface while it runs.
 
     ``manifest_path`` supplies the modification time Docassemble's package
     builder expects, and ``default_branch`` is the repository's default branch,
@@ -1101,40 +1250,80 @@ def publish_github_package(
                     )
                 )
 
+        # Git names a blob by the SHA-1 of its content, so a file that is
+        # already anywhere in the parent commit's tree can go into the new tree
+        # as it is. Only new and changed files are uploaded.
+        existing_blobs = (
+            _github_tree_blob_shas(http, repository_path, parent_sha)
+            if parent_sha
+            else set()
+        )
         tree_entries: List[Dict[str, str]] = []
-        total_files = len(files)
-        for index, (relative_path, full_path) in enumerate(files, start=1):
-            report(
-                f"Uploading {relative_path} ({index} of {total_files}).",
-                15 + int(70 * (index - 1) / total_files),
-            )
+        uploads: List[Tuple[Dict[str, str], str, int]] = []
+        for relative_path, full_path in files:
             with open(full_path, "rb") as stream:
-                encoded_content = base64.b64encode(stream.read()).decode("ascii")
-            response, blob = _github_json_request(
-                http,
-                f"{repository_path}/git/blobs",
-                "POST",
-                {"content": encoded_content, "encoding": "base64"},
+                content = stream.read()
+            entry = {
+                "path": relative_path,
+                "mode": "100755" if os.access(full_path, os.X_OK) else "100644",
+                "type": "blob",
+                "sha": _git_blob_sha(content),
+            }
+            tree_entries.append(entry)
+            if entry["sha"] not in existing_blobs:
+                uploads.append((entry, full_path, len(content)))
+
+        total_bytes = sum(size for _entry, _path, size in uploads)
+        unchanged = len(files) - len(uploads)
+        if not uploads:
+            report(f"All {len(files)} files are unchanged on GitHub.", 85)
+        else:
+            report(
+                f"Uploading {len(uploads)} new or changed files "
+                f"({_describe_bytes(total_bytes)}); {unchanged} unchanged.",
+                15,
             )
-            if int(response.get("status", 0)) != 201 or not isinstance(blob, dict):
-                raise DocassembleCompatibilityError(
-                    _github_error_message(
-                        blob, f"GitHub could not upload {relative_path}"
+            # An httplib2 connection is not thread-safe, so each upload takes a
+            # connection no other upload is using, authorizing another only
+            # when every existing one is busy.
+            idle_connections: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+            idle_connections.put(http)
+
+            def upload(full_path: str, relative_path: str) -> str:
+                try:
+                    client = idle_connections.get_nowait()
+                except queue.Empty:
+                    client = _github_authorized_http(user_id=user_id)
+                try:
+                    return _upload_github_blob(
+                        client, repository_path, full_path, relative_path
                     )
-                )
-            blob_sha = str(blob.get("sha") or "").strip()
-            if not blob_sha:
-                raise DocassembleCompatibilityError(
-                    f"GitHub did not return a blob for {relative_path}"
-                )
-            tree_entries.append(
-                {
-                    "path": relative_path,
-                    "mode": "100755" if os.access(full_path, os.X_OK) else "100644",
-                    "type": "blob",
-                    "sha": blob_sha,
+                finally:
+                    idle_connections.put(client)
+
+            uploaded_bytes = 0
+            with ThreadPoolExecutor(
+                max_workers=min(_GITHUB_BLOB_UPLOAD_CONNECTIONS, len(uploads))
+            ) as executor:
+                pending = {
+                    executor.submit(upload, full_path, entry["path"]): (entry, size)
+                    for entry, full_path, size in uploads
                 }
-            )
+                try:
+                    for future in as_completed(pending):
+                        entry, size = pending[future]
+                        entry["sha"] = future.result()
+                        uploaded_bytes += size
+                        report(
+                            f"Uploaded {entry['path']} "
+                            f"({_describe_bytes(uploaded_bytes)} of "
+                            f"{_describe_bytes(total_bytes)}).",
+                            15 + int(70 * uploaded_bytes / max(total_bytes, 1)),
+                        )
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
 
         # Deliberately no ``base_tree``: the walk above already covers every
         # file in the package, so posting a standalone tree replaces the branch
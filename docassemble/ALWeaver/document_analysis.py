@@ -0,0 +1,265 @@
+# do not pre-load
+
+"""Read each template once, however many parts of the generator ask about it.
+
+Drafting an interview asks the same questions of a template several times over:
+the field list reads its AcroForm fields, then opens it again with pikepdf for
+the flags pdfminer does not report; each attachment block reads the fields a
+third time; and the LLM context and category guess each extract the full text.
+On a 40-page court form that parsing is most of the time a generation takes.
+
+:func:`analyze_document` hands out one :class:`DocumentAnalysis` per template
+content, keyed by a SHA-256 of the bytes, and each analysis works out each
+answer at most once. Because the key is the content rather than the path, a
+template whose fields were renamed into a new copy is read afresh, and the same
+form uploaded twice is read once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+__all__ = [
+    "DocumentAnalysis",
+    "PdfFieldInfo",
+    "adopt_document_analysis",
+    "analyze_document",
+    "clear_document_analysis_cache",
+]
+
+#: How many templates' analyses are kept. A generation uses one per template,
+#: so this only has to cover the templates of the requests in flight.
+MAX_CACHED_ANALYSES = 32
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PdfFieldInfo:
+    """What pikepdf records about one AcroForm field.
+
+    Attributes:
+        field_type (Optional[str]): the ``/FT`` entry, like ``/Btn`` or ``/Ch``.
+        flags (int): the ``/Ff`` bit flags, or 0 when the field has none.
+    """
+
+    field_type: Optional[str]
+    flags: int = 0
+
+    @property
+    def is_push_button(self) -> bool:
+        """Bit 17 on a button marks a push button, which never holds a value."""
+        return self.field_type == "/Btn" and bool(self.flags & 0x10000)
+
+
+@dataclass
+class DocumentAnalysis:
+    """Everything the generator reads out of one template, read once.
+
+    Attributes:
+        path (str): a file holding the content this analysis describes.
+        digest (str): the SHA-256 of that content.
+        document_type (str): ``"pdf"`` or ``"docx"``, from the filename.
+    """
+
+    path: str
+    digest: str
+    document_type: str
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _pdf_fields: Optional[List[Tuple]] = field(default=None, repr=False)
+    _pdf_field_info: Optional[Dict[str, PdfFieldInfo]] = field(default=None, repr=False)
+    _text: Optional[str] = field(default=None, repr=False)
+
+    def pdf_fields(self) -> List[Tuple]:
+        """The field tuples ``DAFile.get_pdf_fields()`` would return."""
+        if self.document_type != "pdf":
+            return []
+        with self._lock:
+            if self._pdf_fields is None:
+                self._pdf_fields = _read_pdf_fields(self.path)
+            return list(self._pdf_fields)
+
+    def pdf_field_info(self) -> Dict[str, PdfFieldInfo]:
+        """Type and flags for each top-level AcroForm field, by field name."""
+        if self.document_type != "pdf":
+            return {}
+        with self._lock:
+            if self._pdf_field_info is None:
+                self._pdf_field_info = _read_pdf_field_info(self.path)
+            return dict(self._pdf_field_info)
+
+    def text(self) -> str:
+        """The template's full text, as pdfminer or docx2python extracts it."""
+        with self._lock:
+            if self._text is None:
+                self._text = _extract_text(self.path, self.document_type)
+            return self._text
+
+    def read_all(self, include_text: bool = True) -> "DocumentAnalysis":
+        """Read everything now, so the analysis can be sent to another process."""
+        self.pdf_fields()
+        self.pdf_field_info()
+        if include_text:
+            self.text()
+        return self
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def _read_pdf_fields(path: str) -> List[Tuple]:
+    from docassemble.base.pdftk import read_fields
+
+    results: List[Tuple] = []
+    for item in read_fields(path) or []:
+        # The same normalization DAFile.get_pdf_fields() applies
+        field_type: Optional[str] = re.sub(r"[^/A-Za-z]", "", str(item[4]))
+        if field_type == "None":
+            field_type = None
+        results.append(
+            (
+                item[0],
+                "" if item[1] == "something" else item[1],
+                item[2],
+                item[3],
+                field_type,
+                item[5],
+            )
+        )
+    return results
+
+
+def _read_pdf_field_info(path: str) -> Dict[str, PdfFieldInfo]:
+    from pikepdf import Pdf
+
+    info: Dict[str, PdfFieldInfo] = {}
+    with Pdf.open(path) as pdf:
+        acroform = pdf.Root.get("/AcroForm")
+        fields = acroform.get("/Fields") if acroform is not None else None
+        if not fields:
+            return info
+        for pike_field in fields:
+            field_type = pike_field.get("/FT")
+            flags = pike_field.get("/Ff")
+            info[str(pike_field.get("/T"))] = PdfFieldInfo(
+                field_type=str(field_type) if field_type is not None else None,
+                flags=int(flags) if flags is not None else 0,
+            )
+    return info
+
+
+def _extract_text(path: str, document_type: str) -> str:
+    if document_type == "pdf":
+        from pdfminer.high_level import extract_text
+
+        return extract_text(path) or ""
+    from docx2python import docx2python
+
+    return docx2python(path).text or ""  # Will error with invalid value
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_cache_lock = threading.Lock()
+_analyses: "OrderedDict[Tuple[str, str], DocumentAnalysis]" = OrderedDict()
+# (path, mtime, size) -> digest, so a file asked about repeatedly is hashed once
+_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+
+def analyze_document(path: str, filename: Optional[str] = None) -> DocumentAnalysis:
+    """The shared analysis of the template at ``path``.
+
+    Args:
+        path (str): where the template is on disk.
+        filename (Optional[str]): the template's real name, when ``path`` is a
+            temporary file whose name does not carry the extension.
+
+    Returns:
+        DocumentAnalysis: the analysis for this content, new or already begun.
+    """
+    name = (filename or path).lower()
+    document_type = "docx" if name.endswith(".docx") else "pdf"
+    stat_result = os.stat(path)
+    stat_key = (os.path.realpath(path), stat_result.st_mtime_ns, stat_result.st_size)
+    with _cache_lock:
+        digest = _digests.get(stat_key)
+    if digest is None:
+        digest = _file_digest(path)
+
+    key = (digest, document_type)
+    with _cache_lock:
+        _digests[stat_key] = digest
+        _digests.move_to_end(stat_key)
+        while len(_digests) > MAX_CACHED_ANALYSES * 4:
+            _digests.popitem(last=False)
+        analysis = _analyses.get(key)
+        if analysis is not None:
+            # The file it was first read from may have been a temporary copy
+            # that is gone by now; anything still to be read comes from here.
+            analysis.path = path
+            _analyses.move_to_end(key)
+            return analysis
+        analysis = DocumentAnalysis(
+            path=path, digest=digest, document_type=document_type
+        )
+        _analyses[key] = analysis
+        while len(_analyses) > MAX_CACHED_ANALYSES:
+            _analyses.popitem(last=False)
+        return analysis
+
+
+def adopt_document_analysis(analysis: DocumentAnalysis) -> DocumentAnalysis:
+    """Share an analysis read elsewhere, like in a worker process.
+
+    Whatever it has already read is kept; if this process already holds an
+    analysis of the same content, the answers are merged into that one.
+    """
+    stat_result = os.stat(analysis.path)
+    stat_key = (
+        os.path.realpath(analysis.path),
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+    )
+    key = (analysis.digest, analysis.document_type)
+    with _cache_lock:
+        _digests[stat_key] = analysis.digest
+        existing = _analyses.get(key)
+        if existing is None:
+            _analyses[key] = analysis
+            while len(_analyses) > MAX_CACHED_ANALYSES:
+                _analyses.popitem(last=False)
+            return analysis
+    with existing._lock:
+        existing.path = analysis.path
+        if existing._pdf_fields is None:
+            existing._pdf_fields = analysis._pdf_fields
+        if existing._pdf_field_info is None:
+            existing._pdf_field_info = analysis._pdf_field_info
+        if existing._text is None:
+            existing._text = analysis._text
+    return existing
+
+
+def clear_document_analysis_cache() -> None:
+    """Forget every analysis, for tests and for freeing memory."""
+    with _cache_lock:
+        _analyses.clear()
+        _digests.clear()
@@ -115,7 +115,8 @@ class AgentCandidate:
     """The in-memory working document for one agent session.
 
     The candidate only ever holds source that passed the whole-candidate
-    validator, so its validity is monotonic across a conversation.
+    validator, so its validity is monotonic across a conversation. The last
+    accepted validation is kept so the next edit's can start from it.
     """
 
     base_source: str
@@ -124,6 +125,7 @@ class AgentCandidate:
     revision: str
     applied_commands: List[Dict[str, Any]] = field(default_factory=list)
     diagnostics: List[Dict[str, Any]] = field(default_factory=list)
+    validation: Optional[CandidateValidation] = field(default=None, repr=False)
 
     @classmethod
     def from_source(cls, raw_source: str) -> "AgentCandidate":
@@ -152,6 +154,7 @@ class AgentCandidate:
         self.raw_source = proposed_source
         self.revision = validation.revision or source_revision(proposed_source)
         self.diagnostics = list(validation.diagnostics)
+        self.validation = validation
         record = {
             "sequence": len(self.applied_commands) + 1,
             "tool": tool,
@@ -309,13 +312,27 @@ class WeaverAgentSession:
         }
 
 
-# Live progress lives under its own key rather than inside the session record.
+# Live progress lives under its own keys rather than inside the session record.
 # A turn is one blocking request that writes progress as it goes, while Stop
 # and the polling reads touch the session concurrently; sharing one record
 # would make those writers clobber each other.
+#
+# The turn's state — running, its result or error — is one small record that is
+# written when the turn starts and when it ends. The steps it takes are appended
+# to a Redis list as they happen, so each step costs one RPUSH however many came
+# before it, and a reader holding a cursor (the number of events it has seen)
+# fetches only the events after it. The list keeps only the latest events, and
+# a counter beside it records how many were ever appended, so cursors still
+# count from the start of the turn after older events are dropped.
 AGENT_PROGRESS_KEY_PREFIX = "da:alweaver:editor:agent-progress:"
+AGENT_PROGRESS_EVENTS_KEY_PREFIX = "da:alweaver:editor:agent-progress-events:"
+AGENT_PROGRESS_COUNT_KEY_PREFIX = "da:alweaver:editor:agent-progress-count:"
 AGENT_PROGRESS_EXPIRE_SECONDS = 30 * 60
+# How many of the latest events a reader without a cursor is sent.
 MAX_PROGRESS_EVENTS = 60
+# How many events are kept at all. A runaway turn drops its oldest events
+# rather than growing the list without bound.
+MAX_STORED_PROGRESS_EVENTS = 500
 # A turn writes progress on every step. If nothing has been written for this
 # long the worker running it is gone — a recycled process, say — and the record
 # must not be believed to be alive forever.
@@ -339,27 +356,51 @@ def _progress_key(session_id: str) -> str:
     return AGENT_PROGRESS_KEY_PREFIX + session_id
 
 
+def _progress_events_key(session_id: str) -> str:
+    return AGENT_PROGRESS_EVENTS_KEY_PREFIX + session_id
+
+
+def _progress_count_key(session_id: str) -> str:
+    return AGENT_PROGRESS_COUNT_KEY_PREFIX + session_id
+
+
+def _decode_json(raw: Any) -> Any:
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8")
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+
+
 def store_progress(
     redis_client: Any,
     session_id: str,
     owner_user_id: int,
     *,
     running: bool,
-    events: List[Dict[str, Any]],
     started_at: float,
+    events: Optional[List[Dict[str, Any]]] = None,
     result: Optional[Dict[str, Any]] = None,
     error: Optional[Dict[str, Any]] = None,
 ) -> None:
-    """Publish what the running turn has done so far, and its outcome.
+    """Publish whether the turn is running, and its outcome once it is not.
 
     The finished turn's result lives here rather than in an HTTP response: a
     turn outlives any request the browser can hold open, so the browser reads
     the outcome by polling once ``running`` goes false.
+
+    Passing ``events`` starts the event stream over with those events, as a
+    new turn does; otherwise the events already appended are left alone.
     """
+    if events is not None:
+        redis_client.delete(_progress_events_key(session_id))
+        redis_client.delete(_progress_count_key(session_id))
+        for event in events:
+            append_progress_event(redis_client, session_id, event)
     payload = {
         "owner_user_id": int(owner_user_id),
         "running": bool(running),
-        "events": list(events)[-MAX_PROGRESS_EVENTS:],
         "started_at": started_at,
         "updated_at": utc_timestamp(),
         "result": result,
@@ -372,28 +413,86 @@ def store_progress(
     )
 
 
+def append_progress_event(
+    redis_client: Any, session_id: str, event: Dict[str, Any]
+) -> int:
+    """Add one event to the running turn's stream.
+
+    Every event also renews the turn's state record, so a turn that runs
+    longer than :data:`AGENT_PROGRESS_EXPIRE_SECONDS` keeps it.
+
+    Returns:
+        int: the cursor just past this event.
+    """
+    events_key = _progress_events_key(session_id)
+    count_key = _progress_count_key(session_id)
+    pipe = redis_client.pipeline()
+    pipe.rpush(
+        events_key,
+        json.dumps({"at": utc_timestamp(), "event": event}, default=str),
+    )
+    pipe.ltrim(events_key, -MAX_STORED_PROGRESS_EVENTS, -1)
+    pipe.incr(count_key)
+    for key in (events_key, count_key, _progress_key(session_id)):
+        pipe.expire(key, AGENT_PROGRESS_EXPIRE_SECONDS)
+    return int(pipe.execute()[2])
+
+
 def load_progress(
-    redis_client: Any, session_id: str, owner_user_id: int
+    redis_client: Any,
+    session_id: str,
+    owner_user_id: int,
+    after: Optional[int] = None,
 ) -> Optional[Dict[str, Any]]:
-    raw = redis_client.get(_progress_key(session_id))
-    if raw is None:
-        return None
-    if isinstance(raw, (bytes, bytearray)):
-        raw = raw.decode("utf-8")
-    try:
-        payload = json.loads(raw)
-    except (TypeError, ValueError):
-        return None
+    """Read the turn's state and the events after the cursor ``after``.
+
+    Without a cursor, the latest :data:`MAX_PROGRESS_EVENTS` events are
+    returned. The returned ``cursor`` is what to send as ``after`` next time.
+    """
+    # Events are read before the state: a turn appends its last event before
+    # marking itself finished, so a finished state is never read alongside an
+    # event list that is missing the end of the turn. The list and its counter
+    # are read together, so an event appended meanwhile cannot shift one
+    # against the other.
+    pipe = redis_client.pipeline()
+    pipe.get(_progress_count_key(session_id))
+    pipe.lrange(_progress_events_key(session_id), 0, -1)
+    raw_total, stored = pipe.execute()
+    stored = stored or []
+    total = max(int(raw_total or 0), len(stored))
+    # The cursor of the oldest event still kept
+    first = total - len(stored)
+    if after is None:
+        start = max(first, total - MAX_PROGRESS_EVENTS)
+    else:
+        start = min(max(first, int(after)), total)
+    raw_entries = stored[start - first :]
+    entries = [_decode_json(item) for item in raw_entries]
+    latest = _decode_json(stored[-1]) if stored else None
+
+    payload = _decode_json(redis_client.get(_progress_key(session_id)))
     if not isinstance(payload, dict):
         return None
     if int(payload.get("owner_user_id", -1)) != int(owner_user_id):
         return None
     payload.pop("owner_user_id", None)
+    # Each appended event shows the turn is still alive, without rewriting the
+    # state record to say so.
+    if isinstance(latest, dict) and isinstance(latest.get("at"), (int, float)):
+        payload["updated_at"] = max(
+            float(payload.get("updated_at") or 0), float(latest["at"])
+        )
+    payload["events"] = [
+        entry.get("event") for entry in entries if isinstance(entry, dict)
+    ]
+    payload["cursor"] = start + len(raw_entries)
     return payload
 
 
 def clear_progress(redis_client: Any, session_id: str) -> None:
     redis_client.delete(_progress_key(session_id))
+    redis_client.delete(_progress_events_key(session_id))
+    redis_client.delete(_progress_count_key(session_id))
 
 
 def store_agent_session(redis_client: Any, session: WeaverAgentSession) -> None:
@@ -339,7 +339,9 @@ def _commit(
     """
     before_revision = context.candidate.revision
     validation = validate_candidate_source(
-        filename=context.filename, raw_yaml=proposed_source
+        filename=context.filename,
+        raw_yaml=proposed_source,
+        previous=context.candidate.validation,
     )
     if validation.blocking:
         return AgentToolResult(
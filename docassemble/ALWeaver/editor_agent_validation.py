@@ -5,12 +5,20 @@ check run through :func:`validate_candidate_source`. Keeping a single answer to
 "may Weaver accept this source?" is what stops agent editing from acquiring a
 weaker standard than ordinary editing.
 
+An agent turn validates the candidate after every edit, and an edit usually
+touches one document of a long interview. Given the previous accepted
+validation, :func:`validate_candidate_source` only checks the documents whose
+text changed and carries every other document's findings across; the stream
+itself is only composed again when the edit could have changed how it splits
+into documents.
+
 This module deliberately imports Docassemble-facing helpers lazily so that the
 deterministic pipeline stays unit-testable without a Docassemble server.
 """
 
 from __future__ import annotations
 
+import bisect
 from dataclasses import dataclass, field
 import re
 from typing import Any, Dict, List, Optional, Tuple
@@ -18,6 +26,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import yaml
 
 from .source_document import (
+    SourceBlock,
     SourceDocument,
     parse_source_document,
     source_revision,
@@ -363,9 +372,155 @@ def deterministic_style_findings(raw_yaml: str) -> List[Dict[str, Any]]:
     return findings if isinstance(findings, list) else []
 
 
+def _document_start_lines(source_document: SourceDocument) -> List[int]:
+    raw_text = source_document.raw_text
+    start_lines: List[int] = []
+    line = 1
+    previous_start = 0
+    for block in source_document.documents:
+        line += raw_text.count("\n", previous_start, block.start_offset)
+        previous_start = block.start_offset
+        start_lines.append(line)
+    return start_lines
+
+
+def _findings_by_document(
+    findings: List[Dict[str, Any]], start_lines: List[int]
+) -> Optional[List[List[Dict[str, Any]]]]:
+    """Each document's findings, numbered from its first line.
+
+    None when a finding has no line inside a document: it may be about the
+    interview as a whole, so it cannot be carried across an edit.
+    """
+    by_document: List[List[Dict[str, Any]]] = [[] for _ in start_lines]
+    for finding in findings:
+        raw_line_number = finding.get("line_number")
+        if raw_line_number is None:
+            return None
+        try:
+            line_number = int(raw_line_number)
+        except (TypeError, ValueError):
+            return None
+        index = bisect.bisect_right(start_lines, line_number) - 1
+        # A line just before the next document's first is its separator
+        if index < 0 or (
+            index + 1 < len(start_lines) and line_number == start_lines[index + 1] - 1
+        ):
+            return None
+        item = dict(finding)
+        item["line_number"] = line_number - start_lines[index] + 1
+        item["source_range"] = None
+        by_document[index].append(item)
+    return by_document
+
+
+#: Keys DAYamlChecker compares across documents, for duplicate ids, more than
+#: one ``mandatory`` block and the interview's metadata.
+_INTERVIEW_WIDE_KEYS = ("id", "mandatory", "metadata")
+
+
+def _interview_wide_facts(block: SourceBlock) -> Optional[Dict[str, Any]]:
+    """The block's values for :data:`_INTERVIEW_WIDE_KEYS`, None if unknown."""
+    value = block.parsed_value
+    if not isinstance(value, dict):
+        return None
+    return {key: value[key] for key in _INTERVIEW_WIDE_KEYS if key in value}
+
+
+def _changed_documents(
+    source_document: SourceDocument, previous: Optional["CandidateValidation"]
+) -> Optional[List[int]]:
+    """Indices of the documents that differ from ``previous``'s, if comparable.
+
+    None as well when an edit changed what other documents are checked
+    against, since the checker only sees the changed documents.
+    """
+    if (
+        previous is None
+        or previous.checker_findings is None
+        or previous.source_document is None
+        or len(previous.source_document.documents) != len(source_document.documents)
+    ):
+        return None
+    changed: List[int] = []
+    for index, (before, after) in enumerate(
+        zip(previous.source_document.documents, source_document.documents)
+    ):
+        if before.raw_text == after.raw_text:
+            continue
+        facts = _interview_wide_facts(after)
+        if facts is None or facts != _interview_wide_facts(before):
+            return None
+        changed.append(index)
+    return changed
+
+
+def _checker_findings(
+    raw_yaml: str,
+    filename: str,
+    source_document: SourceDocument,
+    previous: Optional["CandidateValidation"],
+) -> Tuple[List[Dict[str, Any]], Optional[List[List[Dict[str, Any]]]]]:
+    """DAYamlChecker's findings for ``raw_yaml``, and the same by document.
+
+    When ``previous`` can be compared, the checker reads only the changed
+    documents: the others are blanked to the same number of lines, so line
+    numbers and separators are untouched. An edit to a document's ``id``,
+    ``mandatory`` or ``metadata`` is checked against the whole source, since
+    the checker compares those across documents. Anything it reports outside
+    the changed documents also means a check looked across documents, and the
+    whole source is checked instead.
+    """
+    start_lines = _document_start_lines(source_document)
+    changed = _changed_documents(source_document, previous)
+    by_document: Optional[List[List[Dict[str, Any]]]] = None
+    if changed is not None and previous and previous.checker_findings is not None:
+        by_document = list(previous.checker_findings)
+        if changed:
+            pieces: List[str] = []
+            cursor = 0
+            for index, block in enumerate(source_document.documents):
+                pieces.append(raw_yaml[cursor : block.start_offset])
+                if index in changed:
+                    pieces.append(block.raw_text)
+                else:
+                    pieces.append("\n" * block.raw_text.count("\n"))
+                cursor = block.end_offset
+            pieces.append(raw_yaml[cursor:])
+            fresh = _findings_by_document(
+                dayamlchecker_findings("".join(pieces), filename), start_lines
+            )
+            if fresh is None or any(
+                items for index, items in enumerate(fresh) if index not in changed
+            ):
+                by_document = None
+            else:
+                for index in changed:
+                    by_document[index] = fresh[index]
+    if by_document is None:
+        findings = dayamlchecker_findings(raw_yaml, filename)
+        return findings, _findings_by_document(findings, start_lines)
+
+    findings = []
+    for start_line, items in zip(start_lines, by_document):
+        for item in items:
+            placed = dict(item)
+            placed["line_number"] = item["line_number"] + start_line - 1
+            placed["source_range"] = source_range_for_line(
+                raw_yaml, placed["line_number"]
+            )
+            findings.append(placed)
+    return findings, by_document
+
+
 @dataclass
 class CandidateValidation:
-    """The verdict on one complete candidate source document."""
+    """The verdict on one complete candidate source document.
+
+    ``checker_findings`` keeps DAYamlChecker's findings for each document,
+    numbered from the document's first line, so the next validation can carry
+    them across; it is None when a finding could not be placed in a document.
+    """
 
     structurally_valid: bool
     blocking: bool
@@ -373,6 +528,7 @@ class CandidateValidation:
     model: Optional[Dict[str, Any]] = None
     source_document: Optional[SourceDocument] = None
     revision: str = ""
+    checker_findings: Optional[List[List[Dict[str, Any]]]] = None
 
     @property
     def summary(self) -> Dict[str, int]:
@@ -401,6 +557,7 @@ def validate_candidate_source(
     filename: str,
     raw_yaml: str,
     run_style_checks: bool = False,
+    previous: Optional[CandidateValidation] = None,
 ) -> CandidateValidation:
     """Answer: may Weaver present this candidate as a valid edit?
 
@@ -408,9 +565,17 @@ def validate_candidate_source(
     parse_interview_yaml → Weaver source diagnostics → DAYamlChecker →
     optional deterministic ALDashboard lint. Any error-severity diagnostic is
     blocking; warnings and infos are reported but do not block.
+
+    ``previous`` is the validation of the revision this one was edited from.
+    The verdict is the same with or without it; with it, documents the edit
+    did not touch are not parsed or checked again.
     """
     revision = source_revision(raw_yaml)
-    source_document = parse_source_document(filename, raw_yaml)
+    source_document = parse_source_document(
+        filename,
+        raw_yaml,
+        previous=None if previous is None else previous.source_document,
+    )
     diagnostics: List[Dict[str, Any]] = [
         _document_diagnostic_to_dict(item, filename)
         for item in source_document.diagnostics
@@ -433,11 +598,14 @@ def validate_candidate_source(
     model = parse_interview_yaml(raw_yaml)
     blocks = model.get("blocks", [])
 
-    weaver_findings = _yaml_stream_findings(raw_yaml, filename)
-    weaver_findings.extend(dayamlchecker_findings(raw_yaml, filename))
+    # The stream has already composed in parse_source_document, so the only
+    # findings left to collect are the checker's.
+    checker_findings, checker_findings_by_document = _checker_findings(
+        raw_yaml, filename, source_document, previous
+    )
     diagnostics.extend(
         annotate_lint_findings(
-            _dedupe(weaver_findings), blocks, source_name="candidate"
+            _dedupe(checker_findings), blocks, source_name="candidate"
         )
     )
 
@@ -457,6 +625,7 @@ def validate_candidate_source(
         model=model,
         source_document=source_document,
         revision=revision,
+        checker_findings=checker_findings_by_document,
     )
     validation.blocking = bool(validation.blocking_diagnostics())
     return validation
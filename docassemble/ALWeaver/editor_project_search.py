@@ -7,8 +7,11 @@ the spans are still matches before producing a new source buffer.
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from dataclasses import dataclass
 import re
-from typing import Any, Dict, Iterable, List, Sequence, Tuple
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Set, Tuple
 
 MAX_SEARCH_QUERY_CHARS = 500
 MAX_REPLACEMENT_CHARS = 100_000
@@ -129,3 +132,89 @@ def replace_selected_matches(
     for start, end in reversed(spans):
         updated = updated[:start] + replacement + updated[end:]
     return updated, len(spans)
+
+
+# ---------------------------------------------------------------------------
+# Search index
+# ---------------------------------------------------------------------------
+
+# Every search reads the whole project, but a file's text rarely changes
+# between two keystrokes. Each file version is indexed once, under its
+# source revision, so an edit re-indexes only the file that changed. The index
+# can only rule a file out. A file it keeps is still searched exactly, so a
+# search with the index finds exactly what a search without it finds.
+MAX_INDEXED_FILES = 512
+TRIGRAM_LENGTH = 3
+
+# The only characters outside ASCII that a case-insensitive ``re`` pattern of
+# ASCII letters can match, folded to the letter they match.
+_ASCII_CASE_FOLDS = str.maketrans({"ı": "i", "İ": "i", "ſ": "s", "K": "k"})
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_]\w*")
+
+
+@dataclass(frozen=True)
+class SearchIndexEntry:
+    """What one file version contains, for ruling it out of a search.
+
+    Attributes:
+        trigrams: every three-character run of the case-folded text.
+        identifiers: every Python-style name in the text.
+    """
+
+    trigrams: FrozenSet[str]
+    identifiers: FrozenSet[str]
+
+
+_index_lock = threading.Lock()
+_index: "OrderedDict[str, SearchIndexEntry]" = OrderedDict()
+
+
+def _fold_case(text: str) -> str:
+    return text.translate(_ASCII_CASE_FOLDS).lower()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {
+        text[index : index + TRIGRAM_LENGTH]
+        for index in range(len(text) - TRIGRAM_LENGTH + 1)
+    }
+
+
+def search_index_entry(content: str, revision: str) -> SearchIndexEntry:
+    """The index of one file version, built the first time it is asked for."""
+    with _index_lock:
+        entry = _index.get(revision)
+        if entry is not None:
+            _index.move_to_end(revision)
+            return entry
+    entry = SearchIndexEntry(
+        trigrams=frozenset(_trigrams(_fold_case(content))),
+        identifiers=frozenset(_IDENTIFIER_RE.findall(content)),
+    )
+    with _index_lock:
+        _index[revision] = entry
+        while len(_index) > MAX_INDEXED_FILES:
+            _index.popitem(last=False)
+    return entry
+
+
+def may_contain_text(entry: SearchIndexEntry, query: str) -> bool:
+    """False only when the file cannot hold a match for ``query``.
+
+    Holds for every combination of the case and whole-word options, since each
+    of them only narrows what a case-insensitive match would find.
+    """
+    if len(query) < TRIGRAM_LENGTH or not query.isascii():
+        return True
+    return entry.trigrams.issuperset(_trigrams(query.lower()))
+
+
+def may_contain_variable(entry: SearchIndexEntry, name: str) -> bool:
+    """False only when the file cannot mention the variable ``name``."""
+    return entry.identifiers.issuperset(_IDENTIFIER_RE.findall(name))
+
+
+def clear_search_index() -> None:
+    """Forget every indexed file, for tests and for freeing memory."""
+    with _index_lock:
+        _index.clear()
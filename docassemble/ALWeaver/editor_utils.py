@@ -16,6 +16,8 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 import yaml
 
 from .docassemble_compat import create_playground, create_saved_file
+from .parsed_source_cache import cached_parse
+from .project_index import note_saved_file
 
 __all__ = [
     "parse_interview_yaml",
@@ -464,21 +466,17 @@ def delete_saved_file(area: Any, directory: str, filename: str) -> None:
     area.finalize()
 
 
-def _stable_block_id(index: int, block: Dict[str, Any]) -> str:
-    """Derive a stable id for a parsed block.
+def _block_content_digest(block: Dict[str, Any]) -> str:
+    """Hash a parsed block's content for the id of a block without an ``id``.
 
-    Uses the ``id`` key if present, otherwise falls back to a
-    content-based hash combined with the positional index.
+    Such a block's id is ``block-<index>-<digest>``: the content hash combined
+    with the document's position in the file.
     """
-    explicit_id = block.get("id")
-    if explicit_id:
-        return str(explicit_id)
     stable_block = {
         key: value for key, value in block.items() if not str(key).startswith("_")
     }
     raw = canonical_block_yaml(stable_block)
-    digest = hashlib.sha256(raw.encode()).hexdigest()[:8]
-    return f"block-{index}-{digest}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:8]
 
 
 def is_comment_only_yaml(text: str) -> bool:
@@ -711,164 +709,58 @@ def parse_interview_yaml(raw_yaml: str) -> Dict[str, Any]:
         default_screen_parts_blocks: indices of default-screen-parts blocks
         order_blocks: indices of mandatory code blocks (interview order)
         raw_yaml: the original YAML text
-    """
 
-    segments: List[Dict[str, Any]] = []
-    body_start = 0
-    for separator in _YAML_DOCUMENT_SEPARATOR_RE.finditer(raw_yaml):
-        body = raw_yaml[body_start : separator.start()]
-        start_line = raw_yaml.count("\n", 0, body_start) + 1
-        segments.append(
-            {
-                "start_line": start_line,
-                "end_line": start_line + len(body.splitlines()) - 1,
-                "text": body,
-            }
-        )
-        body_start = separator.end()
-    body = raw_yaml[body_start:]
-    start_line = raw_yaml.count("\n", 0, body_start) + 1
-    segments.append(
-        {
-            "start_line": start_line,
-            "end_line": start_line + len(body.splitlines()) - 1,
-            "text": body,
-        }
+    A source parsed before is answered from a copy of the earlier model.
+    """
+    return cached_parse(
+        ("interview_model", source_revision(raw_yaml)),
+        raw_yaml,
+        lambda: _parse_interview_yaml(raw_yaml),
     )
 
+
+def _parse_interview_yaml(raw_yaml: str) -> Dict[str, Any]:
     blocks: List[Dict[str, Any]] = []
     metadata_indices: List[int] = []
     include_indices: List[int] = []
     default_sp_indices: List[int] = []
     order_indices: List[int] = []
 
-    for i, segment in enumerate(segments):
-        segment_text_raw = str(segment["text"])
-        segment_text = segment_text_raw.strip()
-        line_start = int(segment["start_line"])
-        line_end = int(segment["end_line"])
-        if not segment_text:
+    # Each document is parsed on its own, and the parse does not depend on
+    # where the document sits, so editing one block re-parses only that block:
+    # every other document's text is unchanged and comes from the cache.
+    start_line = 1
+    previous_start = 0
+    for i, (body_start, _end, body) in enumerate(_source_document_bodies(raw_yaml)):
+        start_line += raw_yaml.count("\n", previous_start, body_start)
+        previous_start = body_start
+        if not body.strip():
             continue
-
-        if is_comment_only_yaml(segment_text_raw):
-            uncommented = _uncomment_yaml_block(segment_text)
-            try:
-                parsed_commented = yaml.safe_load(uncommented)
-            except yaml.YAMLError:
-                parsed_commented = None
-            if not isinstance(parsed_commented, dict):
-                # Prose, not a disabled block: there is no block underneath to
-                # re-enable, and uncommenting it would only produce invalid
-                # YAML. Treated as an editable note so an author can type a
-                # real block over it.
-                note_doc: Dict[str, Any] = {"_raw": segment_text}
-                blocks.append(
-                    {
-                        "id": _stable_block_id(i, note_doc),
-                        "index": i,
-                        "line_start": line_start,
-                        "line_end": line_end,
-                        "type": BLOCK_TYPE_OTHER,
-                        "title": _first_line_title(uncommented) or "Note",
-                        "variable": None,
-                        "tags": [BLOCK_TYPE_OTHER, "note"],
-                        "yaml": segment_text,
-                        "data": note_doc,
-                    }
-                )
-                continue
-            doc = dict(parsed_commented)
-            underlying_type = _detect_block_type(doc)
-            doc["_commented"] = True
-            doc["_commented_type"] = underlying_type
-            doc["_commented_yaml"] = segment_text
-            block_type = BLOCK_TYPE_COMMENTED
-            block_id = _stable_block_id(i, doc)
-            tags = [BLOCK_TYPE_COMMENTED]
-            for tag in _extract_tags(doc, underlying_type):
-                if tag not in tags:
-                    tags.append(tag)
-            commented_entry: Dict[str, Any] = {
-                "id": block_id,
-                "index": i,
-                "line_start": line_start,
-                "line_end": line_end,
-                "type": block_type,
-                "title": _extract_title(doc, underlying_type),
-                "variable": _extract_variable(doc, underlying_type),
-                "tags": tags,
-                "yaml": segment_text,
-                "data": doc,
-            }
-            blocks.append(commented_entry)
-            continue
-
-        try:
-            doc = yaml.safe_load(segment_text_raw)
-        except yaml.YAMLError:
-            blocks.append(
-                {
-                    "id": _stable_block_id(i, {"_raw": segment_text}),
-                    "index": i,
-                    "line_start": line_start,
-                    "line_end": line_end,
-                    "type": BLOCK_TYPE_OTHER,
-                    "title": "Unparseable block",
-                    "variable": None,
-                    "tags": [BLOCK_TYPE_OTHER],
-                    "yaml": segment_text,
-                    "data": {"_unparseable": True, "_raw": segment_text},
-                }
-            )
-            continue
-
-        if doc is None:
-            continue
-
-        if not isinstance(doc, dict):
-            doc = {"_raw": str(doc)}
-
-        block_type = _detect_block_type(doc)
-        block_id = _stable_block_id(i, doc)
-        editor_objects = (
-            _build_editor_objects(doc.get("objects")) if "objects" in doc else []
+        parsed = cached_parse(
+            ("interview_document", source_revision(body)),
+            body,
+            lambda: _parse_interview_document(body),
         )
-        # The source shown in a block's YAML tab must be the source the user
-        # wrote.  Canonicalizing it here silently discarded comments, anchors,
-        # quoting and scalar styles before the user had made any edit.
-        block_yaml = segment_text_raw.strip("\r\n")
-
+        if parsed is None:
+            continue
         block_entry: Dict[str, Any] = {
-            "id": block_id,
+            "id": parsed["explicit_id"] or f"block-{i}-{parsed['id_digest']}",
             "index": i,
-            "line_start": line_start,
-            "line_end": line_end,
-            "type": block_type,
-            "title": _extract_title(doc, block_type),
-            "variable": _extract_variable(doc, block_type),
-            "tags": _extract_tags(doc, block_type),
-            "yaml": block_yaml,
-            "data": doc,
+            "line_start": start_line,
+            "line_end": start_line + len(body.splitlines()) - 1,
         }
-        if editor_objects:
-            block_entry["editor_objects"] = editor_objects
-
+        block_entry.update(parsed["entry"])
         blocks.append(block_entry)
 
-        if block_type == BLOCK_TYPE_METADATA:
+        role = parsed["role"]
+        if role == BLOCK_TYPE_METADATA:
             metadata_indices.append(i)
-        elif block_type == BLOCK_TYPE_INCLUDES:
+        elif role == BLOCK_TYPE_INCLUDES:
             include_indices.append(i)
-        elif block_type == BLOCK_TYPE_DEFAULT_SCREEN_PARTS:
+        elif role == BLOCK_TYPE_DEFAULT_SCREEN_PARTS:
             default_sp_indices.append(i)
-        elif block_type == BLOCK_TYPE_CODE and doc.get("mandatory"):
+        elif role == "order":
             order_indices.append(i)
-        elif block_type == BLOCK_TYPE_CODE:
-            block_id_str = str(doc.get("id", ""))
-            if block_id_str.startswith("interview_order") or block_id_str.startswith(
-                "interview order"
-            ):
-                order_indices.append(i)
 
     return {
         "blocks": blocks,
@@ -880,6 +772,130 @@ def parse_interview_yaml(raw_yaml: str) -> Dict[str, Any]:
     }
 
 
+def _parse_interview_document(segment_text_raw: str) -> Optional[Dict[str, Any]]:
+    """Parse one YAML document into the parts of its block that do not depend
+    on where the document sits in the file.
+
+    Returns None for a document that is not a block. Otherwise a dict with the
+    block entry's ``entry`` fields, the ``explicit_id`` and ``id_digest`` its id
+    is made from, and the ``role`` the model indexes it under, if any.
+    """
+    segment_text = segment_text_raw.strip()
+    if is_comment_only_yaml(segment_text_raw):
+        uncommented = _uncomment_yaml_block(segment_text)
+        try:
+            parsed_commented = yaml.safe_load(uncommented)
+        except yaml.YAMLError:
+            parsed_commented = None
+        if not isinstance(parsed_commented, dict):
+            # Prose, not a disabled block: there is no block underneath to
+            # re-enable, and uncommenting it would only produce invalid
+            # YAML. Treated as an editable note so an author can type a
+            # real block over it.
+            note_doc: Dict[str, Any] = {"_raw": segment_text}
+            return _parsed_document(
+                note_doc,
+                {
+                    "type": BLOCK_TYPE_OTHER,
+                    "title": _first_line_title(uncommented) or "Note",
+                    "variable": None,
+                    "tags": [BLOCK_TYPE_OTHER, "note"],
+                    "yaml": segment_text,
+                    "data": note_doc,
+                },
+            )
+        doc = dict(parsed_commented)
+        underlying_type = _detect_block_type(doc)
+        doc["_commented"] = True
+        doc["_commented_type"] = underlying_type
+        doc["_commented_yaml"] = segment_text
+        tags = [BLOCK_TYPE_COMMENTED]
+        for tag in _extract_tags(doc, underlying_type):
+            if tag not in tags:
+                tags.append(tag)
+        return _parsed_document(
+            doc,
+            {
+                "type": BLOCK_TYPE_COMMENTED,
+                "title": _extract_title(doc, underlying_type),
+                "variable": _extract_variable(doc, underlying_type),
+                "tags": tags,
+                "yaml": segment_text,
+                "data": doc,
+            },
+        )
+
+    try:
+        doc = yaml.safe_load(segment_text_raw)
+    except yaml.YAMLError:
+        return _parsed_document(
+            {"_raw": segment_text},
+            {
+                "type": BLOCK_TYPE_OTHER,
+                "title": "Unparseable block",
+                "variable": None,
+                "tags": [BLOCK_TYPE_OTHER],
+                "yaml": segment_text,
+                "data": {"_unparseable": True, "_raw": segment_text},
+            },
+        )
+
+    if doc is None:
+        return None
+
+    if not isinstance(doc, dict):
+        doc = {"_raw": str(doc)}
+
+    block_type = _detect_block_type(doc)
+    editor_objects = (
+        _build_editor_objects(doc.get("objects")) if "objects" in doc else []
+    )
+    # The source shown in a block's YAML tab must be the source the user
+    # wrote.  Canonicalizing it here silently discarded comments, anchors,
+    # quoting and scalar styles before the user had made any edit.
+    block_yaml = segment_text_raw.strip("\r\n")
+
+    entry: Dict[str, Any] = {
+        "type": block_type,
+        "title": _extract_title(doc, block_type),
+        "variable": _extract_variable(doc, block_type),
+        "tags": _extract_tags(doc, block_type),
+        "yaml": block_yaml,
+        "data": doc,
+    }
+    if editor_objects:
+        entry["editor_objects"] = editor_objects
+
+    role: Optional[str] = None
+    if block_type in (
+        BLOCK_TYPE_METADATA,
+        BLOCK_TYPE_INCLUDES,
+        BLOCK_TYPE_DEFAULT_SCREEN_PARTS,
+    ):
+        role = block_type
+    elif block_type == BLOCK_TYPE_CODE and doc.get("mandatory"):
+        role = "order"
+    elif block_type == BLOCK_TYPE_CODE:
+        block_id_str = str(doc.get("id", ""))
+        if block_id_str.startswith("interview_order") or block_id_str.startswith(
+            "interview order"
+        ):
+            role = "order"
+    return _parsed_document(doc, entry, role)
+
+
+def _parsed_document(
+    id_source: Dict[str, Any], entry: Dict[str, Any], role: Optional[str] = None
+) -> Dict[str, Any]:
+    explicit_id = id_source.get("id")
+    return {
+        "explicit_id": str(explicit_id) if explicit_id else None,
+        "id_digest": None if explicit_id else _block_content_digest(id_source),
+        "entry": entry,
+        "role": role,
+    }
+
+
 def source_revision(raw_yaml: str) -> str:
     """Return the content revision used for optimistic source updates."""
     return hashlib.sha256(raw_yaml.encode("utf-8")).hexdigest()
@@ -1817,6 +1833,7 @@ def playground_write_yaml(
     with _playground_user_context(user_id):
         pg = create_playground(project=project)
         pg.write_file(filename, content)
+    note_saved_file(user_id, project, filename, content)
 
 
 def _al_individual_primitive_groups(model: Dict[str, Any]) -> Dict[str, List[str]]:
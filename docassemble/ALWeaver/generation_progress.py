@@ -0,0 +1,143 @@
+# do not pre-load
+
+"""Report how far a generation has got, one stage at a time.
+
+A generation passes through a fixed series of stages: the upload, reading the
+template's fields, grouping them onto screens, the AI-assist requests,
+rendering the YAML, the lint repair and packaging. Code that runs a stage
+calls :func:`report_stage` as it starts one, with whatever ``progress``
+callback it was given, so a caller that does not care passes None.
+
+An async job records each report in a Redis list through
+:class:`RedisProgressRecorder`, and the job endpoint turns the list back into
+per-stage durations with :func:`stage_durations`. The AI-assist requests run
+side by side, so they are reported after the fact with their own ``seconds``,
+as parts of the ``llm_assist`` stage rather than stages of their own.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+__all__ = [
+    "GENERATION_STAGES",
+    "ProgressCallback",
+    "RedisProgressRecorder",
+    "load_progress_events",
+    "report_stage",
+    "stage_durations",
+]
+
+#: The stages of a generation, in the order they run. ``queued`` is the wait
+#: for a worker, and ``finished`` and ``failed`` close the record.
+GENERATION_STAGES = (
+    "upload",
+    "queued",
+    "field_extraction",
+    "grouping",
+    "llm_assist",
+    "rendering",
+    "lint_repair",
+    "packaging",
+    "finished",
+    "failed",
+)
+
+#: Called with a stage's name and any details as the stage starts.
+ProgressCallback = Callable[[str, Mapping[str, Any]], None]
+
+
+def report_stage(
+    progress: Optional[ProgressCallback], stage: str, **detail: Any
+) -> None:
+    """Tell ``progress`` that ``stage`` has started.
+
+    Reporting is best effort: a callback that fails is ignored rather than
+    failing the generation it describes.
+    """
+    if progress is None:
+        return
+    try:
+        progress(stage, detail)
+    except Exception:
+        pass
+
+
+class RedisProgressRecorder:
+    """Append each reported stage to a Redis list, with the time it started."""
+
+    def __init__(self, redis_client: Any, key: str, expire_seconds: int):
+        self.redis = redis_client
+        self.key = key
+        self.expire_seconds = expire_seconds
+
+    def __call__(self, stage: str, detail: Mapping[str, Any]) -> None:
+        event = {"stage": stage, "at": time.time()}
+        event.update(detail)
+        self.redis.rpush(self.key, json.dumps(event, default=str))
+        self.redis.expire(self.key, self.expire_seconds)
+
+
+def load_progress_events(redis_client: Any, key: str) -> List[Dict[str, Any]]:
+    """The events recorded under ``key``, oldest first.
+
+    The web server and the worker both record events, so they are sorted by
+    time rather than trusted to have arrived in order.
+    """
+    events: List[Dict[str, Any]] = []
+    for raw in redis_client.lrange(key, 0, -1) or []:
+        try:
+            event = json.loads(raw.decode() if isinstance(raw, bytes) else raw)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(event, dict) and isinstance(event.get("at"), (int, float)):
+            events.append(event)
+    events.sort(key=lambda event: event["at"])
+    return events
+
+
+def stage_durations(
+    events: Sequence[Mapping[str, Any]], now: Optional[float] = None
+) -> Dict[str, Any]:
+    """Per-stage durations from recorded events.
+
+    A stage lasts until the next one starts; the stage still running at
+    ``now`` is marked ``running``. Events that carry their own ``seconds``
+    are parts of the stage they ran in and are listed under it.
+
+    Returns:
+        Dict[str, Any]: ``stage`` (the latest), ``stages`` (each with
+        ``started_at``, ``seconds`` and any parts) and ``total_seconds``.
+    """
+    now = time.time() if now is None else now
+    stages: List[Dict[str, Any]] = []
+    for event in events:
+        if "seconds" in event:
+            part = {key: value for key, value in event.items() if key != "at"}
+            part["started_at"] = event["at"]
+            if stages:
+                stages[-1].setdefault("parts", []).append(part)
+            continue
+        if stages:
+            stages[-1]["seconds"] = max(0.0, event["at"] - stages[-1]["started_at"])
+            stages[-1].pop("running", None)
+        stage = {key: value for key, value in event.items() if key != "at"}
+        stage["started_at"] = event["at"]
+        if event["stage"] not in {"finished", "failed"}:
+            stage["seconds"] = max(0.0, now - event["at"])
+            stage["running"] = True
+        stages.append(stage)
+    if not stages:
+        return {"stage": None, "stages": [], "total_seconds": 0.0}
+    ended = (
+        stages[-1]["started_at"]
+        if stages[-1]["stage"] in {"finished", "failed"}
+        else now
+    )
+    return {
+        "stage": stages[-1]["stage"],
+        "stages": stages,
+        "total_seconds": max(0.0, ended - stages[0]["started_at"]),
+    }
@@ -0,0 +1,196 @@
+# do not pre-load
+
+"""Time the stages of a generation, and profile one when asked to.
+
+A generation opens a :class:`GenerationTimer` with :func:`collecting_timings`,
+and the code it runs marks its stages with :func:`timed_stage`, either around
+a block or as a decorator. The timer is found through a context variable, so a
+method deep in the generator can be timed without a parameter being threaded
+down to it, and outside a generation :func:`timed_stage` does nothing.
+
+Each stage records its wall time and the CPU time of the thread that ran it.
+Work handed to other threads or processes -- the AI-assist requests, templates
+read side by side -- shows up in the wall time of the stage that waited for it
+but not in its CPU time, which is the point: a stage with much more wall than
+CPU time is waiting, not computing.
+
+:class:`GenerationProfiler` wraps a generation in cProfile, or in pyinstrument
+when that is installed and asked for, and writes the profile to a file.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+__all__ = [
+    "DEFAULT_PROFILE_DIRECTORY",
+    "PROFILERS",
+    "GenerationProfiler",
+    "GenerationTimer",
+    "StageTiming",
+    "collecting_timings",
+    "timed_stage",
+]
+
+#: The profilers :class:`GenerationProfiler` knows, and the file extension of
+#: the profile each writes.
+PROFILERS = {"cprofile": ".prof", "pyinstrument": ".html"}
+
+#: Where profiles are written unless the configuration says otherwise.
+DEFAULT_PROFILE_DIRECTORY = os.path.join(tempfile.gettempdir(), "alweaver-profiles")
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """How long one stage took.
+
+    Attributes:
+        name (str): the stage's name.
+        depth (int): how many stages it ran inside; 0 for the outermost.
+        started (float): seconds after the timer started that this did.
+        wall_seconds (float): elapsed time.
+        cpu_seconds (float): CPU time of the thread that ran the stage.
+    """
+
+    name: str
+    depth: int
+    started: float
+    wall_seconds: float
+    cpu_seconds: float
+
+
+class GenerationTimer:
+    """Collects the :class:`StageTiming` of each stage, in the order they started."""
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self._timings: List[Optional[StageTiming]] = []
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the block as a stage called ``name``, even if it raises."""
+        # Reserve the stage's place so it is listed before the stages inside it
+        index = len(self._timings)
+        self._timings.append(None)
+        depth = self._depth
+        self._depth += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self._depth = depth
+            self._timings[index] = StageTiming(
+                name=name,
+                depth=depth,
+                started=wall_start - self.started_at,
+                wall_seconds=time.perf_counter() - wall_start,
+                cpu_seconds=time.thread_time() - cpu_start,
+            )
+
+    @property
+    def timings(self) -> List[StageTiming]:
+        """The stages that have finished, in the order they started."""
+        return [timing for timing in self._timings if timing is not None]
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """The finished stages as plain dicts, for a JSON response."""
+        return [asdict(timing) for timing in self.timings]
+
+
+_current_timer: contextvars.ContextVar[Optional[GenerationTimer]] = (
+    contextvars.ContextVar("alweaver_generation_timer", default=None)
+)
+
+
+@contextmanager
+def collecting_timings(timer: GenerationTimer) -> Iterator[GenerationTimer]:
+    """Send the stages timed inside the block to ``timer``."""
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """Time the block, or the decorated function, as a stage called ``name``.
+
+    Does nothing unless a :func:`collecting_timings` block is open.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.span(name):
+        yield
+
+
+class GenerationProfiler:
+    """Profile the block and write the profile into ``directory``.
+
+    ``kind`` is a key of :data:`PROFILERS`; pyinstrument is optional, and
+    cProfile is used in its place when it is not installed. After the block,
+    ``path`` is where the profile was written, or None if writing it failed.
+    """
+
+    def __init__(self, kind: str, directory: str, label: str = "generation"):
+        if kind not in PROFILERS:
+            raise ValueError(f"Unknown profiler {kind!r}")
+        self.kind = kind
+        self.directory = directory
+        self.label = label
+        self.path: Optional[str] = None
+        self._profiler: Any = None
+
+    def __enter__(self) -> "GenerationProfiler":
+        if self.kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                self.kind = "cprofile"
+            else:
+                self._profiler = Profiler()
+                self._profiler.start()
+                return self
+        self._profiler = cProfile.Profile()
+        try:
+            self._profiler.enable()
+        except ValueError:
+            # Another profiler is already running on this thread
+            self._profiler = None
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._profiler is None:
+            return
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+        filename = (
+            f"{self.label}-{time.strftime('%Y%m%d-%H%M%S')}-"
+            f"{uuid.uuid4().hex[:8]}{PROFILERS[self.kind]}"
+        )
+        path = os.path.join(self.directory, filename)
+        # A profile that cannot be written must not fail the generation
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.kind == "pyinstrument":
+                with open(path, "w", encoding="utf-8") as handle:
+                    handle.write(self._profiler.output_html())
+            else:
+                self._profiler.dump_stats(path)
+        except Exception:
+            return
+        self.path = path
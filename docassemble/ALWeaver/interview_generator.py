@@ -1,9 +1,34 @@
 from .custom_values import get_matching_deps, get_output_mako_package_and_path
+from .document_analysis import (
+    DocumentAnalysis,
+    adopt_document_analysis,
+    analyze_document,
+)
+from .generation_progress import ProgressCallback, report_stage
+from .generation_timing import (
+    DEFAULT_PROFILE_DIRECTORY,
+    GenerationProfiler,
+    GenerationTimer,
+    PROFILERS,
+    collecting_timings,
+    timed_stage,
+)
 from .generator_constants import generator_constants
+from .lazy_imports import lazy_module
+from .llm_assist import (
+    DEFAULT_LLM_ASSIST_TIMEOUT,
+    DEFAULT_LLM_ASSIST_WORKERS,
+    LLMAssistStep,
+    LLMAssistTiming,
+    run_llm_assist_steps,
+)
+from .llm_response_cache import cached_llms, llm_response_cache_stats
 from .question_library import baseline_question_specs
 from .review_screen import build_review_entries, table_edit_attributes
 from .validate_template_files import matching_reserved_names, has_fields
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from dataclasses import field
 from docassemble.base.util import (
     bold,
@@ -26,16 +51,12 @@ from docassemble.base.util import (
     user_info,
     user_logged_in,
 )
-from docx2python import docx2python
 from enum import Enum
-from functools import lru_cache
-from itertools import zip_longest, chain
-from pdfminer.high_level import extract_text
-from pdfminer.pdfparser import PDFSyntaxError
-from pdfminer.psparser import PSEOF
-from pikepdf import Pdf
+from functools import lru_cache, wraps
+from itertools import chain
 from typing import (
     Any,
+    Callable,
     Container,
     Dict,
     List,
@@ -59,7 +80,7 @@ import datetime
 import docassemble.base.functions
 import docassemble.base.parse
 import docassemble.base.pdftk
-import formfyxer
+import hashlib
 import importlib
 import json
 import html
@@ -71,17 +92,23 @@ import os
 import re
 import shutil
 import tempfile
+import threading
+import time
 import uuid
 import zipfile
 import ipaddress
 import socket
 from dataclasses import dataclass
-import pycountry
 import yaml
 from urllib.request import Request, urlopen
 
 mako.runtime.UNDEFINED = DAEmpty()
 
+# formfyxer takes seconds to import and most processes that import this module
+# never call it, so it and pycountry are only imported when first used
+formfyxer = lazy_module("formfyxer")
+pycountry = lazy_module("pycountry")
+
 
 TypeType = type(type(None))
 _PROMPTS_CACHE: Optional[Dict[str, Any]] = None
@@ -112,6 +139,11 @@ class WeaverGenerationResult:
     #: names, so a caller that keeps the templates has to keep *these* files,
     #: not the originals it handed in.
     normalized_template_paths: Dict[str, str] = field(default_factory=dict)
+    #: How long each stage of the generation took, outermost first; see
+    #: :class:`.generation_timing.StageTiming` for the keys.
+    timings: List[Dict[str, Any]] = field(default_factory=list)
+    #: Where this generation's profile was written, when one was asked for.
+    profile_path: Optional[str] = None
 
 
 @dataclass
@@ -645,15 +677,22 @@ def logic_to_code_block(items: List[Union[Dict, str]], indent_level=0) -> str:
     return "\n".join(code_lines)
 
 
-def _load_llms_module():
-    """Load ALToolbox llms lazily so Weaver still works without it."""
+def _load_llms_module(bypass_cache: bool = False):
+    """Load ALToolbox llms lazily so Weaver still works without it.
+
+    The module comes wrapped in the LLM response cache; ``bypass_cache`` asks
+    the model again instead of using a remembered answer.
+    """
     try:
         from docassemble.ALToolbox import llms
-
-        return llms
     except Exception as exc:
         log(f"Unable to load docassemble.ALToolbox.llms: {exc!r}")
         return None
+    return cached_llms(llms, bypass=bypass_cache)
+
+
+def _bypasses_llm_cache(interview: Any) -> bool:
+    return bool(getattr(interview, "bypass_llm_cache", False))
 
 
 def _safe_short_label(label: str, max_length: int = 45) -> str:
@@ -1765,6 +1804,7 @@ class DAFieldList(DAList):
 
         return sorted(collections, key=sort_key)
 
+    @timed_stage("add_fields_from_file")
     def add_fields_from_file(self, document: Union[DAFile, DAFileList]) -> None:
         """
         Given a DAFile or DAFileList, process the raw fields in each file and
@@ -1787,43 +1827,31 @@ class DAFieldList(DAList):
 
         boolean_fields: Set[str] = set()
         type_hints: Dict[str, str] = {}
+        # One analysis per template content: the fields, the pikepdf flags and
+        # the text are each read once, however often later steps ask for them
+        analysis = analyze_document(document.path(), filename=document.filename)
         if document_type == "docx":
             # Read the template once so the variables and the "used as a
             # condition" hints come from the same pass over the text
-            docx_text = docx2python(document.path()).text
+            docx_text = analysis.text()
             all_fields: Iterable = get_docx_variables(docx_text)
             boolean_fields = get_docx_boolean_variables(docx_text)
             type_hints = get_docx_function_type_hints(docx_text)
         else:
-            all_fields = get_fields(document)
+            all_fields = analysis.pdf_fields()
 
         if document_type == "pdf":
-            # Use pikepdf to get more info about each field
-            pike_fields: Dict = {}
-            pike_obj = Pdf.open(document.path())
-            if (
-                hasattr(pike_obj.Root, "AcroForm")
-                and pike_obj.Root.AcroForm.Fields
-                and isinstance(pike_obj.Root.AcroForm.Fields, Iterable)
-            ):
-                for pike_info in pike_obj.Root.AcroForm.Fields:
-                    pike_fields[str(pike_info.T)] = pike_info
-            pike_obj.close()
-            for pdf_field_tuple, pike_info in zip_longest(all_fields, pike_fields):
+            # pikepdf sees flags and types that the field tuples leave out
+            pike_fields = analysis.pdf_field_info()
+            for pdf_field_tuple in all_fields:
                 pdf_field_name = pdf_field_tuple[0]
-                if pdf_field_name in pike_fields:
-                    pike_info = pike_fields[pdf_field_name]
-                    # PDF fields have bit flags that set specific options. The 17th bit (or hex
-                    # 10000) on Buttons says it's a "push button", that "does not retain a
-                    # permanent value" (e.g. a "Print this PDF" button.) They generally aren't
-                    # really fields, and don't play well with PDF editing tools. Just skip them.
-                    if (
-                        hasattr(pike_info, "FT")
-                        and hasattr(pike_info, "Ff")
-                        and pike_info.FT == "/Btn"
-                        and bool(pike_info.Ff & 0x10000)
-                    ):
-                        continue
+                pike_info = pike_fields.get(pdf_field_name)
+                # PDF fields have bit flags that set specific options. The 17th bit (or hex
+                # 10000) on Buttons says it's a "push button", that "does not retain a
+                # permanent value" (e.g. a "Print this PDF" button.) They generally aren't
+                # really fields, and don't play well with PDF editing tools. Just skip them.
+                if pike_info is not None and pike_info.is_push_button:
+                    continue
 
                 new_field: DAField = self.appendObject()
                 new_field.source_document_type = "pdf"
@@ -1844,11 +1872,7 @@ class DAFieldList(DAList):
                 # Some PDFs declare the field type on a parent field, so a
                 # drop-down can reach us looking like plain text. pikepdf sees
                 # the type the PDF actually recorded.
-                if (
-                    pdf_field_name in pike_fields
-                    and hasattr(pike_fields[pdf_field_name], "FT")
-                    and str(pike_fields[pdf_field_name].FT) == "/Ch"
-                ):
+                if pike_info is not None and pike_info.field_type == "/Ch":
                     new_field.pdf_field_type = "/Ch"
                     new_field.mark_type_not_handled()
                 if new_field.group == DAFieldGroup.BUILT_IN:
@@ -2808,6 +2832,7 @@ class DAInterview(DAObject):
         else:
             self.auto_group_fields()
 
+    @timed_stage("auto_assign_attributes")
     def auto_assign_attributes(
         self,
         url: Optional[str] = None,
@@ -2906,10 +2931,10 @@ class DAInterview(DAObject):
             for template in self.uploaded_templates:
                 extracted = ""
                 try:
-                    if template.filename.lower().endswith(".pdf"):
-                        extracted = extract_text(template.path())
-                    elif template.filename.lower().endswith(".docx"):
-                        extracted = docx2python(template.path()).text
+                    if template.filename.lower().endswith((".pdf", ".docx")):
+                        extracted = analyze_document(
+                            template.path(), filename=template.filename
+                        ).text()
                 except Exception as exc:
                     log(
                         f"Failed to extract text from {template.filename}: {exc!r}",
@@ -2966,17 +2991,33 @@ class DAInterview(DAObject):
             self.help_page_text = _extract_help_page_text(str(self.help_page_url))
 
     def llm_prefill_metadata(self, apply: bool = True) -> bool:
-        llms = _load_llms_module()
+        draft = self._llm_draft_metadata()
+        if draft is None:
+            return False
+        try:
+            self._apply_llm_metadata(draft, apply=apply)
+        except Exception as exc:
+            log(f"LLM metadata prefill failed: {exc!r}")
+            return False
+        log("LLM metadata prefill completed successfully", "info")
+        return True
+
+    def _llm_draft_metadata(self) -> Optional[Dict[str, Any]]:
+        """Ask the model for the interview's metadata, without changing anything.
+
+        Returns None when the model could not be asked or the request failed.
+        """
+        llms = _load_llms_module(bypass_cache=_bypasses_llm_cache(self))
         if not llms:
             log("LLM prefill_metadata skipped: llms module not available", "warning")
-            return False
+            return None
         context_text = self._llm_context_text()
         if not context_text:
             log(
                 "LLM prefill_metadata skipped: no document context text extracted",
                 "warning",
             )
-            return False
+            return None
 
         log(
             f"LLM prefill_metadata starting with {len(context_text)} chars of context",
@@ -3050,6 +3091,7 @@ Predicted role: {{ROLE}}
                 json_mode=True,
                 model=self._llm_default_model(),
             )
+            fields: Optional[Dict[str, str]] = None
             if isinstance(drafted, dict):
                 drafted_title = _safe_short_label(str(drafted.get("title", "")), 100)
                 intro_prompt = _safe_short_label(
@@ -3107,136 +3149,191 @@ Predicted role: {{ROLE}}
                     drafted_when_finished = drafted_next_steps_what_happens_next
                 elif drafted_when_finished and drafted_next_steps_what_happens_next:
                     drafted_next_steps_what_happens_next = drafted_when_finished
-                if apply:
-                    if drafted_title:
-                        self.title = drafted_title
-                        self.short_title = drafted_title[:25]
-                        self.short_filename_with_spaces = drafted_title
-                        self.short_filename = space_to_underscore(
-                            varname(drafted_title)
-                        )
-                    if intro_prompt:
-                        self.intro_prompt = intro_prompt
-                    if drafted_description:
-                        self.description = drafted_description
-                    if drafted_can_use:
-                        self.can_I_use_this_form = drafted_can_use
-                    if drafted_getting_started:
-                        self.getting_started = drafted_getting_started
-                    if drafted_when_finished:
-                        self.when_you_are_finished = drafted_when_finished
-                    if drafted_landing_page_url:
-                        self.landing_page_url = drafted_landing_page_url
-                    if drafted_next_steps_document_title:
-                        self.next_steps_document_title = (
-                            drafted_next_steps_document_title
-                        )
-                    if drafted_next_steps_document_concept:
-                        self.next_steps_document_concept = (
-                            drafted_next_steps_document_concept
-                        )
-                    if drafted_next_steps_help_organization:
-                        self.next_steps_help_organization = (
-                            drafted_next_steps_help_organization
-                        )
-                    if drafted_next_steps_help_url:
-                        self.next_steps_help_url = drafted_next_steps_help_url
-                    if not hasattr(self, "custom_next_steps_instructions"):
-                        self.custom_next_steps_instructions = {}
-                    if drafted_next_steps_what_happens_next:
-                        self.custom_next_steps_instructions["what_happens_next"] = (
-                            drafted_next_steps_what_happens_next
-                        )
-                    if drafted_next_steps_what_can_decision_maker_do:
-                        self.custom_next_steps_instructions[
-                            "what_can_decision_maker_do"
-                        ] = drafted_next_steps_what_can_decision_maker_do
-                    if drafted_next_steps_what_happens_if_i_win:
-                        self.custom_next_steps_instructions["what_happens_if_i_win"] = (
-                            drafted_next_steps_what_happens_if_i_win
-                        )
-                else:
-                    if drafted_title:
-                        self.llm_draft_title = drafted_title
-                    if intro_prompt:
-                        self.llm_draft_intro_prompt = intro_prompt
-                    if drafted_description:
-                        self.llm_draft_description = drafted_description
-                    if drafted_can_use:
-                        self.llm_draft_can_i_use_this_form = drafted_can_use
-                    if drafted_getting_started:
-                        self.llm_draft_getting_started = drafted_getting_started
-                    if drafted_when_finished:
-                        self.llm_draft_when_you_are_finished = drafted_when_finished
-                    if drafted_landing_page_url:
-                        self.llm_draft_landing_page_url = drafted_landing_page_url
-                    if drafted_next_steps_document_title:
-                        self.llm_draft_next_steps_document_title = (
-                            drafted_next_steps_document_title
-                        )
-                    if drafted_next_steps_document_concept:
-                        self.llm_draft_next_steps_document_concept = (
-                            drafted_next_steps_document_concept
-                        )
-                    if drafted_next_steps_help_organization:
-                        self.llm_draft_next_steps_help_organization = (
-                            drafted_next_steps_help_organization
-                        )
-                    if drafted_next_steps_help_url:
-                        self.llm_draft_next_steps_help_url = drafted_next_steps_help_url
-                    if drafted_next_steps_what_happens_next:
-                        self.llm_draft_next_steps_what_happens_next = (
-                            drafted_next_steps_what_happens_next
-                        )
-                    if drafted_next_steps_what_can_decision_maker_do:
-                        self.llm_draft_next_steps_what_can_decision_maker_do = (
-                            drafted_next_steps_what_can_decision_maker_do
-                        )
-                    if drafted_next_steps_what_happens_if_i_win:
-                        self.llm_draft_next_steps_what_happens_if_i_win = (
-                            drafted_next_steps_what_happens_if_i_win
-                        )
-
-            if form_type in {
-                "starts_case",
-                "existing_case",
-                "appeal",
-                "letter",
-                "other_form",
-                "other",
-            }:
-                if apply:
-                    self.form_type = form_type
-                    self.court_related = self.form_type in {
-                        "starts_case",
-                        "existing_case",
-                        "appeal",
-                    }
-                else:
-                    self.llm_draft_form_type = form_type
-                    self.llm_draft_court_related = form_type in {
-                        "starts_case",
-                        "existing_case",
-                        "appeal",
-                    }
-            if role in {"plaintiff", "defendant", "unknown"}:
-                if apply:
-                    self.typical_role = role
-                else:
-                    self.llm_draft_typical_role = role
-            log("LLM metadata prefill completed successfully", "info")
-            return True
+                fields = {
+                    "title": drafted_title,
+                    "intro_prompt": intro_prompt,
+                    "description": drafted_description,
+                    "can_I_use_this_form": drafted_can_use,
+                    "getting_started": drafted_getting_started,
+                    "when_you_are_finished": drafted_when_finished,
+                    "landing_page_url": drafted_landing_page_url,
+                    "next_steps_document_title": drafted_next_steps_document_title,
+                    "next_steps_document_concept": drafted_next_steps_document_concept,
+                    "next_steps_help_organization": drafted_next_steps_help_organization,
+                    "next_steps_help_url": drafted_next_steps_help_url,
+                    "next_steps_what_happens_next": drafted_next_steps_what_happens_next,
+                    "next_steps_what_can_decision_maker_do": drafted_next_steps_what_can_decision_maker_do,
+                    "next_steps_what_happens_if_i_win": drafted_next_steps_what_happens_if_i_win,
+                }
+            return {"form_type": form_type, "role": role, "fields": fields}
         except Exception as exc:
             log(f"LLM metadata prefill failed: {exc!r}")
-            return False
+            return None
+
+    def _apply_llm_metadata(self, draft: Mapping[str, Any], apply: bool = True) -> None:
+        """Write what :meth:`_llm_draft_metadata` drafted onto the interview.
+
+        With ``apply=False`` it goes into the ``llm_draft_*`` attributes instead.
+        """
+        form_type = draft.get("form_type")
+        role = draft.get("role")
+        fields = draft.get("fields")
+        if isinstance(fields, Mapping):
+            drafted_title = str(fields.get("title") or "")
+            intro_prompt = str(fields.get("intro_prompt") or "")
+            drafted_description = str(fields.get("description") or "")
+            drafted_can_use = str(fields.get("can_I_use_this_form") or "")
+            drafted_getting_started = str(fields.get("getting_started") or "")
+            drafted_when_finished = str(fields.get("when_you_are_finished") or "")
+            drafted_landing_page_url = str(fields.get("landing_page_url") or "")
+            drafted_next_steps_document_title = str(
+                fields.get("next_steps_document_title") or ""
+            )
+            drafted_next_steps_document_concept = str(
+                fields.get("next_steps_document_concept") or ""
+            )
+            drafted_next_steps_help_organization = str(
+                fields.get("next_steps_help_organization") or ""
+            )
+            drafted_next_steps_help_url = str(fields.get("next_steps_help_url") or "")
+            drafted_next_steps_what_happens_next = str(
+                fields.get("next_steps_what_happens_next") or ""
+            )
+            drafted_next_steps_what_can_decision_maker_do = str(
+                fields.get("next_steps_what_can_decision_maker_do") or ""
+            )
+            drafted_next_steps_what_happens_if_i_win = str(
+                fields.get("next_steps_what_happens_if_i_win") or ""
+            )
+            if apply:
+                if drafted_title:
+                    self.title = drafted_title
+                    self.short_title = drafted_title[:25]
+                    self.short_filename_with_spaces = drafted_title
+                    self.short_filename = space_to_underscore(varname(drafted_title))
+                if intro_prompt:
+                    self.intro_prompt = intro_prompt
+                if drafted_description:
+                    self.description = drafted_description
+                if drafted_can_use:
+                    self.can_I_use_this_form = drafted_can_use
+                if drafted_getting_started:
+                    self.getting_started = drafted_getting_started
+                if drafted_when_finished:
+                    self.when_you_are_finished = drafted_when_finished
+                if drafted_landing_page_url:
+                    self.landing_page_url = drafted_landing_page_url
+                if drafted_next_steps_document_title:
+                    self.next_steps_document_title = drafted_next_steps_document_title
+                if drafted_next_steps_document_concept:
+                    self.next_steps_document_concept = (
+                        drafted_next_steps_document_concept
+                    )
+                if drafted_next_steps_help_organization:
+                    self.next_steps_help_organization = (
+                        drafted_next_steps_help_organization
+                    )
+                if drafted_next_steps_help_url:
+                    self.next_steps_help_url = drafted_next_steps_help_url
+                if not hasattr(self, "custom_next_steps_instructions"):
+                    self.custom_next_steps_instructions = {}
+                if drafted_next_steps_what_happens_next:
+                    self.custom_next_steps_instructions["what_happens_next"] = (
+                        drafted_next_steps_what_happens_next
+                    )
+                if drafted_next_steps_what_can_decision_maker_do:
+                    self.custom_next_steps_instructions[
+                        "what_can_decision_maker_do"
+                    ] = drafted_next_steps_what_can_decision_maker_do
+                if drafted_next_steps_what_happens_if_i_win:
+                    self.custom_next_steps_instructions["what_happens_if_i_win"] = (
+                        drafted_next_steps_what_happens_if_i_win
+                    )
+            else:
+                if drafted_title:
+                    self.llm_draft_title = drafted_title
+                if intro_prompt:
+                    self.llm_draft_intro_prompt = intro_prompt
+                if drafted_description:
+                    self.llm_draft_description = drafted_description
+                if drafted_can_use:
+                    self.llm_draft_can_i_use_this_form = drafted_can_use
+                if drafted_getting_started:
+                    self.llm_draft_getting_started = drafted_getting_started
+                if drafted_when_finished:
+                    self.llm_draft_when_you_are_finished = drafted_when_finished
+                if drafted_landing_page_url:
+                    self.llm_draft_landing_page_url = drafted_landing_page_url
+                if drafted_next_steps_document_title:
+                    self.llm_draft_next_steps_document_title = (
+                        drafted_next_steps_document_title
+                    )
+                if drafted_next_steps_document_concept:
+                    self.llm_draft_next_steps_document_concept = (
+                        drafted_next_steps_document_concept
+                    )
+                if drafted_next_steps_help_organization:
+                    self.llm_draft_next_steps_help_organization = (
+                        drafted_next_steps_help_organization
+                    )
+                if drafted_next_steps_help_url:
+                    self.llm_draft_next_steps_help_url = drafted_next_steps_help_url
+                if drafted_next_steps_what_happens_next:
+                    self.llm_draft_next_steps_what_happens_next = (
+                        drafted_next_steps_what_happens_next
+                    )
+                if drafted_next_steps_what_can_decision_maker_do:
+                    self.llm_draft_next_steps_what_can_decision_maker_do = (
+                        drafted_next_steps_what_can_decision_maker_do
+                    )
+                if drafted_next_steps_what_happens_if_i_win:
+                    self.llm_draft_next_steps_what_happens_if_i_win = (
+                        drafted_next_steps_what_happens_if_i_win
+                    )
+
+        if form_type in {
+            "starts_case",
+            "existing_case",
+            "appeal",
+            "letter",
+            "other_form",
+            "other",
+        }:
+            if apply:
+                self.form_type = form_type
+                self.court_related = self.form_type in {
+                    "starts_case",
+                    "existing_case",
+                    "appeal",
+                }
+            else:
+                self.llm_draft_form_type = form_type
+                self.llm_draft_court_related = form_type in {
+                    "starts_case",
+                    "existing_case",
+                    "appeal",
+                }
+        if role in {"plaintiff", "defendant", "unknown"}:
+            if apply:
+                self.typical_role = role
+            else:
+                self.llm_draft_typical_role = role
 
     def llm_predict_state(self, apply: bool = True) -> bool:
-        llms = _load_llms_module()
-        if not llms:
+        predicted_state = self._llm_draft_state()
+        if not predicted_state:
             return False
+        self._apply_llm_state(predicted_state, apply=apply)
+        return True
+
+    def _llm_draft_state(self) -> str:
+        """Ask the model which state the form is from, or "" when it cannot say."""
+        llms = _load_llms_module(bypass_cache=_bypasses_llm_cache(self))
+        if not llms:
+            return ""
         context_text = self._llm_context_text(max_chars=8000)
         if not context_text:
-            return False
+            return ""
 
         try:
             us_subdivisions = pycountry.subdivisions.get(country_code="US") or []
@@ -3246,7 +3343,7 @@ Predicted role: {{ROLE}}
                 if subdivision.code.startswith("US-")
             }
             if not choices:
-                return False
+                return ""
             predicted_state = llms.classify_text(
                 text=f"Title: {self.title}\nJurisdiction: {getattr(self, 'jurisdiction', '')}\n\n{context_text}",
                 choices=choices,
@@ -3255,24 +3352,26 @@ Predicted role: {{ROLE}}
             )
             predicted_state = str(predicted_state or "").strip().upper()
             if predicted_state not in choices:
-                return False
-            if apply:
-                self.default_country_code = "US"
-                self.state = predicted_state
-                self.jurisdiction = "NAM-US-US+" + predicted_state
-            else:
-                self.llm_draft_default_country_code = "US"
-                self.llm_draft_state = predicted_state
-                self.llm_draft_jurisdiction = "NAM-US-US+" + predicted_state
-            return True
+                return ""
+            return predicted_state
         except Exception as exc:
             log(f"LLM state prediction failed: {exc!r}")
-            return False
+            return ""
+
+    def _apply_llm_state(self, predicted_state: str, apply: bool = True) -> None:
+        if apply:
+            self.default_country_code = "US"
+            self.state = predicted_state
+            self.jurisdiction = "NAM-US-US+" + predicted_state
+        else:
+            self.llm_draft_default_country_code = "US"
+            self.llm_draft_state = predicted_state
+            self.llm_draft_jurisdiction = "NAM-US-US+" + predicted_state
 
     def llm_refine_field_labels(
         self, apply: bool = True
     ) -> Union[int, Dict[str, Dict[str, str]]]:
-        llms = _load_llms_module()
+        llms = _load_llms_module(bypass_cache=_bypasses_llm_cache(self))
         if not llms:
             return 0
 
@@ -3347,7 +3446,7 @@ Return JSON object with shape:
             return {} if not apply else 0
 
     def llm_group_fields(self, apply: bool = True) -> Union[bool, List[Screen]]:
-        llms = _load_llms_module()
+        llms = _load_llms_module(bypass_cache=_bypasses_llm_cache(self))
         if not llms:
             return False
 
@@ -3483,20 +3582,24 @@ Rules:
                 return [] if not apply else False
             if not apply:
                 return screen_list
-            if hasattr(self, "questions"):
-                try:
-                    self.questions.clear()
-                except Exception:
-                    self.initializeAttribute("questions", DAQuestionList)
-            else:
-                self.initializeAttribute("questions", DAQuestionList)
-            self.questions.gathered = False
-            self.create_questions_from_screen_list(screen_list)
+            self._apply_llm_screens(screen_list)
             return True
         except Exception as exc:
             log(f"LLM screen grouping failed: {exc!r}")
             return [] if not apply else False
 
+    def _apply_llm_screens(self, screen_list: List[Screen]) -> None:
+        """Replace the interview's screens with the ones the model grouped."""
+        if hasattr(self, "questions"):
+            try:
+                self.questions.clear()
+            except Exception:
+                self.initializeAttribute("questions", DAQuestionList)
+        else:
+            self.initializeAttribute("questions", DAQuestionList)
+        self.questions.gathered = False
+        self.create_questions_from_screen_list(screen_list)
+
     def apply_llm_field_updates(
         self, field_updates: Mapping[str, Mapping[str, str]]
     ) -> int:
@@ -3519,12 +3622,126 @@ Rules:
                 updated += 1
         return updated
 
+    @timed_stage("run_llm_assist")
+    def run_llm_assist(self, include_grouping: bool = True) -> List[LLMAssistTiming]:
+        """Draft the metadata, state, labels and screens with the model, and apply them.
+
+        The requests are sent side by side and applied in a fixed order; see
+        :mod:`.llm_assist`. ``include_grouping=False`` keeps the current screens.
+        """
+        return self._run_llm_assist(apply=True, include_grouping=include_grouping)
+
+    def _run_llm_assist(
+        self,
+        apply: bool,
+        include_grouping: bool = True,
+        drafted: Optional[Dict[str, Any]] = None,
+    ) -> List[LLMAssistTiming]:
+        if drafted is None:
+            drafted = {}
+        # Fill the shared caches here, so the worker threads only read them
+        _load_prompts_config()
+        self._cached_template_context_text()
+
+        def draft_reference_site() -> Optional[str]:
+            if (
+                hasattr(self, "help_page_url")
+                and self.help_page_url
+                and not hasattr(self, "help_page_text")
+            ):
+                return _extract_help_page_text(str(self.help_page_url))
+            return None
+
+        def apply_reference_site(text: Optional[str]) -> None:
+            if text is not None:
+                self.help_page_text = text
+
+        def apply_metadata(draft: Optional[Dict[str, Any]]) -> None:
+            if draft is not None:
+                self._apply_llm_metadata(draft, apply=apply)
+
+        def apply_state(predicted_state: str) -> None:
+            if predicted_state:
+                self._apply_llm_state(predicted_state, apply=apply)
+
+        def apply_field_labels(field_updates: Any) -> None:
+            if not isinstance(field_updates, dict):
+                field_updates = {}
+            drafted["field_updates"] = field_updates
+            # Labels on the grouped screens come from the fields, so these are
+            # applied even to a draft.
+            if field_updates:
+                self.apply_llm_field_updates(field_updates)
+
+        def apply_screens(screen_list: Any) -> None:
+            drafted["screen_list"] = screen_list
+            if apply and isinstance(screen_list, list) and screen_list:
+                self._apply_llm_screens(screen_list)
+
+        # Every request reads the reference site. The state guess reads the
+        # drafted title and the grouping reads the refined labels; the rest
+        # write attributes nothing else here reads.
+        steps = [
+            LLMAssistStep(
+                name="reference_site",
+                draft=draft_reference_site,
+                apply=apply_reference_site,
+            ),
+            LLMAssistStep(
+                name="metadata",
+                draft=self._llm_draft_metadata,
+                apply=apply_metadata,
+                after=("reference_site",),
+            ),
+            LLMAssistStep(
+                name="field_labels",
+                draft=lambda: self.llm_refine_field_labels(apply=False),
+                apply=apply_field_labels,
+                after=("reference_site",),
+            ),
+            LLMAssistStep(
+                name="state",
+                draft=self._llm_draft_state,
+                apply=apply_state,
+                after=("metadata",),
+            ),
+        ]
+        if include_grouping:
+            steps.append(
+                LLMAssistStep(
+                    name="screens",
+                    draft=lambda: self.llm_group_fields(apply=False),
+                    apply=apply_screens,
+                    after=("field_labels",),
+                )
+            )
+        workers, timeout = _llm_assist_settings()
+        timings = run_llm_assist_steps(steps, workers=workers, timeout=timeout)
+        for timing in timings:
+            if timing.error:
+                log(f"AI-assist step {timing.name} {timing.status}: {timing.error}")
+        log(
+            "ALWeaver AI assist: "
+            + ", ".join(
+                f"{timing.name} {timing.status} in {timing.seconds:.1f}s "
+                f"(started at {timing.started:.1f}s)"
+                for timing in timings
+            ),
+            "info",
+        )
+        cache_stats = llm_response_cache_stats()
+        log(
+            f"ALWeaver LLM response cache: {cache_stats['hits']:g} hits, "
+            f"{cache_stats['misses']:g} misses, {cache_stats['bypassed']:g} bypassed "
+            f"({cache_stats['hit_rate']:.0%} hit rate in this process)",
+            "info",
+        )
+        return timings
+
     def llm_generate_draft_payload(self) -> Dict[str, Any]:
         payload: Dict[str, Any] = {}
-        # Fetch reference site content upfront in background task
-        self._prefetch_reference_site()
-        self.llm_prefill_metadata(apply=False)
-        self.llm_predict_state(apply=False)
+        drafted: Dict[str, Any] = {}
+        self._run_llm_assist(apply=False, drafted=drafted)
         for key in [
             "llm_draft_title",
             "llm_draft_intro_prompt",
@@ -3549,16 +3766,8 @@ Rules:
         ]:
             if hasattr(self, key):
                 payload[key] = getattr(self, key)
-
-        field_updates = self.llm_refine_field_labels(apply=False)
-        if not isinstance(field_updates, dict):
-            field_updates = {}
-        payload["field_updates"] = field_updates
-
-        # Keep labels in grouped screen payload aligned with drafted updates.
-        if field_updates:
-            self.apply_llm_field_updates(field_updates)
-        payload["screen_list"] = self.llm_group_fields(apply=False)
+        payload["field_updates"] = drafted.get("field_updates", {})
+        payload["screen_list"] = drafted.get("screen_list", [])
         return payload
 
     def apply_llm_draft_payload(self, payload: Mapping[str, Any]) -> None:
@@ -3913,13 +4122,11 @@ Rules:
         # Get the full text of all templates
         full_text = ""
         for template in self.uploaded_templates:
-            if template.filename.lower().endswith(".pdf"):
-                full_text += extract_text(template.path())
-            elif template.filename.lower().endswith(".docx"):
-                docx_data = docx2python(
-                    template.path()
-                )  # Will error with invalid value
-                full_text += docx_data.text
+            if template.filename.lower().endswith((".pdf", ".docx")):
+                # Will error with invalid value
+                full_text += analyze_document(
+                    template.path(), filename=template.filename
+                ).text()
         categories = formfyxer.spot(
             title + ": " + full_text,
             token=get_config("assembly line", {}).get("spot api key", None),
@@ -4148,6 +4355,7 @@ Rules:
                 new_screen.needs_continue_button_field = True
         self.questions.gathered = True
 
+    @timed_stage("auto_group_fields")
     def auto_group_fields(self):
         """
         Use FormFyxer to assign fields to screens.
@@ -4295,13 +4503,13 @@ def get_fields(document: Union[DAFile, DAFileList]) -> Iterable:
     # TODO(qs): refactor to use DAField object at this stage
     if isinstance(document, DAFileList):
         if document[0].mimetype == "application/pdf":
-            return document[0].get_pdf_fields()
+            return analyze_document(document[0].path()).pdf_fields()
     else:
         if document.mimetype == "application/pdf":
-            return document.get_pdf_fields()
+            return analyze_document(document.path()).pdf_fields()
 
-    docx_data = docx2python(document.path())  # Will error with invalid value
-    text = docx_data.text
+    # Will error with invalid value
+    text = analyze_document(document.path(), filename=".docx").text()
     return get_docx_variables(text)
 
 
@@ -5086,6 +5294,9 @@ ValidationError = Tuple[str, Union[str, ParsingException]]
 
 
 def get_pdf_validation_errors(document: DAFile) -> Optional[ValidationError]:
+    from pdfminer.pdfparser import PDFSyntaxError
+    from pdfminer.psparser import PSEOF
+
     try:
         fields = DAFieldList()
         fields.add_fields_from_file(document)
@@ -5134,6 +5345,11 @@ def get_help_document_text(document: DAFile) -> str:
     if not document or not hasattr(document, "path"):
         return ""
 
+    from docx2python import docx2python
+    from pdfminer.high_level import extract_text
+    from pdfminer.pdfparser import PDFSyntaxError
+    from pdfminer.psparser import PSEOF
+
     filename = str(getattr(document, "filename", "") or "").lower()
     try:
         if filename.endswith(".pdf"):
@@ -5344,6 +5560,8 @@ def get_pdf_variable_name_matches(document: Union[DAFile, str]) -> Set[Tuple[str
     Identify any variable names that look like they are intended to be for a PDF
     in a DOCX template.
     """
+    from docx2python import docx2python
+
     if isinstance(document, DAFile):
         docx_data = docx2python(document.path())
     else:
@@ -5404,6 +5622,7 @@ def is_url(url: str) -> bool:
 ############################
 
 
+@timed_stage("create_package_zip")
 def create_package_zip(
     pkgname: str,
     info: dict,
@@ -6109,9 +6328,11 @@ def _sections_from_frontend(interview: DAInterview) -> List[Dict[str, str]]:
 
 
 def _llm_refine_section_catalog(
-    screen_summaries: Sequence[str], base_sections: Sequence[Dict[str, str]]
+    screen_summaries: Sequence[str],
+    base_sections: Sequence[Dict[str, str]],
+    bypass_cache: bool = False,
 ) -> Optional[List[Dict[str, str]]]:
-    llms = _load_llms_module()
+    llms = _load_llms_module(bypass_cache=bypass_cache)
     if not llms or not screen_summaries or not base_sections:
         return None
     prompt = _prompt_str(
@@ -6166,8 +6387,9 @@ def _llm_refine_section_ids(
     screen_summaries: Sequence[str],
     section_ids: Sequence[str],
     deterministic: Sequence[str],
+    bypass_cache: bool = False,
 ) -> Optional[List[str]]:
-    llms = _load_llms_module()
+    llms = _load_llms_module(bypass_cache=bypass_cache)
     if not llms or not screen_summaries:
         return None
     allowed = sorted(set(section_ids))
@@ -6246,7 +6468,9 @@ def _navigation_sections_and_assignments(
 
     llm_enabled = bool(getattr(interview, "use_llm_assist", False))
     if llm_enabled:
-        refined_catalog = _llm_refine_section_catalog(summaries, section_catalog)
+        refined_catalog = _llm_refine_section_catalog(
+            summaries, section_catalog, bypass_cache=_bypasses_llm_cache(interview)
+        )
         if refined_catalog:
             section_catalog = refined_catalog
 
@@ -6267,6 +6491,7 @@ def _navigation_sections_and_assignments(
             screen_summaries=summaries,
             section_ids=allowed_ids,
             deterministic=seeded_ids,
+            bypass_cache=_bypasses_llm_cache(interview),
         )
     assigned = llm_ids or seeded_ids
 
@@ -6310,15 +6535,57 @@ def _navigation_sections_and_assignments(
     return sections, monotonic
 
 
-def _ensure_question_block_ids(yaml_text: str) -> str:
-    """Add deterministic ids to question blocks that are missing an id."""
-    docs = re.split(r"(?m)^---\s*$", yaml_text)
+_YAML_DOCUMENT_SEPARATOR = re.compile(r"(?m)^---\s*$")
+
+
+def _yaml_document_index(yaml_text: str, line_number: int) -> int:
+    """Which ``---``-separated document of ``yaml_text`` holds a 1-based line."""
+    offset = 0
+    for _ in range(max(0, line_number - 1)):
+        next_line = yaml_text.find("\n", offset)
+        if next_line < 0:
+            break
+        offset = next_line + 1
+    return sum(
+        1
+        for separator in _YAML_DOCUMENT_SEPARATOR.finditer(yaml_text)
+        if separator.start() < offset
+    )
+
+
+def _lint_finding_documents(
+    yaml_text: str, findings: Sequence[Mapping[str, Any]]
+) -> Optional[Set[int]]:
+    """The documents ``findings`` point at, or None if any of them is unlocated."""
+    documents: Set[int] = set()
+    for finding in findings:
+        try:
+            line_number = int(str(finding.get("line_number") or "").strip())
+        except ValueError:
+            return None
+        if line_number < 1:
+            return None
+        documents.add(_yaml_document_index(yaml_text, line_number))
+    return documents
+
+
+def _ensure_question_block_ids(
+    yaml_text: str, documents: Optional[Set[int]] = None
+) -> str:
+    """Add deterministic ids to question blocks that are missing an id.
+
+    ``documents`` limits this to those documents, counted from 0; the others
+    are left exactly as they are.
+    """
+    # The separators are kept, so joining the pieces gives back the source
+    pieces = _YAML_DOCUMENT_SEPARATOR.split(yaml_text)
+    separators = _YAML_DOCUMENT_SEPARATOR.findall(yaml_text)
     updated_docs: List[str] = []
     generated_counter = 1
 
-    for raw_doc in docs:
+    for index, raw_doc in enumerate(pieces):
         doc_text = raw_doc
-        if not doc_text.strip():
+        if not doc_text.strip() or (documents is not None and index not in documents):
             updated_docs.append(doc_text)
             continue
         has_top_level_id = re.search(r"(?m)^id:\s*", doc_text) is not None
@@ -6357,7 +6624,9 @@ def _ensure_question_block_ids(yaml_text: str) -> str:
                 doc_text = id_line + doc_text
         updated_docs.append(doc_text)
 
-    return "---\n".join(updated_docs)
+    return "".join(
+        piece for pair in zip(updated_docs, separators + [""]) for piece in pair
+    )
 
 
 def _ensure_unique_question_ids(yaml_text: str) -> str:
@@ -6482,12 +6751,17 @@ def _lint_with_aldashboard_interview_linter(
         return None
 
 
-def _llm_rewrite_for_plain_language(text: str) -> str:
-    llms = _load_llms_module()
-    if not llms or not text.strip():
-        return text
-    if "${" in text or "<%text>" in text or "% if" in text:
-        return text
+#: The model the plain-language pass asks for rewrites.
+PLAIN_LANGUAGE_MODEL = "gpt-5-mini"
+
+
+def _request_plain_language_rewrite(
+    text: str, model: str, bypass_cache: bool = False
+) -> Optional[str]:
+    """Ask the model to rewrite ``text``; None when it could not be asked."""
+    llms = _load_llms_module(bypass_cache=bypass_cache)
+    if not llms:
+        return None
     try:
         rewritten = llms.chat_completion(
             system_message=(
@@ -6496,18 +6770,122 @@ def _llm_rewrite_for_plain_language(text: str) -> str:
             ),
             user_message=text,
             json_mode=True,
-            model="gpt-5-mini",
+            model=model,
         )
-        if isinstance(rewritten, dict):
-            candidate = str(rewritten.get("rewrite", "") or "").strip()
-            if candidate:
-                return candidate
     except Exception:
-        return text
+        return None
+    if isinstance(rewritten, dict):
+        candidate = str(rewritten.get("rewrite", "") or "").strip()
+        if candidate:
+            return candidate
     return text
 
 
-def _apply_plain_language_repairs(yaml_text: str, max_rewrites: int = 8) -> str:
+def _llm_rewrite_for_plain_language(
+    text: str, model: str = PLAIN_LANGUAGE_MODEL, bypass_cache: bool = False
+) -> str:
+    if not text.strip():
+        return text
+    if "${" in text or "<%text>" in text or "% if" in text:
+        return text
+    rewritten = _request_plain_language_rewrite(text, model, bypass_cache)
+    return text if rewritten is None else rewritten
+
+
+def _plain_language_settings() -> Tuple[int, float]:
+    """How many rewrites to ask for at once, and how long the whole pass may take.
+
+    Read from ``weaver plain language workers`` and ``weaver plain language
+    budget`` (in seconds) under ``assembly line`` in the configuration.
+    """
+    try:
+        configured = get_config("assembly line", {}) or {}
+    except Exception:
+        configured = {}
+    try:
+        workers = int(configured.get("weaver plain language workers") or 4)
+    except (TypeError, ValueError):
+        workers = 4
+    try:
+        budget = float(configured.get("weaver plain language budget") or 60)
+    except (TypeError, ValueError):
+        budget = 60.0
+    return max(1, workers), max(0.0, budget)
+
+
+def _plain_language_rewrites(
+    originals: Sequence[str],
+    workers: int,
+    budget_seconds: float,
+    model: str = PLAIN_LANGUAGE_MODEL,
+    bypass_cache: bool = False,
+) -> Dict[str, str]:
+    """Rewrite each of ``originals``, leaving out any not back within the budget.
+
+    The rewrites are asked for side by side, ``workers`` at a time; those the
+    LLM response cache remembers come back without asking the model.
+    """
+    if not originals:
+        return {}
+    rewrites: Dict[str, str] = {}
+    executor = ThreadPoolExecutor(
+        max_workers=min(workers, len(originals)),
+        thread_name_prefix="weaver-plain-language",
+    )
+    try:
+        futures = {
+            executor.submit(
+                _llm_rewrite_for_plain_language, original, model, bypass_cache
+            ): original
+            for original in originals
+        }
+        done, not_done = wait(list(futures), timeout=budget_seconds)
+        if not_done:
+            log(
+                f"Plain-language pass used its {budget_seconds:g} second budget; "
+                f"{len(not_done)} of {len(futures)} rewrites were left out",
+                "info",
+            )
+        for future in done:
+            try:
+                rewrites[futures[future]] = future.result()
+            except Exception as exc:
+                log(f"Plain-language rewrite failed: {exc!r}")
+    finally:
+        # Whatever is still running finishes in the background and is cached
+        # for next time, but is not waited for here.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return rewrites
+
+
+def _replace_first_occurrences(text: str, replacements: Mapping[str, str]) -> str:
+    """Replace the first occurrence of each key, in one pass over ``text``.
+
+    Where two keys overlap, the longer one wins.
+    """
+    if not replacements:
+        return text
+    pattern = re.compile(
+        "|".join(
+            re.escape(original)
+            for original in sorted(replacements, key=len, reverse=True)
+        )
+    )
+    replaced: Set[str] = set()
+
+    def _replace(match: "re.Match[str]") -> str:
+        original = match.group(0)
+        if original in replaced:
+            return original
+        replaced.add(original)
+        return replacements[original]
+
+    return pattern.sub(_replace, text)
+
+
+def _apply_plain_language_repairs(
+    yaml_text: str, max_rewrites: int = 8, bypass_cache: bool = False
+) -> str:
     lint_result = _lint_with_aldashboard_interview_linter(yaml_text, include_llm=True)
     if not lint_result:
         return yaml_text
@@ -6525,19 +6903,25 @@ def _apply_plain_language_repairs(yaml_text: str, max_rewrites: int = 8) -> str:
         if problematic_text not in candidates:
             candidates.append(problematic_text)
 
-    updated = yaml_text
-    rewrite_count = 0
-    for original in sorted(candidates, key=len, reverse=True):
-        if rewrite_count >= max_rewrites:
-            break
-        if original not in updated:
-            continue
-        rewritten = _llm_rewrite_for_plain_language(original)
-        if not rewritten or rewritten == original:
-            continue
-        updated = updated.replace(original, rewritten, 1)
-        rewrite_count += 1
-    return updated
+    originals = [
+        original
+        for original in sorted(candidates, key=len, reverse=True)
+        if original in yaml_text
+    ][:max_rewrites]
+    if not originals:
+        return yaml_text
+    workers, budget_seconds = _plain_language_settings()
+    rewrites = _plain_language_rewrites(
+        originals, workers, budget_seconds, bypass_cache=bypass_cache
+    )
+    return _replace_first_occurrences(
+        yaml_text,
+        {
+            original: rewritten
+            for original, rewritten in rewrites.items()
+            if rewritten and rewritten != original
+        },
+    )
 
 
 def _tidy_generated_yaml(yaml_text: str) -> str:
@@ -6580,54 +6964,196 @@ def _tidy_generated_yaml(yaml_text: str) -> str:
     return "\n".join(tidied) + "\n"
 
 
+def _red_lint_findings(
+    lint_result: Optional[Mapping[str, Any]],
+) -> List[Dict[str, Any]]:
+    if not lint_result:
+        return []
+    return [
+        finding
+        for finding in (lint_result.get("findings", []) or [])
+        if str(finding.get("severity")) == "red"
+    ]
+
+
+@timed_stage("lint_repair")
 def _repair_generated_yaml_with_lint(
-    yaml_text: str, interview: DAInterview, max_passes: int = 3
+    yaml_text: str, interview: DAInterview, lint: bool = True
 ) -> str:
-    """Generate-then-repair loop using deterministic lint fixes."""
-    updated = yaml_text
+    """Fix what the interview linter flags, linting at most twice.
+
+    One lint finds the problems. The deterministic fixers then patch only the
+    documents the findings point at -- every document, for a finding with no
+    line -- and one more lint confirms the result. Only when that still fails
+    does the plain-language pass run. ``lint=False`` skips the linter entirely,
+    for bulk generation.
+    """
     # Always enforce ID uniqueness, even when lint is unavailable.
+    updated = _ensure_unique_question_ids(yaml_text)
+    if not lint:
+        return updated
+    lint_result = _lint_with_aldashboard_interview_linter(updated)
+    red_findings = _red_lint_findings(lint_result)
+    if not red_findings:
+        return updated
+
+    before = updated
+    missing_ids = [
+        finding
+        for finding in red_findings
+        if str(finding.get("rule_id")) == "missing-question-id"
+    ]
+    if missing_ids:
+        updated = _ensure_question_block_ids(
+            updated, documents=_lint_finding_documents(updated, missing_ids)
+        )
+    if any(
+        str(finding.get("rule_id")) == "missing-metadata-fields"
+        for finding in red_findings
+    ):
+        # Only ever touches the metadata block
+        updated = _ensure_required_metadata_values(updated, interview)
     updated = _ensure_unique_question_ids(updated)
-    for _ in range(max_passes):
-        lint_result = _lint_with_aldashboard_interview_linter(updated)
-        if not lint_result:
-            break
-        findings = lint_result.get("findings", []) or []
-        red_rules = {
-            str(finding.get("rule_id"))
-            for finding in findings
-            if str(finding.get("severity")) == "red"
-        }
-        if not red_rules:
-            break
-        before = updated
-        if "missing-question-id" in red_rules:
-            updated = _ensure_question_block_ids(updated)
-        if "missing-metadata-fields" in red_rules:
-            updated = _ensure_required_metadata_values(updated, interview)
-        updated = _ensure_unique_question_ids(updated)
-        if updated == before:
-            break
+    if updated != before:
+        red_findings = _red_lint_findings(
+            _lint_with_aldashboard_interview_linter(updated)
+        )
     # Optional readability/tone cleanup as a second try only when lint still fails.
-    final_lint = _lint_with_aldashboard_interview_linter(updated)
-    has_red_failures = bool(
-        final_lint
-        and any(
-            str(finding.get("severity")) == "red"
-            for finding in (final_lint.get("findings", []) or [])
+    if red_findings:
+        updated = _ensure_unique_question_ids(
+            _apply_plain_language_repairs(
+                updated, bypass_cache=_bypasses_llm_cache(interview)
+            )
         )
-    )
-    if has_red_failures:
-        updated = _apply_plain_language_repairs(updated)
-    updated = _ensure_unique_question_ids(updated)
     return updated
 
 
+_TemplateFingerprint = Tuple[Tuple[str, int, int], ...]
+_COMPILED_TEMPLATE_CACHE: Dict[_TemplateFingerprint, "mako.template.Template"] = {}
+_COMPILED_TEMPLATE_CACHE_LOCK = threading.Lock()
+_COMPILED_TEMPLATE_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+#: Older compiled templates are dropped once this many are held. Each distinct
+#: output template choice (and each edit to one on disk) takes one slot.
+_COMPILED_TEMPLATE_CACHE_MAX_ENTRIES = 16
+
+
+def _template_fingerprint(paths: Sequence[str]) -> _TemplateFingerprint:
+    """Identify the exact files a compiled template was built from."""
+    fingerprint = []
+    for path in paths:
+        stat_result = os.stat(path)
+        fingerprint.append(
+            (os.path.realpath(path), stat_result.st_mtime_ns, stat_result.st_size)
+        )
+    return tuple(fingerprint)
+
+
+def _mako_module_directory() -> Optional[str]:
+    """Where compiled Mako modules persist between worker processes, if anywhere.
+
+    Set ``weaver mako module directory`` under ``assembly line`` in the
+    Docassemble configuration to let a freshly started worker import the
+    already-compiled template instead of compiling it again.
+    """
+    try:
+        configured = get_config("assembly line", {}).get("weaver mako module directory")
+    except Exception:
+        return None
+    if not isinstance(configured, str) or not configured.strip():
+        return None
+    return configured.strip()
+
+
+def _compile_output_template(
+    template_text: str, module_directory: Optional[str]
+) -> "mako.template.Template":
+    # This template renders docassemble YAML, not HTML output.
+    if not module_directory:
+        return mako.template.Template(
+            template_text, input_encoding="utf-8"
+        )  # nosec B702
+    # Mako only reuses a compiled module for templates loaded from a file, so
+    # write the combined source under a name derived from its content. A module
+    # compiled from it stays valid for as long as that name exists.
+    digest = hashlib.sha256(template_text.encode("utf-8")).hexdigest()[:24]
+    source_name = f"weaver_output_{digest}.mako"
+    os.makedirs(module_directory, exist_ok=True)
+    source_path = os.path.join(module_directory, source_name)
+    if not os.path.exists(source_path):
+        handle = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=module_directory, delete=False
+        )
+        with handle:
+            handle.write(template_text)
+        os.replace(handle.name, source_path)
+    return mako.template.Template(
+        filename=source_path,
+        uri=source_name,
+        module_directory=module_directory,
+        input_encoding="utf-8",
+    )  # nosec B702
+
+
+def _compiled_output_template(
+    output_defs_path: str, question_library_path: str, output_mako_path: str
+) -> "mako.template.Template":
+    """The Mako template that renders an interview, compiled once per process.
+
+    Keyed by each source file's resolved path, modification time and size, so
+    editing one of them on disk is picked up on the next generation without a
+    restart.
+    """
+    paths = (output_defs_path, question_library_path, output_mako_path)
+    key = _template_fingerprint(paths)
+    with _COMPILED_TEMPLATE_CACHE_LOCK:
+        cached = _COMPILED_TEMPLATE_CACHE.get(key)
+        if cached is not None:
+            _COMPILED_TEMPLATE_CACHE_STATS["hits"] += 1
+            return cached
+        _COMPILED_TEMPLATE_CACHE_STATS["misses"] += 1
+
+    texts = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as handle:
+            texts.append(handle.read())
+    # The question library ships as its own file so authors can keep it in sync
+    # with AssemblyLine's ql_baseline.yml, but its defs have to be part of the same
+    # Mako template as the output template that calls them.
+    template = _compile_output_template("\n".join(texts), _mako_module_directory())
+
+    with _COMPILED_TEMPLATE_CACHE_LOCK:
+        _COMPILED_TEMPLATE_CACHE[key] = template
+        while len(_COMPILED_TEMPLATE_CACHE) > _COMPILED_TEMPLATE_CACHE_MAX_ENTRIES:
+            del _COMPILED_TEMPLATE_CACHE[next(iter(_COMPILED_TEMPLATE_CACHE))]
+    return template
+
+
+def compiled_template_cache_stats() -> Dict[str, int]:
+    """Hit and miss counts for the compiled output template cache."""
+    with _COMPILED_TEMPLATE_CACHE_LOCK:
+        return {
+            **_COMPILED_TEMPLATE_CACHE_STATS,
+            "entries": len(_COMPILED_TEMPLATE_CACHE),
+        }
+
+
+def clear_compiled_template_cache() -> None:
+    """Forget every compiled output template and reset the counters."""
+    with _COMPILED_TEMPLATE_CACHE_LOCK:
+        _COMPILED_TEMPLATE_CACHE.clear()
+        _COMPILED_TEMPLATE_CACHE_STATS["hits"] = 0
+        _COMPILED_TEMPLATE_CACHE_STATS["misses"] = 0
+
+
+@timed_stage("render_interview_yaml")
 def _render_interview_yaml(
     interview: DAInterview,
     include_download_screen: bool,
     output_mako_choice: str,
     objects: Optional[List[Any]] = None,
     screen_reordered: Optional[List[Any]] = None,
+    lint_generated_yaml: bool = True,
+    progress: Optional[ProgressCallback] = None,
 ) -> str:
     try:
         from . import __version__
@@ -6646,27 +7172,12 @@ def _render_interview_yaml(
         yesno,
     )
 
-    output_defs_path = _resolve_template_path("output_defs.mako")
-    question_library_path = _resolve_template_path("question_library.mako")
     output_mako_ref = get_output_mako_package_and_path(output_mako_choice)
-    output_mako_path = _resolve_template_path(output_mako_ref)
-    with open(output_defs_path, "r", encoding="utf-8") as defs_handle:
-        output_defs_text = defs_handle.read()
-    with open(question_library_path, "r", encoding="utf-8") as library_handle:
-        question_library_text = library_handle.read()
-    with open(output_mako_path, "r", encoding="utf-8") as mako_handle:
-        output_mako_text = mako_handle.read()
-
-    # The question library ships as its own file so authors can keep it in sync
-    # with AssemblyLine's ql_baseline.yml, but its defs have to be part of the same
-    # Mako template as the output template that calls them.
-    template_text = (
-        output_defs_text + "\n" + question_library_text + "\n" + output_mako_text
+    template = _compiled_output_template(
+        _resolve_template_path("output_defs.mako"),
+        _resolve_template_path("question_library.mako"),
+        _resolve_template_path(output_mako_ref),
     )
-    # This template renders docassemble YAML, not HTML output.
-    template = mako.template.Template(
-        template_text, input_encoding="utf-8"
-    )  # nosec B702
 
     questions = getattr(interview, "questions", None)
     can_render_question_order = hasattr(interview, "draft_screen_order") and getattr(
@@ -6756,7 +7267,11 @@ def _render_interview_yaml(
         "get_yml_deps_from_choices": get_yml_deps_from_choices,
     }
     yaml_text = _tidy_generated_yaml(template.render(**context))
-    return _tidy_generated_yaml(_repair_generated_yaml_with_lint(yaml_text, interview))
+    if lint_generated_yaml:
+        report_stage(progress, "lint_repair")
+    return _tidy_generated_yaml(
+        _repair_generated_yaml_with_lint(yaml_text, interview, lint=lint_generated_yaml)
+    )
 
 
 _NEXT_STEPS_RUNTIME_REPLACEMENTS = {
@@ -6954,6 +7469,8 @@ def generate_interview_artifacts(
     yaml_output_file: Optional[Any] = None,
     package_output_file: Optional[Any] = None,
     objects: Optional[List[Any]] = None,
+    lint_generated_yaml: bool = True,
+    progress: Optional[ProgressCallback] = None,
 ) -> WeaverInterviewArtifacts:
     yaml_filename = f"{interview.interview_label}.yml"
     chosen_output_mako_raw = output_mako_choice
@@ -6982,6 +7499,8 @@ def generate_interview_artifacts(
         output_mako_choice=chosen_output_mako,
         objects=resolved_objects,
         screen_reordered=None,
+        lint_generated_yaml=lint_generated_yaml,
+        progress=progress,
     )
 
     yaml_file = yaml_output_file or DAFile(filename=yaml_filename)
@@ -6992,6 +7511,7 @@ def generate_interview_artifacts(
 
     package_file = None
     if create_package_archive:
+        report_stage(progress, "packaging")
         include_next_steps = getattr(interview, "include_next_steps", True)
         if include_next_steps and not hasattr(interview, "instructions"):
             _assign_next_steps_template(interview)
@@ -7060,9 +7580,7 @@ def _apply_field_name_normalization(
     try:
         field_names = [
             item[0]
-            for item in _make_static_file_from_path(
-                input_path, filename=exact_name
-            ).get_pdf_fields()
+            for item in analyze_document(input_path, filename=exact_name).pdf_fields()
         ]
     except Exception as exc:
         log(f"Unable to read fields from {input_path}: {exc!r}")
@@ -7084,6 +7602,148 @@ def _apply_field_name_normalization(
     return renames, True, renamed_path
 
 
+@dataclass
+class _PreparedTemplate:
+    """One template after renaming and reading, ready to become a `DAFile`."""
+
+    renames: List[Tuple[str, str]]
+    renames_applied: bool
+    path: str
+    analysis: Optional[DocumentAnalysis] = None
+
+
+def _prepare_template(
+    input_path: str,
+    output_dir: Optional[str],
+    exact_name: str,
+    normalize_field_names: bool,
+    read_text: bool,
+) -> _PreparedTemplate:
+    """Rename one template's fields if asked, then read everything out of it.
+
+    Touches nothing but the files involved, so it can run in a worker process;
+    the analysis it returns carries the parsed fields and text back with it.
+    """
+    renames, renames_applied, template_path = _apply_field_name_normalization(
+        input_path,
+        output_dir=output_dir,
+        exact_name=exact_name,
+        normalize_field_names=normalize_field_names,
+    )
+    analysis = None
+    if exact_name.lower().endswith((".pdf", ".docx")):
+        try:
+            analysis = analyze_document(template_path, filename=exact_name).read_all(
+                include_text=read_text
+            )
+        except Exception as exc:
+            # Reported again, with context, when the fields are actually loaded
+            log(f"Unable to read {exact_name} ahead of time: {exc!r}")
+    return _PreparedTemplate(
+        renames=renames,
+        renames_applied=renames_applied,
+        path=template_path,
+        analysis=analysis,
+    )
+
+
+def _template_worker_count(requested: Optional[int], template_count: int) -> int:
+    """How many processes should prepare templates at once.
+
+    An explicit ``template_workers`` wins, then ``weaver template workers``
+    under ``assembly line`` in the configuration. Without either, templates are
+    prepared one at a time: generations run inside uwsgi web workers and
+    Celery prefork children, and forking those multithreaded processes copies
+    their locks and Redis and database connections into the children, so a
+    process pool is only used where a deployment has asked for one.
+    """
+    configured: Any = requested
+    if configured is None:
+        try:
+            configured = get_config("assembly line", {}).get("weaver template workers")
+        except Exception:
+            configured = None
+    try:
+        workers = int(configured) if configured is not None else 0
+    except (TypeError, ValueError):
+        workers = 0
+    if workers <= 0:
+        return 1
+    return max(1, min(workers, template_count))
+
+
+def _llm_assist_settings() -> Tuple[int, Optional[float]]:
+    """How many AI-assist requests to send at once, and how long each may take.
+
+    Read from ``weaver llm assist workers`` and ``weaver llm assist timeout``
+    (in seconds) under ``assembly line`` in the configuration. A timeout of 0
+    waits as long as the model takes.
+    """
+    try:
+        configured = get_config("assembly line", {}) or {}
+    except Exception:
+        configured = {}
+    try:
+        workers = int(configured.get("weaver llm assist workers") or 0)
+    except (TypeError, ValueError):
+        workers = 0
+    try:
+        timeout = float(
+            configured.get("weaver llm assist timeout", DEFAULT_LLM_ASSIST_TIMEOUT)
+        )
+    except (TypeError, ValueError):
+        timeout = DEFAULT_LLM_ASSIST_TIMEOUT
+    return (
+        workers if workers > 0 else DEFAULT_LLM_ASSIST_WORKERS,
+        timeout if timeout > 0 else None,
+    )
+
+
+@timed_stage("prepare_templates")
+def _prepare_templates(
+    template_inputs: Sequence[TemplateInput],
+    *,
+    output_dir: Optional[str],
+    normalize_field_names: bool,
+    read_text: bool,
+    workers: Optional[int] = None,
+) -> List[_PreparedTemplate]:
+    """Prepare every template, in parallel when configured to.
+
+    Results come back in the order the templates were given, so the bundle and
+    `document_names()` come out the same however the work was scheduled. A
+    process pool that cannot start -- a Celery prefork worker may not have
+    children of its own -- falls back to doing the templates one at a time.
+    """
+    arguments = [
+        (
+            template_input.path,
+            output_dir,
+            str(template_input.exact_name),
+            normalize_field_names,
+            read_text,
+        )
+        for template_input in template_inputs
+    ]
+    worker_count = _template_worker_count(workers, len(arguments))
+    prepared: Optional[List[_PreparedTemplate]] = None
+    if worker_count > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=worker_count) as executor:
+                prepared = list(executor.map(_prepare_template, *zip(*arguments)))
+        except Exception as exc:
+            log(
+                f"Preparing templates in parallel failed, continuing one at a time: {exc!r}"
+            )
+            prepared = None
+    if prepared is None:
+        return [_prepare_template(*argument) for argument in arguments]
+    for item in prepared:
+        if item.analysis is not None:
+            item.analysis = adopt_document_analysis(item.analysis)
+    return prepared
+
+
 @dataclass
 class DocumentName:
     """What one template is called once the interview assembles it.
@@ -7190,6 +7850,65 @@ def _resolve_template_inputs(
     return resolved
 
 
+def _generation_profiler_settings() -> Tuple[Optional[str], str]:
+    """Which profiler a generation that asks to be profiled runs under, and where
+    its profile is written.
+
+    Read from ``weaver profile generation`` (``cprofile`` or ``pyinstrument``;
+    anything else leaves profiling off) and ``weaver profile directory`` under
+    ``assembly line`` in the configuration.
+    """
+    try:
+        configured = get_config("assembly line", {}) or {}
+    except Exception:
+        configured = {}
+    kind = str(configured.get("weaver profile generation") or "").strip().lower()
+    directory = str(
+        configured.get("weaver profile directory") or DEFAULT_PROFILE_DIRECTORY
+    )
+    return (kind if kind in PROFILERS else None), directory
+
+
+def _timed_generation(generate: Callable[..., WeaverGenerationResult]):
+    """Time each stage of ``generate`` onto the result it returns, and profile
+    it when it is called with ``profile=True`` and profiling is configured."""
+
+    @wraps(generate)
+    def timed(*args, **kwargs) -> WeaverGenerationResult:
+        profiler: Optional[GenerationProfiler] = None
+        if kwargs.get("profile"):
+            kind, directory = _generation_profiler_settings()
+            if kind:
+                profiler = GenerationProfiler(kind, directory, label="weaver")
+            else:
+                log(
+                    "ALWeaver generate_interview_from_path: profile was asked "
+                    "for, but no profiler is configured in 'weaver profile "
+                    "generation'",
+                    "info",
+                )
+        timer = GenerationTimer()
+        with collecting_timings(timer), profiler or nullcontext():
+            with timer.span(generate.__name__):
+                result = generate(*args, **kwargs)
+        result.timings = timer.as_dicts()
+        if profiler is not None:
+            result.profile_path = profiler.path
+        log(
+            "ALWeaver generate_interview_from_path: stage timings "
+            + ", ".join(
+                f"{timing['name']}={timing['wall_seconds']:.3f}s"
+                f"/{timing['cpu_seconds']:.3f}s cpu"
+                for timing in result.timings
+            ),
+            "info",
+        )
+        return result
+
+    return timed
+
+
+@_timed_generation
 def generate_interview_from_path(
     input_path: str,
     *,
@@ -7213,12 +7932,35 @@ def generate_interview_from_path(
     screen_definitions: Optional[List[Screen]] = None,
     normalize_field_names: bool = False,
     additional_templates: Optional[Sequence[Union[str, TemplateInput]]] = None,
+    template_workers: Optional[int] = None,
+    lint_generated_yaml: bool = True,
+    bypass_llm_cache: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    profile: bool = False,
 ) -> WeaverGenerationResult:
     """Weave one or more templates into a single draft interview.
 
     ``input_path`` is the lead document: the interview takes its title and
     filename from that one, and every template contributes fields, an
     ``attachment`` block and an entry in the ``ALDocumentBundle``.
+
+    With several templates, each is renamed and read in turn, or in its own
+    process, up to ``template_workers`` at once, when ``template_workers`` or
+    ``weaver template workers`` asks for more than one.
+
+    ``lint_generated_yaml=False`` skips the interview linter and the fixes it
+    drives, for bulk generation where the drafts are checked later anyway.
+
+    ``bypass_llm_cache=True`` asks the model afresh for every AI-assist step
+    instead of reusing remembered answers, and remembers the new ones.
+
+    ``progress`` is told as each stage starts; see
+    :mod:`.generation_progress`.
+
+    The wall and CPU time of each stage are returned in the result's
+    ``timings``. ``profile=True`` also runs the generation under the profiler
+    configured in ``weaver profile generation`` and returns where the profile
+    was written as ``profile_path``; see :mod:`.generation_timing`.
     """
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Template file not found: {input_path}")
@@ -7246,18 +7988,19 @@ def generate_interview_from_path(
     normalized_template_paths: Dict[str, str] = {}
     renames_applied = False
     da_files: List[Union[DAFile, DAStaticFile]] = []
-    for template_input in template_inputs:
+    report_stage(progress, "field_extraction")
+    prepared_templates = _prepare_templates(
+        template_inputs,
+        output_dir=output_dir,
+        normalize_field_names=normalize_field_names,
+        read_text=bool(use_llm_assist),
+        workers=template_workers,
+    )
+    for template_input, prepared in zip(template_inputs, prepared_templates):
         template_name = str(template_input.exact_name)
-        (
-            template_renames,
-            template_renames_applied,
-            template_path,
-        ) = _apply_field_name_normalization(
-            template_input.path,
-            output_dir=output_dir,
-            exact_name=template_name,
-            normalize_field_names=normalize_field_names,
-        )
+        template_renames = prepared.renames
+        template_renames_applied = prepared.renames_applied
+        template_path = prepared.path
         if template_renames:
             suggested_renames_by_template[template_name] = template_renames
             for rename in template_renames:
@@ -7302,6 +8045,7 @@ def generate_interview_from_path(
     interview.include_next_steps = include_next_steps
     interview.copy_baseline_questions = bool(copy_baseline_questions)
     interview.use_llm_assist = bool(use_llm_assist)
+    interview.bypass_llm_cache = bool(bypass_llm_cache)
     if help_page_url is not None:
         interview.help_page_url = str(help_page_url).strip()
     if help_page_title is not None:
@@ -7362,6 +8106,7 @@ def generate_interview_from_path(
     if hasattr(interview, "help_source_text"):
         interview.help_source_text = str(interview.help_source_text or "")
 
+    report_stage(progress, "grouping")
     added_fields = _apply_field_definitions_to_interview(interview, field_definitions)
     for field in interview.all_fields:
         if (
@@ -7388,12 +8133,16 @@ def generate_interview_from_path(
             f"help_source_chars={len(str(getattr(interview, 'help_source_text', '') or ''))}",
             "info",
         )
-        interview._prefetch_reference_site()
-        interview.llm_prefill_metadata(apply=True)
-        interview.llm_predict_state(apply=True)
-        interview.llm_refine_field_labels(apply=True)
-        if not screen_definitions:
-            interview.llm_group_fields(apply=True)
+        report_stage(progress, "llm_assist")
+        llm_started_at = time.time()
+        for timing in interview.run_llm_assist(include_grouping=not screen_definitions):
+            report_stage(
+                progress,
+                f"llm:{timing.name}",
+                at=llm_started_at + timing.started,
+                seconds=timing.seconds,
+                status=timing.status,
+            )
 
     if exact_name and not str(title or "").strip() and not override_title_requested:
         _apply_exact_name_to_interview(interview, exact_name)
@@ -7435,6 +8184,7 @@ def generate_interview_from_path(
     else:
         package_zip_path = None
 
+    report_stage(progress, "rendering")
     artifacts = generate_interview_artifacts(
         interview=interview,
         include_download_screen=include_download_screen,
@@ -7442,6 +8192,8 @@ def generate_interview_from_path(
         output_mako_choice=output_mako_choice,
         yaml_output_file=yaml_output_file,
         package_output_file=package_output_file,
+        lint_generated_yaml=lint_generated_yaml,
+        progress=progress,
     )
 
     yaml_path = artifacts.yaml_file.path()
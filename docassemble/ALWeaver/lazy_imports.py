@@ -0,0 +1,48 @@
+# do not pre-load
+
+"""Put off importing a heavy dependency until it is first used.
+
+Every web worker reload and every Celery worker start imports the API modules,
+including processes that only ever serve the editor. Some of the generator's
+dependencies take seconds to import -- formfyxer loads its language models and
+machine learning stack -- so :func:`lazy_module` gives a module-level name
+that imports the real module the first time one of its attributes is read.
+
+The stand-in keeps working with ``unittest.mock.patch.object``: an attribute
+set on it shadows the real module's until it is removed again.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import types
+from typing import Any
+
+__all__ = ["lazy_module"]
+
+
+class _LazyModule(types.ModuleType):
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names not set on the stand-in itself. The import
+        # system's own locks make the first import safe across threads.
+        return getattr(importlib.import_module(self.__name__), name)
+
+    def __dir__(self):
+        return dir(importlib.import_module(self.__name__))
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """The module called ``name``, imported when an attribute is first read.
+
+    Returns the module itself when it has already been imported. A module that
+    is not installed at all is still reported straight away, as an import
+    would.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
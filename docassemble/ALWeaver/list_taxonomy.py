@@ -1,4 +1,3 @@
-import pandas as pd
 from typing import List, Dict, Optional
 from docassemble.base.util import log
 
@@ -34,6 +33,9 @@ def get_LIST_codes(
             custom_order.index(prefix) if prefix in custom_order else len(custom_order)
         )
 
+    # pandas is slow to import and only this needs it
+    import pandas as pd
+
     # Load the CSV into a pandas DataFrame
     df = pd.read_csv(file_path)
 
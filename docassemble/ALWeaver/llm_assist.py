@@ -0,0 +1,203 @@
+# do not pre-load
+
+"""Run the AI-assist steps of a generation side by side.
+
+Drafting an interview with AI assist makes several chat completions: one
+batch to draft the metadata, then one each to guess the state, reword the
+field labels and group the fields onto screens. Each spends nearly all of its
+time waiting on the network, and most of them only read the template text and
+the field list, so there is no need to wait for one before sending the next.
+
+Each :class:`LLMAssistStep` is split in two. ``draft`` asks the model and
+returns what it said without touching the interview, so it can run on a
+worker thread. ``apply`` writes that answer onto the interview and always runs
+on the calling thread, in the order the steps were given, so the interview
+comes out the same however the replies happened to arrive. A step names the
+steps whose answers it reads in ``after`` and is not started until those have
+been applied.
+
+A step that fails or runs past its timeout is left out, as the steps were when
+they ran one at a time, and the steps after it still run; what went wrong is
+in its :class:`LLMAssistTiming`.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "DEFAULT_LLM_ASSIST_TIMEOUT",
+    "DEFAULT_LLM_ASSIST_WORKERS",
+    "LLMAssistStep",
+    "LLMAssistTiming",
+    "run_llm_assist_steps",
+]
+
+#: How many steps may wait on the model at once. The generator has four
+#: requests it can send together at most, so more would only sit idle.
+DEFAULT_LLM_ASSIST_WORKERS = 4
+
+#: Seconds one step may wait on the model. The metadata step makes three
+#: requests in a row, so this leaves each of them well over half a minute.
+DEFAULT_LLM_ASSIST_TIMEOUT = 120.0
+
+
+@dataclass(frozen=True)
+class LLMAssistStep:
+    """One request to the model and how to apply its answer.
+
+    Attributes:
+        name (str): names the step in ``after`` and in the timings.
+        draft (Callable[[], Any]): asks the model; must not change the interview.
+        apply (Callable[[Any], Any]): applies what ``draft`` returned.
+        after (Tuple[str, ...]): steps that must be applied before this starts.
+            Each must be given before this step.
+        timeout (Optional[float]): seconds ``draft`` may take, overriding the
+            timeout given to :func:`run_llm_assist_steps`.
+    """
+
+    name: str
+    draft: Callable[[], Any]
+    apply: Callable[[Any], Any]
+    after: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class LLMAssistTiming:
+    """How one step went.
+
+    Attributes:
+        name (str): the step's name.
+        status (str): ``"applied"``, ``"failed"`` or ``"timed out"``.
+        started (float): seconds after the first step started that this did.
+        seconds (float): how long ``draft`` ran, or ran before it was given up on.
+        error (str): why the step failed or timed out, or "" when it was applied.
+    """
+
+    name: str
+    status: str
+    started: float
+    seconds: float
+    error: str = ""
+
+
+def run_llm_assist_steps(
+    steps: Sequence[LLMAssistStep],
+    *,
+    workers: int = DEFAULT_LLM_ASSIST_WORKERS,
+    timeout: Optional[float] = None,
+) -> List[LLMAssistTiming]:
+    """Draft every step as soon as it may start, and apply them in order.
+
+    Args:
+        steps (Sequence[LLMAssistStep]): the steps, in the order to apply them.
+        workers (int): how many drafts may run at once; 1 runs them in turn.
+        timeout (Optional[float]): seconds each draft may take, or None to wait
+            as long as it takes.
+
+    Returns:
+        List[LLMAssistTiming]: one timing for each step, in the order given.
+    """
+    index_by_name: Dict[str, int] = {}
+    for index, step in enumerate(steps):
+        if step.name in index_by_name:
+            raise ValueError(f"Two AI-assist steps are named {step.name!r}")
+        for name in step.after:
+            if name not in index_by_name:
+                raise ValueError(
+                    f"AI-assist step {step.name!r} runs after {name!r}, "
+                    "which is not given before it"
+                )
+        index_by_name[step.name] = index
+    requirements = [
+        max((index_by_name[name] for name in step.after), default=-1) for step in steps
+    ]
+
+    clock_start = time.monotonic()
+    started: Dict[int, float] = {}
+    finished: Dict[int, float] = {}
+    outcomes: Dict[int, Tuple[str, Any, str]] = {}
+    running: Dict[Future, int] = {}
+    timings: List[LLMAssistTiming] = []
+    next_to_apply = 0
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, int(workers)), thread_name_prefix="weaver-llm-assist"
+    )
+    try:
+        while next_to_apply < len(steps):
+            # Because every step's requirements are given before it, applying
+            # in order never waits on a step that has not been started.
+            for index, step in enumerate(steps):
+                if index in started or requirements[index] >= next_to_apply:
+                    continue
+                started[index] = time.monotonic()
+                running[executor.submit(step.draft)] = index
+
+            while next_to_apply in outcomes:
+                step = steps[next_to_apply]
+                status, value, error = outcomes.pop(next_to_apply)
+                if status == "drafted":
+                    try:
+                        step.apply(value)
+                        status = "applied"
+                    except Exception as exc:
+                        status, error = "failed", repr(exc)
+                timings.append(
+                    LLMAssistTiming(
+                        name=step.name,
+                        status=status,
+                        started=started[next_to_apply] - clock_start,
+                        seconds=finished[next_to_apply] - started[next_to_apply],
+                        error=error,
+                    )
+                )
+                next_to_apply += 1
+            if next_to_apply >= len(steps) or not running:
+                continue
+
+            deadlines = [
+                started[index] + limit
+                for index in running.values()
+                for limit in [_step_timeout(steps[index], timeout)]
+                if limit is not None
+            ]
+            wait_for = (
+                max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            )
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in done:
+                index = running.pop(future)
+                finished[index] = now
+                try:
+                    outcomes[index] = ("drafted", future.result(), "")
+                except Exception as exc:
+                    outcomes[index] = ("failed", None, repr(exc))
+            for future, index in list(running.items()):
+                limit = _step_timeout(steps[index], timeout)
+                if limit is not None and now - started[index] >= limit:
+                    # The thread cannot be stopped, but its answer is never
+                    # applied, so it can no longer change the interview.
+                    future.cancel()
+                    del running[future]
+                    finished[index] = now
+                    outcomes[index] = (
+                        "timed out",
+                        None,
+                        f"no answer within {limit:g} seconds",
+                    )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return timings
+
+
+def _step_timeout(step: LLMAssistStep, timeout: Optional[float]) -> Optional[float]:
+    limit = step.timeout if step.timeout is not None else timeout
+    if limit is None or limit <= 0:
+        return None
+    return float(limit)
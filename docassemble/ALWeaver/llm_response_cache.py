@@ -0,0 +1,371 @@
+# do not pre-load
+
+"""Remember what the model answered, so the same request is only paid for once.
+
+Drafting the same form again, or retrying a generation that timed out, sends
+the model the same prompts it has already answered: the metadata, label and
+grouping requests for a template, the plain-language rewrite of a sentence that
+appears on every form in a court's library, the editor's screen drafts.
+:func:`cached_llms` wraps ``docassemble.ALToolbox.llms`` so that
+``chat_completion`` and ``classify_text`` look each request up first, keyed by
+a SHA-256 of everything that shapes the answer -- model, system prompt, user
+message, JSON mode and the rest of the arguments.
+
+Where answers are kept is set by ``weaver llm cache`` under ``assembly line``
+in the configuration: ``redis`` (the default) shares them between every worker
+of the server, ``sqlite`` keeps them in the file named by ``weaver llm cache
+path``, ``memory`` keeps them in this process and ``off`` turns caching off.
+Answers are kept for ``weaver llm cache seconds`` and at most ``weaver llm
+cache max entries`` of them, dropping the least recently used first.
+
+A request that wants a fresh answer passes ``bypass=True``: the model is asked
+again and its new answer replaces the one kept. Failed requests, empty answers
+and a classification that fell back to its ``default_response`` are never kept.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+__all__ = [
+    "DEFAULT_CACHE_MAX_ENTRIES",
+    "DEFAULT_CACHE_SECONDS",
+    "CachedLLMs",
+    "MemoryResponseCache",
+    "RedisResponseCache",
+    "ResponseCache",
+    "SqliteResponseCache",
+    "cached_llms",
+    "clear_llm_response_cache_stats",
+    "configured_response_cache",
+    "llm_response_cache_stats",
+    "response_cache_key",
+    "set_response_cache",
+]
+
+#: How long an answer is kept. A prompt that has not changed in a month gets
+#: the same answer it got then, so there is no reason to keep them shorter.
+DEFAULT_CACHE_SECONDS = 30 * 24 * 60 * 60
+
+#: How many answers are kept. Most are a few kilobytes of JSON.
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+
+_CACHED_METHODS = ("chat_completion", "classify_text")
+
+
+class ResponseCache(ABC):
+    """Where answers are kept: a key-value store of JSON text."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """The answer kept under ``key``, or None if there is none."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Keep ``value`` under ``key``."""
+
+
+class MemoryResponseCache(ResponseCache):
+    """Answers kept in this process only."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_CACHE_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.time())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisResponseCache(ResponseCache):
+    """Answers kept in Redis, shared by every process of the server.
+
+    Each answer expires on its own after ``ttl_seconds``. A sorted set of keys
+    by last use bounds how many are kept.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        ttl_seconds: float = DEFAULT_CACHE_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        prefix: str = "da:weaver:llm_response:",
+    ) -> None:
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self.index_key = prefix + "index"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.redis.get(self.prefix + key)
+        if value is None:
+            return None
+        self.redis.zadd(self.index_key, {key: time.time()})
+        return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        self.redis.set(self.prefix + key, value, ex=max(1, int(self.ttl_seconds)))
+        self.redis.zadd(self.index_key, {key: now})
+        # Members whose answer has expired are only bookkeeping by now
+        self.redis.zremrangebyscore(self.index_key, 0, now - self.ttl_seconds)
+        excess = int(self.redis.zcard(self.index_key)) - self.max_entries
+        if excess > 0:
+            evicted = [
+                item.decode("utf-8") if isinstance(item, bytes) else str(item)
+                for item in self.redis.zrange(self.index_key, 0, excess - 1)
+            ]
+            if evicted:
+                self.redis.delete(*[self.prefix + item for item in evicted])
+                self.redis.zrem(self.index_key, *evicted)
+
+
+class SqliteResponseCache(ResponseCache):
+    """Answers kept in an SQLite file, for a server without a shared Redis."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = DEFAULT_CACHE_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (now, key)
+            )
+            return str(row[0])
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE stored_at < ?", (now - self.ttl_seconds,)
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "bypassed": 0, "errors": 0}
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def llm_response_cache_stats() -> Dict[str, float]:
+    """Hits, misses, bypassed requests and cache errors in this process.
+
+    ``hit_rate`` is the share of looked-up requests that were answered from
+    the cache.
+    """
+    with _stats_lock:
+        stats: Dict[str, float] = dict(_stats)
+    looked_up = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / looked_up if looked_up else 0.0
+    return stats
+
+
+def clear_llm_response_cache_stats() -> None:
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def response_cache_key(method: str, arguments: Mapping[str, Any]) -> str:
+    """A SHA-256 of the method and every argument that shapes its answer."""
+    canonical = json.dumps(
+        [method, dict(arguments)], sort_keys=True, ensure_ascii=False, default=repr
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CachedLLMs:
+    """``docassemble.ALToolbox.llms`` with its answers remembered.
+
+    Everything but ``chat_completion`` and ``classify_text`` is passed
+    straight through, so this can stand in for the module anywhere.
+    """
+
+    def __init__(self, llms: Any, cache: ResponseCache, bypass: bool = False):
+        self._llms = llms
+        self._cache = cache
+        self._bypass = bypass
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._llms, name)
+        if name not in _CACHED_METHODS or not callable(attribute):
+            return attribute
+
+        def cached_call(*args: Any, **kwargs: Any) -> Any:
+            if args:
+                return attribute(*args, **kwargs)
+            return self._call(name, attribute, kwargs)
+
+        return cached_call
+
+    def _call(self, name: str, method: Any, kwargs: Dict[str, Any]) -> Any:
+        key = response_cache_key(name, kwargs)
+        if self._bypass:
+            _count("bypassed")
+        else:
+            try:
+                stored = self._cache.get(key)
+            except Exception:
+                _count("errors")
+                stored = None
+            if stored is not None:
+                _count("hits")
+                return json.loads(stored)
+            _count("misses")
+        response = method(**kwargs)
+        if response is None or response == "" or response == {}:
+            return response
+        if name == "classify_text" and response == kwargs.get("default_response"):
+            # The fallback also stands in for a request that failed
+            return response
+        try:
+            self._cache.set(key, json.dumps(response, ensure_ascii=False))
+        except Exception:
+            # Not JSON, or the cache is unreachable; either way the answer stands
+            _count("errors")
+        return response
+
+
+_configured_lock = threading.Lock()
+_configured: Dict[str, Any] = {}
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Use ``cache`` from now on, or no cache at all for None."""
+    with _configured_lock:
+        _configured["cache"] = cache
+
+
+def configured_response_cache() -> Optional[ResponseCache]:
+    """The cache the configuration asks for, built the first time it is needed."""
+    with _configured_lock:
+        if "cache" not in _configured:
+            _configured["cache"] = _response_cache_from_config()
+        return _configured["cache"]
+
+
+def _response_cache_from_config() -> Optional[ResponseCache]:
+    try:
+        from docassemble.base.util import get_config
+
+        settings = get_config("assembly line", {}) or {}
+    except Exception:
+        settings = {}
+    backend = str(settings.get("weaver llm cache") or "redis").strip().lower()
+    try:
+        ttl_seconds = float(
+            settings.get("weaver llm cache seconds") or DEFAULT_CACHE_SECONDS
+        )
+        max_entries = int(
+            settings.get("weaver llm cache max entries") or DEFAULT_CACHE_MAX_ENTRIES
+        )
+    except (TypeError, ValueError):
+        ttl_seconds, max_entries = DEFAULT_CACHE_SECONDS, DEFAULT_CACHE_MAX_ENTRIES
+    if backend in {"off", "none", "false", "no"}:
+        return None
+    if backend == "memory":
+        return MemoryResponseCache(ttl_seconds, max_entries)
+    if backend == "sqlite":
+        path = str(
+            settings.get("weaver llm cache path")
+            or os.path.join(tempfile.gettempdir(), "alweaver-llm-cache.sqlite3")
+        )
+        try:
+            return SqliteResponseCache(path, ttl_seconds, max_entries)
+        except (OSError, sqlite3.Error):
+            return None
+    try:
+        from .docassemble_compat import get_redis_client
+
+        return RedisResponseCache(get_redis_client(), ttl_seconds, max_entries)
+    except Exception:
+        # Outside a Docassemble server there is no Redis to share
+        return None
+
+
+def cached_llms(llms: Any, *, bypass: bool = False) -> Any:
+    """``llms`` wrapped in the configured cache, or ``llms`` itself without one.
+
+    Args:
+        llms (Any): the ``docassemble.ALToolbox.llms`` module, or None.
+        bypass (bool): ask the model again and keep its new answer.
+    """
+    if llms is None:
+        return None
+    cache = configured_response_cache()
+    if cache is None:
+        return llms
+    return CachedLLMs(llms, cache, bypass=bypass)
@@ -0,0 +1,96 @@
+# do not pre-load
+
+"""Parse each revision of an interview's source once, however often it is asked for.
+
+Almost every editor request reads a playground YAML file and parses all of it:
+one ``yaml.safe_load`` per document, then titles, tags and editor objects for
+each block. The text usually has not changed since the last request, so the
+block model and the :class:`~.source_document.SourceDocument` built from it are
+kept here, keyed by the source's SHA-256 revision. The block model also keeps
+each YAML document's parse under that document's own revision, so after an
+edit to one block only that block is parsed again.
+
+Callers are free to change what they are given, so every hit is a deep copy of
+the cached value; copying parsed YAML is several times cheaper than parsing it.
+Entries are weighed by the length of their source and the least recently used
+are dropped once the total passes :data:`MAX_CACHED_SOURCE_CHARACTERS`.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+__all__ = [
+    "MAX_CACHED_SOURCE_CHARACTERS",
+    "cached_parse",
+    "clear_parsed_source_cache",
+    "parsed_source_cache_stats",
+]
+
+#: The total length of source text whose parsed forms are kept. A parsed model
+#: takes several times the memory of its text, so this bounds the cache at a
+#: few tens of megabytes.
+MAX_CACHED_SOURCE_CHARACTERS = 8 * 1024 * 1024
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "characters": 0}
+
+
+def cached_parse(key: Hashable, raw_text: str, parse: Callable[[], Any]) -> Any:
+    """Return a private copy of ``parse()``'s result for ``key``.
+
+    Args:
+        key (Hashable): identifies the parse, and must include the source's
+            revision so a changed source is never answered from the cache.
+        raw_text (str): the source being parsed, used to weigh the entry.
+        parse (Callable[[], Any]): does the parse on a miss.
+
+    Returns:
+        Any: a value the caller may change without affecting later callers.
+    """
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            cached = entry[0]
+    if entry is not None:
+        return copy.deepcopy(cached)
+
+    value = parse()
+    weight = len(raw_text)
+    if weight > MAX_CACHED_SOURCE_CHARACTERS:
+        with _lock:
+            _stats["misses"] += 1
+        return value
+    stored = copy.deepcopy(value)
+    with _lock:
+        _stats["misses"] += 1
+        previous = _entries.pop(key, None)
+        if previous is not None:
+            _stats["characters"] -= previous[1]
+        _entries[key] = (stored, weight)
+        _stats["characters"] += weight
+        while _stats["characters"] > MAX_CACHED_SOURCE_CHARACTERS:
+            _, (_, evicted_weight) = _entries.popitem(last=False)
+            _stats["characters"] -= evicted_weight
+            _stats["evictions"] += 1
+    return value
+
+
+def parsed_source_cache_stats() -> Dict[str, int]:
+    """Hit, miss and eviction counts, and how many entries and characters are held."""
+    with _lock:
+        return dict(_stats, entries=len(_entries))
+
+
+def clear_parsed_source_cache() -> None:
+    """Forget every parsed source, for tests and for freeing memory."""
+    with _lock:
+        _entries.clear()
+        for name in _stats:
+            _stats[name] = 0
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import hashlib
+import io
 import os
 import re
 import shutil
 import subprocess
 import tempfile
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import yaml
 
 from .docassemble_compat import create_saved_file
+from .text_merge import MergeDeclined, merge_three_way
 
 __all__ = [
     "create_project",
@@ -46,6 +62,11 @@ SECTION_TO_STORAGE = {
     "modules": "playgroundmodules",
 }
 
+# Files changed on both sides of a pull are merged this many at a time. Most
+# merge in process, so this mainly overlaps reading them and the occasional
+# ``git merge-file`` for a file the in-process merge leaves to git.
+_MERGE_WORKERS = 4
+
 
 def normalize_project_name(
     raw_name: Optional[str], *, fallback: str = "ALWeaverProject"
@@ -292,11 +313,15 @@ def record_project_github_sync(
 
 
 def _snapshot_project_files(
-    files: Dict[str, bytes],
-) -> Tuple[str, Dict[Tuple[str, str], bytes]]:
-    """Translate a docassemble repository tree into Playground section files."""
-    roots: Dict[str, Dict[Tuple[str, str], bytes]] = {}
-    for path, content in files.items():
+    files: Mapping[str, bytes],
+) -> Tuple[str, Dict[Tuple[str, str], str]]:
+    """Translate a docassemble repository tree into Playground section files.
+
+    Returns the package name and, for each Playground file, the repository
+    path its content is at in ``files``; no content is read.
+    """
+    roots: Dict[str, Dict[Tuple[str, str], str]] = {}
+    for path in files:
         if re.fullmatch(
             r"docassemble/[^/]+/data/(questions|templates|static|sources)/.+/.+",
             path,
@@ -311,12 +336,12 @@ def _snapshot_project_files(
         )
         if match:
             package, section, filename = match.groups()
-            roots.setdefault(package, {})[(section, filename)] = content
+            roots.setdefault(package, {})[(section, filename)] = path
             continue
         match = re.fullmatch(r"docassemble/([^/]+)/([^/]+\.py)", path)
         if match and match.group(2) != "__init__.py":
             package, filename = match.groups()
-            roots.setdefault(package, {})[("modules", filename)] = content
+            roots.setdefault(package, {})[("modules", filename)] = path
     candidates = [
         (name, data)
         for name, data in roots.items()
@@ -329,10 +354,41 @@ def _snapshot_project_files(
     return candidates[0]
 
 
+def _snapshot_digest(files: Mapping[str, bytes], path: str) -> str:
+    """The SHA-256 of a snapshot file, without reading it when it is known."""
+    digest = getattr(files, "digest", None)
+    if digest is not None:
+        return digest(path)
+    return hashlib.sha256(files[path]).hexdigest()
+
+
+def _open_snapshot_file(files: Mapping[str, bytes], path: str) -> BinaryIO:
+    opener = getattr(files, "open", None)
+    if opener is not None:
+        return opener(path)
+    return io.BytesIO(files[path])
+
+
+def close_github_snapshot(snapshot: Dict[str, Any]) -> None:
+    """Remove the on-disk copy of a snapshot's files, if it has one."""
+    close = getattr(snapshot.get("files"), "close", None)
+    if close is not None:
+        close()
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def _project_section_files(
     user_id: int, project_name: str
-) -> Dict[Tuple[str, str], bytes]:
-    result: Dict[Tuple[str, str], bytes] = {}
+) -> Dict[Tuple[str, str], str]:
+    """Where each of a project's Playground files is on disk."""
+    result: Dict[Tuple[str, str], str] = {}
     for section, storage in SECTION_TO_STORAGE.items():
         area = create_saved_file(user_id, fix=True, section=storage)
         directory = _directory_for(area, project_name)
@@ -341,8 +397,7 @@ def _project_section_files(
         for filename in os.listdir(directory):
             path = os.path.join(directory, filename)
             if not filename.startswith(".") and os.path.isfile(path):
-                with open(path, "rb") as stream:
-                    result[(section, filename)] = stream.read()
+                result[(section, filename)] = path
     return result
 
 
@@ -350,59 +405,80 @@ def _apply_project_files(
     *,
     user_id: int,
     project_name: str,
-    previous: Dict[Tuple[str, str], bytes],
-    merged: Dict[Tuple[str, str], bytes],
+    deleted: Iterable[Tuple[str, str]],
+    written: Dict[Tuple[str, str], Callable[[], BinaryIO]],
 ) -> None:
+    """Remove the ``deleted`` files and write each ``written`` one.
+
+    A written file's content comes from the stream its callable opens, so
+    only one file is copied at a time.
+    """
+    deleted = set(deleted)
     for section, storage in SECTION_TO_STORAGE.items():
         area = create_saved_file(user_id, fix=True, section=storage)
         directory = _directory_for(area, project_name)
         os.makedirs(directory, exist_ok=True)
-        for key in [key for key in previous if key[0] == section and key not in merged]:
+        for key in [key for key in deleted if key[0] == section]:
             path = os.path.join(directory, key[1])
             if os.path.isfile(path):
                 os.remove(path)
-        for key, content in merged.items():
-            if key[0] != section or previous.get(key) == content:
+        for key, open_content in written.items():
+            if key[0] != section:
                 continue
-            with open(os.path.join(directory, key[1]), "wb") as stream:
-                stream.write(content)
+            with open_content() as source, open(
+                os.path.join(directory, key[1]), "wb"
+            ) as target:
+                shutil.copyfileobj(source, target)
         area.finalize()
 
 
 def import_github_snapshot(
     *, user_id: int, project_name: str, snapshot: Dict[str, Any]
 ) -> Dict[str, Any]:
-    package, imported = _snapshot_project_files(snapshot["files"])
-    _apply_project_files(
-        user_id=user_id, project_name=project_name, previous={}, merged=imported
-    )
-    prepare_project_github_package(
-        user_id=user_id,
-        project_name=project_name,
-        package_name=package,
-        github_url=str(snapshot["url"]),
-    )
-    record_project_github_sync(
-        user_id=user_id,
-        project_name=project_name,
-        package_name=package,
-        repository_url=str(snapshot["url"]),
-        branch=str(snapshot["branch"]),
-        commit_sha=str(snapshot["sha"]),
-    )
-    interviews = sorted(
-        filename for (section, filename) in imported if section == "questions"
-    )
-    return {
-        "package": package,
-        "filename": interviews[0],
-        "files_imported": len(imported),
-    }
+    """Write a repository snapshot into a new Playground project.
 
+    The snapshot's files are closed once they have been copied, whether or
+    not the import succeeds.
+    """
+    try:
+        files = snapshot["files"]
+        package, imported = _snapshot_project_files(files)
+        _apply_project_files(
+            user_id=user_id,
+            project_name=project_name,
+            deleted=(),
+            written={
+                key: partial(_open_snapshot_file, files, path)
+                for key, path in imported.items()
+            },
+        )
+        prepare_project_github_package(
+            user_id=user_id,
+            project_name=project_name,
+            package_name=package,
+            github_url=str(snapshot["url"]),
+        )
+        record_project_github_sync(
+            user_id=user_id,
+            project_name=project_name,
+            package_name=package,
+            repository_url=str(snapshot["url"]),
+            branch=str(snapshot["branch"]),
+            commit_sha=str(snapshot["sha"]),
+        )
+        interviews = sorted(
+            filename for (section, filename) in imported if section == "questions"
+        )
+        return {
+            "package": package,
+            "filename": interviews[0],
+            "files_imported": len(imported),
+        }
+    finally:
+        close_github_snapshot(snapshot)
 
-def _merge_file_content(local: bytes, base: bytes, remote: bytes) -> Optional[bytes]:
-    if b"\x00" in local + base + remote:
-        return None
+
+def _git_merge_file(local: bytes, base: bytes, remote: bytes) -> Optional[bytes]:
     directory = tempfile.mkdtemp(prefix="weaver-merge-")
     try:
         paths = [os.path.join(directory, name) for name in ("local", "base", "remote")]
@@ -424,6 +500,23 @@ def _merge_file_content(local: bytes, base: bytes, remote: bytes) -> Optional[by
         shutil.rmtree(directory, ignore_errors=True)
 
 
+def _merge_file_content(local: bytes, base: bytes, remote: bytes) -> Optional[bytes]:
+    if b"\x00" in local + base + remote:
+        return None
+    try:
+        return merge_three_way(local, base, remote)
+    except MergeDeclined:
+        return _git_merge_file(local, base, remote)
+
+
+def _merge_project_file(
+    local_path: str, base_value: bytes, remote_value: bytes
+) -> Optional[bytes]:
+    with open(local_path, "rb") as stream:
+        local_value = stream.read()
+    return _merge_file_content(local_value, base_value, remote_value)
+
+
 def merge_github_snapshot(
     *,
     user_id: int,
@@ -432,58 +525,98 @@ def merge_github_snapshot(
     remote_snapshot: Dict[str, Any],
     sync: Dict[str, Any],
 ) -> Dict[str, Any]:
-    """Three-way merge a remote repository into a Playground project."""
-    base_package, base = _snapshot_project_files(base_snapshot["files"])
-    remote_package, remote = _snapshot_project_files(remote_snapshot["files"])
-    if base_package != remote_package or base_package != sync["package"]:
-        raise ValueError("The GitHub repository package no longer matches this project")
-    local = _project_section_files(user_id, project_name)
-    merged: Dict[Tuple[str, str], bytes] = {}
-    conflicts: List[str] = []
-    for key in sorted(set(base) | set(local) | set(remote)):
-        base_value = base.get(key)
-        local_value = local.get(key)
-        remote_value = remote.get(key)
-        if local_value == remote_value:
-            value = local_value
-        elif local_value == base_value:
-            value = remote_value
-        elif remote_value == base_value:
-            value = local_value
-        elif base_value is None or local_value is None or remote_value is None:
-            value = None
-            conflicts.append(f"{key[0]}/{key[1]}")
-        else:
-            value = _merge_file_content(local_value, base_value, remote_value)
-            if value is None:
+    """Three-way merge a remote repository into a Playground project.
+
+    The three versions of each file are compared by digest. Only a file that
+    changed on both sides, differently, is read into memory to be merged, and
+    those files are merged side by side. Both snapshots' files are closed
+    before this returns.
+    """
+    try:
+        base_files = base_snapshot["files"]
+        remote_files = remote_snapshot["files"]
+        base_package, base = _snapshot_project_files(base_files)
+        remote_package, remote = _snapshot_project_files(remote_files)
+        if base_package != remote_package or base_package != sync["package"]:
+            raise ValueError(
+                "The GitHub repository package no longer matches this project"
+            )
+        local = _project_section_files(user_id, project_name)
+        base_digests = {
+            key: _snapshot_digest(base_files, path) for key, path in base.items()
+        }
+        remote_digests = {
+            key: _snapshot_digest(remote_files, path) for key, path in remote.items()
+        }
+        local_digests = {key: _file_digest(path) for key, path in local.items()}
+
+        deleted: List[Tuple[str, str]] = []
+        written: Dict[Tuple[str, str], Callable[[], BinaryIO]] = {}
+        kept = 0
+        conflicts: List[str] = []
+        both_changed: List[Tuple[str, str]] = []
+        for key in sorted(set(base) | set(local) | set(remote)):
+            base_digest = base_digests.get(key)
+            local_digest = local_digests.get(key)
+            remote_digest = remote_digests.get(key)
+            if local_digest == remote_digest or remote_digest == base_digest:
+                kept += local_digest is not None
+            elif local_digest == base_digest:
+                if remote_digest is None:
+                    deleted.append(key)
+                else:
+                    written[key] = partial(
+                        _open_snapshot_file, remote_files, remote[key]
+                    )
+                    kept += 1
+            elif base_digest is None or local_digest is None or remote_digest is None:
                 conflicts.append(f"{key[0]}/{key[1]}")
-        if value is not None:
-            merged[key] = value
-    if conflicts:
-        return {"merged": False, "conflicts": conflicts}
-    _apply_project_files(
-        user_id=user_id, project_name=project_name, previous=local, merged=merged
-    )
-    prepare_project_github_package(
-        user_id=user_id,
-        project_name=project_name,
-        package_name=sync["package"],
-        github_url=sync["repository_url"],
-    )
-    record_project_github_sync(
-        user_id=user_id,
-        project_name=project_name,
-        package_name=sync["package"],
-        repository_url=sync["repository_url"],
-        branch=str(remote_snapshot["branch"]),
-        commit_sha=str(remote_snapshot["sha"]),
-    )
-    return {
-        "merged": True,
-        "conflicts": [],
-        "files": len(merged),
-        "commit": remote_snapshot["sha"],
-    }
+            else:
+                both_changed.append(key)
+        if both_changed:
+            with ThreadPoolExecutor(
+                max_workers=min(_MERGE_WORKERS, len(both_changed))
+            ) as executor:
+                merged = executor.map(
+                    lambda key: _merge_project_file(
+                        local[key], base_files[base[key]], remote_files[remote[key]]
+                    ),
+                    both_changed,
+                )
+                for key, value in zip(both_changed, merged):
+                    if value is None:
+                        conflicts.append(f"{key[0]}/{key[1]}")
+                    else:
+                        written[key] = partial(io.BytesIO, value)
+                        kept += 1
+        if conflicts:
+            return {"merged": False, "conflicts": sorted(conflicts)}
+        _apply_project_files(
+            user_id=user_id, project_name=project_name, deleted=deleted, written=written
+        )
+        prepare_project_github_package(
+            user_id=user_id,
+            project_name=project_name,
+            package_name=sync["package"],
+            github_url=sync["repository_url"],
+        )
+        record_project_github_sync(
+            user_id=user_id,
+            project_name=project_name,
+            package_name=sync["package"],
+            repository_url=sync["repository_url"],
+            branch=str(remote_snapshot["branch"]),
+            commit_sha=str(remote_snapshot["sha"]),
+        )
+        return {
+            "merged": True,
+            "conflicts": [],
+            "files": kept,
+            "commit": remote_snapshot["sha"],
+        }
+    finally:
+        close_github_snapshot(base_snapshot)
+        close_github_snapshot(remote_snapshot)
 
 
 def get_list_of_projects(user_id: int) -> List[str]:
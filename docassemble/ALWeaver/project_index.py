@@ -0,0 +1,163 @@
+# do not pre-load
+
+"""What each YAML file in a Playground project includes, declares and defines.
+
+Drafting or syncing a review screen works out which files make up the
+interview by following `include:` directives up and down the whole project, and
+importing a template asks which variables the interview already defines. Both
+used to parse every file again on every request. A :class:`ProjectIndex` keeps
+those facts per file, keyed by the file's revision, and the editor updates it
+as it saves, so after an edit only the saved file is scanned again.
+
+The Playground page, a GitHub pull or another worker can change a file behind
+this process's back, so the index does not stand in for reading a file: each
+lookup passes the text just read, and an entry whose revision no longer matches
+is scanned again rather than trusted. Reading a file is cheap; parsing it is
+what the index saves.
+
+Indexes live in this process only. The least recently used project's index is
+dropped once :data:`MAX_INDEXED_PROJECTS` are held.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .review_screen_sync import _declared_object_names, _include_targets
+from .source_document import source_revision
+
+__all__ = [
+    "MAX_INDEXED_PROJECTS",
+    "IndexedFile",
+    "ProjectIndex",
+    "clear_project_indexes",
+    "forget_project_file",
+    "note_saved_file",
+    "project_index",
+]
+
+#: Projects whose index is kept. An index holds a few names per file, so this
+#: bounds the total at a few megabytes even for large projects.
+MAX_INDEXED_PROJECTS = 256
+
+
+@dataclass
+class IndexedFile:
+    """The facts about one revision of one file."""
+
+    revision: str
+    #: Project files named by the file's `include:` blocks, in order.
+    includes: Tuple[str, ...]
+    #: Every object named in one of the file's `objects:` blocks.
+    declared_objects: FrozenSet[str]
+    #: Variable roots the file has a way to define; worked out on first use,
+    #: since only importing a template asks for them.
+    defined_variables: Optional[FrozenSet[str]] = None
+
+
+class ProjectIndex:
+    """The indexed facts for the YAML files of one project."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._files: Dict[str, IndexedFile] = {}
+
+    def entry(self, filename: str, text: str) -> IndexedFile:
+        """The facts for ``filename``, whose current content is ``text``.
+
+        Scans the text only when it is not the revision already indexed.
+        """
+        revision = source_revision(text)
+        with self._lock:
+            entry = self._files.get(filename)
+        if entry is not None and entry.revision == revision:
+            return entry
+        entry = IndexedFile(
+            revision=revision,
+            includes=tuple(_include_targets(text)),
+            declared_objects=frozenset(_declared_object_names([text])),
+        )
+        with self._lock:
+            self._files[filename] = entry
+        return entry
+
+    def includes(self, filename: str, text: str) -> List[str]:
+        """Project files ``filename`` includes, in the order it lists them."""
+        return list(self.entry(filename, text).includes)
+
+    def declared_objects(self, filename: str, text: str) -> Set[str]:
+        """Objects ``filename`` declares in an `objects:` block."""
+        return set(self.entry(filename, text).declared_objects)
+
+    def defined_variables(self, filename: str, text: str) -> Set[str]:
+        """Variable roots ``filename`` already has a way to define.
+
+        See :func:`~.template_analysis.interview_defined_variables`.
+        """
+        entry = self.entry(filename, text)
+        if entry.defined_variables is None:
+            # Imported here: template analysis pulls in the whole generator.
+            from .template_analysis import interview_defined_variables
+
+            entry.defined_variables = frozenset(interview_defined_variables(text))
+        return set(entry.defined_variables)
+
+    def forget(self, filename: str) -> None:
+        """Drop ``filename``'s entry, for a file that was renamed or deleted."""
+        with self._lock:
+            self._files.pop(filename, None)
+
+    def __contains__(self, filename: object) -> bool:
+        with self._lock:
+            return filename in self._files
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+
+_lock = threading.Lock()
+_indexes: "OrderedDict[Tuple[int, str], ProjectIndex]" = OrderedDict()
+
+
+def project_index(user_id: int, project: str) -> ProjectIndex:
+    """The index for one user's Playground project, created when first asked for."""
+    key = (user_id, project)
+    with _lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ProjectIndex()
+            while len(_indexes) > MAX_INDEXED_PROJECTS:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
+
+
+def note_saved_file(user_id: int, project: str, filename: str, text: str) -> None:
+    """Bring the index up to date with a file the editor just wrote.
+
+    Does nothing for a project with no index yet: one is built from the files
+    themselves the first time it is needed.
+    """
+    with _lock:
+        index = _indexes.get((user_id, project))
+    if index is not None:
+        index.entry(filename, text)
+
+
+def forget_project_file(user_id: int, project: str, filename: str) -> None:
+    """Drop a renamed or deleted file from its project's index, if there is one."""
+    with _lock:
+        index = _indexes.get((user_id, project))
+    if index is not None:
+        index.forget(filename)
+
+
+def clear_project_indexes() -> None:
+    """Forget every project's index, for tests and for freeing memory."""
+    with _lock:
+        _indexes.clear()
@@ -16,7 +16,9 @@ a traceback when it is not installed.
 What this module adds on top of the Dashboard's generator:
 
 * the whole interview, not one file: `include:` directives inside the project
-  are followed so variables asked in an included file are reviewed too;
+  are followed so variables asked in an included file are reviewed too, with
+  what each file includes kept in the project's
+  :class:`~.project_index.ProjectIndex` when the caller has one;
 * the interview's own identity: the drafted block keeps the `id`, `event` and
   `question` the interview already uses, so the download screen's "Edit answers"
   button and the navigation still point at it;
@@ -25,7 +27,20 @@ What this module adds on top of the Dashboard's generator:
 """
 
 import re
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from .project_index import ProjectIndex
 
 __all__ = [
     "ALDashboardUnavailable",
@@ -103,13 +118,18 @@ def _include_targets(yaml_text: str) -> List[str]:
 
 
 def project_include_chain(
-    read_file, filename: str, *, max_files: int = MAX_INCLUDED_FILES
+    read_file,
+    filename: str,
+    *,
+    max_files: int = MAX_INCLUDED_FILES,
+    index: Optional["ProjectIndex"] = None,
 ) -> List[str]:
     """Every project YAML file the interview pulls in, starting with itself.
 
     ``read_file`` takes a filename and returns its text. Files that cannot be
     read are skipped: an interview that includes a file from a package we cannot
-    see should still get a review screen for the parts we can.
+    see should still get a review screen for the parts we can. With an
+    ``index``, a file already indexed at the revision read is not parsed again.
     """
     ordered: List[str] = []
     seen: Set[str] = set()
@@ -124,40 +144,29 @@ def project_include_chain(
         except Exception:
             continue
         ordered.append(current)
-        for target in _include_targets(text):
+        targets = (
+            index.includes(current, text)
+            if index is not None
+            else _include_targets(text)
+        )
+        for target in targets:
             if target not in seen:
                 queue.append(target)
     return ordered
 
 
-def interview_scope(
+def _walk_scope(
     read_file,
     filename: str,
-    project_filenames: Optional[Sequence[str]] = None,
-    *,
-    max_files: int = MAX_INCLUDED_FILES,
-) -> Tuple[List[str], List[str]]:
-    """Work out which files make up the interview a review screen belongs to.
-
-    Review screens are very often kept in a file of their own -- `review.yml`,
-    `review_page.yml`, `review_screens.yml` -- that includes nothing and is
-    included *by* the interviews that use it. Drafting from that file alone
-    finds no questions at all, so the walk has to go up the include graph as
-    well as down: the scope is every file reachable from the root interviews
-    that pull this one in.
-
-    A review screen shared by several interviews is scoped to all of them,
-    which is what its author has to cover anyway.
-
-    Returns ``(roots, filenames)``. ``roots`` is empty when the file is its own
-    interview, in which case the scope is just its own include chain.
+    project_filenames: Optional[Sequence[str]],
+    max_files: int,
+    index: Optional["ProjectIndex"],
+) -> Tuple[List[str], List[str], Dict[str, Any]]:
+    """:func:`interview_scope`, plus the text of every file it read.
+
+    Each file is read once however many chains it is on, and the texts are
+    kept so collecting the interview does not read them all again.
     """
-    own_chain = project_include_chain(read_file, filename, max_files=max_files)
-    candidates = [str(name) for name in (project_filenames or []) if name]
-    if not candidates:
-        return [], own_chain
-
-    # Every candidate's chain is walked, so each file is read once and kept.
     texts: Dict[str, Any] = {}
 
     def cached_read(name: str) -> str:
@@ -171,9 +180,18 @@ def interview_scope(
             raise value
         return str(value)
 
+    own_chain = project_include_chain(
+        cached_read, filename, max_files=max_files, index=index
+    )
+    candidates = [str(name) for name in (project_filenames or []) if name]
+    if not candidates:
+        return [], own_chain, texts
+
     cache: Dict[str, List[str]] = {}
     for name in candidates:
-        cache[name] = project_include_chain(cached_read, name, max_files=max_files)
+        cache[name] = project_include_chain(
+            cached_read, name, max_files=max_files, index=index
+        )
     cache.setdefault(filename, own_chain)
 
     included_by_something: Set[str] = set()
@@ -186,14 +204,43 @@ def interview_scope(
         if name not in included_by_something and filename in cache.get(name, [])
     ]
     if not roots:
-        return [], own_chain
+        return [], own_chain, texts
 
     ordered: List[str] = []
     for root in roots:
         for name in cache[root]:
             if name not in ordered:
                 ordered.append(name)
-    return roots, ordered[:max_files]
+    return roots, ordered[:max_files], texts
+
+
+def interview_scope(
+    read_file,
+    filename: str,
+    project_filenames: Optional[Sequence[str]] = None,
+    *,
+    max_files: int = MAX_INCLUDED_FILES,
+    index: Optional["ProjectIndex"] = None,
+) -> Tuple[List[str], List[str]]:
+    """Work out which files make up the interview a review screen belongs to.
+
+    Review screens are very often kept in a file of their own -- `review.yml`,
+    `review_page.yml`, `review_screens.yml` -- that includes nothing and is
+    included *by* the interviews that use it. Drafting from that file alone
+    finds no questions at all, so the walk has to go up the include graph as
+    well as down: the scope is every file reachable from the root interviews
+    that pull this one in.
+
+    A review screen shared by several interviews is scoped to all of them,
+    which is what its author has to cover anyway.
+
+    Returns ``(roots, filenames)``. ``roots`` is empty when the file is its own
+    interview, in which case the scope is just its own include chain.
+    """
+    roots, filenames, _texts = _walk_scope(
+        read_file, filename, project_filenames, max_files, index
+    )
+    return roots, filenames
 
 
 def collect_interview_yaml_texts(
@@ -202,19 +249,21 @@ def collect_interview_yaml_texts(
     project_filenames: Optional[Sequence[str]] = None,
     *,
     max_files: int = MAX_INCLUDED_FILES,
+    index: Optional["ProjectIndex"] = None,
 ) -> Tuple[List[str], List[str]]:
     """Return ``(filenames, yaml_texts)`` for the whole interview."""
-    _roots, filenames = interview_scope(
-        read_file, filename, project_filenames, max_files=max_files
+    _roots, filenames, read = _walk_scope(
+        read_file, filename, project_filenames, max_files, index
     )
     texts: List[str] = []
     kept: List[str] = []
     for name in filenames:
-        try:
-            texts.append(read_file(name))
-            kept.append(name)
-        except Exception:
+        # The walk only lists a file it managed to read
+        value = read.get(name)
+        if value is None or isinstance(value, Exception):
             continue
+        texts.append(str(value))
+        kept.append(name)
     return kept, texts
 
 
@@ -357,7 +406,9 @@ def _reviewed_list_names(source_yaml: str) -> List[str]:
     return names
 
 
-def inferred_objects_document(yaml_texts: Sequence[str]) -> Optional[str]:
+def inferred_objects_document(
+    yaml_texts: Sequence[str], declared_objects: Optional[Set[str]] = None
+) -> Optional[str]:
     """An `objects:` document for reviewable lists nothing in scope declares.
 
     AssemblyLine declares `plaintiffs`, `defendants` and `courts` in its own
@@ -369,8 +420,15 @@ def inferred_objects_document(yaml_texts: Sequence[str]) -> Optional[str]:
 
     The class name is a stand-in: it never reaches the file, and the generator
     only asks whether the type looks like a list.
+
+    ``declared_objects``, when the caller already knows them from the project
+    index, saves scanning ``yaml_texts`` for `objects:` blocks again.
     """
-    declared = _declared_object_names(yaml_texts)
+    declared = (
+        declared_objects
+        if declared_objects is not None
+        else _declared_object_names(yaml_texts)
+    )
     reviewed: List[str] = []
     for text in yaml_texts:
         for name in _reviewed_list_names(str(text or "")):
@@ -11,7 +11,11 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 import yaml
 from yaml.nodes import MappingNode, ScalarNode
 
+from .parsed_source_cache import cached_parse
+
 _DOCUMENT_SEPARATOR_RE = re.compile(r"(?m)^---[ \t]*(?:#[^\r\n]*)?(?:\r\n|\n|\r|$)")
+# Directives and document-end markers, which affect the documents after them
+_STREAM_MARKER_RE = re.compile(r"(?m)^(?:%|\.\.\.)")
 
 
 @dataclass(frozen=True)
@@ -128,92 +132,166 @@ def _block_id(document_index: int, start: int, raw_text: str, value: Any) -> str
     return f"block-{document_index}-{fingerprint}"
 
 
-def _property_ranges(
-    full_source: str, body_start: int, node: Optional[MappingNode]
-) -> Dict[str, SourceRange]:
-    ranges: Dict[str, SourceRange] = {}
+def _property_offsets(node: Optional[MappingNode]) -> Dict[str, Tuple[int, int]]:
+    offsets: Dict[str, Tuple[int, int]] = {}
     if not isinstance(node, MappingNode):
-        return ranges
+        return offsets
     for key_node, value_node in node.value:
         if not isinstance(key_node, ScalarNode):
             continue
         key = str(key_node.value)
-        start = body_start + value_node.start_mark.index
-        end = body_start + value_node.end_mark.index
-        if key not in ranges:
-            ranges[key] = _range(full_source, start, end)
-    return ranges
+        if key not in offsets:
+            offsets[key] = (value_node.start_mark.index, value_node.end_mark.index)
+    return offsets
 
 
-def parse_source_document(filename: str, raw_text: str) -> SourceDocument:
-    """Parse source for analysis while retaining every original character."""
-    documents: List[SourceBlock] = []
-    diagnostics: List[Diagnostic] = []
-    try:
-        # Structural validity belongs to the complete YAML stream. Directives
-        # and document markers can lose their meaning when a body is parsed in
-        # isolation, so sliced-block parsing below is analysis-only.
-        list(yaml.compose_all(raw_text))
-    except yaml.YAMLError as exc:
-        mark = getattr(exc, "problem_mark", None)
-        error_start = getattr(mark, "index", 0) or 0
-        diagnostics.append(
-            Diagnostic(
-                severity="error",
-                message=str(exc),
-                filename=filename,
-                source_range=_range(raw_text, error_start, error_start),
+def _analyse_document(body: str) -> Dict[str, Any]:
+    """Parse one document body, with offsets relative to the body's start."""
+    parsed_value: Any = None
+    node = None
+    composed = True
+    load_error: Optional[str] = None
+    unsupported_reasons: List[str] = []
+    if not body.strip():
+        unsupported_reasons.append("empty document")
+    else:
+        try:
+            node = yaml.compose(body)
+        except yaml.YAMLError:
+            composed = False
+            unsupported_reasons.append(
+                "document cannot be mapped safely outside its YAML stream context"
             )
-        )
-    for document_index, (start, end, body) in enumerate(_document_bodies(raw_text)):
-        parsed_value: Any = None
-        node = None
-        unsupported_reasons: List[str] = []
-        if not body.strip():
-            unsupported_reasons.append("empty document")
-        else:
+        if node is not None:
             try:
-                node = yaml.compose(body)
-            except yaml.YAMLError:
+                parsed_value = yaml.safe_load(body)
+            except yaml.YAMLError as exc:
                 unsupported_reasons.append(
-                    "document cannot be mapped safely outside its YAML stream context"
+                    "YAML tags or values are not supported by the graphical parser"
                 )
-            if node is not None:
-                try:
-                    parsed_value = yaml.safe_load(body)
-                except yaml.YAMLError as exc:
-                    unsupported_reasons.append(
-                        "YAML tags or values are not supported by the graphical parser"
-                    )
-                    diagnostics.append(
-                        Diagnostic(
-                            severity="warning",
-                            message=str(exc),
-                            filename=filename,
-                            source_range=_range(raw_text, start, end),
-                        )
-                    )
-        if node is not None and not isinstance(node, MappingNode):
-            unsupported_reasons.append("top-level document is not a mapping")
-        block_id = _block_id(document_index, start, body, parsed_value)
+                load_error = str(exc)
+    if node is not None and not isinstance(node, MappingNode):
+        unsupported_reasons.append("top-level document is not a mapping")
+    return {
+        "composed": composed,
+        "parsed_value": parsed_value,
+        "load_error": load_error,
+        "supported": bool(
+            isinstance(node, MappingNode)
+            and isinstance(parsed_value, dict)
+            and not unsupported_reasons
+        ),
+        "unsupported_reasons": unsupported_reasons,
+        "property_offsets": _property_offsets(
+            node if isinstance(node, MappingNode) else None
+        ),
+    }
+
+
+def _stream_still_valid(
+    previous: Optional[SourceDocument],
+    bodies: Sequence[Tuple[int, int, str]],
+    analyses: Sequence[Dict[str, Any]],
+) -> bool:
+    """Whether the stream is known to compose without composing it again.
+
+    True when the previous revision composed, the separators still split the
+    source into as many documents, and every document whose text changed
+    composes on its own and carries no directive or document-end marker --
+    the only constructs whose meaning reaches past a ``---`` separator.
+    """
+    if previous is None or not previous.structurally_valid:
+        return False
+    if len(previous.documents) != len(bodies):
+        return False
+    for before, (_start, _end, body), analysis in zip(
+        previous.documents, bodies, analyses
+    ):
+        if before.raw_text == body:
+            continue
+        if not analysis["composed"] or _STREAM_MARKER_RE.search(body):
+            return False
+    return True
+
+
+def parse_source_document(
+    filename: str, raw_text: str, previous: Optional[SourceDocument] = None
+) -> SourceDocument:
+    """Parse source for analysis while retaining every original character.
+
+    Each document is parsed once per revision of its own text. Given the
+    ``previous`` revision of the same file, the whole stream is only composed
+    again when an edit could have changed how it divides into documents.
+    """
+    return cached_parse(
+        ("source_document", filename, source_revision(raw_text)),
+        raw_text,
+        lambda: _parse_source_document(filename, raw_text, previous),
+    )
+
+
+def _parse_source_document(
+    filename: str, raw_text: str, previous: Optional[SourceDocument] = None
+) -> SourceDocument:
+    documents: List[SourceBlock] = []
+    diagnostics: List[Diagnostic] = []
+    bodies = _document_bodies(raw_text)
+    analyses = [
+        cached_parse(
+            ("source_block", source_revision(body)),
+            body,
+            lambda: _analyse_document(body),
+        )
+        for _start, _end, body in bodies
+    ]
+    if not _stream_still_valid(previous, bodies, analyses):
+        try:
+            # Structural validity belongs to the complete YAML stream.
+            # Directives and document markers can lose their meaning when a
+            # body is parsed in isolation, so sliced-block parsing below is
+            # analysis-only.
+            list(yaml.compose_all(raw_text))
+        except yaml.YAMLError as exc:
+            mark = getattr(exc, "problem_mark", None)
+            error_start = getattr(mark, "index", 0) or 0
+            diagnostics.append(
+                Diagnostic(
+                    severity="error",
+                    message=str(exc),
+                    filename=filename,
+                    source_range=_range(raw_text, error_start, error_start),
+                )
+            )
+    for document_index, ((start, end, body), analysis) in enumerate(
+        zip(bodies, analyses)
+    ):
+        parsed_value = analysis["parsed_value"]
+        if analysis["load_error"] is not None:
+            diagnostics.append(
+                Diagnostic(
+                    severity="warning",
+                    message=analysis["load_error"],
+                    filename=filename,
+                    source_range=_range(raw_text, start, end),
+                )
+            )
         documents.append(
             SourceBlock(
-                block_id=block_id,
+                block_id=_block_id(document_index, start, body, parsed_value),
                 document_index=document_index,
                 start_offset=start,
                 end_offset=end,
                 raw_text=body,
                 parsed_value=parsed_value,
                 block_type=_block_type(parsed_value),
-                supported=bool(
-                    isinstance(node, MappingNode)
-                    and isinstance(parsed_value, dict)
-                    and not unsupported_reasons
-                ),
-                unsupported_reasons=unsupported_reasons,
-                property_ranges=_property_ranges(
-                    raw_text, start, node if isinstance(node, MappingNode) else None
-                ),
+                supported=analysis["supported"],
+                unsupported_reasons=analysis["unsupported_reasons"],
+                property_ranges={
+                    key: _range(raw_text, start + value_start, start + value_end)
+                    for key, (value_start, value_end) in analysis[
+                        "property_offsets"
+                    ].items()
+                },
             )
         )
     return SourceDocument(
@@ -353,6 +353,7 @@ def analyze_template(
     interview_yaml: str,
     use_llm_assist: bool = False,
     generation_options: Optional[Dict[str, Any]] = None,
+    already_defined: Optional[Set[str]] = None,
 ) -> TemplateAnalysis:
     """Work out what adding this template to this interview would take.
 
@@ -364,12 +365,16 @@ def analyze_template(
             screen grouping with AI.
         generation_options (Optional[Dict[str, Any]]): further options passed
             through to the generator.
+        already_defined (Optional[Set[str]]): the interview's
+            :func:`interview_defined_variables`, when the caller has them from
+            the project index; worked out from ``interview_yaml`` otherwise.
 
     Returns:
         TemplateAnalysis: the separately-acceptable pieces, and what is already
         covered.
     """
-    already_defined = interview_defined_variables(interview_yaml)
+    if already_defined is None:
+        already_defined = interview_defined_variables(interview_yaml)
     existing = interview_documents(interview_yaml)
     # An `attachment` block already filling this template is the interview
     # telling us the template is imported, whatever the document is called. A
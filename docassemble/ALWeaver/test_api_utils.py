@@ -1,23 +1,71 @@
 # do not pre-load
 
+import base64
+import fnmatch
+import hashlib
+import io
+import os
+import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
+from . import api_utils
 from .api_utils import (
     DEFAULT_MAX_UPLOAD_BYTES,
+    DirectoryArtifactStore,
+    RedisArtifactStore,
+    _save_artifacts,
     WEAVER_API_BASE_PATH,
     WeaverAPIValidationError,
     build_openapi_spec,
     coerce_async_flag,
+    coerce_batch_documents,
+    coerce_cache_flags,
     coerce_generation_options,
     coerce_response_flags,
     generate_interview_from_bytes,
+    generation_result_cache_key,
     merge_raw_options,
     parse_bool,
+    restore_upload_from_redis,
+    result_cache_applies,
+    spool_base64_upload,
+    spool_upload_stream,
+    store_upload_in_redis,
+    summarize_batch_statuses,
     validate_upload_metadata,
 )
 
 
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def append(self, key, chunk):
+        self.values[key] = self.values.get(key, b"") + chunk
+
+    def expire(self, key, seconds):
+        pass
+
+    def strlen(self, key):
+        return len(self.values.get(key, b""))
+
+    def getrange(self, key, start, end):
+        return self.values.get(key, b"")[start : end + 1]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in list(self.values) if fnmatch.fnmatchcase(key, match)]
+
+    def exists(self, key):
+        return int(key in self.values)
+
+
 class test_api_utils(unittest.TestCase):
     def test_parse_bool(self):
         self.assertTrue(parse_bool("true"))
@@ -41,6 +89,8 @@ class test_api_utils(unittest.TestCase):
                 "help_page_title": "Example reference",
                 "help_source_text": "Context for Weaver",
                 "use_llm_assist": "true",
+                "lint_generated_yaml": "false",
+                "bypass_llm_cache": "yes",
                 "field_definitions": '[{"field":"x","datatype":"text"}]',
                 "screen_definitions": '[{"question":"Screen 1","fields":[{"field":"x"}]}]',
                 "interview_overrides": '{"foo":"bar"}',
@@ -54,6 +104,8 @@ class test_api_utils(unittest.TestCase):
         self.assertEqual(options["help_page_title"], "Example reference")
         self.assertEqual(options["help_source_text"], "Context for Weaver")
         self.assertTrue(options["use_llm_assist"])
+        self.assertFalse(options["lint_generated_yaml"])
+        self.assertTrue(options["bypass_llm_cache"])
         self.assertEqual(options["field_definitions"][0]["field"], "x")
         self.assertEqual(options["screen_definitions"][0]["question"], "Screen 1")
         self.assertEqual(options["interview_overrides"]["foo"], "bar")
@@ -74,6 +126,10 @@ class test_api_utils(unittest.TestCase):
         )
         self.assertTrue(flags["include_package_zip_base64"])
         self.assertFalse(flags["include_yaml_text"])
+        self.assertFalse(flags["include_timings"])
+        self.assertTrue(
+            coerce_response_flags({"include_timings": "true"})["include_timings"]
+        )
 
     def test_coerce_async_flag(self):
         self.assertFalse(coerce_async_flag({}))
@@ -114,12 +170,100 @@ class test_api_utils(unittest.TestCase):
                 mimetype="application/pdf",
             )
 
+    def test_result_cache_is_opt_in_and_skips_llm_requests(self):
+        self.assertFalse(result_cache_applies({}, coerce_cache_flags({})))
+        opted_in = coerce_cache_flags({"use_result_cache": "true"})
+        self.assertTrue(result_cache_applies({}, opted_in))
+        self.assertFalse(result_cache_applies({"use_llm_assist": True}, opted_in))
+        self.assertTrue(
+            result_cache_applies(
+                {"use_llm_assist": True},
+                coerce_cache_flags(
+                    {"use_result_cache": "true", "cache_llm_results": "true"}
+                ),
+            )
+        )
+        self.assertFalse(
+            result_cache_applies(coerce_generation_options({"profile": "1"}), opted_in)
+        )
+
+    def test_result_cache_key_covers_content_options_and_flags(self):
+        def key(**overrides):
+            arguments = {
+                "filename": "form.pdf",
+                "content_bytes": b"%PDF-1.7 one",
+                "mimetype": "application/pdf",
+                "generation_options": {"title": "Form", "include_next_steps": False},
+                "response_flags": coerce_response_flags({}),
+            }
+            arguments.update(overrides)
+            return generation_result_cache_key(**arguments)
+
+        self.assertEqual(
+            key(),
+            key(generation_options={"include_next_steps": False, "title": "Form"}),
+        )
+        self.assertNotEqual(key(), key(content_bytes=b"%PDF-1.7 two"))
+        self.assertNotEqual(key(), key(generation_options={"title": "Other"}))
+        self.assertNotEqual(key(), key(filename="other.pdf"))
+        self.assertNotEqual(
+            key(),
+            key(response_flags=coerce_response_flags({"include_yaml_text": "false"})),
+        )
+
+    def test_coerce_batch_documents(self):
+        documents = coerce_batch_documents(
+            [
+                {
+                    "filename": "one.pdf",
+                    "file_content_base64": base64.b64encode(b"%PDF").decode(),
+                },
+                {
+                    "filename": "two",
+                    "mimetype": "application/pdf",
+                    "file_content_base64": base64.b64encode(b"%PDF").decode(),
+                },
+            ]
+        )
+        self.assertEqual([doc["filename"] for doc in documents], ["one.pdf", "two"])
+        self.assertEqual(documents[1]["mimetype"], "application/pdf")
+        self.assertEqual(documents[0]["content_bytes"], b"%PDF")
+
+    def test_coerce_batch_documents_names_the_bad_entry(self):
+        good = {
+            "filename": "one.pdf",
+            "file_content_base64": base64.b64encode(b"%PDF").decode(),
+        }
+        with self.assertRaisesRegex(WeaverAPIValidationError, r"documents\[1\]"):
+            coerce_batch_documents([good, {"filename": "two.txt"}])
+        with self.assertRaises(WeaverAPIValidationError):
+            coerce_batch_documents([])
+        with self.assertRaises(WeaverAPIValidationError):
+            coerce_batch_documents([good, good], max_documents=1)
+
+    def test_one_failed_document_does_not_fail_the_batch(self):
+        self.assertEqual(
+            summarize_batch_statuses(["succeeded", "failed"])["status"], "succeeded"
+        )
+        self.assertEqual(
+            summarize_batch_statuses(["failed", "failed"])["status"], "failed"
+        )
+        running = summarize_batch_statuses(["succeeded", "queued"])
+        self.assertEqual(running["status"], "running")
+        self.assertEqual((running["finished"], running["total"]), (1, 2))
+        self.assertEqual(summarize_batch_statuses(["queued"])["status"], "queued")
+
     def test_build_openapi_spec_has_expected_paths(self):
         spec = build_openapi_spec()
         self.assertIn(WEAVER_API_BASE_PATH, spec["paths"])
         self.assertIn(f"{WEAVER_API_BASE_PATH}/openapi.json", spec["paths"])
         self.assertIn(f"{WEAVER_API_BASE_PATH}/docs", spec["paths"])
         self.assertIn(f"{WEAVER_API_BASE_PATH}/jobs/{{job_id}}", spec["paths"])
+        self.assertIn(
+            f"{WEAVER_API_BASE_PATH}/jobs/{{job_id}}/artifacts/{{name}}",
+            spec["paths"],
+        )
+        self.assertIn(f"{WEAVER_API_BASE_PATH}/batch", spec["paths"])
 
     def test_generate_interview_from_bytes_docx(self):
         docx_path = Path(__file__).parent / "test/test_docx_no_pdf_field_names.docx"
@@ -140,6 +284,208 @@ class test_api_utils(unittest.TestCase):
         self.assertNotIn("package_zip_base64", result)
         self.assertNotIn("generated_template_files", result)
 
+    def test_bytes_keep_their_artifacts_and_report_progress(self):
+        store, stages = object(), []
+        with patch.object(
+            api_utils, "_generate_interview_in_input_dir", return_value={}
+        ) as generate:
+            generate_interview_from_bytes(
+                filename="example.pdf",
+                content_bytes=b"%PDF-1.7",
+                mimetype="application/pdf",
+                generation_options={},
+                artifact_store=store,
+                artifact_id="job-1",
+                progress=stages.append,
+            )
+        kwargs = generate.call_args.kwargs
+        self.addCleanup(api_utils.shutil.rmtree, kwargs["input_dir"], True)
+        self.assertIs(kwargs["artifact_store"], store)
+        self.assertEqual(kwargs["artifact_id"], "job-1")
+        self.assertEqual(kwargs["progress"], stages.append)
+
+
+class TestSpooledUploads(unittest.TestCase):
+    CONTENT = b"%PDF-1.7 " + bytes(range(256)) * 4
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.spool_dir = temp_dir.name
+        # Small chunks, so every upload here spans several of them
+        patcher = patch.object(api_utils, "UPLOAD_CHUNK_BYTES", 96)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_a_stream_is_spooled_with_its_digest(self):
+        upload = spool_upload_stream(
+            io.BytesIO(self.CONTENT), filename="form.pdf", spool_dir=self.spool_dir
+        )
+        self.assertEqual(Path(upload.path).read_bytes(), self.CONTENT)
+        self.assertEqual(upload.size, len(self.CONTENT))
+        self.assertEqual(upload.sha256, hashlib.sha256(self.CONTENT).hexdigest())
+        self.assertTrue(upload.path.endswith(".pdf"))
+        self.assertEqual(
+            generation_result_cache_key(
+                filename="form.pdf",
+                content_sha256=upload.sha256,
+                mimetype=None,
+                generation_options={},
+                response_flags=coerce_response_flags({}),
+            ),
+            generation_result_cache_key(
+                filename="form.pdf",
+                content_bytes=self.CONTENT,
+                mimetype=None,
+                generation_options={},
+                response_flags=coerce_response_flags({}),
+            ),
+        )
+
+    def test_an_oversized_stream_is_refused_without_reading_it_all(self):
+        stream = io.BytesIO(self.CONTENT)
+        with self.assertRaises(WeaverAPIValidationError) as raised:
+            spool_upload_stream(
+                stream,
+                filename="form.pdf",
+                spool_dir=self.spool_dir,
+                max_upload_bytes=100,
+            )
+        self.assertEqual(raised.exception.status_code, 413)
+        self.assertLess(stream.tell(), len(self.CONTENT))
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_unsupported_and_empty_uploads_leave_nothing_behind(self):
+        with self.assertRaises(WeaverAPIValidationError):
+            spool_upload_stream(
+                io.BytesIO(b"text"), filename="notes.txt", spool_dir=self.spool_dir
+            )
+        with self.assertRaises(WeaverAPIValidationError):
+            spool_upload_stream(
+                io.BytesIO(b""), filename="form.pdf", spool_dir=self.spool_dir
+            )
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_base64_is_decoded_a_chunk_at_a_time(self):
+        upload = spool_base64_upload(
+            base64.b64encode(self.CONTENT).decode(),
+            filename="form.pdf",
+            spool_dir=self.spool_dir,
+        )
+        self.assertEqual(Path(upload.path).read_bytes(), self.CONTENT)
+        with self.assertRaises(WeaverAPIValidationError):
+            spool_base64_upload(
+                "not base64!", filename="form.pdf", spool_dir=self.spool_dir
+            )
+        self.assertEqual(os.listdir(self.spool_dir), [os.path.basename(upload.path)])
+
+    def test_an_upload_round_trips_through_redis(self):
+        redis_client = FakeRedis()
+        upload = spool_upload_stream(
+            io.BytesIO(self.CONTENT), filename="form.pdf", spool_dir=self.spool_dir
+        )
+        key = store_upload_in_redis(redis_client, upload, expire_seconds=60)
+        self.assertFalse(os.path.exists(upload.path))
+        restored = restore_upload_from_redis(
+            redis_client, key, filename="form.pdf", spool_dir=self.spool_dir
+        )
+        self.assertEqual(Path(restored.path).read_bytes(), self.CONTENT)
+        self.assertNotIn(key, redis_client.values)
+        with self.assertRaises(WeaverAPIValidationError):
+            restore_upload_from_redis(redis_client, key, filename="form.pdf")
+
+
+class TestJobArtifacts(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        patcher = patch.object(api_utils, "UPLOAD_CHUNK_BYTES", 4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _file(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        Path(path).write_bytes(content)
+        return path
+
+    def test_each_store_reads_back_any_range(self):
+        path = self._file("interview.yml", b"metadata:\n  title: Test\n")
+        stores = [
+            DirectoryArtifactStore(os.path.join(self.temp_dir, "artifacts")),
+            RedisArtifactStore(FakeRedis()),
+        ]
+        for store in stores:
+            self.assertEqual(store.save("task-1", "interview.yml", path), 24)
+            self.assertEqual(store.size("task-1", "interview.yml"), 24)
+            self.assertIsNone(store.size("task-1", "other.yml"))
+            self.assertIsNone(store.size("task-2", "interview.yml"))
+            self.assertEqual(
+                b"".join(store.read("task-1", "interview.yml", 3, 13)),
+                b"adata:\n  t",
+            )
+            self.assertEqual(
+                b"".join(store.read("task-1", "interview.yml", 0, 24)),
+                Path(path).read_bytes(),
+            )
+
+    def test_deleting_a_task_removes_only_its_files(self):
+        path = self._file("interview.yml", b"question: Hi\n")
+        stores = [
+            DirectoryArtifactStore(os.path.join(self.temp_dir, "artifacts")),
+            RedisArtifactStore(FakeRedis()),
+        ]
+        for store in stores:
+            for task_id in ("task-1", "task-10"):
+                store.save(task_id, "interview.yml", path)
+                store.save(task_id, "form.pdf", path)
+            store.delete("task-1")
+            store.delete("task-2")
+            self.assertIsNone(store.size("task-1", "interview.yml"))
+            self.assertIsNone(store.size("task-1", "form.pdf"))
+            self.assertEqual(store.size("task-10", "form.pdf"), 13)
+
+    def test_a_store_missing_a_method_cannot_be_created(self):
+        class WriteOnlyStore(api_utils.ArtifactStore):
+            def save(self, artifact_id, name, path):
+                return 0
+
+        with self.assertRaises(TypeError):
+            WriteOnlyStore()
+
+    def test_artifact_names_cannot_leave_the_store(self):
+        store = DirectoryArtifactStore(self.temp_dir)
+        for name in ("../secret", ".hidden", "a/b", ""):
+            with self.assertRaises(WeaverAPIValidationError):
+                store.size("task-1", name)
+
+    def test_generated_files_are_kept_under_safe_unique_names(self):
+        store = DirectoryArtifactStore(os.path.join(self.temp_dir, "artifacts"))
+        result = SimpleNamespace(
+            yaml_path=self._file("form.yml", b"question: Hi\n"),
+            package_zip_path=self._file("docassemble-Form.zip", b"PK"),
+            normalized_template_paths={
+                "my form.pdf": self._file("one.pdf", b"%PDF one"),
+                "my_form.pdf": self._file("two.pdf", b"%PDF two"),
+            },
+            profile_path=self._file("weaver-1.prof", b"profile"),
+        )
+        artifacts = _save_artifacts(store, "task-1", result)
+        self.assertEqual(
+            [(item["name"], item["kind"]) for item in artifacts],
+            [
+                ("form.yml", "interview"),
+                ("docassemble-Form.zip", "package_zip"),
+                ("my_form.pdf", "normalized_template"),
+                ("my_form_2.pdf", "normalized_template"),
+                ("weaver-1.prof", "profile"),
+            ],
+        )
+        self.assertEqual(artifacts[1]["content_type"], "application/zip")
+        self.assertEqual(
+            b"".join(store.read("task-1", "my_form_2.pdf", 0, 8)), b"%PDF two"
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
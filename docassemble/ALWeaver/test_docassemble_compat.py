@@ -1,6 +1,8 @@
 # do not pre-load
 
 from contextlib import contextmanager, nullcontext
+import base64
+import hashlib
 import json
 import io
 import os
@@ -11,7 +13,7 @@ import tempfile
 import tarfile
 import types
 import unittest
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 from flask import Flask
 from jinja2 import DebugUndefined
@@ -289,6 +291,24 @@ class TestNativeGithubCompatibility(unittest.TestCase):
         self.assertEqual(len(http.calls), 3)
         self.assertFalse(any("/git/blobs/" in url for url, _method in http.calls))
 
+    def test_snapshot_files_are_kept_on_disk_with_their_digests(self):
+        files = docassemble_compat.GithubSnapshotFiles()
+        files.add("docassemble/PublicForms/data/questions/main.yml", io.BytesIO(b"a"))
+        files.add("docassemble/PublicForms/__init__.py", io.BytesIO(b""))
+        directory = files._directory
+
+        self.assertEqual(len(files), 2)
+        self.assertEqual(files["docassemble/PublicForms/data/questions/main.yml"], b"a")
+        self.assertEqual(
+            files.digest("docassemble/PublicForms/data/questions/main.yml"),
+            hashlib.sha256(b"a").hexdigest(),
+        )
+        with files.open("docassemble/PublicForms/__init__.py") as stream:
+            self.assertEqual(stream.read(), b"")
+        self.assertEqual(len(os.listdir(directory)), 2)
+        files.close()
+        self.assertFalse(os.path.exists(directory))
+
     def test_public_snapshot_needs_no_github_api_or_oauth_connection(self):
         archive_buffer = io.BytesIO()
         content = b"question: Public interview\n"
@@ -694,7 +714,11 @@ class TestNativeGithubCompatibility(unittest.TestCase):
             ) as authorized,
         ):
             result = docassemble_compat.publish_github_package(**arguments)
-        authorized.assert_called_once_with(user_id=arguments["user_id"])
+        # Concurrent blob uploads may authorize more than one connection, but
+        # every one of them as the user who asked for the publish.
+        self.assertTrue(authorized.call_args_list)
+        for authorized_call in authorized.call_args_list:
+            self.assertEqual(authorized_call, call(user_id=arguments["user_id"]))
         return result
 
     @staticmethod
@@ -887,7 +911,8 @@ class TestNativeGithubCompatibility(unittest.TestCase):
             sorted(entry["path"] for entry in tree_body["tree"]),
             ["README.md", "setup.py"],
         )
-        # The parent commit's tree is never read, so no extra round trip.
+        # The parent tree is read by commit SHA, to find unchanged files, so
+        # the parent commit itself needs no extra round trip.
         self.assertFalse(
             [url for url, _method, _body in http.calls if "/git/commits/" in url]
         )
@@ -957,13 +982,78 @@ class TestNativeGithubCompatibility(unittest.TestCase):
         )
 
         messages = [message for message, _percent in reported]
-        self.assertIn("Uploading README.md (1 of 2).", messages)
-        self.assertIn("Uploading setup.py (2 of 2).", messages)
+        self.assertIn(
+            "Uploading 2 new or changed files (23 bytes); 0 unchanged.", messages
+        )
+        # The uploads run side by side, so either file may finish first
+        uploaded = [message for message in messages if message.startswith("Uploaded")]
+        self.assertEqual(len(uploaded), 2)
+        self.assertTrue(uploaded[-1].endswith("(23 bytes of 23 bytes)."))
         self.assertIn("Creating the commit.", messages)
         percents = [percent for _message, percent in reported]
         self.assertEqual(percents, sorted(percents))
         self.assertTrue(all(0 <= percent <= 100 for percent in percents))
 
+    def test_publish_github_package_uploads_only_new_or_changed_files(self):
+        builder, _staging = self._fake_package_builder(
+            filenames=("README.md", "setup.py")
+        )
+        readme = b"# README.md\n"
+        readme_sha = hashlib.sha1(b"blob %d\0" % len(readme) + readme).hexdigest()
+
+        class FakeHttp:
+            def __init__(self):
+                self.calls = []
+
+            def request(self, url, method, headers=None, body=None):
+                parsed_body = json.loads(body) if body else None
+                self.calls.append((url, method, parsed_body))
+                if method == "GET" and "/git/trees/" in url:
+                    tree = [
+                        {"path": "README.md", "type": "blob", "sha": readme_sha},
+                        {"path": "docassemble", "type": "tree", "sha": "dir-sha"},
+                    ]
+                    return {"status": "200"}, json.dumps({"tree": tree}).encode()
+                if method == "GET":
+                    return (
+                        {"status": "200"},
+                        b'{"object": {"sha": "existing-commit-sha"}}',
+                    )
+                if url.endswith("/git/blobs"):
+                    return {"status": "201"}, b'{"sha": "setup-blob-sha"}'
+                if url.endswith("/git/trees"):
+                    return {"status": "201"}, b'{"sha": "tree-sha"}'
+                if url.endswith("/git/commits"):
+                    return {"status": "201"}, b'{"sha": "next-commit-sha"}'
+                return {"status": "200"}, b'{"ref": "refs/heads/main"}'
+
+        http = FakeHttp()
+        result = self._publish(http, builder)
+
+        self.assertEqual(result["files"], 2)
+        tree_reads = [url for url, method, _body in http.calls if "/git/trees/" in url]
+        self.assertEqual(
+            tree_reads,
+            [
+                "https://api.github.com/repos/LegalAid/docassemble-HousingForms"
+                "/git/trees/existing-commit-sha?recursive=1"
+            ],
+        )
+        uploads = [
+            body for url, method, body in http.calls if url.endswith("/git/blobs")
+        ]
+        self.assertEqual(
+            [base64.b64decode(body["content"]) for body in uploads],
+            [b"# setup.py\n"],
+        )
+        self.assertEqual(
+            {
+                entry["path"]: entry["sha"]
+                for entry in self._body_for(http, "/git/trees")["tree"]
+            },
+            {"README.md": readme_sha, "setup.py": "setup-blob-sha"},
+        )
+
     def test_publish_github_package_survives_a_failing_progress_hook(self):
         builder, _staging = self._fake_package_builder()
 
@@ -0,0 +1,65 @@
+# do not pre-load
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from . import document_analysis
+from .document_analysis import analyze_document, clear_document_analysis_cache
+
+TEST_DIR = Path(__file__).parent / "test"
+
+
+class TestDocumentAnalysis(unittest.TestCase):
+    def setUp(self):
+        clear_document_analysis_cache()
+        self.addCleanup(clear_document_analysis_cache)
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, True)
+
+    def _copy(self, name: str, new_name: str) -> str:
+        target = os.path.join(self.tmpdir, new_name)
+        shutil.copyfile(TEST_DIR / name, target)
+        return target
+
+    def test_a_pdf_is_read_once_however_often_it_is_asked_about(self):
+        path = str(TEST_DIR / "test_push_button.pdf")
+        with patch.object(
+            document_analysis,
+            "_read_pdf_fields",
+            wraps=document_analysis._read_pdf_fields,
+        ) as read_fields:
+            first = analyze_document(path).pdf_fields()
+            second = analyze_document(path).pdf_fields()
+        self.assertEqual(read_fields.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertTrue(first)
+
+    def test_the_same_content_at_two_paths_shares_one_analysis(self):
+        first = self._copy("test_push_button.pdf", "one.pdf")
+        second = self._copy("test_push_button.pdf", "two.pdf")
+        self.assertIs(analyze_document(first), analyze_document(second))
+
+    def test_changed_content_is_read_afresh(self):
+        path = self._copy("test_push_button.pdf", "form.pdf")
+        before = analyze_document(path)
+        shutil.copyfile(TEST_DIR / "test_option_groups.pdf", path)
+        self.assertIsNot(before, analyze_document(path))
+
+    def test_push_buttons_are_identified_from_their_flags(self):
+        info = analyze_document(str(TEST_DIR / "test_push_button.pdf")).pdf_field_info()
+        self.assertTrue(any(item.is_push_button for item in info.values()))
+
+    def test_docx_text_is_extracted(self):
+        path = str(TEST_DIR / "test_docx_no_pdf_field_names.docx")
+        analysis = analyze_document(path)
+        self.assertEqual(analysis.document_type, "docx")
+        self.assertEqual(analysis.pdf_fields(), [])
+        self.assertIn("{{", analysis.text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,12 +9,13 @@ Playground.
 """
 
 from contextlib import ExitStack
+import json
 from pathlib import Path
 import types
 import unittest
 from unittest.mock import patch
 
-from . import editor_agent_validation
+from . import editor_agent_models, editor_agent_validation
 from .editor_agent_models import (
     WeaverAgentSession,
     load_agent_session,
@@ -87,15 +88,72 @@ def _id_diagnostics(raw_yaml, filename):
 class FakeRedis:
     def __init__(self):
         self.values = {}
+        self.expiries = {}
 
     def set(self, key, value, ex=None):
         self.values[key] = value
+        if ex is not None:
+            self.expiries[key] = ex
 
     def get(self, key):
         return self.values.get(key)
 
     def delete(self, key):
         self.values.pop(key, None)
+        self.expiries.pop(key, None)
+
+    def expire(self, key, seconds):
+        if key in self.values:
+            self.expiries[key] = seconds
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key) or 0) + 1
+        return self.values[key]
+
+    def rpush(self, key, *items):
+        self.values.setdefault(key, []).extend(items)
+        return len(self.values[key])
+
+    def ltrim(self, key, start, end):
+        items = self.values.get(key, [])
+        self.values[key] = items[start:] if end == -1 else items[start : end + 1]
+
+    def pipeline(self):
+        client = self
+
+        class _Pipe:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                def queue(*args, **kwargs):
+                    self.calls.append((name, args, kwargs))
+                    return self
+
+                return queue
+
+            def execute(self):
+                calls, self.calls = self.calls, []
+                return [
+                    getattr(client, name)(*args, **kwargs)
+                    for name, args, kwargs in calls
+                ]
+
+        return _Pipe()
+
+    def llen(self, key):
+        return len(self.values.get(key, []))
+
+    def lrange(self, key, start, end):
+        items = self.values.get(key, [])
+        return items[start:] if end == -1 else items[start : end + 1]
+
+    def lindex(self, key, index):
+        items = self.values.get(key, [])
+        try:
+            return items[index]
+        except IndexError:
+            return None
 
 
 class FakeLLM:
@@ -135,7 +193,13 @@ class AgentApiTestCase(unittest.TestCase):
         self.saved_revision = source_revision(INTERVIEW)
 
     def _patches(
-        self, user_id=7, agent=True, patch_model=True, runtime=False, saved=INTERVIEW
+        self,
+        user_id=7,
+        agent=True,
+        patch_model=True,
+        runtime=False,
+        saved=INTERVIEW,
+        stream=False,
     ):
         return [
             patch.object(api_editor, "_editor_auth_check", return_value=True),
@@ -153,6 +217,9 @@ class AgentApiTestCase(unittest.TestCase):
             patch.object(
                 api_editor, "_runtime_inspector_enabled", return_value=runtime
             ),
+            patch.object(
+                api_editor, "_agent_progress_stream_enabled", return_value=stream
+            ),
             patch.object(api_editor, "r", self.redis),
             patch.object(api_editor, "playground_read_yaml", return_value=saved),
         ]
@@ -194,6 +261,13 @@ class TestConfiguration(unittest.TestCase):
         with patch.object(api_editor, "_daconfig", return_value={}):
             self.assertTrue(api_editor._agent_editor_enabled())
 
+    def test_the_progress_stream_is_opt_in(self):
+        with patch.object(api_editor, "_daconfig", return_value={}):
+            self.assertFalse(api_editor._agent_progress_stream_enabled())
+        config = {"weaver": {"progress stream": True}}
+        with patch.object(api_editor, "_daconfig", return_value=config):
+            self.assertTrue(api_editor._agent_progress_stream_enabled())
+
     def test_a_grouped_lowercase_setting_turns_it_off(self):
         config = {"weaver": {"assistant": False}}
         with patch.object(api_editor, "_daconfig", return_value=config):
@@ -964,11 +1038,13 @@ class TestLiveProgress(AgentApiTestCase):
         self._stored_session()
         seen = []
 
-        original = api_editor.store_progress
+        original = api_editor.append_progress_event
 
-        def recording(redis_client, session_id, owner, **kwargs):
-            seen.append({"running": kwargs["running"], "count": len(kwargs["events"])})
-            return original(redis_client, session_id, owner, **kwargs)
+        def recording(redis_client, session_id, event):
+            cursor = original(redis_client, session_id, event)
+            progress = api_editor.load_progress(redis_client, session_id, 7)
+            seen.append({"cursor": cursor, "running": progress["running"]})
+            return cursor
 
         llm = FakeLLM(
             [
@@ -980,9 +1056,12 @@ class TestLiveProgress(AgentApiTestCase):
                 {"action": "final", "summary": "Looked around."},
             ]
         )
+        api_editor.store_progress(
+            self.redis, "agent-1", 7, running=True, events=[], started_at=0.0
+        )
         with (
             patch.object(api_editor, "_load_llms_module", return_value=llm),
-            patch.object(api_editor, "store_progress", side_effect=recording),
+            patch.object(api_editor, "append_progress_event", side_effect=recording),
         ):
             with ExitStack() as stack:
                 for patcher in self._patches():
@@ -996,13 +1075,16 @@ class TestLiveProgress(AgentApiTestCase):
                     request_id="req-1",
                     started_at=0.0,
                 )
-        # Published repeatedly during the run, and the event list grows.
-        self.assertGreater(len(seen), 2)
-        self.assertTrue(all(item["running"] for item in seen[:-1]))
-        self.assertGreater(seen[-2]["count"], seen[0]["count"])
+        # Each step is appended as it happens, while the turn is still running.
+        self.assertGreater(len(seen), 1)
+        self.assertTrue(all(item["running"] for item in seen))
+        self.assertEqual(
+            [item["cursor"] for item in seen], list(range(1, len(seen) + 1))
+        )
         # The final write marks the turn finished and carries the outcome.
-        self.assertFalse(seen[-1]["running"])
         finished = api_editor.load_progress(self.redis, "agent-1", 7)
+        self.assertFalse(finished["running"])
+        self.assertEqual(len(finished["events"]), len(seen))
         self.assertIsNotNone(finished["result"])
         self.assertIsNone(finished["error"])
 
@@ -1084,6 +1166,130 @@ class TestLiveProgress(AgentApiTestCase):
         # The owner id is never handed back to the browser.
         self.assertNotIn("owner_user_id", data)
 
+    def test_a_cursor_returns_only_the_events_after_it(self):
+        self._stored_session()
+        api_editor.store_progress(
+            self.redis,
+            "agent-1",
+            7,
+            running=True,
+            events=[{"type": "status", "label": "Starting", "status": "thinking"}],
+            started_at=0.0,
+        )
+        first = self._request(
+            api_editor.editor_api_agent_progress,
+            "/api/agent/sessions/agent-1/progress",
+            method="GET",
+            args=("agent-1",),
+        ).get_json()["data"]
+        self.assertEqual(first["cursor"], 1)
+        api_editor.append_progress_event(
+            self.redis, "agent-1", {"type": "tool_result", "label": "Read it"}
+        )
+        second = self._request(
+            api_editor.editor_api_agent_progress,
+            f"/api/agent/sessions/agent-1/progress?after={first['cursor']}",
+            method="GET",
+            args=("agent-1",),
+        ).get_json()["data"]
+        self.assertEqual([event["label"] for event in second["events"]], ["Read it"])
+        self.assertEqual(second["cursor"], 2)
+
+    def test_an_appended_event_keeps_the_turn_alive(self):
+        self._stored_session()
+        api_editor.store_progress(
+            self.redis, "agent-1", 7, running=True, events=[], started_at=0.0
+        )
+        record = json.loads(self.redis.get("da:alweaver:editor:agent-progress:agent-1"))
+        record["updated_at"] = api_editor.time.time() - 600
+        self.redis.set("da:alweaver:editor:agent-progress:agent-1", json.dumps(record))
+        self.assertFalse(
+            api_editor.progress_is_live(
+                api_editor.load_progress(self.redis, "agent-1", 7)
+            )
+        )
+        api_editor.append_progress_event(self.redis, "agent-1", {"type": "status"})
+        self.assertTrue(
+            api_editor.progress_is_live(
+                api_editor.load_progress(self.redis, "agent-1", 7)
+            )
+        )
+
+    def test_a_long_turn_keeps_only_its_latest_events_and_its_state(self):
+        api_editor.store_progress(
+            self.redis, "agent-1", 7, running=True, events=[], started_at=0.0
+        )
+        state_key = "da:alweaver:editor:agent-progress:agent-1"
+        events_key = "da:alweaver:editor:agent-progress-events:agent-1"
+        self.redis.expiries[state_key] = 1
+        with patch.object(editor_agent_models, "MAX_STORED_PROGRESS_EVENTS", 3):
+            cursors = [
+                api_editor.append_progress_event(
+                    self.redis, "agent-1", {"type": "status", "label": str(number)}
+                )
+                for number in range(5)
+            ]
+        self.assertEqual(cursors, [1, 2, 3, 4, 5])
+        self.assertEqual(len(self.redis.values[events_key]), 3)
+        self.assertEqual(
+            self.redis.expiries[state_key],
+            editor_agent_models.AGENT_PROGRESS_EXPIRE_SECONDS,
+        )
+
+        # A cursor from before the dropped events picks up at the oldest kept
+        progress = api_editor.load_progress(self.redis, "agent-1", 7, after=1)
+        self.assertEqual(
+            [event["label"] for event in progress["events"]], ["2", "3", "4"]
+        )
+        self.assertEqual(progress["cursor"], 5)
+        progress = api_editor.load_progress(self.redis, "agent-1", 7, after=4)
+        self.assertEqual([event["label"] for event in progress["events"]], ["4"])
+
+    def test_the_stream_sends_each_event_and_then_the_outcome(self):
+        self._stored_session()
+        api_editor.store_progress(
+            self.redis,
+            "agent-1",
+            7,
+            running=False,
+            events=[
+                {"type": "status", "label": "Starting", "status": "thinking"},
+                {"type": "tool_result", "label": "Read it", "status": "success"},
+            ],
+            started_at=0.0,
+            result={"summary": "Done."},
+        )
+        with ExitStack() as stack:
+            for patcher in self._patches(stream=True):
+                stack.enter_context(patcher)
+            with api_editor.app.test_request_context(
+                "/api/agent/sessions/agent-1/progress/stream",
+                headers={"Last-Event-ID": "1"},
+            ):
+                response = api_editor.editor_api_agent_progress_stream("agent-1")
+                body = "".join(
+                    chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+                    for chunk in response.response
+                )
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertNotIn("Starting", body, "events before Last-Event-ID are skipped")
+        self.assertIn('id: 2\nevent: progress\ndata: {"type": "tool_result"', body)
+        self.assertIn("event: finished", body)
+        self.assertIn('"summary": "Done."', body)
+
+    def test_the_stream_is_off_unless_configured(self):
+        self._stored_session()
+        response = self._request(
+            api_editor.editor_api_agent_progress_stream,
+            "/api/agent/sessions/agent-1/progress/stream",
+            method="GET",
+            args=("agent-1",),
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.get_json()["error"]["code"], "progress_stream_disabled"
+        )
+
     def test_a_reset_clears_stale_progress(self):
         self._stored_session()
         api_editor.store_progress(
@@ -95,7 +95,7 @@ function createHarness(options) {
     },
     get(path, requestOptions) {
       calls.push({ method: 'GET', path, requestOptions });
-      const responder = responses[path];
+      const responder = responses[path.split('?')[0]];
       if (!responder) return Promise.resolve({ success: true, data: {} });
       const value = typeof responder === 'function' ? responder() : responder;
       return value instanceof Error ? Promise.reject(value) : Promise.resolve(value);
@@ -114,6 +114,7 @@ function createHarness(options) {
       source_scope: 'working_source',
     })),
     onApply: (data) => applied.push(data),
+    openEventStream: options.openEventStream,
   });
   const container = createNode('div');
   chat.render(container);
@@ -527,6 +528,94 @@ const READY_TURN = TURN_STARTED;
   }).catch((error) => { console.error(error); process.exit(1); });
 }
 
+// --- Polling asks only for the events after those it already has ---------
+{
+  let polls = 0;
+  const harness = createHarness({
+    responses: {
+      '/api/agent/sessions': { success: true, data: { agent_session_id: 'agent-1' } },
+      '/api/agent/sessions/agent-1/turn': TURN_STARTED,
+      '/api/agent/sessions/agent-1/progress': () => {
+        polls += 1;
+        if (polls === 1) {
+          return {
+            success: true,
+            data: {
+              running: true,
+              started_at: 0,
+              cursor: 1,
+              events: [{ type: 'tool_result', tool: 'a', label: 'First step', status: 'success' }],
+            },
+          };
+        }
+        return {
+          success: true,
+          data: {
+            running: false,
+            started_at: 0,
+            cursor: 2,
+            events: [{ type: 'tool_result', tool: 'b', label: 'Second step', status: 'success' }],
+            result: READY_RESULT,
+          },
+        };
+      },
+    },
+  });
+  harness.chat.send('Two steps').then(() => {
+    const paths = harness.calls
+      .filter((call) => call.method === 'GET')
+      .map((call) => call.path);
+    assert.deepStrictEqual(paths, [
+      '/api/agent/sessions/agent-1/progress?after=0',
+      '/api/agent/sessions/agent-1/progress?after=1',
+    ]);
+    assert.ok(harness.chat.canApply());
+  }).catch((error) => { console.error(error); process.exit(1); });
+}
+
+// --- With an event stream, progress is pushed instead of polled -----------
+{
+  const streams = [];
+  function openEventStream(path) {
+    const stream = {
+      path,
+      listeners: {},
+      closed: false,
+      readyState: 1,
+      addEventListener(name, handler) { this.listeners[name] = handler; },
+      close() { this.closed = true; },
+    };
+    streams.push(stream);
+    return stream;
+  }
+  const harness = createHarness({
+    openEventStream,
+    responses: {
+      '/api/agent/sessions': { success: true, data: { agent_session_id: 'agent-1' } },
+      '/api/agent/sessions/agent-1/turn': TURN_STARTED,
+    },
+  });
+  const sent = harness.chat.send('Stream it');
+  setTimeout(() => {
+    assert.strictEqual(streams.length, 1);
+    assert.strictEqual(streams[0].path, '/api/agent/sessions/agent-1/progress/stream');
+    streams[0].listeners.progress({
+      lastEventId: '1',
+      data: JSON.stringify({ type: 'tool_result', tool: 'a', label: 'Streamed step', status: 'success' }),
+    });
+    const live = findAll(harness.container, (n) => n.className === 'editor-agent-step-label');
+    assert.strictEqual(live[live.length - 1].textContent, 'Streamed step');
+    streams[0].listeners.finished({
+      data: JSON.stringify({ running: false, result: READY_RESULT, error: null }),
+    });
+    sent.then(() => {
+      assert.ok(streams[0].closed, 'the stream is closed once the turn finishes');
+      assert.ok(!harness.calls.some((call) => call.method === 'GET'), 'nothing is polled');
+      assert.ok(harness.chat.canApply());
+    }).catch((error) => { console.error(error); process.exit(1); });
+  }, 50);
+}
+
 process.on('exit', function (code) {
   if (code === 0) console.log('editor_agent_chat.js checks passed');
 });
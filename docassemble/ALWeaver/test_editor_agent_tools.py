@@ -274,6 +274,100 @@ class TestCandidateValidationGate(AgentToolTestCase):
         self.assertEqual(self.context.candidate.raw_source, good_source)
         self.assertEqual(len(self.context.candidate.applied_commands), 1)
 
+    def test_later_edits_check_only_the_documents_they_change(self):
+        checked = []
+
+        def street_warnings(raw_yaml, filename):
+            checked.append(raw_yaml)
+            return [
+                {
+                    "level": "warning",
+                    "severity": "warning",
+                    "message": "Street is vague",
+                    "filename": filename,
+                    "line_number": number,
+                    "source": "dayamlchecker",
+                }
+                for number, line in enumerate(raw_yaml.splitlines(), start=1)
+                if "Street:" in line
+            ]
+
+        self.checker.side_effect = street_warnings
+        for text in ("First edit", "Second edit\nover two lines"):
+            result = self.call(
+                "replace_question",
+                {"block_id": "intro", "question": {"question": text}},
+            )
+            self.assertTrue(result.succeeded)
+
+        self.assertEqual(len(checked), 2)
+        self.assertIn("Street:", checked[0])
+        # Only the edited screen is given to the checker the second time, with
+        # every other line kept so line numbers still match the candidate
+        self.assertNotIn("Street:", checked[1])
+        self.assertNotIn("Demo interview", checked[1])
+        self.assertIn("over two lines", checked[1])
+        source = self.context.candidate.raw_source
+        self.assertEqual(checked[1].count("\n"), source.count("\n"))
+        street_line = source[: source.index("Street:")].count("\n") + 1
+        self.assertEqual(
+            [
+                item["line_number"]
+                for item in self.context.candidate.diagnostics
+                if item["message"] == "Street is vague"
+            ],
+            [street_line],
+        )
+
+    def test_edits_to_ids_and_mandatory_blocks_are_checked_against_every_block(self):
+        def cross_document_errors(raw_yaml, filename):
+            findings, ids, mandatory = [], set(), 0
+            for number, line in enumerate(raw_yaml.splitlines(), start=1):
+                message = None
+                if line.startswith("id: "):
+                    if line in ids:
+                        message = "Duplicate block id"
+                    ids.add(line)
+                elif line == "mandatory: True":
+                    mandatory += 1
+                    if mandatory > 1:
+                        message = "More than one mandatory block"
+                if message:
+                    findings.append(
+                        {
+                            "level": "error",
+                            "severity": "error",
+                            "message": message,
+                            "filename": filename,
+                            "line_number": number,
+                            "source": "dayamlchecker",
+                        }
+                    )
+            return findings
+
+        self.checker.side_effect = cross_document_errors
+        validate = editor_agent_validation.validate_candidate_source
+        previous = validate(filename="main.yml", raw_yaml=INTERVIEW)
+        self.assertFalse(previous.blocking)
+        cases = {
+            "duplicate id": INTERVIEW.replace("id: user_address", "id: intro"),
+            "second mandatory block": INTERVIEW.replace(
+                "id: user_address\n", "id: user_address\nmandatory: True\n"
+            ),
+        }
+        for name, edited in cases.items():
+            with self.subTest(case=name):
+                full = validate(filename="main.yml", raw_yaml=edited)
+                incremental = validate(
+                    filename="main.yml", raw_yaml=edited, previous=previous
+                )
+                self.assertTrue(full.blocking)
+                self.assertEqual(incremental.blocking, full.blocking)
+                self.assertEqual(
+                    [item["message"] for item in incremental.diagnostics],
+                    [item["message"] for item in full.diagnostics],
+                )
+
 
 class TestLosslessEditing(AgentToolTestCase):
     def test_a_successful_edit_touches_only_the_target_block(self):
@@ -1,6 +1,7 @@
 # do not pre-load
 
 from io import BytesIO
+import gzip
 from contextlib import nullcontext
 from pathlib import Path
 import os
@@ -134,6 +135,7 @@ def _load_api_editor_for_tests():
         "sources": "sources",
     }
     playground_publish._copy_files_to_section = lambda *args, **kwargs: None
+    playground_publish.close_github_snapshot = lambda snapshot: None
     playground_publish.delete_project = lambda *args, **kwargs: None
     playground_publish.create_project = lambda *args, **kwargs: None
     playground_publish.get_list_of_projects = lambda *args, **kwargs: []
@@ -1832,6 +1834,38 @@ class TestEditorDocumentsApi(unittest.TestCase):
         self.assertEqual(templates["logo.png"]["status"], "referenced")
         self.assertEqual(templates["leftover.pdf"]["status"], "not_imported")
 
+    def test_a_new_template_file_is_not_answered_with_not_modified(self):
+        def documents(template_names, headers=None):
+            with (
+                patch.object(api_editor, "_editor_auth_check", return_value=True),
+                patch.object(api_editor, "_current_user_id", return_value=7),
+                patch.object(
+                    api_editor,
+                    "playground_read_yaml",
+                    return_value=INTERVIEW_WITH_TWO_DOCUMENTS,
+                ),
+                patch.object(
+                    api_editor,
+                    "_list_editor_section_files",
+                    return_value=[{"filename": name} for name in template_names],
+                ),
+            ):
+                with api_editor.app.test_request_context(
+                    "/al/editor/api/documents?project=Eviction&filename=main.yml",
+                    headers=headers,
+                ):
+                    return api_editor.editor_api_documents()
+
+        first = documents(["petition.pdf"])
+        cached = {"If-None-Match": first.headers["ETag"]}
+        self.assertEqual(documents(["petition.pdf"], cached).status_code, 304)
+        uploaded = documents(["petition.pdf", "new.pdf"], cached)
+        self.assertEqual(uploaded.status_code, 200)
+        self.assertEqual(
+            uploaded.get_json()["data"]["templates"]["new.pdf"]["status"],
+            "not_imported",
+        )
+
     def _save(self, payload):
         written = {}
         with (
@@ -2329,5 +2363,108 @@ class TestEditorPackageFileApi(unittest.TestCase):
         self.assertIn(response.status_code, (401, 403))
 
 
+class TestEditorFileRevisionEtag(unittest.TestCase):
+    """The file's revision doubles as its ETag, so unchanged reads are cheap."""
+
+    def _get_file(self, headers=None):
+        model = {
+            "blocks": [],
+            "metadata_blocks": [],
+            "include_blocks": [],
+            "default_screen_parts_blocks": [],
+            "order_blocks": [],
+        }
+        with (
+            patch.object(api_editor, "_editor_auth_check", return_value=True),
+            patch.object(api_editor, "_current_user_id", return_value=7),
+            patch.object(
+                api_editor, "playground_read_yaml", return_value="question: Hi\n"
+            ),
+            patch.object(api_editor, "parse_interview_yaml", return_value=model),
+        ):
+            with api_editor.app.test_request_context(
+                "/al/editor/api/file?project=Eviction&filename=main.yml",
+                headers=headers or {},
+            ):
+                return api_editor.editor_api_get_file()
+
+    def test_the_revision_is_sent_as_the_etag(self):
+        response = self._get_file()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_etag()[0], "test-revision")
+        self.assertEqual(response.get_json()["data"]["revision"], "test-revision")
+
+    def test_a_client_holding_the_revision_is_told_it_has_not_changed(self):
+        response = self._get_file(headers={"If-None-Match": '"test-revision"'})
+        self.assertEqual(response.status_code, 304)
+
+    def test_a_client_holding_an_older_revision_gets_the_file(self):
+        response = self._get_file(headers={"If-None-Match": '"older-revision"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()["success"])
+
+
+class TestEditorStaticAssets(unittest.TestCase):
+    """The editor's scripts are compressed once and cached by content hash."""
+
+    def setUp(self):
+        api_editor._static_assets.clear()
+        self.addCleanup(api_editor._static_assets.clear)
+
+    def _get(self, path, headers=None):
+        filename = path.split("?")[0].rsplit("/", 1)[-1]
+        with api_editor.app.test_request_context(path, headers=headers or {}):
+            return api_editor.editor_static(filename)
+
+    def test_the_page_links_each_asset_by_its_content_hash(self):
+        fingerprint = api_editor._editor_static_asset("editor.js").fingerprint
+        html = api_editor._fingerprint_static_urls(
+            '<script src="/al/editor/static/editor.js"></script>'
+            '<script src="/al/editor/static/missing.js"></script>'
+        )
+        self.assertIn(f'/al/editor/static/editor.js?v={fingerprint}"', html)
+        self.assertIn('/al/editor/static/missing.js"', html)
+
+    def test_a_browser_that_accepts_gzip_gets_it(self):
+        response = self._get(
+            "/al/editor/static/editor.js", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        body = gzip.decompress(response.get_data())
+        self.assertEqual(
+            body.decode("utf-8"), api_editor._get_static_content("editor.js")
+        )
+
+    def test_an_unchanged_asset_is_answered_with_not_modified(self):
+        first = self._get("/al/editor/static/editor.css")
+        self.assertNotIn("Content-Encoding", first.headers)
+        second = self._get(
+            "/al/editor/static/editor.css",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        self.assertEqual(second.status_code, 304)
+
+    def test_only_the_current_hash_may_be_cached_for_long(self):
+        fingerprint = api_editor._editor_static_asset("editor.js").fingerprint
+        current = self._get(f"/al/editor/static/editor.js?v={fingerprint}")
+        self.assertIn("immutable", current.headers["Cache-Control"])
+        stale = self._get("/al/editor/static/editor.js?v=0000")
+        self.assertEqual(stale.headers["Cache-Control"], "no-cache")
+
+    def test_paths_outside_the_static_folder_are_not_served(self):
+        with api_editor.app.test_request_context("/al/editor/static/x"):
+            response = api_editor.editor_static("../api_editor.py")
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_assets_are_not_remembered(self):
+        for number in range(3):
+            response = self._get(f"/al/editor/static/missing-{number}.js")
+            self.assertEqual(response.status_code, 404)
+        self._get("/al/editor/static/editor.js")
+        self.assertEqual(list(api_editor._static_assets), ["editor.js"])
+
+
 if __name__ == "__main__":
     unittest.main()
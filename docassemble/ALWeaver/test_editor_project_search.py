@@ -3,9 +3,14 @@
 import unittest
 
 from .editor_project_search import (
+    clear_search_index,
     find_literal_matches,
+    may_contain_text,
+    may_contain_variable,
     replace_selected_matches,
+    search_index_entry,
 )
+from .source_document import source_revision
 
 
 class TestEditorProjectSearch(unittest.TestCase):
@@ -65,5 +70,44 @@ class TestEditorProjectSearch(unittest.TestCase):
             )
 
 
+class TestProjectSearchIndex(unittest.TestCase):
+    def setUp(self):
+        clear_search_index()
+        self.addCleanup(clear_search_index)
+
+    def _entry(self, source):
+        return search_index_entry(source, source_revision(source))
+
+    def test_a_file_without_the_text_is_ruled_out(self):
+        entry = self._entry("question: What is the Tenant's name?\n")
+        self.assertTrue(may_contain_text(entry, "tenant"))
+        self.assertTrue(may_contain_text(entry, "TENANT'S"))
+        self.assertFalse(may_contain_text(entry, "landlord"))
+
+    def test_the_index_never_rules_out_a_file_the_search_would_match(self):
+        for source, query in (
+            ("Kelvin: 300 \u212a\n", "300 k"),
+            ("\u0130stanbul\n", "ista"),
+            ("lo\u017fe\n", "ose"),
+            ("Stra\u00dfe Street\n", "street"),
+            ("caf\u00e9\n", "CAF\u00c9"),
+        ):
+            with self.subTest(query=query):
+                matches, _truncated = find_literal_matches(source, query)
+                self.assertTrue(matches)
+                self.assertTrue(may_contain_text(self._entry(source), query))
+
+    def test_a_file_without_the_variable_is_ruled_out(self):
+        entry = self._entry("fields:\n  - Name: users[0].name.first\n")
+        self.assertTrue(may_contain_variable(entry, "users[0].name.first"))
+        self.assertFalse(may_contain_variable(entry, "users[0].address.city"))
+
+    def test_each_file_version_is_indexed_once(self):
+        source = "question: Hi\n"
+        first = self._entry(source)
+        self.assertIs(first, self._entry(source))
+        self.assertIsNot(first, self._entry(source + "subquestion: There\n"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,10 +4,11 @@ import os
 import re
 import shutil
 import tempfile
+import threading
 import unittest
 import zipfile
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from . import interview_generator as interview_generator_module
 from .interview_generator import (
@@ -19,6 +20,7 @@ from .interview_generator import (
     _with_progress_markers,
     _guard_indexed_reference,
 )
+from .llm_response_cache import MemoryResponseCache, cached_llms, set_response_cache
 
 
 class TestGenerateInterviewFromPath(unittest.TestCase):
@@ -111,6 +113,53 @@ class TestGenerateInterviewFromPath(unittest.TestCase):
             self.assertTrue(result.package_zip_path)
             self.assertTrue(os.path.exists(result.package_zip_path))
 
+    def test_generate_reports_each_stage_as_it_starts(self):
+        pdf_path = (
+            Path(__file__).parent / "test/test_petition_to_enforce_sanitary_code.pdf"
+        )
+        stages = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            generate_interview_from_path(
+                str(pdf_path),
+                output_dir=tmpdir,
+                create_package_zip=True,
+                include_next_steps=False,
+                progress=lambda stage, detail: stages.append(stage),
+            )
+        self.assertEqual(
+            stages,
+            ["field_extraction", "grouping", "rendering", "lint_repair", "packaging"],
+        )
+
+    def test_generate_times_each_stage(self):
+        pdf_path = (
+            Path(__file__).parent / "test/test_petition_to_enforce_sanitary_code.pdf"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = generate_interview_from_path(
+                str(pdf_path),
+                output_dir=tmpdir,
+                create_package_zip=True,
+                include_next_steps=False,
+            )
+        names = [timing["name"] for timing in result.timings]
+        self.assertEqual(names[0], "generate_interview_from_path")
+        for stage in (
+            "prepare_templates",
+            "auto_assign_attributes",
+            "add_fields_from_file",
+            "auto_group_fields",
+            "render_interview_yaml",
+            "lint_repair",
+            "create_package_zip",
+        ):
+            self.assertIn(stage, names)
+        total = result.timings[0]["wall_seconds"]
+        for timing in result.timings[1:]:
+            self.assertGreater(timing["depth"], 0)
+            self.assertLessEqual(timing["wall_seconds"], total)
+        self.assertIsNone(result.profile_path)
+
     def test_ensure_unique_question_ids(self):
         sample = """---
 id: Duplicate title
@@ -1080,6 +1129,39 @@ class TestMultipleTemplates(unittest.TestCase):
             r"elements=\[cover_sheet, petition, affidavit\]",
         )
 
+    def test_parallel_and_serial_preparation_draft_the_same_interview(self):
+        templates = [
+            ("cover_sheet.pdf", ["docket_number", "Bad Field Name"]),
+            ("petition.pdf", ["users1_name_first"]),
+            ("affidavit.pdf", ["rent_amount"]),
+        ]
+        serial, serial_yaml = self._draft(
+            templates, template_workers=1, normalize_field_names=True
+        )
+        parallel, parallel_yaml = self._draft(
+            templates, template_workers=3, normalize_field_names=True
+        )
+        self.assertEqual(serial.template_names, parallel.template_names)
+        self.assertEqual(
+            serial.suggested_renames_by_template,
+            parallel.suggested_renames_by_template,
+        )
+        self.assertEqual(serial_yaml, parallel_yaml)
+
+    def test_templates_are_prepared_in_turn_unless_workers_are_configured(self):
+        worker_count = interview_generator_module._template_worker_count
+        with patch.object(interview_generator_module, "get_config", return_value={}):
+            self.assertEqual(worker_count(None, 3), 1)
+            self.assertEqual(worker_count(0, 3), 1)
+            self.assertEqual(worker_count(8, 3), 3)
+        with patch.object(
+            interview_generator_module,
+            "get_config",
+            return_value={"weaver template workers": 2},
+        ):
+            self.assertEqual(worker_count(None, 3), 2)
+            self.assertEqual(worker_count(1, 3), 1)
+
     def test_the_interview_is_named_after_the_first_template(self):
         result, yaml_text = self._draft(
             [
@@ -1205,3 +1287,239 @@ class TestMultipleTemplates(unittest.TestCase):
                 create_package_zip=False,
                 additional_templates=[os.path.join(tmpdir, "nope.pdf")],
             )
+
+
+class TestCompiledTemplateCache(unittest.TestCase):
+    def setUp(self):
+        interview_generator_module.clear_compiled_template_cache()
+        self.addCleanup(interview_generator_module.clear_compiled_template_cache)
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, True)
+        self.paths = []
+        for name, text in (
+            ("defs.mako", "<%def name='greet(x)'>hello ${x}</%def>"),
+            ("library.mako", ""),
+            ("output.mako", "${greet(name)}"),
+        ):
+            path = os.path.join(self.tmpdir, name)
+            Path(path).write_text(text, encoding="utf-8")
+            self.paths.append(path)
+
+    def test_a_template_is_compiled_once_and_then_reused(self):
+        first = interview_generator_module._compiled_output_template(*self.paths)
+        second = interview_generator_module._compiled_output_template(*self.paths)
+        self.assertIs(first, second)
+        self.assertEqual(second.render(name="court").strip(), "hello court")
+        stats = interview_generator_module.compiled_template_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_editing_a_source_file_recompiles(self):
+        first = interview_generator_module._compiled_output_template(*self.paths)
+        Path(self.paths[2]).write_text("${greet(name)}!", encoding="utf-8")
+        stat_result = os.stat(self.paths[2])
+        os.utime(
+            self.paths[2],
+            ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000),
+        )
+        second = interview_generator_module._compiled_output_template(*self.paths)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.render(name="court").strip(), "hello court!")
+
+    def test_a_module_directory_keeps_compiled_modules_on_disk(self):
+        module_directory = os.path.join(self.tmpdir, "modules")
+        with patch.object(
+            interview_generator_module,
+            "_mako_module_directory",
+            return_value=module_directory,
+        ):
+            template = interview_generator_module._compiled_output_template(*self.paths)
+        self.assertEqual(template.render(name="court").strip(), "hello court")
+        self.assertTrue(
+            any(name.endswith(".py") for name in os.listdir(module_directory))
+        )
+
+
+class TestPlainLanguageRepairs(unittest.TestCase):
+    YAML = (
+        "question: |\n"
+        "  You must effectuate service upon the respondent.\n"
+        "subquestion: |\n"
+        "  Pursuant to the statute, you must file.\n"
+        "  You must effectuate service upon the respondent.\n"
+    )
+
+    def setUp(self):
+        patcher = patch.object(
+            interview_generator_module,
+            "_plain_language_settings",
+            return_value=(4, 5.0),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        set_response_cache(MemoryResponseCache())
+        self.addCleanup(set_response_cache, None)
+
+    def _lint_finding(self, text):
+        return {
+            "source": "llm",
+            "rule_id": "plain-language-rewrite-opportunities",
+            "problematic_text": text,
+        }
+
+    def test_rewrites_are_applied_to_the_first_occurrence_in_one_pass(self):
+        rewrites = {
+            "You must effectuate service upon the respondent.": (
+                "You must give the papers to the other side."
+            ),
+            "Pursuant to the statute, you must file.": "The law says you must file.",
+        }
+        lint = {"findings": [self._lint_finding(text) for text in rewrites]}
+        with (
+            patch.object(
+                interview_generator_module,
+                "_lint_with_aldashboard_interview_linter",
+                return_value=lint,
+            ),
+            patch.object(
+                interview_generator_module,
+                "_request_plain_language_rewrite",
+                side_effect=lambda text, model, bypass_cache: rewrites[text],
+            ) as request,
+        ):
+            updated = interview_generator_module._apply_plain_language_repairs(
+                self.YAML
+            )
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(
+            updated,
+            "question: |\n"
+            "  You must give the papers to the other side.\n"
+            "subquestion: |\n"
+            "  The law says you must file.\n"
+            "  You must effectuate service upon the respondent.\n",
+        )
+
+    def test_a_remembered_rewrite_does_not_ask_the_model(self):
+        original = "You must effectuate service upon the respondent."
+        llms = Mock()
+        llms.chat_completion.return_value = {
+            "rewrite": "Give the papers to the other side."
+        }
+        with patch.object(
+            interview_generator_module,
+            "_load_llms_module",
+            side_effect=lambda bypass_cache: cached_llms(llms, bypass=bypass_cache),
+        ):
+            first = interview_generator_module._plain_language_rewrites(
+                [original], workers=2, budget_seconds=5
+            )
+            again = interview_generator_module._plain_language_rewrites(
+                [original], workers=2, budget_seconds=5
+            )
+            self.assertEqual(llms.chat_completion.call_count, 1)
+            interview_generator_module._plain_language_rewrites(
+                [original], workers=2, budget_seconds=5, bypass_cache=True
+            )
+        self.assertEqual(llms.chat_completion.call_count, 2)
+        self.assertEqual(first, {original: "Give the papers to the other side."})
+        self.assertEqual(again, first)
+
+    def test_rewrites_not_back_within_the_budget_are_left_out(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def request(text, model, bypass_cache):
+            if text.startswith("Pursuant"):
+                release.wait(5)
+            return text.upper()
+
+        with patch.object(
+            interview_generator_module,
+            "_request_plain_language_rewrite",
+            side_effect=request,
+        ):
+            rewrites = interview_generator_module._plain_language_rewrites(
+                [
+                    "Pursuant to the statute, you must file.",
+                    "You must effectuate service upon the respondent.",
+                ],
+                workers=2,
+                budget_seconds=0.1,
+            )
+        self.assertEqual(
+            rewrites,
+            {
+                "You must effectuate service upon the respondent.": (
+                    "YOU MUST EFFECTUATE SERVICE UPON THE RESPONDENT."
+                )
+            },
+        )
+
+
+class TestLintRepair(unittest.TestCase):
+    YAML = (
+        "---\n"
+        "metadata:\n"
+        "  title: Test\n"
+        "---\n"
+        "question: |\n"
+        "  First screen\n"
+        "---\n"
+        "question: |\n"
+        "  Second screen\n"
+    )
+
+    def test_fixes_are_confirmed_with_a_single_further_lint(self):
+        findings = [
+            {
+                "rule_id": "missing-question-id",
+                "severity": "red",
+                "line_number": 8,
+            }
+        ]
+        with (
+            patch.object(
+                interview_generator_module,
+                "_lint_with_aldashboard_interview_linter",
+                side_effect=[{"findings": findings}, {"findings": []}],
+            ) as lint,
+            patch.object(
+                interview_generator_module, "_apply_plain_language_repairs"
+            ) as plain_language,
+        ):
+            repaired = interview_generator_module._repair_generated_yaml_with_lint(
+                self.YAML, interview=None
+            )
+        self.assertEqual(lint.call_count, 2)
+        plain_language.assert_not_called()
+        # Only the document the finding points at is given an id
+        self.assertEqual(
+            repaired,
+            self.YAML.replace(
+                "---\nquestion: |\n  Second screen\n",
+                "---\nid: Second screen\nquestion: |\n  Second screen\n",
+            ),
+        )
+
+    def test_an_unlocated_finding_fixes_every_document(self):
+        findings = [{"rule_id": "missing-question-id", "severity": "red"}]
+        with patch.object(
+            interview_generator_module,
+            "_lint_with_aldashboard_interview_linter",
+            side_effect=[{"findings": findings}, {"findings": []}],
+        ):
+            repaired = interview_generator_module._repair_generated_yaml_with_lint(
+                self.YAML, interview=None
+            )
+        self.assertIn("id: First screen\n", repaired)
+        self.assertIn("id: Second screen\n", repaired)
+
+    def test_lint_can_be_skipped(self):
+        with patch.object(
+            interview_generator_module, "_lint_with_aldashboard_interview_linter"
+        ) as lint:
+            repaired = interview_generator_module._repair_generated_yaml_with_lint(
+                self.YAML, interview=None, lint=False
+            )
+        lint.assert_not_called()
+        self.assertEqual(repaired, self.YAML)
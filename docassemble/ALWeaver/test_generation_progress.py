@@ -0,0 +1,102 @@
+# do not pre-load
+
+import json
+import unittest
+
+from .generation_progress import (
+    RedisProgressRecorder,
+    load_progress_events,
+    report_stage,
+    stage_durations,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value.encode("utf-8"))
+
+    def expire(self, key, seconds):
+        pass
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+
+class TestGenerationProgress(unittest.TestCase):
+    def test_each_stage_lasts_until_the_next_starts(self):
+        progress = stage_durations(
+            [
+                {"stage": "upload", "at": 100.0},
+                {"stage": "queued", "at": 101.0},
+                {"stage": "field_extraction", "at": 104.0},
+                {"stage": "finished", "at": 110.0},
+            ],
+            now=200.0,
+        )
+        self.assertEqual(progress["stage"], "finished")
+        self.assertEqual(
+            [(stage["stage"], stage.get("seconds")) for stage in progress["stages"]],
+            [
+                ("upload", 1.0),
+                ("queued", 3.0),
+                ("field_extraction", 6.0),
+                ("finished", None),
+            ],
+        )
+        self.assertEqual(progress["total_seconds"], 10.0)
+
+    def test_the_running_stage_is_timed_up_to_now(self):
+        progress = stage_durations(
+            [{"stage": "upload", "at": 100.0}, {"stage": "llm_assist", "at": 102.0}],
+            now=107.5,
+        )
+        self.assertEqual(progress["stage"], "llm_assist")
+        self.assertTrue(progress["stages"][-1]["running"])
+        self.assertEqual(progress["stages"][-1]["seconds"], 5.5)
+        self.assertNotIn("running", progress["stages"][0])
+        self.assertEqual(progress["total_seconds"], 7.5)
+
+    def test_side_by_side_requests_are_parts_of_their_stage(self):
+        redis_client = FakeRedis()
+        recorder = RedisProgressRecorder(redis_client, "job", 60)
+        report_stage(recorder, "llm_assist", at=10.0)
+        report_stage(recorder, "rendering", at=20.0)
+        # Reported once they are done, so after the stage that followed them
+        report_stage(recorder, "llm:metadata", at=10.5, seconds=6.0, status="applied")
+        report_stage(recorder, "llm:state", at=16.5, seconds=2.0, status="failed")
+        events = load_progress_events(redis_client, "job")
+        progress = stage_durations(events, now=25.0)
+        llm_stage = progress["stages"][0]
+        self.assertEqual(llm_stage["seconds"], 10.0)
+        self.assertEqual(
+            [(part["stage"], part["seconds"]) for part in llm_stage["parts"]],
+            [("llm:metadata", 6.0), ("llm:state", 2.0)],
+        )
+        self.assertEqual(progress["stage"], "rendering")
+
+    def test_a_failing_callback_does_not_fail_the_generation(self):
+        def broken(stage, detail):
+            raise ConnectionError("redis is down")
+
+        report_stage(broken, "grouping")
+        report_stage(None, "grouping")
+
+    def test_unreadable_events_are_skipped(self):
+        redis_client = FakeRedis()
+        redis_client.lists["job"] = [
+            b"not json",
+            json.dumps({"stage": "upload"}).encode(),
+            json.dumps({"stage": "queued", "at": 1.0}).encode(),
+        ]
+        self.assertEqual(
+            [event["stage"] for event in load_progress_events(redis_client, "job")],
+            ["queued"],
+        )
+        self.assertEqual(stage_durations([])["stages"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
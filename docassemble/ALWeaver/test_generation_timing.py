@@ -0,0 +1,93 @@
+# do not pre-load
+
+import os
+import pstats
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from .generation_timing import (
+    GenerationProfiler,
+    GenerationTimer,
+    collecting_timings,
+    timed_stage,
+)
+
+
+@timed_stage("decorated")
+def _decorated(value):
+    return value * 2
+
+
+class TestGenerationTimer(unittest.TestCase):
+    def test_stages_are_listed_in_the_order_they_started(self):
+        timer = GenerationTimer()
+        with collecting_timings(timer):
+            with timed_stage("outer"):
+                with timed_stage("inner"):
+                    sum(range(10000))
+                self.assertEqual(_decorated(2), 4)
+        self.assertEqual(
+            [(timing.name, timing.depth) for timing in timer.timings],
+            [("outer", 0), ("inner", 1), ("decorated", 1)],
+        )
+        outer, inner, decorated = timer.timings
+        self.assertGreaterEqual(outer.wall_seconds, inner.wall_seconds)
+        self.assertGreaterEqual(decorated.started, inner.started)
+        self.assertGreaterEqual(inner.cpu_seconds, 0.0)
+        self.assertEqual(
+            sorted(timer.as_dicts()[0]),
+            ["cpu_seconds", "depth", "name", "started", "wall_seconds"],
+        )
+
+    def test_a_stage_that_raises_is_still_timed(self):
+        timer = GenerationTimer()
+        with collecting_timings(timer):
+            with self.assertRaises(RuntimeError):
+                with timed_stage("failing"):
+                    raise RuntimeError("boom")
+            with timed_stage("next"):
+                pass
+        self.assertEqual(
+            [(timing.name, timing.depth) for timing in timer.timings],
+            [("failing", 0), ("next", 0)],
+        )
+
+    def test_stages_outside_a_generation_are_not_recorded(self):
+        timer = GenerationTimer()
+        with collecting_timings(timer):
+            pass
+        with timed_stage("ignored"):
+            self.assertEqual(_decorated(3), 6)
+        self.assertEqual(timer.timings, [])
+
+
+class TestGenerationProfiler(unittest.TestCase):
+    def test_cprofile_writes_a_readable_profile(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = os.path.join(temp_dir, "profiles")
+            with GenerationProfiler("cprofile", directory, label="test") as profiler:
+                _decorated(5)
+            self.assertTrue(profiler.path.endswith(".prof"))
+            self.assertTrue(os.path.basename(profiler.path).startswith("test-"))
+            stats = pstats.Stats(profiler.path)
+            self.assertTrue(
+                any(name == "_decorated" for _, _, name in stats.stats.keys())
+            )
+
+    def test_pyinstrument_falls_back_to_cprofile_when_missing(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(sys.modules, {"pyinstrument": None}):
+                with GenerationProfiler("pyinstrument", temp_dir) as profiler:
+                    _decorated(5)
+            self.assertEqual(profiler.kind, "cprofile")
+            self.assertTrue(os.path.isfile(profiler.path))
+
+    def test_unknown_profilers_are_refused(self):
+        with self.assertRaises(ValueError):
+            GenerationProfiler("perf", tempfile.gettempdir())
+
+
+if __name__ == "__main__":
+    unittest.main()
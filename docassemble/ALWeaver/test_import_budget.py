@@ -0,0 +1,154 @@
+# do not pre-load
+
+import json
+import subprocess
+import sys
+import textwrap
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from .lazy_imports import lazy_module
+
+# Each import runs in a fresh interpreter, after the modules a Docassemble
+# server has always loaded by the time it reaches this package's, with
+# stand-ins for the webapp objects and the thread context that only exist
+# inside a running server. Only the modules the import itself adds count.
+_PROBE = textwrap.dedent("""
+    import importlib, json, sys, time, types
+    from contextlib import nullcontext
+
+    try:
+        import flask
+        for name in (
+            "docassemble.base.config",
+            "docassemble.base.functions",
+            "docassemble.base.util",
+            "flask_cors",
+            "flask_login",
+            "flask_wtf.csrf",
+        ):
+            importlib.import_module(name)
+    except Exception as exc:
+        print(json.dumps({"skip": repr(exc)}))
+        raise SystemExit(0)
+
+    class _Worker:
+        def task(self, *args, **kwargs):
+            return lambda function: function
+
+    class _CSRF:
+        def exempt(self, function):
+            return function
+
+    for name, attributes in {
+        "docassemble.webapp.app_object": {"app": flask.Flask("probe"), "csrf": _CSRF()},
+        "docassemble.webapp.api.helpers": {"api_verify": lambda *args, **kwargs: True},
+        "docassemble.webapp.daredis": {"r": types.SimpleNamespace()},
+        "docassemble.webapp.worker_common": {
+            "workerapp": _Worker(),
+            "bg_context": nullcontext,
+        },
+    }.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+
+    try:
+        from docassemble.base.thread_context import empty_globals, global_context
+    except ImportError:
+        context = nullcontext()
+    else:
+        globals_for_probe = empty_globals()
+        globals_for_probe.current_question = types.SimpleNamespace(package="ALWeaver")
+        context = global_context(globals_for_probe)
+
+    preloaded = set(sys.modules)
+    with context:
+        started = time.perf_counter()
+        importlib.import_module(sys.argv[1])
+        seconds = time.perf_counter() - started
+    print(
+        json.dumps(
+            {"seconds": seconds, "added": sorted(set(sys.modules) - preloaded)}
+        )
+    )
+    """)
+
+# Seconds each module may take to import on top of the server's own modules.
+# Generous for a slow CI machine; the generator's dependencies alone took
+# several times this before they were deferred.
+IMPORT_BUDGETS = {
+    "docassemble.ALWeaver.api_weaver": 2.0,
+    "docassemble.ALWeaver.api_weaver_worker": 2.0,
+    "docassemble.ALWeaver.api_editor": 4.0,
+}
+
+# Only generating an interview needs these, and each is slow to import. Some
+# are already loaded by docassemble.base.util, so they only count when a
+# server has not loaded them first.
+DEFERRED_MODULES = (
+    "docassemble.ALWeaver.interview_generator",
+    "docx2python",
+    "docxtpl",
+    "formfyxer",
+    "pandas",
+    "pdfminer",
+    "pikepdf",
+)
+
+
+def _probe_import(module_name: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, module_name],
+        capture_output=True,
+        text=True,
+        timeout=300,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    if completed.returncode != 0:
+        raise AssertionError(
+            f"Importing {module_name} failed:\n{completed.stderr[-4000:]}"
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+class TestImportBudget(unittest.TestCase):
+    def test_api_modules_import_within_budget_without_generator_dependencies(self):
+        for module_name, budget in IMPORT_BUDGETS.items():
+            with self.subTest(module=module_name):
+                result = _probe_import(module_name)
+                if "skip" in result:
+                    self.skipTest(
+                        f"Docassemble's own modules do not import here: {result['skip']}"
+                    )
+                added = set(result["added"])
+                self.assertEqual(
+                    [
+                        name
+                        for name in DEFERRED_MODULES
+                        if name in added or f"{name}.__init__" in added
+                    ],
+                    [],
+                )
+                self.assertLess(result["seconds"], budget)
+
+
+class TestLazyModule(unittest.TestCase):
+    def test_the_module_is_imported_on_first_use_and_can_be_patched(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_module("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        with patch.object(colorsys, "rgb_to_hsv", return_value="patched"):
+            self.assertEqual(colorsys.rgb_to_hsv(1, 0, 0), "patched")
+        self.assertEqual(colorsys.rgb_to_hsv(1, 0, 0), (0.0, 1.0, 1))
+        self.assertIn("colorsys", sys.modules)
+        self.assertIs(lazy_module("colorsys"), sys.modules["colorsys"])
+
+    def test_a_missing_module_is_reported_straight_away(self):
+        with self.assertRaises(ModuleNotFoundError):
+            lazy_module("alweaver_no_such_module")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# do not pre-load
+
+import threading
+import unittest
+
+from .llm_assist import LLMAssistStep, run_llm_assist_steps
+
+
+class TestLLMAssistSteps(unittest.TestCase):
+    def test_independent_steps_wait_on_the_model_together(self):
+        both_asked = threading.Barrier(2, timeout=5)
+        applied = []
+        steps = [
+            LLMAssistStep(
+                name=name,
+                draft=lambda name=name: (both_asked.wait(), name)[1],
+                apply=applied.append,
+            )
+            for name in ["metadata", "field_labels"]
+        ]
+        timings = run_llm_assist_steps(steps, workers=2)
+        self.assertEqual(applied, ["metadata", "field_labels"])
+        self.assertEqual([timing.status for timing in timings], ["applied"] * 2)
+
+    def test_answers_are_applied_in_the_order_given(self):
+        second_answered = threading.Event()
+        applied = []
+        steps = [
+            LLMAssistStep(
+                name="first",
+                draft=lambda: second_answered.wait(5) and "first",
+                apply=applied.append,
+            ),
+            LLMAssistStep(
+                name="second",
+                draft=lambda: (second_answered.set(), "second")[1],
+                apply=applied.append,
+            ),
+        ]
+        run_llm_assist_steps(steps, workers=2)
+        self.assertEqual(applied, ["first", "second"])
+
+    def test_a_step_starts_once_what_it_reads_is_applied(self):
+        interview = {}
+        steps = [
+            LLMAssistStep(
+                name="metadata",
+                draft=lambda: "Eviction answer",
+                apply=lambda title: interview.update(title=title),
+            ),
+            LLMAssistStep(
+                name="state",
+                draft=lambda: interview.get("title"),
+                apply=lambda seen: interview.update(seen=seen),
+                after=("metadata",),
+            ),
+        ]
+        run_llm_assist_steps(steps, workers=2)
+        self.assertEqual(interview["seen"], "Eviction answer")
+
+    def test_failed_and_slow_steps_are_left_out(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        applied = []
+
+        def fail():
+            raise RuntimeError("synthetic llm failure")
+
+        steps = [
+            LLMAssistStep(name="failing", draft=fail, apply=applied.append),
+            LLMAssistStep(
+                name="slow",
+                draft=lambda: release.wait(5) and "slow",
+                apply=applied.append,
+                timeout=0.05,
+            ),
+            LLMAssistStep(
+                name="after_both",
+                draft=lambda: "after_both",
+                apply=applied.append,
+                after=("failing", "slow"),
+            ),
+        ]
+        timings = run_llm_assist_steps(steps, workers=3)
+        release.set()
+        self.assertEqual(applied, ["after_both"])
+        self.assertEqual(
+            [timing.status for timing in timings], ["failed", "timed out", "applied"]
+        )
+        self.assertIn("synthetic llm failure", timings[0].error)
+        self.assertGreaterEqual(timings[2].started, timings[1].seconds)
+
+    def test_a_step_must_come_after_the_steps_it_reads(self):
+        steps = [
+            LLMAssistStep(
+                name="state", draft=lambda: "", apply=print, after=("metadata",)
+            ),
+            LLMAssistStep(name="metadata", draft=lambda: "", apply=print),
+        ]
+        with self.assertRaises(ValueError):
+            run_llm_assist_steps(steps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+# do not pre-load
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from .llm_response_cache import (
+    MemoryResponseCache,
+    RedisResponseCache,
+    ResponseCache,
+    SqliteResponseCache,
+    cached_llms,
+    clear_llm_response_cache_stats,
+    llm_response_cache_stats,
+    response_cache_key,
+    set_response_cache,
+)
+
+
+class FakeRedis:
+    """Just enough of redis-py for the cache: strings and one sorted set."""
+
+    def __init__(self):
+        self.values = {}
+        self.sorted = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return None if value is None else value.encode("utf-8")
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def zadd(self, key, mapping):
+        self.sorted.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        members = self.sorted.get(key, {})
+        for member, score in list(members.items()):
+            if low <= score <= high:
+                del members[member]
+
+    def zcard(self, key):
+        return len(self.sorted.get(key, {}))
+
+    def zrange(self, key, start, end):
+        members = sorted(self.sorted.get(key, {}).items(), key=lambda item: item[1])
+        return [member.encode("utf-8") for member, _ in members[start : end + 1]]
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.sorted.get(key, {}).pop(member, None)
+
+
+class TestCachedLLMs(unittest.TestCase):
+    def setUp(self):
+        clear_llm_response_cache_stats()
+        self.addCleanup(clear_llm_response_cache_stats)
+        set_response_cache(MemoryResponseCache())
+        self.addCleanup(set_response_cache, None)
+        self.llms = Mock()
+        self.llms.chat_completion.return_value = {"fields": ["name"]}
+
+    def _ask(self, llms, user_message="Draft the screen"):
+        return llms.chat_completion(
+            system_message="You draft screens.",
+            user_message=user_message,
+            json_mode=True,
+            model="gpt-5-mini",
+        )
+
+    def test_the_same_request_is_answered_once(self):
+        first = self._ask(cached_llms(self.llms))
+        again = self._ask(cached_llms(self.llms))
+        self.assertEqual(first, {"fields": ["name"]})
+        self.assertEqual(again, first)
+        self.assertEqual(self.llms.chat_completion.call_count, 1)
+        stats = llm_response_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_a_different_prompt_or_model_is_asked_again(self):
+        self._ask(cached_llms(self.llms))
+        self._ask(cached_llms(self.llms), user_message="Draft another screen")
+        cached_llms(self.llms).chat_completion(
+            system_message="You draft screens.",
+            user_message="Draft the screen",
+            json_mode=True,
+            model="gpt-5",
+        )
+        self.assertEqual(self.llms.chat_completion.call_count, 3)
+
+    def test_bypass_asks_again_and_keeps_the_new_answer(self):
+        self._ask(cached_llms(self.llms))
+        self.llms.chat_completion.return_value = {"fields": ["address"]}
+        fresh = self._ask(cached_llms(self.llms, bypass=True))
+        self.assertEqual(fresh, {"fields": ["address"]})
+        self.assertEqual(self._ask(cached_llms(self.llms)), {"fields": ["address"]})
+        self.assertEqual(self.llms.chat_completion.call_count, 2)
+        self.assertEqual(llm_response_cache_stats()["bypassed"], 1)
+
+    def test_failures_and_fallback_classifications_are_not_kept(self):
+        self.llms.chat_completion.side_effect = [RuntimeError("timeout"), None, {}]
+        for _ in range(3):
+            try:
+                self._ask(cached_llms(self.llms))
+            except RuntimeError:
+                pass
+        self.llms.classify_text.return_value = "other"
+        for _ in range(2):
+            cached_llms(self.llms).classify_text(
+                text="Title", choices={"other": "Other"}, default_response="other"
+            )
+        self.assertEqual(self.llms.chat_completion.call_count, 3)
+        self.assertEqual(self.llms.classify_text.call_count, 2)
+
+    def test_other_attributes_pass_straight_through(self):
+        self.llms.client = "client"
+        self.assertEqual(cached_llms(self.llms).client, "client")
+        set_response_cache(None)
+        self.assertIs(cached_llms(self.llms), self.llms)
+
+
+class TestResponseCacheBackends(unittest.TestCase):
+    def test_memory_drops_the_least_recently_used(self):
+        cache = MemoryResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertEqual((cache.get("a"), cache.get("b")), ("1", None))
+
+    def test_memory_forgets_expired_answers(self):
+        cache = MemoryResponseCache(ttl_seconds=60)
+        cache.set("a", "1")
+        with patch.object(time, "time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get("a"))
+
+    def test_redis_keeps_at_most_max_entries(self):
+        redis_client = FakeRedis()
+        cache = RedisResponseCache(redis_client, max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertEqual((cache.get("a"), cache.get("b")), ("1", None))
+        self.assertEqual(redis_client.zcard(cache.index_key), 2)
+
+    def test_sqlite_survives_a_new_connection_and_evicts(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache", "llm.sqlite3")
+            cache = SqliteResponseCache(path, max_entries=2)
+            cache.set("a", "1")
+            with patch.object(time, "time", return_value=time.time() + 1):
+                cache.set("b", "2")
+            with patch.object(time, "time", return_value=time.time() + 2):
+                cache.get("a")
+            with patch.object(time, "time", return_value=time.time() + 3):
+                cache.set("c", "3")
+            reopened = SqliteResponseCache(path, max_entries=2)
+            self.assertEqual((reopened.get("a"), reopened.get("b")), ("1", None))
+            self.assertEqual(reopened.get("c"), "3")
+            with patch.object(time, "time", return_value=time.time() + 10**9):
+                self.assertIsNone(reopened.get("c"))
+
+    def test_a_backend_missing_a_method_cannot_be_created(self):
+        class ReadOnlyCache(ResponseCache):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            ReadOnlyCache()
+
+    def test_keys_do_not_depend_on_argument_order(self):
+        self.assertEqual(
+            response_cache_key("chat_completion", {"model": "m", "json_mode": True}),
+            response_cache_key("chat_completion", {"json_mode": True, "model": "m"}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -111,6 +111,25 @@ class TestLLMRobustness(unittest.TestCase):
         self.assertEqual(len(interview.questions), 1)
         self.assertEqual(interview.questions[0].question_text, "LLM Screen")
 
+    def test_run_llm_assist_applies_screens_when_other_steps_fail(self):
+        interview = self._build_interview_with_custom_field()
+        interview._llm_context_text = MethodType(
+            lambda self, **kwargs: "context", interview
+        )
+        interview._llm_default_model = MethodType(lambda self: "gpt-5-mini", interview)
+
+        # The fake has no classify_text, so the metadata and state steps draft nothing
+        with patch.object(ig, "_load_llms_module", return_value=_FakeLlms()):
+            timings = interview.run_llm_assist()
+
+        self.assertEqual(
+            [timing.name for timing in timings],
+            ["reference_site", "metadata", "field_labels", "state", "screens"],
+        )
+        self.assertEqual(len(interview.questions), 1)
+        self.assertEqual(interview.questions[0].question_text, "LLM Screen")
+        self.assertFalse(hasattr(interview, "state"))
+
     def test_apply_llm_draft_payload_refreshes_stale_screen_field_labels(self):
         interview = self._build_interview_with_custom_field()
         payload = {
@@ -0,0 +1,104 @@
+# do not pre-load
+
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from . import parsed_source_cache
+from .editor_utils import _parse_interview_yaml, parse_interview_yaml
+from .parsed_source_cache import clear_parsed_source_cache, parsed_source_cache_stats
+from .source_document import parse_source_document
+
+SOURCE = (
+    "metadata:\n"
+    "  title: Eviction answer\n"
+    "---\n"
+    "id: intro\n"
+    "question: |\n"
+    "  What is your name?\n"
+    "fields:\n"
+    "  - Name: users[0].name.first\n"
+)
+
+
+class TestParsedSourceCache(unittest.TestCase):
+    def setUp(self):
+        clear_parsed_source_cache()
+        self.addCleanup(clear_parsed_source_cache)
+
+    def test_an_unchanged_source_is_parsed_once(self):
+        with patch.object(yaml, "safe_load", wraps=yaml.safe_load) as safe_load:
+            first = parse_interview_yaml(SOURCE)
+            loads = safe_load.call_count
+            second = parse_interview_yaml(SOURCE)
+        self.assertGreater(loads, 0)
+        self.assertEqual(safe_load.call_count, loads)
+        self.assertEqual(first, second)
+        self.assertEqual(parsed_source_cache_stats()["hits"], 1)
+
+    def test_changing_a_returned_model_does_not_change_the_next_one(self):
+        first = parse_interview_yaml(SOURCE)
+        first["blocks"][1]["data"]["question"] = "Changed"
+        first["blocks"].clear()
+        second = parse_interview_yaml(SOURCE)
+        self.assertEqual(len(second["blocks"]), 2)
+        self.assertEqual(
+            second["blocks"][1]["data"]["question"], "What is your name?\n"
+        )
+
+    def test_an_edited_source_is_parsed_afresh(self):
+        parse_interview_yaml(SOURCE)
+        edited = parse_interview_yaml(SOURCE.replace("your name", "your full name"))
+        self.assertEqual(
+            edited["blocks"][1]["data"]["question"], "What is your full name?\n"
+        )
+
+    def test_editing_one_block_reparses_only_that_block(self):
+        parse_interview_yaml(SOURCE)
+        edited = SOURCE.replace("your name", "your full name")
+        with patch.object(yaml, "safe_load", wraps=yaml.safe_load) as safe_load:
+            model = parse_interview_yaml(edited)
+        self.assertEqual(safe_load.call_count, 1)
+        self.assertEqual(model["blocks"][0]["title"], "Eviction answer")
+        self.assertEqual(model["metadata_blocks"], [0])
+
+    def test_reused_blocks_move_with_the_documents_before_them(self):
+        parse_interview_yaml(SOURCE)
+        shifted = "code: |\n  x = 1\n---\n" + SOURCE
+        model = parse_interview_yaml(shifted)
+        self.assertEqual(model, _parse_interview_yaml(shifted))
+        metadata = model["blocks"][1]
+        self.assertEqual(metadata["index"], 1)
+        self.assertEqual(metadata["line_start"], 4)
+        self.assertTrue(metadata["id"].startswith("block-1-"))
+        self.assertEqual(model["metadata_blocks"], [1])
+
+    def test_source_documents_are_cached_per_filename(self):
+        first = parse_source_document("main.yml", SOURCE)
+        again = parse_source_document("main.yml", SOURCE)
+        elsewhere = parse_source_document("other.yml", SOURCE)
+        self.assertIsNot(first, again)
+        self.assertEqual(first, again)
+        self.assertEqual(elsewhere.filename, "other.yml")
+        # The second file is parsed again, but from both documents' cached parses
+        self.assertEqual(parsed_source_cache_stats()["hits"], 3)
+
+    def test_the_least_recently_used_source_is_dropped_past_the_budget(self):
+        other = SOURCE.replace("intro", "outro")
+        with patch.object(
+            parsed_source_cache, "MAX_CACHED_SOURCE_CHARACTERS", len(SOURCE) + 1
+        ):
+            parse_source_document("main.yml", SOURCE)
+            parse_source_document("main.yml", other)
+            before = parsed_source_cache_stats()
+            parse_source_document("main.yml", other)
+            stats = parsed_source_cache_stats()
+        self.assertLessEqual(stats["characters"], len(SOURCE) + 1)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertEqual(stats["hits"], before["hits"] + 1)
+        self.assertEqual(stats["misses"], before["misses"])
+
+
+if __name__ == "__main__":
+    unittest.main()
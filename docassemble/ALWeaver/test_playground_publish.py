@@ -1,5 +1,8 @@
 # do not pre-load
 
+import hashlib
+import io
+import os
 import subprocess
 import unittest
 import tempfile
@@ -9,6 +12,7 @@ from unittest.mock import patch
 import yaml
 
 from . import playground_publish
+from .docassemble_compat import GithubSnapshotFiles
 from .playground_publish import (
     _source_path_and_filename,
     load_project_github_manifest,
@@ -31,13 +35,46 @@ class test_playground_publish(unittest.TestCase):
                 with patch.object(
                     playground_publish.subprocess, "run", side_effect=failure
                 ) as merge_file:
-                    result = playground_publish._merge_file_content(
+                    result = playground_publish._git_merge_file(
                         b"local\n", b"base\n", b"remote\n"
                     )
 
                 self.assertIsNone(result)
                 self.assertEqual(merge_file.call_args.kwargs["timeout"], 30)
 
+    def test_merge_file_content_merges_in_process_and_falls_back_to_git(self):
+        with patch.object(playground_publish.subprocess, "run") as merge_file:
+            self.assertEqual(
+                playground_publish._merge_file_content(
+                    b"ours\nsame\nend\n",
+                    b"start\nsame\nend\n",
+                    b"start\nsame\ntheirs\n",
+                ),
+                b"ours\nsame\ntheirs\n",
+            )
+            self.assertIsNone(
+                playground_publish._merge_file_content(
+                    b"ours\n", b"base\n", b"theirs\n"
+                )
+            )
+        merge_file.assert_not_called()
+
+        with (
+            patch.object(
+                playground_publish,
+                "merge_three_way",
+                side_effect=playground_publish.MergeDeclined("too long"),
+            ),
+            patch.object(
+                playground_publish, "_git_merge_file", return_value=b"merged by git\n"
+            ) as git_merge_file,
+        ):
+            self.assertEqual(
+                playground_publish._merge_file_content(b"a\n", b"b\n", b"c\n"),
+                b"merged by git\n",
+            )
+        git_merge_file.assert_called_once_with(b"a\n", b"b\n", b"c\n")
+
     def test_github_pull_three_way_merges_non_overlapping_edits(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             root = Path(temp_dir)
@@ -95,6 +132,114 @@ class test_playground_publish(unittest.TestCase):
             self.assertIn("ending: Remote", merged)
             record.assert_called_once()
 
+    def test_github_pull_reads_only_the_files_it_has_to_merge(self):
+        class TrackedSnapshot(dict):
+            """Digests are free; every read of a file's content is recorded."""
+
+            def __init__(self, files, reads):
+                super().__init__(files)
+                self.reads = reads
+
+            def digest(self, path):
+                return hashlib.sha256(dict.__getitem__(self, path)).hexdigest()
+
+            def __getitem__(self, path):
+                self.reads.append(path)
+                return dict.__getitem__(self, path)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+
+            class FakeArea:
+                def __init__(self, section):
+                    self.directory = str(root / section)
+                    Path(self.directory).mkdir(parents=True, exist_ok=True)
+
+                def finalize(self):
+                    pass
+
+            areas = {
+                section: FakeArea(section)
+                for section in playground_publish.PLAYGROUND_SECTIONS
+            }
+            questions = Path(areas["playground"].directory) / "Housing"
+            templates = Path(areas["playgroundtemplate"].directory) / "Housing"
+            questions.mkdir()
+            templates.mkdir()
+            base_text = b"title: Original\nline2: same\nline3: same\nending: Original\n"
+            (questions / "main.yml").write_bytes(
+                base_text.replace(b"title: Original", b"title: Local")
+            )
+            (questions / "gone.yml").write_bytes(b"question: Deleted upstream\n")
+            (templates / "letter.docx").write_bytes(b"unchanged template")
+            prefix = "docassemble/HousingForms/data/"
+            reads = []
+            base = TrackedSnapshot(
+                {
+                    prefix + "questions/main.yml": base_text,
+                    prefix + "questions/gone.yml": b"question: Deleted upstream\n",
+                    prefix + "templates/letter.docx": b"unchanged template",
+                },
+                reads,
+            )
+            remote = TrackedSnapshot(
+                {
+                    prefix
+                    + "questions/main.yml": base_text.replace(
+                        b"ending: Original", b"ending: Remote"
+                    ),
+                    prefix + "questions/added.yml": b"question: New upstream\n",
+                    prefix + "templates/letter.docx": b"unchanged template",
+                },
+                reads,
+            )
+            with (
+                patch.object(
+                    playground_publish,
+                    "create_saved_file",
+                    side_effect=lambda _uid, fix, section: areas[section],
+                ),
+                patch.object(playground_publish, "prepare_project_github_package"),
+                patch.object(playground_publish, "record_project_github_sync"),
+            ):
+                result = merge_github_snapshot(
+                    user_id=7,
+                    project_name="Housing",
+                    base_snapshot={"files": base},
+                    remote_snapshot={
+                        "files": remote,
+                        "branch": "main",
+                        "sha": "remote-sha",
+                    },
+                    sync={
+                        "package": "HousingForms",
+                        "repository_url": "https://github.com/LegalAid/docassemble-HousingForms",
+                        "branch": "main",
+                    },
+                )
+
+            self.assertEqual(result["files"], 3)
+            self.assertEqual(
+                sorted(reads),
+                sorted(
+                    [
+                        prefix + "questions/main.yml",
+                        prefix + "questions/main.yml",
+                        prefix + "questions/added.yml",
+                    ]
+                ),
+            )
+            merged = (questions / "main.yml").read_bytes()
+            self.assertIn(b"title: Local", merged)
+            self.assertIn(b"ending: Remote", merged)
+            self.assertEqual(
+                (questions / "added.yml").read_bytes(), b"question: New upstream\n"
+            )
+            self.assertFalse((questions / "gone.yml").exists())
+            self.assertEqual(
+                (templates / "letter.docx").read_bytes(), b"unchanged template"
+            )
+
     def test_github_pull_leaves_project_untouched_on_conflict(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             root = Path(temp_dir)
@@ -245,6 +390,38 @@ class test_playground_publish(unittest.TestCase):
                 }
             )
 
+    def test_failed_imports_and_merges_still_remove_snapshot_files(self):
+        def snapshot(package):
+            files = GithubSnapshotFiles()
+            files.add(
+                f"docassemble/{package}/data/questions/main.yml",
+                io.BytesIO(b"question: Hi\n"),
+            )
+            files.add(
+                f"docassemble/{package}/data/static/images/logo.svg",
+                io.BytesIO(b"<svg />"),
+            )
+            return {"files": files, "url": "", "branch": "main", "sha": "sha"}
+
+        imported = snapshot("HousingForms")
+        with self.assertRaisesRegex(ValueError, "nested files"):
+            playground_publish.import_github_snapshot(
+                user_id=7, project_name="Housing", snapshot=imported
+            )
+        self.assertFalse(os.path.exists(imported["files"]._directory))
+
+        base, remote = snapshot("HousingForms"), snapshot("HousingForms")
+        with self.assertRaisesRegex(ValueError, "nested files"):
+            merge_github_snapshot(
+                user_id=7,
+                project_name="Housing",
+                base_snapshot=base,
+                remote_snapshot=remote,
+                sync={"package": "HousingForms"},
+            )
+        self.assertFalse(os.path.exists(base["files"]._directory))
+        self.assertFalse(os.path.exists(remote["files"]._directory))
+
     def test_prepare_project_github_package_lists_every_visible_project_file(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             root = Path(temp_dir)
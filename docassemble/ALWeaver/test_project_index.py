@@ -0,0 +1,132 @@
+# do not pre-load
+
+import unittest
+from unittest.mock import patch
+
+from . import project_index as project_index_module
+from .project_index import (
+    ProjectIndex,
+    clear_project_indexes,
+    forget_project_file,
+    note_saved_file,
+    project_index,
+)
+from .review_screen_sync import collect_interview_yaml_texts, interview_scope
+
+FILES = {
+    "main.yml": "---\ninclude:\n  - questions.yml\n  - review.yml\n",
+    "questions.yml": (
+        "---\nobjects:\n  - tenants: ALPeopleList\n---\nid: q\nquestion: |\n  Q\n"
+    ),
+    "review.yml": "---\nid: r\nreview:\n  - Edit: x\n",
+}
+
+
+class TestProjectIndex(unittest.TestCase):
+    def setUp(self):
+        clear_project_indexes()
+        self.addCleanup(clear_project_indexes)
+        self.files = dict(FILES)
+        self.reads = []
+
+    def read(self, name):
+        self.reads.append(name)
+        return self.files[name]
+
+    def scans(self):
+        return patch.object(
+            project_index_module,
+            "_include_targets",
+            wraps=project_index_module._include_targets,
+        )
+
+    def test_a_file_is_scanned_once_per_revision(self):
+        index = ProjectIndex()
+        with self.scans() as scan:
+            for _ in range(3):
+                self.assertEqual(
+                    interview_scope(
+                        self.read, "review.yml", list(self.files), index=index
+                    ),
+                    (["main.yml"], ["main.yml", "questions.yml", "review.yml"]),
+                )
+            self.assertEqual(scan.call_count, 3)
+
+            self.files["review.yml"] = "---\ninclude:\n  - extra.yml\n"
+            self.files["extra.yml"] = "---\nid: e\nquestion: |\n  E\n"
+            roots, files = interview_scope(
+                self.read, "review.yml", list(self.files), index=index
+            )
+            self.assertEqual(
+                files, ["main.yml", "questions.yml", "review.yml", "extra.yml"]
+            )
+            self.assertEqual(
+                [call.args[0] for call in scan.call_args_list[3:]],
+                [self.files["review.yml"], self.files["extra.yml"]],
+            )
+        self.assertEqual(roots, ["main.yml"])
+
+    def test_the_interview_is_read_once_while_collecting_it(self):
+        names, texts = collect_interview_yaml_texts(
+            self.read, "review.yml", list(self.files), index=ProjectIndex()
+        )
+        self.assertEqual(names, ["main.yml", "questions.yml", "review.yml"])
+        self.assertEqual(texts, [self.files[name] for name in names])
+        self.assertEqual(sorted(self.reads), sorted(self.files))
+
+    def test_declared_objects_follow_the_text(self):
+        index = ProjectIndex()
+        text = self.files["questions.yml"]
+        self.assertEqual(index.declared_objects("questions.yml", text), {"tenants"})
+        self.assertEqual(
+            index.declared_objects(
+                "questions.yml", text + "---\nobjects:\n  - x: DAList\n"
+            ),
+            {"tenants", "x"},
+        )
+
+    def test_defined_variables_are_worked_out_once_per_revision(self):
+        try:
+            from . import template_analysis
+        except ImportError as err:
+            self.skipTest(f"The generator's dependencies do not import here: {err!r}")
+        index = ProjectIndex()
+        text = self.files["questions.yml"]
+        with patch.object(
+            template_analysis,
+            "interview_defined_variables",
+            wraps=template_analysis.interview_defined_variables,
+        ) as defined:
+            self.assertIn("tenants", index.defined_variables("questions.yml", text))
+            index.defined_variables("questions.yml", text)
+            self.assertEqual(defined.call_count, 1)
+            index.defined_variables("questions.yml", text + "---\nid: more\n")
+            self.assertEqual(defined.call_count, 2)
+
+    def test_saves_update_an_existing_index_and_renames_forget(self):
+        note_saved_file(1, "Housing", "main.yml", self.files["main.yml"])
+        index = project_index(1, "Housing")
+        self.assertNotIn("main.yml", index)
+        self.assertIs(project_index(1, "Housing"), index)
+        self.assertIsNot(project_index(2, "Housing"), index)
+
+        note_saved_file(1, "Housing", "main.yml", self.files["main.yml"])
+        self.assertEqual(
+            index.entry("main.yml", self.files["main.yml"]).includes,
+            ("questions.yml", "review.yml"),
+        )
+        forget_project_file(1, "Housing", "main.yml")
+        self.assertNotIn("main.yml", index)
+
+    def test_the_least_recently_used_project_is_dropped(self):
+        with patch.object(project_index_module, "MAX_INDEXED_PROJECTS", 2):
+            first = project_index(1, "A")
+            second = project_index(1, "B")
+            self.assertIs(project_index(1, "A"), first)
+            project_index(1, "C")
+            self.assertIs(project_index(1, "A"), first)
+            self.assertIsNot(project_index(1, "B"), second)
+
+
+if __name__ == "__main__":
+    unittest.main()
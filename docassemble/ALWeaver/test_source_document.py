@@ -2,7 +2,11 @@
 
 from pathlib import Path
 import unittest
+from unittest.mock import patch
 
+import yaml
+
+from .parsed_source_cache import clear_parsed_source_cache
 from .source_document import (
     apply_range_operations,
     parse_source_document,
@@ -95,5 +99,47 @@ class TestSourceDocument(unittest.TestCase):
                 )
 
 
+class TestIncrementalParse(unittest.TestCase):
+    source = (
+        "metadata:\n  title: Demo\n---\nid: intro\nquestion: Hi\n---\ncode: x = 1\n"
+    )
+
+    def setUp(self):
+        clear_parsed_source_cache()
+        self.addCleanup(clear_parsed_source_cache)
+        self.previous = parse_source_document("main.yml", self.source)
+
+    def parse_from_previous(self, updated):
+        clear_parsed_source_cache()
+        with patch.object(yaml, "compose_all", wraps=yaml.compose_all) as compose_all:
+            incremental = parse_source_document(
+                "main.yml", updated, previous=self.previous
+            )
+        clear_parsed_source_cache()
+        self.assertEqual(incremental, parse_source_document("main.yml", updated))
+        return incremental, compose_all.call_count
+
+    def test_an_edit_inside_one_document_does_not_compose_the_stream_again(self):
+        document, composed = self.parse_from_previous(
+            self.source.replace("question: Hi", "question: Hello there")
+        )
+        self.assertEqual(composed, 0)
+        self.assertTrue(document.structurally_valid)
+        self.assertEqual(document.documents[1].parsed_value["question"], "Hello there")
+
+    def test_edits_that_can_change_the_stream_compose_it_again(self):
+        for label, updated in (
+            ("new separator", self.source.replace("question: Hi", "a: 1\n---\nb: 2")),
+            ("directive", self.source.replace("code: x = 1\n", "%TAG ! tag:x,1:\n")),
+            ("document end", self.source.replace("question: Hi", "q: 1\n...")),
+            ("broken document", self.source.replace("question: Hi", "question: [")),
+        ):
+            with self.subTest(edit=label):
+                document, composed = self.parse_from_previous(updated)
+                self.assertEqual(composed, 1)
+                if label == "broken document":
+                    self.assertFalse(document.structurally_valid)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,168 @@
+# do not pre-load
+
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from . import text_merge
+from .text_merge import MergeDeclined, merge_three_way
+
+BASE = b"title: Original\nline2: same\nline3: same\nline4: same\nending: Original\n"
+
+
+def _git_merge_file(local: bytes, base: bytes, remote: bytes):
+    directory = tempfile.mkdtemp()
+    try:
+        paths = [os.path.join(directory, name) for name in ("local", "base", "remote")]
+        for path, content in zip(paths, (local, base, remote)):
+            with open(path, "wb") as stream:
+                stream.write(content)
+        result = subprocess.run(
+            ["git", "merge-file", "-p", *paths],
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return result.stdout if result.returncode == 0 else None
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class TestMergeThreeWay(unittest.TestCase):
+    def test_changes_to_different_lines_are_combined(self):
+        local = BASE.replace(b"title: Original", b"title: Local")
+        remote = BASE.replace(b"ending: Original", b"ending: Remote")
+        self.assertEqual(
+            merge_three_way(local, BASE, remote),
+            b"title: Local\nline2: same\nline3: same\nline4: same\nending: Remote\n",
+        )
+
+    def test_one_sided_and_identical_changes_are_taken(self):
+        local = BASE.replace(b"line3: same\n", b"line3: new\nextra: line\n")
+        self.assertEqual(merge_three_way(local, BASE, BASE), local)
+        self.assertEqual(merge_three_way(BASE, BASE, local), local)
+        self.assertEqual(merge_three_way(local, BASE, local), local)
+        self.assertEqual(merge_three_way(b"", b"", b"added\n"), b"added\n")
+
+    def test_insertions_and_deletions_merge(self):
+        local = BASE.replace(b"line2: same\n", b"")
+        remote = BASE.replace(b"line4: same\n", b"line4: same\ninserted: yes\n")
+        self.assertEqual(
+            merge_three_way(local, BASE, remote),
+            b"title: Original\nline3: same\nline4: same\ninserted: yes\n"
+            b"ending: Original\n",
+        )
+
+    def test_overlapping_and_adjacent_changes_conflict(self):
+        cases = {
+            "same line": (
+                BASE.replace(b"line3: same", b"line3: local"),
+                BASE.replace(b"line3: same", b"line3: remote"),
+            ),
+            "adjacent lines": (
+                BASE.replace(b"line3: same", b"line3: local"),
+                BASE.replace(b"line4: same", b"line4: remote"),
+            ),
+            "deleted and edited": (
+                BASE.replace(b"line3: same\n", b""),
+                BASE.replace(b"line3: same", b"line3: remote"),
+            ),
+            "both inserted at one place": (
+                BASE.replace(b"line3: same\n", b"line3: same\nlocal: 1\n"),
+                BASE.replace(b"line3: same\n", b"line3: same\nremote: 1\n"),
+            ),
+        }
+        for name, (local, remote) in cases.items():
+            with self.subTest(case=name):
+                self.assertIsNone(merge_three_way(local, BASE, remote))
+
+    def test_a_missing_final_newline_is_kept_or_changed_as_a_line(self):
+        base = b"first\nmiddle\nlast"
+        self.assertEqual(
+            merge_three_way(b"changed\nmiddle\nlast", base, b"first\nmiddle\nlast\n"),
+            b"changed\nmiddle\nlast\n",
+        )
+        self.assertIsNone(
+            merge_three_way(b"first\nmiddle\nlast\n", base, b"first\nmiddle\nLast")
+        )
+
+    def test_long_files_and_ambiguous_alignments_are_declined(self):
+        with patch.object(text_merge, "MAX_MERGE_LINES", 3):
+            with self.assertRaises(MergeDeclined):
+                merge_three_way(b"a\nb\nc\nd\n", b"a\n", b"a\n")
+        # Which "same" line the deletion took decides whether it touches the
+        # other side's change
+        with self.assertRaises(MergeDeclined):
+            merge_three_way(
+                b"top\nsame\nbottom\n",
+                b"top\nsame\nsame\nbottom\n",
+                b"top\nsame\nsame\nend\n",
+            )
+
+    def test_changes_that_could_be_aligned_another_way_are_declined(self):
+        cases = {
+            # git matches local's "b" with the second one, so the changes meet
+            "replaced next to a repeated line": (
+                b"Z\nb\nW\n",
+                b"c\nb\nb\n",
+                b"c\nb\nW\n",
+            ),
+            # git keeps "a" and moves "c", where difflib keeps "c" and moves "a"
+            "moved line": (b"a\nc\n", b"c\na\n", b"a\n"),
+        }
+        for name, (local, base, remote) in cases.items():
+            with self.subTest(case=name):
+                with self.assertRaises(MergeDeclined):
+                    merge_three_way(local, base, remote)
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_results_match_git_merge_file(self):
+        rng = random.Random(24)
+        few_lines = [b"a\n", b"b\n", b"c\n", b"W\n", b"Z\n"]
+
+        def edit(lines, new_line):
+            lines = list(lines)
+            for _ in range(rng.randint(0, 3)):
+                at = rng.randint(0, len(lines))
+                action = rng.random()
+                if action < 0.4 and at < len(lines):
+                    lines[at] = new_line()
+                elif action < 0.7:
+                    lines.insert(at, new_line())
+                elif at < len(lines):
+                    del lines[at]
+            return b"".join(lines)
+
+        # Many distinct lines, then a few lines repeated over and over, where
+        # the alignment is most often in doubt
+        for base_line, new_line, length in (
+            (
+                lambda: b"line %d\n" % rng.randint(0, 40),
+                lambda: b"changed %d\n" % rng.randint(0, 2),
+                12,
+            ),
+            (
+                lambda: rng.choice(few_lines[:3]),
+                lambda: rng.choice(few_lines),
+                5,
+            ),
+        ):
+            for _ in range(300):
+                base_lines = [base_line() for _ in range(rng.randint(1, length))]
+                base = b"".join(base_lines)
+                local = edit(base_lines, new_line)
+                remote = edit(base_lines, new_line)
+                try:
+                    merged = merge_three_way(local, base, remote)
+                except MergeDeclined:
+                    continue
+                with self.subTest(base=base, local=local, remote=remote):
+                    self.assertEqual(merged, _git_merge_file(local, base, remote))
+
+
+if __name__ == "__main__":
+    unittest.main()
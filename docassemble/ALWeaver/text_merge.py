@@ -0,0 +1,203 @@
+# do not pre-load
+
+"""Three-way merge of text files, in process.
+
+Pulling from GitHub merges every file that changed both in the Playground and
+upstream. Running ``git merge-file`` for each costs a process and three
+temporary files per file, so :func:`merge_three_way` does the same diff3
+merge with :mod:`difflib`.
+
+Each side is aligned with the common ancestor, and the stretches of the
+ancestor that neither side changed divide the files into hunks. A hunk
+changed on one side only takes that side; a hunk both sides changed the same
+way takes either. Any other hunk is a conflict, including changes to adjacent
+lines with no unchanged line between them, which is where ``git merge-file``
+draws the line too. Only a clean merge produces text: like the caller's use
+of ``git merge-file``, a conflict is reported rather than written out with
+markers.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from difflib import Match, SequenceMatcher
+from typing import Dict, List, Optional, Sequence, Tuple
+
+__all__ = ["MAX_MERGE_LINES", "MergeDeclined", "merge_three_way"]
+
+#: Files longer than this are left to ``git merge-file``: difflib's matching
+#: slows down sharply on long files with many changes, where git's does not.
+MAX_MERGE_LINES = 20000
+
+
+class MergeDeclined(ValueError):
+    """Raised for content :func:`merge_three_way` does not merge itself."""
+
+
+# (base start, base end, local start, local end, remote start, remote end) of
+# a stretch that is the same in all three
+_SyncRegion = Tuple[int, int, int, int, int, int]
+
+
+def _lines(content: bytes) -> List[bytes]:
+    # Lines end at "\n" alone, as they do for git; a lone "\r" is not a break
+    lines = [line + b"\n" for line in content.split(b"\n")]
+    last = lines.pop()[:-1]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def _align(
+    base: Sequence[bytes], side: Sequence[bytes]
+) -> Tuple[List[Match], List[Tuple[int, int, bool]]]:
+    """Align ``side`` with ``base``.
+
+    Returns the matching blocks, ending with the empty one at the end of both,
+    and for each change the stretch of ``base`` it could sit against, with
+    whether that stretch is any wider than where difflib put it.
+
+    Another diff can align the files differently only through a line that
+    appears more than once, or a line one file has in a change and the other
+    has somewhere else, as when a line is moved. So a change's stretch runs
+    on over any repeated lines around it, and out to wherever the other file
+    has one of its lines.
+    """
+    matcher = SequenceMatcher(None, base, side, autojunk=False)
+    opcodes = matcher.get_opcodes()
+    base_counts = Counter(base)
+    side_counts = Counter(side)
+    # Where in base each line of either file sits
+    base_positions: Dict[bytes, List[int]] = {}
+    side_positions: Dict[bytes, List[int]] = {}
+    for index, line in enumerate(base):
+        base_positions.setdefault(line, []).append(index)
+    for tag, base_start, _base_end, side_start, side_end in opcodes:
+        for index in range(side_start, side_end):
+            side_positions.setdefault(side[index], []).append(
+                base_start + index - side_start if tag == "equal" else base_start
+            )
+
+    def repeated(line: bytes) -> bool:
+        return base_counts[line] > 1 or side_counts[line] > 1
+
+    changes: List[Tuple[int, int, bool]] = []
+    for tag, base_start, base_end, side_start, side_end in opcodes:
+        if tag == "equal":
+            continue
+        start, end = base_start, base_end
+        for lines, positions in (
+            (base[base_start:base_end], side_positions),
+            (side[side_start:side_end], base_positions),
+        ):
+            for line in lines:
+                if line in positions:
+                    start = min(start, positions[line][0])
+                    end = max(end, positions[line][-1] + 1)
+        while start > 0 and repeated(base[start - 1]):
+            start -= 1
+        while end < len(base) and repeated(base[end]):
+            end += 1
+        changes.append((start, end, (start, end) != (base_start, base_end)))
+    return matcher.get_matching_blocks(), changes
+
+
+def _ambiguous(
+    local_changes: List[Tuple[int, int, bool]],
+    remote_changes: List[Tuple[int, int, bool]],
+) -> bool:
+    # Whether two changes touch can depend on how the lines around one of them
+    # are aligned, and git may align them differently than difflib did
+    return any(
+        (local_slides or remote_slides)
+        and local_start <= remote_end
+        and remote_start <= local_end
+        for local_start, local_end, local_slides in local_changes
+        for remote_start, remote_end, remote_slides in remote_changes
+    )
+
+
+def _sync_regions(
+    local_matches: List[Match], remote_matches: List[Match]
+) -> List[_SyncRegion]:
+    regions: List[_SyncRegion] = []
+    local_index = remote_index = 0
+    while local_index < len(local_matches) and remote_index < len(remote_matches):
+        local_base, local_start, local_length = local_matches[local_index]
+        remote_base, remote_start, remote_length = remote_matches[remote_index]
+        start = max(local_base, remote_base)
+        end = min(local_base + local_length, remote_base + remote_length)
+        if start < end:
+            regions.append(
+                (
+                    start,
+                    end,
+                    local_start + start - local_base,
+                    local_start + end - local_base,
+                    remote_start + start - remote_base,
+                    remote_start + end - remote_base,
+                )
+            )
+        if local_base + local_length < remote_base + remote_length:
+            local_index += 1
+        else:
+            remote_index += 1
+    # Both lists end with an empty match at the end of all the lines, which
+    # the loop skips for being empty; the last hunk runs up to it
+    base_length, local_length, _ = local_matches[-1]
+    _, remote_length, _ = remote_matches[-1]
+    regions.append(
+        (
+            base_length,
+            base_length,
+            local_length,
+            local_length,
+            remote_length,
+            remote_length,
+        )
+    )
+    return regions
+
+
+def merge_three_way(local: bytes, base: bytes, remote: bytes) -> Optional[bytes]:
+    """Merge the changes ``local`` and ``remote`` each made to ``base``.
+
+    Returns the merged content, or None when the changes conflict.
+
+    Raises:
+        MergeDeclined: when a file is too long to merge here, or when whether
+            the changes conflict depends on how the lines around them are
+            aligned; the caller can hand these to ``git merge-file`` instead.
+    """
+    base_lines = _lines(base)
+    local_lines = _lines(local)
+    remote_lines = _lines(remote)
+    if max(len(base_lines), len(local_lines), len(remote_lines)) > MAX_MERGE_LINES:
+        raise MergeDeclined("The file is too long to merge in process")
+    local_matches, local_changes = _align(base_lines, local_lines)
+    remote_matches, remote_changes = _align(base_lines, remote_lines)
+    if _ambiguous(local_changes, remote_changes):
+        raise MergeDeclined("The changes could be aligned more than one way")
+
+    merged: List[bytes] = []
+    base_at = local_at = remote_at = 0
+    for (
+        base_start,
+        base_end,
+        local_start,
+        local_end,
+        remote_start,
+        remote_end,
+    ) in _sync_regions(local_matches, remote_matches):
+        base_hunk = base_lines[base_at:base_start]
+        local_hunk = local_lines[local_at:local_start]
+        remote_hunk = remote_lines[remote_at:remote_start]
+        if local_hunk == remote_hunk or remote_hunk == base_hunk:
+            merged.extend(local_hunk)
+        elif local_hunk == base_hunk:
+            merged.extend(remote_hunk)
+        else:
+            return None
+        merged.extend(base_lines[base_start:base_end])
+        base_at, local_at, remote_at = base_end, local_end, remote_end
+    return b"".join(merged)
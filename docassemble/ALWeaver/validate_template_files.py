@@ -1,19 +1,17 @@
 import ast
 import builtins
 import importlib.util
+from functools import lru_cache
 from pathlib import Path
 
 from jinja2 import DebugUndefined
-from docxtpl import DocxTemplate
-from docx2python import docx2python
 import jinja2.exceptions
 from docassemble.base.util import DAFile
 from .docassemble_compat import create_docx_jinja_environment
 import docassemble.base.util
 import keyword
-from typing import Optional, Iterable, Set
+from typing import Any, FrozenSet, Optional, Iterable, Set
 import re
-import pikepdf
 
 __all__ = [
     "CallAndDebugUndefined",
@@ -21,6 +19,7 @@ __all__ = [
     "get_mako_matches",
     "matching_reserved_names",
     "all_reserved_names",
+    "reserved_names",
     "has_fields",
 ]
 
@@ -53,88 +52,104 @@ def _declared_module_exports(module_name: str) -> Set[str]:
     raise ImportError(f"Unable to read {module_name}.__all__")
 
 
-all_reserved_names = set(
-    list(docassemble.base.util.__all__)
-    + list(_declared_module_exports("docassemble.AssemblyLine.al_general"))
-    + list(_declared_module_exports("docassemble.AssemblyLine.al_document"))
-    + list(_declared_module_exports("docassemble.AssemblyLine.language"))
-    + list(_declared_module_exports("docassemble.ALToolbox.misc"))
-    + list(keyword.kwlist)
-    + list(dir(builtins))
-    + [
-        "_attachment_email_address",
-        "_attachment_include_editable",
-        "_back_one",
-        "_checkboxes",
-        "_datatypes",
-        "_email_attachments",
-        "_files",
-        "_question_number",
-        "_question_name",
-        "_save_as",
-        "_success",
-        "_the_image",
-        "_track_location",
-        "_tracker",
-        "_varnames",
-        "_internal",
-        "nav",
-        "session_local",
-        "device_local",
-        "user_local",
-        "url_args",
-        "role_needed",
-        "x",
-        "i",
-        "j",
-        "k",
-        "l",
-        "m",
-        "n",
-        "role",
-        "speak_text",
-        "track_location",
-        "multi_user",
-        "menu_items",
-        "allow_cron",
-        "incoming_email",
-        "role_event",
-        "cron_hourly",
-        "cron_daily",
-        "cron_weekly",
-        "cron_monthly",
-        "_internal",
-        "allow_cron",
-        "cron_daily",
-        "cron_hourly",
-        "cron_monthly",
-        "cron_weekly",
-        "caller",
-        "device_local",
-        "loop",
-        "incoming_email",
-        "menu_items",
-        "multi_user",
-        "nav",
-        "role_event",
-        "role_needed",
-        "row_index",
-        "row_item",
-        "self",
-        "session_local",
-        "speak_text",
-        "STOP_RENDERING",
-        "track_location",
-        "url_args",
-        "user_local",
-        "user_dict",
-        "allow_cron",
-    ]
-)
+@lru_cache(maxsize=None)
+def reserved_names() -> FrozenSet[str]:
+    """Names a template variable must not take, worked out on first use.
+
+    Reading the AssemblyLine and ALToolbox sources for their exports costs
+    more than the rest of importing this module, and only checking a
+    template's fields needs them.
+    """
+    return frozenset(
+        list(docassemble.base.util.__all__)
+        + list(_declared_module_exports("docassemble.AssemblyLine.al_general"))
+        + list(_declared_module_exports("docassemble.AssemblyLine.al_document"))
+        + list(_declared_module_exports("docassemble.AssemblyLine.language"))
+        + list(_declared_module_exports("docassemble.ALToolbox.misc"))
+        + list(keyword.kwlist)
+        + list(dir(builtins))
+        + [
+            "_attachment_email_address",
+            "_attachment_include_editable",
+            "_back_one",
+            "_checkboxes",
+            "_datatypes",
+            "_email_attachments",
+            "_files",
+            "_question_number",
+            "_question_name",
+            "_save_as",
+            "_success",
+            "_the_image",
+            "_track_location",
+            "_tracker",
+            "_varnames",
+            "_internal",
+            "nav",
+            "session_local",
+            "device_local",
+            "user_local",
+            "url_args",
+            "role_needed",
+            "x",
+            "i",
+            "j",
+            "k",
+            "l",
+            "m",
+            "n",
+            "role",
+            "speak_text",
+            "track_location",
+            "multi_user",
+            "menu_items",
+            "allow_cron",
+            "incoming_email",
+            "role_event",
+            "cron_hourly",
+            "cron_daily",
+            "cron_weekly",
+            "cron_monthly",
+            "_internal",
+            "allow_cron",
+            "cron_daily",
+            "cron_hourly",
+            "cron_monthly",
+            "cron_weekly",
+            "caller",
+            "device_local",
+            "loop",
+            "incoming_email",
+            "menu_items",
+            "multi_user",
+            "nav",
+            "role_event",
+            "role_needed",
+            "row_index",
+            "row_item",
+            "self",
+            "session_local",
+            "speak_text",
+            "STOP_RENDERING",
+            "track_location",
+            "url_args",
+            "user_local",
+            "user_dict",
+            "allow_cron",
+        ]
+    )
+
 
 just_keywords_and_builtins = set(list(keyword.kwlist) + list(dir(builtins)))
 
 
+def __getattr__(name: str) -> Any:
+    # ``all_reserved_names`` used to be built at import time
+    if name == "all_reserved_names":
+        return set(reserved_names())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def matching_reserved_names(
     field_names: Iterable[str], keywords_and_builtins_only: bool = False
 ) -> Set[str]:
@@ -150,7 +165,7 @@ def matching_reserved_names(
             matches.add(match.group(1))
     if keywords_and_builtins_only:
         return matches.intersection(just_keywords_and_builtins)
-    return matches.intersection(all_reserved_names)
+    return matches.intersection(reserved_names())
 
 
 class CallAndDebugUndefined(DebugUndefined):
@@ -171,6 +186,8 @@ def get_jinja_errors(the_file: DAFile) -> Optional[str]:
     """Just try rendering the DOCX file as a Jinja2 template and catch any errors.
     Returns a string with the errors, if any.
     """
+    from docxtpl import DocxTemplate
+
     env = create_docx_jinja_environment(undefined=CallAndDebugUndefined)
 
     doc = DocxTemplate(the_file.path())
@@ -189,6 +206,8 @@ def get_jinja_errors(the_file: DAFile) -> Optional[str]:
 
 def get_mako_matches(the_file: DAFile) -> Iterable[str]:
     """Find's instances of mako in the file's DOCX content's"""
+    from docx2python import docx2python
+
     match_mako = (
         r"\${[^{].*\}"  # look for ${ without a double {{, for cases of dollar values
     )
@@ -206,6 +225,8 @@ def has_fields(pdf_file: str) -> bool:
     Returns:
         bool: True if the PDF has at least one form field, False otherwise.
     """
+    import pikepdf
+
     with pikepdf.open(pdf_file) as pdf:
         return hasattr(pdf.Root, "AcroForm") and hasattr(pdf.Root.AcroForm, "Fields")
     return False
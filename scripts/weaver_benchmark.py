@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-to-end interview generation over a corpus of templates.
+
+Each template is drafted several times through generate_interview_from_path
+(``--entry path``) and/or the API's generate_interview_from_bytes
+(``--entry bytes``), in a fresh worker process per template, and reported with:
+1) the median and best seconds per draft, and how many fields the template has
+2) the median wall and CPU seconds of each stage, from the generator's timings
+3) the peak RSS of the worker process
+4) throughput, in drafts per minute over the whole corpus
+
+With --save-baseline the report is written for later runs to compare against;
+with --baseline this run is compared to such a report and the script exits 1
+when a draft, or a stage of one, got slower than the tolerance allows, when a
+worker's peak RSS grew past it, or when a template failed.
+
+By default the corpus is the PDF and DOCX templates bundled with the package,
+from data/sources, data/templates and test. Pass files or directories to
+benchmark your own forms instead. The package must be importable, e.g. after
+``pip install --editable .``. No docassemble server runs behind the script, so
+drafts run with stand-ins for the configuration, file lookup and thread context
+the generator reads, as conftest.py provides them for the tests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import mimetypes
+import multiprocessing
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "docassemble" / "ALWeaver"
+DEFAULT_CORPUS = [
+    PACKAGE_DIR / "data" / "sources",
+    PACKAGE_DIR / "data" / "templates",
+    PACKAGE_DIR / "test",
+]
+TEMPLATE_EXTENSIONS = {".pdf", ".docx"}
+ENTRIES = ("path", "bytes")
+REPORT_VERSION = 1
+MIMETYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def discover_corpus(paths: Iterable[Path]) -> List[Path]:
+    """The templates in ``paths``, expanding directories, in a stable order."""
+    found: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found.extend(
+                sorted(
+                    child
+                    for child in path.iterdir()
+                    if child.is_file() and child.suffix.lower() in TEMPLATE_EXTENSIONS
+                )
+            )
+        elif path.is_file():
+            found.append(path)
+        else:
+            raise SystemExit(f"No such file or directory: {path}")
+    return found
+
+
+def _document_name(path: Path) -> str:
+    """How a template is named in reports: relative to the package when bundled."""
+    try:
+        return str(path.resolve().relative_to(PACKAGE_DIR))
+    except ValueError:
+        return str(path)
+
+
+def _local_file_finder(file_reference: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Resolve package files without docassemble's server hooks."""
+    if not isinstance(file_reference, str):
+        return {"fullpath": None, "mimetype": None}
+    if ":" in file_reference:
+        package_name, relative_name = file_reference.split(":", 1)
+    else:
+        package_name, relative_name = "docassemble.ALWeaver", file_reference
+    if package_name == "ALWeaver":
+        package_name = "docassemble.ALWeaver"
+    spec = importlib.util.find_spec(package_name)
+    if spec is None or not spec.submodule_search_locations:
+        return {"fullpath": None, "mimetype": None}
+    path = Path(next(iter(spec.submodule_search_locations))) / relative_name
+    mimetype, _encoding = mimetypes.guess_type(path.name)
+    return {
+        "fullpath": str(path) if path.exists() else None,
+        "mimetype": mimetype,
+        "filename": path.name,
+    }
+
+
+@contextlib.contextmanager
+def _docassemble_context() -> Iterator[None]:
+    """Stand in the server configuration and thread context a draft reads."""
+    import docassemble.base.dates as da_dates
+    import docassemble.base.functions as da_functions
+    import docassemble.base.util as da_util
+
+    patches = [
+        (da_functions, "get_configuration", lambda: {}),
+        (da_dates, "get_configuration", lambda: {}),
+        (da_dates, "get_default_timezone", lambda: "UTC"),
+        (da_util, "file_finder", _local_file_finder),
+    ]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, value in patches:
+        setattr(module, name, value)
+    try:
+        try:
+            from docassemble.base.thread_context import empty_globals, global_context
+        except ImportError:
+            yield
+            return
+        context = empty_globals()
+        context.current_question = SimpleNamespace(package="ALWeaver")
+        with global_context(context):
+            yield
+    finally:
+        for module, name, value in originals:
+            setattr(module, name, value)
+
+
+def _count_fields(path: Path) -> int:
+    from docassemble.ALWeaver.document_analysis import analyze_document
+    from docassemble.ALWeaver.interview_generator import get_docx_variables
+
+    if path.suffix.lower() == ".pdf":
+        return len(analyze_document(str(path)).pdf_fields())
+    return len(get_docx_variables(analyze_document(str(path), filename=".docx").text()))
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run_once(path: Path, entry: str) -> List[Dict[str, Any]]:
+    """Draft ``path`` once and return the generator's stage timings."""
+    if entry == "path":
+        from docassemble.ALWeaver.interview_generator import (
+            generate_interview_from_path,
+        )
+
+        with tempfile.TemporaryDirectory(prefix="alweaver-benchmark-") as output_dir:
+            result = generate_interview_from_path(
+                str(path), output_dir=output_dir, include_next_steps=False
+            )
+        return result.timings
+
+    from docassemble.ALWeaver.api_utils import generate_interview_from_bytes
+
+    payload = generate_interview_from_bytes(
+        filename=path.name,
+        content_bytes=path.read_bytes(),
+        mimetype=MIMETYPES.get(path.suffix.lower()),
+        generation_options={"include_next_steps": False},
+        include_yaml_text=False,
+        include_timings=True,
+    )
+    return payload["timings"]
+
+
+def _stage_seconds(timings: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Wall and CPU seconds by stage name, adding up a stage that ran more than once."""
+    stages: Dict[str, Dict[str, float]] = {}
+    for timing in timings:
+        totals = stages.setdefault(
+            timing["name"], {"wall_seconds": 0.0, "cpu_seconds": 0.0}
+        )
+        totals["wall_seconds"] += timing["wall_seconds"]
+        totals["cpu_seconds"] += timing["cpu_seconds"]
+    return stages
+
+
+def measure_document(
+    path: Path, entries: Sequence[str], repeat: int, warmup: int, warm: bool
+) -> List[Dict[str, Any]]:
+    """Draft one template ``warmup + repeat`` times for each entry point.
+
+    Unless ``warm`` is set, the parsed-template cache is cleared before every
+    draft, so each measures reading the template as a fresh upload would.
+    """
+    from docassemble.ALWeaver.document_analysis import clear_document_analysis_cache
+
+    with _docassemble_context():
+        name = _document_name(path)
+        try:
+            fields: Optional[int] = _count_fields(path)
+        except Exception:
+            fields = None
+        results: List[Dict[str, Any]] = []
+        for entry in entries:
+            record: Dict[str, Any] = {
+                "document": name,
+                "entry": entry,
+                "fields": fields,
+                "size_bytes": path.stat().st_size,
+            }
+            seconds: List[float] = []
+            stage_runs: List[Dict[str, Dict[str, float]]] = []
+            try:
+                for run in range(warmup + repeat):
+                    if not warm:
+                        clear_document_analysis_cache()
+                    started = time.perf_counter()
+                    timings = _run_once(path, entry)
+                    elapsed = time.perf_counter() - started
+                    if run >= warmup:
+                        seconds.append(elapsed)
+                        stage_runs.append(_stage_seconds(timings))
+            except Exception as exc:
+                record["error"] = f"{type(exc).__name__}: {exc}"
+            if seconds:
+                record["runs"] = seconds
+                record["median_seconds"] = statistics.median(seconds)
+                record["best_seconds"] = min(seconds)
+                record["stages"] = {
+                    stage: {
+                        key: statistics.median(
+                            run[stage][key] for run in stage_runs if stage in run
+                        )
+                        for key in ("wall_seconds", "cpu_seconds")
+                    }
+                    for stage in stage_runs[0]
+                }
+            results.append(record)
+    peak_rss_mb = _peak_rss_mb()
+    for record in results:
+        record["peak_rss_mb"] = peak_rss_mb
+    return results
+
+
+def run_benchmark(
+    corpus: Sequence[Path],
+    *,
+    entries: Sequence[str],
+    repeat: int,
+    warmup: int,
+    warm: bool,
+    isolate: bool,
+) -> Dict[str, Any]:
+    documents: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+    for path in corpus:
+        print(f"{_document_name(path)}: drafting {repeat} time(s)...", flush=True)
+        if isolate:
+            # A fresh process per template, so its peak RSS is its own
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                records = executor.submit(
+                    measure_document, path, entries, repeat, warmup, warm
+                ).result()
+        else:
+            records = measure_document(path, entries, repeat, warmup, warm)
+        documents.extend(records)
+    elapsed = time.perf_counter() - started
+
+    drafts = sum(len(record.get("runs", [])) for record in documents)
+    drafting_seconds = sum(sum(record.get("runs", [])) for record in documents)
+    try:
+        from docassemble.ALWeaver import __version__
+    except ImportError:
+        __version__ = "unknown"
+    return {
+        "version": REPORT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "package_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "entries": list(entries),
+            "repeat": repeat,
+            "warmup": warmup,
+            "warm": warm,
+            "isolate": isolate,
+        },
+        "documents": documents,
+        "totals": {
+            "drafts": drafts,
+            "drafting_seconds": drafting_seconds,
+            "elapsed_seconds": elapsed,
+            "drafts_per_minute": (
+                60.0 * drafts / drafting_seconds if drafting_seconds else 0.0
+            ),
+        },
+    }
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    tolerance: float,
+    min_seconds: float,
+    rss_tolerance: float,
+) -> List[str]:
+    """What got worse than ``baseline`` allows, one line each.
+
+    A time counts as a regression when it is more than ``tolerance`` (a
+    fraction) above the baseline *and* more than ``min_seconds`` above it, so
+    stages that take a few milliseconds do not fail the run on noise.
+    """
+    problems: List[str] = []
+    before_by_key = {
+        (record["document"], record["entry"]): record
+        for record in baseline.get("documents", [])
+    }
+
+    def slower(label: str, now: float, before: float) -> None:
+        if now > before * (1 + tolerance) and now - before > min_seconds:
+            problems.append(
+                f"{label}: {now:.3f}s, was {before:.3f}s "
+                f"(+{100 * (now - before) / before if before else 100:.0f}%)"
+            )
+
+    for record in report["documents"]:
+        label = f"{record['document']} [{record['entry']}]"
+        if "error" in record:
+            problems.append(f"{label}: failed: {record['error']}")
+            continue
+        before = before_by_key.get((record["document"], record["entry"]))
+        if before is None or "median_seconds" not in before:
+            continue
+        slower(label, record["median_seconds"], before["median_seconds"])
+        for stage, now in record.get("stages", {}).items():
+            was = before.get("stages", {}).get(stage)
+            if was:
+                slower(f"{label} {stage}", now["wall_seconds"], was["wall_seconds"])
+        if record.get("peak_rss_mb") and before.get("peak_rss_mb"):
+            if record["peak_rss_mb"] > before["peak_rss_mb"] * (1 + rss_tolerance):
+                problems.append(
+                    f"{label}: peak RSS {record['peak_rss_mb']:.0f} MB, "
+                    f"was {before['peak_rss_mb']:.0f} MB"
+                )
+    return problems
+
+
+def print_report(report: Dict[str, Any], *, show_stages: bool) -> None:
+    print()
+    print(
+        f"{'document':<52} {'entry':<6} {'fields':>6} {'median':>8} "
+        f"{'best':>8} {'rss MB':>7}"
+    )
+    for record in report["documents"]:
+        fields = "-" if record.get("fields") is None else str(record["fields"])
+        rss = record.get("peak_rss_mb")
+        if "error" in record:
+            print(
+                f"{record['document']:<52} {record['entry']:<6} FAILED {record['error']}"
+            )
+            continue
+        print(
+            f"{record['document']:<52} {record['entry']:<6} {fields:>6} "
+            f"{record['median_seconds']:>7.3f}s {record['best_seconds']:>7.3f}s "
+            f"{'-' if rss is None else format(rss, '.0f'):>7}"
+        )
+        if show_stages:
+            for stage, seconds in record.get("stages", {}).items():
+                print(
+                    f"    {stage:<46} {seconds['wall_seconds']:>7.3f}s wall "
+                    f"{seconds['cpu_seconds']:>7.3f}s cpu"
+                )
+    totals = report["totals"]
+    print()
+    print(
+        f"{totals['drafts']} drafts in {totals['drafting_seconds']:.1f}s: "
+        f"{totals['drafts_per_minute']:.1f} drafts/minute"
+    )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark interview generation over a corpus of templates."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Templates or directories of templates (default: the bundled ones).",
+    )
+    parser.add_argument(
+        "--entry", choices=[*ENTRIES, "both"], default="path", help="What to call."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--warm",
+        default=False,
+        action="store_true",
+        help="Keep the parsed-template cache between drafts of a template.",
+    )
+    parser.add_argument(
+        "--in-process",
+        default=False,
+        action="store_true",
+        help="Run every template in this process; peak RSS is then cumulative.",
+    )
+    parser.add_argument("--stages", default=False, action="store_true")
+    parser.add_argument("--json", type=Path, help="Write the full report here.")
+    parser.add_argument("--baseline", type=Path, help="Report to compare against.")
+    parser.add_argument("--save-baseline", type=Path, help="Write this run here.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Fraction a time may grow over the baseline (default 0.25).",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="Growth in seconds below which a time never counts as slower.",
+    )
+    parser.add_argument("--rss-tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    corpus = discover_corpus(args.paths or DEFAULT_CORPUS)
+    if not corpus:
+        raise SystemExit("No PDF or DOCX templates to benchmark.")
+    entries = list(ENTRIES) if args.entry == "both" else [args.entry]
+    report = run_benchmark(
+        corpus,
+        entries=entries,
+        repeat=max(1, args.repeat),
+        warmup=max(0, args.warmup),
+        warm=args.warm,
+        isolate=not args.in_process,
+    )
+    print_report(report, show_stages=args.stages)
+
+    for destination in (args.json, args.save_baseline):
+        if destination:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.write_text(
+                json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+            )
+            print(f"Wrote {destination}")
+
+    failures = [
+        f"{record['document']} [{record['entry']}]: failed: {record['error']}"
+        for record in report["documents"]
+        if "error" in record
+    ]
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("version") != REPORT_VERSION:
+            raise SystemExit(
+                f"{args.baseline} is not a version {REPORT_VERSION} report."
+            )
+        failures = compare_to_baseline(
+            report,
+            baseline,
+            tolerance=args.tolerance,
+            min_seconds=args.min_seconds,
+            rss_tolerance=args.rss_tolerance,
+        )
+        if not failures:
+            print(f"No regressions against {args.baseline}.")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))